@@ -5,6 +5,7 @@ from flask_cors import CORS
 from extensions import db, cors, executor
 from config import get_config
 from core.logger import setup_logging
+from core.pagination import PAGE_HEADERS
 
 def create_app(config_name=None):
     """Flask 애플리케이션 팩토리"""
@@ -33,16 +34,63 @@ def create_app(config_name=None):
     
     # 데이터베이스 테이블 생성
     with app.app_context():
+        initialize_partitioning(app)
         db.create_all()
+        initialize_views(app)
+        initialize_cache(app)
     
     return app
 
 def initialize_extensions(app):
     """확장 초기화"""
+    from database.pool import configure_engine_options
+    configure_engine_options(app.config)
     db.init_app(app)
-    cors.init_app(app, origins=app.config['CORS_ORIGINS'])
+    cors.init_app(app, origins=app.config['CORS_ORIGINS'], expose_headers=PAGE_HEADERS + ['ETag'])
     executor.init_app(app)
 
+def initialize_partitioning(app):
+    """거래 데이터 파티션 테이블 준비 (설정된 경우에만)"""
+    interval = app.config.get('TRADING_PARTITION_INTERVAL')
+    if not interval:
+        return
+    
+    from database.partitioning import ensure_partitioned_trading_table, ensure_future_partitions
+    premake = app.config.get('TRADING_PARTITION_PREMAKE', 1)
+    if not ensure_partitioned_trading_table(interval, premake):
+        ensure_future_partitions(interval, premake)
+
+def initialize_views(app):
+    """조회 시점 계산 뷰와 데이터 워터마크 트리거 준비 (누적 순매수, 조건부 GET)"""
+    from database.accumulation_view import ensure_accumulation_view
+    from database.watermarks import ensure_watermark_triggers
+    ensure_accumulation_view()
+    ensure_watermark_triggers()
+
+def initialize_cache(app):
+    """조회 결과 캐시 설정 (다른 워커의 쓰기는 데이터 워터마크로 감지, REDIS_URL이 있으면 공유 캐시 사용)"""
+    from core.cache import result_cache
+    from services.watermark_service import WatermarkService
+    result_cache.configure(
+        max_entries=app.config.get('RESULT_CACHE_MAX_ENTRIES'),
+        max_bytes=app.config.get('RESULT_CACHE_MAX_BYTES'),
+        default_ttl=app.config.get('RESULT_CACHE_TTL')
+    )
+    result_cache.set_version_source(WatermarkService.cache_versions)
+    
+    redis_url = app.config.get('REDIS_URL')
+    if redis_url and app.config.get('RESULT_CACHE_SHARED_ENABLED', True):
+        from core.shared_cache import SharedCache, create_client
+        try:
+            result_cache.shared = SharedCache(
+                create_client(redis_url),
+                prefix=app.config.get('RESULT_CACHE_SHARED_PREFIX', 's-analysis:result'),
+                max_bytes=app.config.get('RESULT_CACHE_SHARED_MAX_BYTES', 8 * 1024 * 1024),
+                compress_level=app.config.get('RESULT_CACHE_COMPRESS_LEVEL', 1)
+            )
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"공유 결과 캐시 사용 안 함: {str(e)}")
+
 def register_blueprints(app):
     """블루프린트 등록"""
     from views.stock import stock_bp
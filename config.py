@@ -5,6 +5,19 @@ from dotenv import load_dotenv
 # .env 파일 로드
 load_dotenv()
 
+# 체크아웃마다 연결을 확인하는 pool_pre_ping은 요청당 왕복을 추가하므로 기본 비활성화합니다.
+# 연결 끊김은 database.transaction에서 발생한 예외로 감지하여 처리합니다.
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'yes')
+
+def build_replica_binds(engine_options):
+    """REPLICA_DATABASE_URL이 설정된 경우 읽기 복제본 바인드를 구성합니다 (주 DB와 같은 풀 설정)."""
+    replica_url = os.environ.get('REPLICA_DATABASE_URL')
+    if not replica_url:
+        return {}
+    connect_args = dict(engine_options.get('connect_args', {}))
+    connect_args['application_name'] = f"{connect_args.get('application_name', 'stock_analysis')}_replica"
+    return {'replica': {**engine_options, 'url': replica_url, 'connect_args': connect_args}}
+
 class BaseConfig:
     """기본 설정 클래스"""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'devkey')
@@ -12,7 +25,7 @@ class BaseConfig:
     
     # PostgreSQL 기본 설정
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
+        'pool_pre_ping': DB_POOL_PRE_PING,
         'pool_recycle': 1800,
         'pool_size': 5,
         'max_overflow': 10,
@@ -26,6 +39,18 @@ class BaseConfig:
         }
     }
     
+    # 커넥션 풀 크기 산정
+    # DB_POOL_SIZING: 'fixed' (SQLALCHEMY_ENGINE_OPTIONS 값 사용), 'auto' (워커 수와 연결 예산으로 계산)
+    # DB_CONNECTION_BUDGET: 애플리케이션 전체(모든 gunicorn 워커 합계)에 허용할 DB 연결 수
+    DB_POOL_SIZING = os.environ.get('DB_POOL_SIZING', 'fixed')
+    DB_CONNECTION_BUDGET = int(os.environ.get('DB_CONNECTION_BUDGET', '80'))
+    EXECUTOR_MAX_WORKERS = int(os.environ.get('EXECUTOR_MAX_WORKERS', '2'))
+    
+    # 읽기 복제본 설정 (read_only_transaction 뷰와 TradingService 조회에 사용)
+    SQLALCHEMY_BINDS = build_replica_binds(SQLALCHEMY_ENGINE_OPTIONS)
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', '10'))
+    REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', '5'))
+    
     # 배치 처리 설정
     BATCH_PROCESSING = {
         'max_workers': 2,
@@ -35,6 +60,27 @@ class BaseConfig:
         'auto_restart_on_failure': True,
     }
     
+    # 거래 데이터 파티션 설정
+    # TRADING_PARTITION_INTERVAL: '' (미사용), 'year', 'quarter'
+    TRADING_PARTITION_INTERVAL = os.environ.get('TRADING_PARTITION_INTERVAL', '')
+    TRADING_PARTITION_PREMAKE = int(os.environ.get('TRADING_PARTITION_PREMAKE', '1'))
+    
+    # 누적 순매수 캐시 설정
+    # ACCUM_CACHE_ENABLED: 수집 시 거래 테이블의 누적 컬럼(초기값 제외 누계)을 증분 갱신할지 여부
+    # 끄면 누적 컬럼을 채우지 않고, 거래 데이터 조회의 누적값을 순매수 누계로 조회 시점에 계산합니다 (누적 뷰와 같은 값).
+    ACCUM_CACHE_ENABLED = os.environ.get('ACCUM_CACHE_ENABLED', 'true').lower() == 'true'
+    
+    # 트렌드 분석 지표 설정 (services/trend_service.py의 DEFAULT_TREND_CONFIG를 덮어씀)
+    # ema_short/ema_long: 순매수 EMA 기간, window: 기울기/z-score 구간
+    # weights: 지표별 가중치, thresholds: 신호 임계값 (strong 이상 '강한 상승', weak 이상 '상승')
+    # TREND_STREAMING_ENABLED: 수집 직후 저장된 지표 상태로 새 거래일의 신호/점수를 증분 계산할지 여부
+    TREND_STREAMING_ENABLED = os.environ.get('TREND_STREAMING_ENABLED', 'true').lower() == 'true'
+    TREND_ANALYSIS = {
+        'ema_short': int(os.environ.get('TREND_EMA_SHORT', '5')),
+        'ema_long': int(os.environ.get('TREND_EMA_LONG', '20')),
+        'window': int(os.environ.get('TREND_WINDOW', '20')),
+    }
+    
     # 로깅 설정
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -44,6 +90,44 @@ class BaseConfig:
     API_VERSION = 'v1'
     API_DESCRIPTION = '주식 분석 및 거래 데이터 관리 API'
     
+    # 목록 조회 커서 페이지네이션 (limit 기본값/서버 상한)
+    PAGINATION_DEFAULT_LIMIT = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', '1000'))
+    PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', '5000'))
+    
+    # 목록 스트리밍(stream=ndjson|json) 시 서버 측 커서에서 한 번에 가져올 행 수
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', '2000'))
+    
+    # 조회 API를 ORM 객체 대신 컬럼 값 Row + projection별 직렬화(orjson 설치 시 orjson)로 응답할지 여부
+    FAST_READ_PATH_ENABLED = os.environ.get('FAST_READ_PATH_ENABLED', 'true').lower() == 'true'
+    
+    # 조건부 GET (ETag/Last-Modified, 일치하면 본 조회 없이 304)
+    # 검증값은 트리거로 갱신되는 데이터 버전/종목별 거래 데이터 범위(database/watermarks.py)에서 만듭니다.
+    CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'true').lower() == 'true'
+    # 엔드포인트별 Cache-Control (정책 이름 또는 엔드포인트 이름(예: trading.get_trading_data_by_stock_code) 키)
+    # no-cache: 매 요청 ETag로 재검증, max-age=N: N초 동안 재검증 없이 사용
+    CACHE_CONTROL = {
+        'default': os.environ.get('CACHE_CONTROL_DEFAULT', 'no-cache'),
+        'stocks': os.environ.get('CACHE_CONTROL_STOCKS', 'no-cache'),
+        'trading': os.environ.get('CACHE_CONTROL_TRADING', 'no-cache'),
+        'trading_stock': os.environ.get('CACHE_CONTROL_TRADING_STOCK', 'no-cache'),
+    }
+    
+    # 조회 결과 캐시 (프로세스 메모리, core/cache.py)
+    # 항목 수와 추정 바이트로 크기를 제한하고, 쓰기 커밋 후 태그 단위로 무효화합니다.
+    # 다른 워커의 쓰기는 RESULT_CACHE_SYNC_INTERVAL초마다 데이터 워터마크를 확인하여 반영합니다.
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+    RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 2048))
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    RESULT_CACHE_TTL = float(os.environ.get('RESULT_CACHE_TTL', 300))
+    RESULT_CACHE_SYNC_INTERVAL = float(os.environ.get('RESULT_CACHE_SYNC_INTERVAL', 1.0))
+    # 워커/노드 간 공유 결과 캐시 (Redis, core/shared_cache.py) - REDIS_URL이 있을 때만 사용 (memory://: 프로세스 안 대용)
+    # 값은 압축하여 저장하고, 키에 태그 버전을 넣어 쓰기 후 버전을 올리면 모든 워커에서 한 번에 무효화됩니다.
+    REDIS_URL = os.environ.get('REDIS_URL')
+    RESULT_CACHE_SHARED_ENABLED = os.environ.get('RESULT_CACHE_SHARED_ENABLED', 'true').lower() == 'true'
+    RESULT_CACHE_SHARED_PREFIX = os.environ.get('RESULT_CACHE_SHARED_PREFIX', 's-analysis:result')
+    RESULT_CACHE_SHARED_MAX_BYTES = int(os.environ.get('RESULT_CACHE_SHARED_MAX_BYTES', 8 * 1024 * 1024))
+    RESULT_CACHE_COMPRESS_LEVEL = int(os.environ.get('RESULT_CACHE_COMPRESS_LEVEL', 1))
+    
     # CORS 설정
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
 
@@ -65,7 +149,7 @@ class ProductionConfig(BaseConfig):
     
     # 운영 환경에서는 더 보수적인 설정
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
+        'pool_pre_ping': DB_POOL_PRE_PING,
         'pool_recycle': 3600,
         'pool_size': 10,
         'max_overflow': 20,
@@ -78,6 +162,7 @@ class ProductionConfig(BaseConfig):
             'keepalives_count': 5,
         }
     }
+    SQLALCHEMY_BINDS = build_replica_binds(SQLALCHEMY_ENGINE_OPTIONS)
 
 class TestingConfig(BaseConfig):
     """테스트 환경 설정"""
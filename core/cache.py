@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+조회 결과 캐시
+서비스 조회 함수의 결과를 프로세스 메모리에 보관하는 크기 제한 캐시입니다.
+
+    - 항목 수(max_entries)와 추정 바이트(max_bytes)를 모두 넘지 않도록 LRU 순서로 제거하고, 항목별 TTL이 지나면 만료
+    - 태그 기반 무효화: 항목마다 태그(예: stocks, trading:005930)를 붙이고 쓰기 후 태그 단위로 제거
+    - 단일 실행(single-flight): 같은 키의 동시 미스는 한 번만 조회하고 나머지는 그 결과를 기다림
+    - 조회 중 무효화 감지: 조회를 시작한 뒤 태그가 무효화되면 결과를 저장하지 않음 (오래된 값 재적재 방지)
+    - 다른 프로세스(gunicorn 워커)의 쓰기: 등록된 버전 조회 함수(데이터 워터마크)를 주기적으로 확인하여 무효화
+    - 적중/미스/제거/무효화 횟수는 core.metrics에 기록
+    - shared(core.shared_cache.SharedCache)를 설정하면 미스 시 워커 간 공유 캐시(Redis)를 먼저 확인
+
+캐시된 값은 여러 요청이 공유하므로 호출자가 수정하면 안 됩니다 (Row, 튜플 등 불변 값을 캐시하도록 사용).
+"""
+import dataclasses
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+from flask import current_app, g, has_app_context
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 크기 추정 시 컬렉션에서 표본으로 측정할 원소 수
+SIZE_SAMPLE = 8
+
+# clear() 시 세대를 올리는 내부 태그 (모든 조회가 이 태그의 세대도 확인)
+_ALL = '*'
+
+
+def estimate_size(value: Any) -> int:
+    """
+    값의 대략적인 메모리 크기(바이트)
+
+    컬렉션은 앞쪽 SIZE_SAMPLE개 원소의 평균 크기로 전체를 추정하므로 큰 목록도 빠르게 계산합니다.
+
+    Args:
+        value: 측정할 값
+
+    Returns:
+        int: 추정 바이트
+    """
+    size = sys.getsizeof(value)
+    if value is None or isinstance(value, (str, bytes, bytearray, int, float, bool, date, datetime)):
+        return size
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return size + sum(estimate_size(getattr(value, field.name)) for field in dataclasses.fields(value))
+    if isinstance(value, Mapping):
+        items = list(value.items())
+        sample = items[:SIZE_SAMPLE]
+        if not sample:
+            return size
+        per_item = sum(estimate_size(key) + estimate_size(item) for key, item in sample) / len(sample)
+        return size + int(per_item * len(items))
+    if isinstance(value, (Sequence, set, frozenset)) or hasattr(value, '_fields'):
+        items = value if isinstance(value, Sequence) else list(value)
+        sample = [items[index] for index in range(min(SIZE_SAMPLE, len(items)))]
+        if not sample:
+            return size
+        return size + int(sum(estimate_size(item) for item in sample) / len(sample) * len(items))
+    return size
+
+
+@dataclasses.dataclass
+class _Entry:
+    """캐시 항목"""
+    value: Any
+    size: int
+    expires_at: float
+    tags: Tuple[str, ...]
+
+
+class _Flight:
+    """진행 중인 조회 (같은 키의 동시 요청이 결과를 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResultCache:
+    """
+    LRU + TTL 결과 캐시 (스레드 안전)
+
+    Args:
+        name (str): 지표 라벨에 쓰는 캐시 이름
+        max_entries (int): 최대 항목 수
+        max_bytes (int): 최대 추정 바이트 (한 항목이 이보다 크면 저장하지 않음)
+        default_ttl (float): 기본 TTL(초)
+    """
+
+    def __init__(self, name: str = 'result', max_entries: int = 2048,
+                 max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 300):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._tag_keys: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._bytes = 0
+        self._versions: Dict[str, Any] = {}
+        self._version_source: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+        self._synced_at: Optional[float] = None
+        self._sync_lock = threading.Lock()
+        # 여러 워커가 함께 쓰는 2차 캐시 (core.shared_cache.SharedCache, 설정하지 않으면 프로세스 캐시만 사용)
+        self.shared = None
+        # True를 반환하면 캐시를 거치지 않음 (예: 현재 세션에 커밋 전 쓰기가 있어 자기 쓰기를 읽어야 하는 경우)
+        self.bypass: Optional[Callable[[], bool]] = None
+
+    def configure(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                  default_ttl: Optional[float] = None) -> None:
+        """크기/TTL 설정을 바꾸고 초과분을 제거합니다."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if default_ttl is not None:
+                self.default_ttl = default_ttl
+            self._evict()
+
+    # 내부 처리 (self._lock을 잡은 상태에서 호출)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            metrics.increment('cache.evictions', labels={'cache': self.name})
+        self._record_gauges()
+
+    def _record_gauges(self) -> None:
+        metrics.set_gauge('cache.entries', len(self._entries), labels={'cache': self.name})
+        metrics.set_gauge('cache.bytes', self._bytes, labels={'cache': self.name})
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    # 공개 API
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        캐시 조회
+
+        Returns:
+            Tuple[bool, Any]: (적중 여부, 값)
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None,
+            generations: Optional[Dict[str, int]] = None) -> bool:
+        """
+        캐시 저장
+
+        Args:
+            key (str): 캐시 키
+            value: 저장할 값
+            tags (Iterable[str]): 무효화 태그
+            ttl (Optional[float]): TTL(초), None이면 기본 TTL
+            generations (Optional[Dict[str, int]]): 조회 시작 시점의 태그 세대 - 그 사이 무효화되었으면 저장하지 않음
+
+        Returns:
+            bool: 저장했으면 True
+        """
+        tags = tuple(tags)
+        size = estimate_size(value)
+        with self._lock:
+            if generations is not None and any(
+                self._generations.get(tag, 0) != generation for tag, generation in generations.items()
+            ):
+                metrics.increment('cache.stale_loads', labels={'cache': self.name})
+                return False
+            if size > self.max_bytes:
+                return False
+            self._remove(key)
+            self._entries[key] = _Entry(value, size, time.monotonic() + (self.default_ttl if ttl is None else ttl), tags)
+            self._bytes += size
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            self._evict()
+            return True
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], tags: Iterable[str] = (),
+                    ttl: Optional[float] = None) -> Any:
+        """
+        캐시에 있으면 반환하고, 없으면 loader로 조회하여 저장 (같은 키의 동시 미스는 한 번만 조회)
+
+        Args:
+            key (str): 캐시 키
+            loader (Callable): 미스 시 값을 조회하는 함수
+            tags (Iterable[str]): 무효화 태그
+            ttl (Optional[float]): TTL(초)
+
+        Returns:
+            Any: 캐시 또는 조회 결과
+        """
+        tags = tuple(tags)
+        labels = {'cache': self.name}
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                metrics.increment('cache.hits', labels=labels)
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                generations = {tag: self._generations.get(tag, 0) for tag in (*tags, _ALL)}
+
+        if not leader:
+            metrics.increment('cache.coalesced', labels=labels)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        metrics.increment('cache.misses', labels=labels)
+        try:
+            flight.value = self._load_shared(key, loader, tags, ttl)
+            self.set(key, flight.value, tags, ttl, generations)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _load_shared(self, key: str, loader: Callable[[], Any], tags: Tuple[str, ...], ttl: Optional[float]) -> Any:
+        """공유 캐시가 있으면 먼저 조회하고, 없으면 loader 결과를 조회 전에 읽은 태그 버전으로 저장합니다."""
+        shared = self.shared
+        if shared is None:
+            return loader()
+        versions = shared.versions(tags)
+        if versions is None:
+            return loader()
+        hit, value = shared.get(key, versions)
+        if hit:
+            return value
+        value = loader()
+        shared.set(key, versions, value, self.default_ttl if ttl is None else ttl)
+        return value
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        태그가 붙은 항목을 모두 제거
+
+        진행 중인 조회도 결과를 저장하지 않도록 태그 세대를 올리고, 공유 캐시가 있으면 태그 버전도 올립니다.
+        다른 워커의 쓰기를 감지한 경우(sync)에도 올리므로, 쓴 워커가 버전을 올리기 전에 이전 공유 항목을 다시 읽지 않습니다.
+
+        Returns:
+            int: 제거한 항목 수
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in list(self._tag_keys.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self._record_gauges()
+        if self.shared is not None:
+            self.shared.bump(tags)
+        if removed:
+            metrics.increment('cache.invalidations', removed, labels={'cache': self.name})
+        return removed
+
+    def clear(self) -> None:
+        """모든 항목을 제거합니다 (진행 중인 조회 결과도 저장하지 않음)."""
+        with self._lock:
+            self._generations[_ALL] = self._generations.get(_ALL, 0) + 1
+            self._entries.clear()
+            self._tag_keys.clear()
+            self._bytes = 0
+            self._versions.clear()
+            self._synced_at = None
+            self._record_gauges()
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 항목 수/바이트와 설정값"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'default_ttl': self.default_ttl,
+            }
+
+    def set_version_source(self, source: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]) -> None:
+        """
+        다른 프로세스의 쓰기를 감지할 버전 조회 함수 등록
+
+        source는 마지막으로 확인한 {태그: 버전}을 받아 현재 {태그: 버전}을 반환하며,
+        이전 확인 이후 값이 바뀐(또는 새로 생긴) 태그는 무효화됩니다.
+        """
+        with self._sync_lock:
+            self._version_source = source
+            self._versions = {}
+            self._synced_at = None
+
+    def sync(self, interval: float, force: bool = False) -> None:
+        """
+        버전 조회 함수로 다른 프로세스의 쓰기를 반영 (interval초에 한 번, force면 즉시)
+
+        Args:
+            interval (float): 최소 확인 간격(초)
+            force (bool): 간격과 관계없이 확인
+        """
+        source = self._version_source
+        if source is None:
+            return
+        synced_at = self._synced_at
+        if not force and synced_at is not None and time.monotonic() - synced_at < interval:
+            return
+        with self._sync_lock:
+            if not force and self._synced_at is not None and time.monotonic() - self._synced_at < interval:
+                return
+            try:
+                versions = source(dict(self._versions))
+            except Exception as e:
+                # 다른 프로세스의 쓰기를 확인할 수 없으므로 보관 중인 결과를 모두 버림
+                logger.warning(f"캐시 데이터 버전 확인 실패, 캐시 비움: {str(e)}")
+                metrics.increment('cache.sync_errors', labels={'cache': self.name})
+                self.clear()
+                return
+            # 처음 확인한 버전은 기준값으로만 기록 (워커 시작 시 공유 캐시 전체를 무효화하지 않도록)
+            known = self._versions
+            changed = [tag for tag, version in versions.items() if known and known.get(tag) != version]
+            self._versions.update(versions)
+            self._synced_at = time.monotonic()
+        if changed:
+            self.invalidate(*changed)
+
+
+# 조회 결과 캐시 (프로세스 단위)
+result_cache = ResultCache()
+
+# 다음 캐시 조회 전에 버전을 즉시 확인하도록 표시하는 요청 컨텍스트 키
+_SYNC_REQUIRED = '_result_cache_sync_required'
+
+
+def require_fresh() -> None:
+    """
+    이 요청의 다음 캐시 조회 전에 다른 프로세스의 쓰기를 즉시 확인하도록 표시
+
+    조건부 GET이 새 ETag로 응답할 때 호출하여, 이전 데이터 버전으로 캐시된 결과가 새 ETag로 나가지 않게 합니다.
+    """
+    if has_app_context():
+        setattr(g, _SYNC_REQUIRED, True)
+
+
+def cache_enabled() -> bool:
+    """RESULT_CACHE_ENABLED 설정 (앱 컨텍스트 밖이거나 설정이 없으면 사용하지 않음)"""
+    return has_app_context() and current_app.config.get('RESULT_CACHE_ENABLED', False)
+
+
+def _freeze(value: Any) -> Any:
+    """캐시 키용 값 (목록은 튜플로)"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def cache_key(func: Callable, arguments: Dict[str, Any]) -> str:
+    """함수 이름과 (기본값을 채운) 인자로 만든 캐시 키"""
+    return f"{func.__module__}.{func.__qualname__}:{_freeze(arguments)!r}"
+
+
+def cached(tags: Union[Iterable[str], Callable[..., Iterable[str]]] = (), ttl: Optional[float] = None,
+           when: Optional[Callable[..., bool]] = None) -> Callable:
+    """
+    서비스 조회 함수 결과 캐시 데코레이터 (core.decorators.cache_result 대체)
+
+    인자는 기본값을 채워 정규화하므로 위치/키워드 인자 차이와 관계없이 같은 호출은 같은 키를 사용합니다.
+    RESULT_CACHE_ENABLED가 꺼져 있으면 함수를 그대로 호출합니다.
+
+    Args:
+        tags: 무효화 태그 목록, 또는 함수 인자를 키워드 인자로 받아 태그 목록을 반환하는 함수
+        ttl (Optional[float]): TTL(초), None이면 RESULT_CACHE_TTL
+        when (Optional[Callable]): 함수 인자를 키워드 인자로 받아 캐시 여부를 반환 (예: 스트리밍 호출 제외)
+
+    Returns:
+        Callable: 데코레이터
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cache_enabled():
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            if (when is not None and not when(**arguments)) or (result_cache.bypass and result_cache.bypass()):
+                return func(*args, **kwargs)
+
+            config = current_app.config
+            result_cache.sync(config.get('RESULT_CACHE_SYNC_INTERVAL', 1.0), force=g.pop(_SYNC_REQUIRED, False))
+            return result_cache.get_or_load(
+                cache_key(func, arguments),
+                lambda: func(*args, **kwargs),
+                tags(**arguments) if callable(tags) else tags,
+                ttl if ttl is not None else config.get('RESULT_CACHE_TTL'),
+            )
+        return wrapper
+    return decorator
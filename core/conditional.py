@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+조건부 GET (ETag / Last-Modified)
+응답 데이터 대신 값싼 워터마크(데이터 버전, 종목별 거래 데이터 범위)로 검증값을 만들고,
+클라이언트의 If-None-Match / If-Modified-Since와 일치하면 본 조회 없이 304 Not Modified를 반환합니다.
+
+ETag는 엔드포인트, 경로 인자, 쿼리 문자열, Accept 헤더(스트리밍 선택)와 워터마크를 합쳐 만든 약한 ETag이며,
+같은 데이터라도 직렬화 방식(FAST_READ_PATH_ENABLED 등)에 따라 바이트가 다를 수 있으므로 W/ 접두사를 붙입니다.
+
+워터마크는 database/watermarks.py의 트리거가 유지하므로 CONDITIONAL_GET_ENABLED가 켜져 있을 때만 사용합니다.
+"""
+import functools
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+from flask import Response, current_app, make_response, request
+from core.cache import require_fresh
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Cache-Control 정책이 설정되지 않은 경우 (매 요청 ETag로 재검증)
+DEFAULT_CACHE_CONTROL = 'no-cache'
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """
+    응답 검증값의 기준
+
+    Attributes:
+        tag (str): 데이터가 바뀌면 달라지는 문자열 (데이터 버전 등)
+        last_modified (Optional[datetime]): 마지막 변경 시간 (없으면 Last-Modified 생략)
+    """
+    tag: str
+    last_modified: Optional[datetime] = None
+
+
+def cache_control_for(policy: str) -> str:
+    """
+    Cache-Control 값 (CACHE_CONTROL 설정에서 엔드포인트 이름 → 정책 이름 → default 순으로 조회)
+
+    Args:
+        policy (str): 정책 이름 (예: stocks, trading, trading_stock)
+
+    Returns:
+        str: Cache-Control 헤더 값
+    """
+    settings = current_app.config.get('CACHE_CONTROL') or {}
+    return settings.get(request.endpoint) or settings.get(policy) or settings.get('default') or DEFAULT_CACHE_CONTROL
+
+
+def compute_etag(watermark: Watermark) -> str:
+    """
+    요청과 워터마크로 ETag 값 계산 (따옴표/W/ 제외)
+
+    쿼리 파라미터는 정렬하여 순서만 다른 요청이 같은 ETag를 갖도록 합니다.
+    """
+    query = '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+    view_args = '&'.join(f'{key}={value}' for key, value in sorted((request.view_args or {}).items()))
+    source = '|'.join([
+        request.endpoint or '', view_args, query, request.headers.get('Accept', ''), watermark.tag
+    ])
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+
+def _utc_seconds(value: datetime) -> datetime:
+    """HTTP 날짜 비교용 UTC 초 단위 시간 (시간대가 없으면 UTC로 간주)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    요청의 조건 헤더로 304 여부 판단 (If-None-Match가 있으면 If-Modified-Since는 무시)
+
+    Args:
+        etag (str): 현재 ETag 값
+        last_modified (Optional[datetime]): 현재 마지막 변경 시간
+
+    Returns:
+        bool: 클라이언트 사본이 최신이면 True
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return _utc_seconds(last_modified) <= _utc_seconds(request.if_modified_since)
+    return False
+
+
+def _set_validators(response: Response, etag: str, watermark: Watermark, cache_control: str) -> None:
+    """ETag, Last-Modified, Cache-Control, Vary 헤더를 설정합니다."""
+    response.set_etag(etag, weak=True)
+    if watermark.last_modified is not None:
+        response.last_modified = _utc_seconds(watermark.last_modified)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept')
+
+
+def conditional_get(watermark: Callable[..., Watermark], policy: str = 'default') -> Callable:
+    """
+    조건부 GET 데코레이터
+
+    뷰보다 먼저 워터마크만 조회하여 클라이언트 사본이 최신이면 304를 반환하고(본 조회 생략),
+    아니면 뷰를 실행한 뒤 200 응답에 ETag/Last-Modified/Cache-Control을 붙입니다.
+    read_only_transaction 안쪽에 적용하여 워터마크도 같은 읽기 트랜잭션(복제본 라우팅 포함)에서 조회합니다.
+    워터마크를 먼저 읽으므로, 그 사이에 커밋된 변경은 다음 요청에서 새 ETag로 반영됩니다.
+
+    Args:
+        watermark (Callable): 뷰의 경로 인자를 키워드 인자로 받아 Watermark를 반환하는 함수
+        policy (str): Cache-Control 정책 이름 (CACHE_CONTROL 설정 키)
+
+    Returns:
+        Callable: 데코레이터
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            if not current_app.config.get('CONDITIONAL_GET_ENABLED', False):
+                return func(*args, **kwargs)
+
+            mark = watermark(**kwargs)
+            etag = compute_etag(mark)
+            cache_control = cache_control_for(policy)
+            if is_not_modified(etag, mark.last_modified):
+                metrics.increment('http.not_modified', labels={'endpoint': request.endpoint})
+                response = Response(status=304)
+                _set_validators(response, etag, mark, cache_control)
+                return response
+
+            # 조회 결과 캐시가 이 워터마크보다 오래된 결과를 새 ETag로 내보내지 않도록 캐시 버전을 먼저 확인
+            require_fresh()
+            response = make_response(func(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, mark, cache_control)
+            return response
+        return wrapper
+    return decorator
@@ -60,25 +60,3 @@ def handle_exceptions(func):
             logger.error('Unexpected error', error=str(e), exc_info=True)
             return jsonify({'error': 'Internal server error'}), 500
     return wrapper
-
-def cache_result(ttl=300):
-    """결과 캐싱 데코레이터 (간단한 메모리 캐시)"""
-    cache = {}
-    
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # 간단한 캐시 키 생성
-            cache_key = f"{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
-            
-            current_time = time.time()
-            if cache_key in cache:
-                result, timestamp = cache[cache_key]
-                if current_time - timestamp < ttl:
-                    return result
-            
-            result = func(*args, **kwargs)
-            cache[cache_key] = (result, current_time)
-            return result
-        return wrapper
-    return decorator 
\ No newline at end of file
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+표 형식(열 기반) 응답 인코딩
+조회 결과(Row 튜플)를 ORM 객체나 행별 딕셔너리를 만들지 않고 열 단위 배열로 모은 뒤 요청한 형식으로 인코딩합니다.
+
+format 파라미터:
+    json:     기존 행 객체 배열 (기본값)
+    columnar: {"meta": {...}, "count": n, "columns": {"필드": [값, ...]}} - 공통 메타데이터는 한 번만 포함
+    csv:      헤더 + 행 (text/csv)
+    arrow:    Apache Arrow IPC 스트림 (pyarrow 필요)
+    parquet:  Apache Parquet (pyarrow 필요, zstd 압축)
+
+pyarrow는 선택 의존성이며, 설치되지 않은 환경에서는 arrow/parquet 요청을 400으로 거부합니다.
+"""
+import csv
+import io
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from flask import Response, current_app, request
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성
+    pa = None
+    pq = None
+
+FORMAT_JSON = 'json'
+FORMAT_COLUMNAR = 'columnar'
+FORMAT_CSV = 'csv'
+FORMAT_ARROW = 'arrow'
+FORMAT_PARQUET = 'parquet'
+RESPONSE_FORMATS = [FORMAT_JSON, FORMAT_COLUMNAR, FORMAT_CSV, FORMAT_ARROW, FORMAT_PARQUET]
+
+# pyarrow가 필요한 형식
+ARROW_FORMATS = [FORMAT_ARROW, FORMAT_PARQUET]
+
+FORMAT_MIMETYPES = {
+    FORMAT_COLUMNAR: 'application/json',
+    FORMAT_CSV: 'text/csv',
+    FORMAT_ARROW: 'application/vnd.apache.arrow.stream',
+    FORMAT_PARQUET: 'application/vnd.apache.parquet',
+}
+
+
+class InvalidFormatError(ValueError):
+    """지원하지 않거나 현재 환경에서 사용할 수 없는 format 값인 경우"""
+    parameter = 'format'
+
+
+def available_formats() -> List[str]:
+    """현재 환경에서 사용할 수 있는 응답 형식 목록"""
+    if pa is None:
+        return [fmt for fmt in RESPONSE_FORMATS if fmt not in ARROW_FORMATS]
+    return list(RESPONSE_FORMATS)
+
+
+def response_format_from_args() -> str:
+    """
+    요청의 응답 형식 (format 파라미터, 없으면 json)
+
+    Returns:
+        str: 응답 형식
+
+    Raises:
+        InvalidFormatError: 지원하지 않거나 pyarrow 없이 arrow/parquet을 요청한 경우
+    """
+    fmt = request.args.get('format', '').strip().lower() or FORMAT_JSON
+    if fmt not in RESPONSE_FORMATS:
+        raise InvalidFormatError(f"유효하지 않은 format 값입니다: {fmt}")
+    if fmt not in available_formats():
+        raise InvalidFormatError(f"{fmt} 형식은 pyarrow가 설치된 환경에서만 사용할 수 있습니다.")
+    return fmt
+
+
+def rows_to_columns(rows: Sequence[Any], keys: Iterable[str]) -> Dict[str, list]:
+    """
+    Row 튜플 목록을 열 이름 → 값 목록으로 전치
+
+    Args:
+        rows: 조회 결과 (튜플/Row)
+        keys: 열 이름 (Row 순서)
+
+    Returns:
+        Dict[str, list]: 열 기반 데이터 (행이 없으면 빈 목록)
+    """
+    keys = list(keys)
+    if not rows:
+        return {key: [] for key in keys}
+    return dict(zip(keys, (list(values) for values in zip(*rows))))
+
+
+def _iso_dates(values: list) -> list:
+    """date 값을 YYYY-MM-DD 문자열로 변환합니다 (JSON 응답의 날짜 표기와 동일)."""
+    if values and any(isinstance(value, date) for value in values):
+        return [value.isoformat() if isinstance(value, date) else value for value in values]
+    return values
+
+
+def encode_columnar(columns: Dict[str, list], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """열 기반 JSON 인코딩"""
+    count = len(next(iter(columns.values()))) if columns else 0
+    payload = {
+        'meta': meta or {},
+        'count': count,
+        'columns': {key: _iso_dates(values) for key, values in columns.items()},
+    }
+    return current_app.json.dumps(payload).encode('utf-8')
+
+
+def encode_csv(columns: Dict[str, list]) -> bytes:
+    """CSV 인코딩 (NULL은 빈 값)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns.keys())
+    writer.writerows(zip(*columns.values()))
+    return buffer.getvalue().encode('utf-8')
+
+
+def _arrow_table(columns: Dict[str, list]):
+    """열 기반 데이터로 Arrow 테이블 생성 (타입은 값에서 추론)"""
+    return pa.table({key: pa.array(values) for key, values in columns.items()})
+
+
+def encode_arrow(columns: Dict[str, list]) -> bytes:
+    """Arrow IPC 스트림 인코딩"""
+    table = _arrow_table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_parquet(columns: Dict[str, list]) -> bytes:
+    """Parquet 인코딩 (zstd 압축)"""
+    sink = pa.BufferOutputStream()
+    pq.write_table(_arrow_table(columns), sink, compression='zstd')
+    return sink.getvalue().to_pybytes()
+
+
+def encode_table(fmt: str, columns: Dict[str, list], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    열 기반 데이터를 지정한 형식으로 인코딩
+
+    columnar 외의 형식은 메타데이터를 담을 곳이 없으므로 필요한 값은 호출자가 열로 포함해야 합니다.
+
+    Args:
+        fmt (str): columnar, csv, arrow, parquet
+        columns (Dict[str, list]): 열 기반 데이터
+        meta (Optional[Dict]): columnar 메타데이터
+
+    Returns:
+        bytes: 인코딩 결과
+    """
+    if fmt == FORMAT_COLUMNAR:
+        return encode_columnar(columns, meta)
+    if fmt == FORMAT_CSV:
+        return encode_csv(columns)
+    if fmt == FORMAT_ARROW:
+        return encode_arrow(columns)
+    if fmt == FORMAT_PARQUET:
+        return encode_parquet(columns)
+    raise InvalidFormatError(f"유효하지 않은 format 값입니다: {fmt}")
+
+
+def table_response(fmt: str, columns: Dict[str, list], meta: Optional[Dict[str, Any]] = None) -> Response:
+    """
+    열 기반 데이터를 지정한 형식의 응답으로 변환
+
+    Args:
+        fmt (str): columnar, csv, arrow, parquet
+        columns (Dict[str, list]): 열 기반 데이터
+        meta (Optional[Dict]): columnar 메타데이터
+
+    Returns:
+        Response: 형식별 Content-Type 응답
+    """
+    return Response(encode_table(fmt, columns, meta), mimetype=FORMAT_MIMETYPES[fmt])
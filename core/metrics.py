@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 내 운영 지표
+카운터(누적 횟수)와 게이지(현재 값)를 스레드 안전하게 기록하고 /metrics 엔드포인트로 노출합니다.
+값은 gunicorn 워커 프로세스별로 독립적입니다.
+"""
+import threading
+from typing import Dict, Optional
+
+
+class MetricsRegistry:
+    """카운터/게이지 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Optional[Dict[str, str]] = None) -> str:
+        """지표 이름과 라벨을 하나의 키로 합칩니다 (예: db.read_retries{view=get_stocks})."""
+        if not labels:
+            return name
+        label_text = ','.join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{label_text}}}"
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """카운터를 증가시킵니다."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """게이지 값을 설정합니다."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """현재 지표 값을 복사하여 반환합니다."""
+        with self._lock:
+            return {'counters': dict(self._counters), 'gauges': dict(self._gauges)}
+
+    def reset(self) -> None:
+        """모든 지표를 초기화합니다 (테스트용)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Keyset(커서) 페이지네이션
+정렬 키 값을 불투명한 커서 토큰으로 주고받아 (key) < (마지막 값) 조건으로 다음 페이지를 조회합니다.
+OFFSET과 달리 앞 페이지를 읽고 버리지 않으므로 몇 번째 페이지든 첫 페이지와 같은 비용이 듭니다.
+
+목록 응답 본문은 그대로 배열이며, 커서는 응답 헤더로 전달합니다.
+    Link: <...?cursor=...>; rel="next", <...?cursor=...>; rel="prev"
+    X-Next-Cursor / X-Prev-Cursor: 다음/이전 페이지 커서 (없으면 생략)
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from flask import Response, current_app, jsonify, request
+from sqlalchemy import tuple_
+
+DIRECTION_NEXT = 'next'
+DIRECTION_PREV = 'prev'
+
+PAGE_HEADERS = ['Link', 'X-Next-Cursor', 'X-Prev-Cursor', 'X-Page-Limit']
+
+
+class InvalidCursorError(ValueError):
+    """커서 토큰을 해석할 수 없거나 다른 정렬 키로 만든 경우"""
+    parameter = 'cursor'
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """
+    페이지 요청
+
+    Attributes:
+        limit (int): 페이지 크기 (서버 상한 적용 후)
+        cursor (Optional[str]): 이전 응답의 next/prev 커서 (없으면 첫 페이지)
+        offset (Optional[int]): 하위 호환용 OFFSET (커서가 없을 때만 적용)
+    """
+    limit: int
+    cursor: Optional[str] = None
+    offset: Optional[int] = None
+
+
+@dataclass
+class Page:
+    """
+    페이지 조회 결과
+
+    Attributes:
+        items (list): 페이지 항목 (정렬 순서 유지)
+        limit (int): 페이지 크기
+        next_cursor (Optional[str]): 다음 페이지 커서 (마지막 페이지면 None)
+        prev_cursor (Optional[str]): 이전 페이지 커서 (첫 페이지면 None)
+    """
+    items: List[Any]
+    limit: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _encode_value(value: Any) -> Any:
+    """커서에 담을 키 값을 JSON 값으로 변환합니다."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, python_type: type) -> Any:
+    """커서의 JSON 값을 정렬 키 컬럼 타입으로 되돌립니다."""
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+@dataclass
+class Keyset:
+    """
+    페이지 정렬 키 (모든 컬럼이 같은 방향으로 정렬되며 마지막 컬럼은 유일해야 함)
+
+    Attributes:
+        name (str): 키 이름 (다른 목록의 커서를 거부하는 데 사용)
+        columns (list): 정렬 키 컬럼
+        descending (bool): 내림차순 여부
+    """
+    name: str
+    columns: List[Any]
+    descending: bool = True
+    _types: List[type] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._types = [column.type.python_type for column in self.columns]
+
+    def encode(self, direction: str, item: Any) -> str:
+        """
+        항목의 키 값으로 커서 토큰 생성
+
+        Args:
+            direction (str): next 또는 prev
+            item: ORM 객체 또는 Row (키 컬럼 이름의 속성 필요)
+
+        Returns:
+            str: URL-safe base64 커서
+        """
+        values = [_encode_value(getattr(item, column.key)) for column in self.columns]
+        payload = json.dumps({'k': self.name, 'd': direction, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode(self, cursor: str) -> Tuple[str, List[Any]]:
+        """
+        커서 토큰 해석
+
+        Args:
+            cursor (str): 커서 토큰
+
+        Returns:
+            Tuple[str, List]: (방향, 키 값)
+
+        Raises:
+            InvalidCursorError: 형식이 잘못되었거나 다른 키의 커서인 경우
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            direction, values = payload['d'], payload['v']
+            if payload['k'] != self.name or direction not in (DIRECTION_NEXT, DIRECTION_PREV) \
+                    or len(values) != len(self.columns):
+                raise ValueError(cursor)
+            return direction, [_decode_value(value, python_type) for value, python_type in zip(values, self._types)]
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCursorError('유효하지 않은 cursor입니다.') from e
+
+    def order(self, query):
+        """쿼리의 정렬을 키 정렬로 대체합니다 (페이지를 나누지 않는 전체 조회도 같은 순서 유지)."""
+        return query.order_by(None).order_by(*[column.desc() if self.descending else column.asc() for column in self.columns])
+
+    def paginate(self, query, page: PageRequest) -> Page:
+        """
+        쿼리에 keyset 조건/정렬/LIMIT을 적용하여 한 페이지 조회
+
+        기존 정렬은 키 정렬로 대체하며, 다음 페이지 여부는 limit + 1건을 읽어 판단합니다.
+
+        Args:
+            query: SQLAlchemy Query (필터까지 적용된 상태)
+            page (PageRequest): 페이지 요청
+
+        Returns:
+            Page: 페이지 결과
+        """
+        direction, values = self.decode(page.cursor) if page.cursor else (DIRECTION_NEXT, None)
+        backward = direction == DIRECTION_PREV
+        descending = self.descending != backward
+
+        if values is not None:
+            key, bound = tuple_(*self.columns), tuple_(*values)
+            query = query.filter(key < bound if descending else key > bound)
+        elif page.offset:
+            query = query.offset(page.offset)
+
+        ordering = [column.desc() if descending else column.asc() for column in self.columns]
+        items = query.order_by(None).order_by(*ordering).limit(page.limit + 1).all()
+        has_more = len(items) > page.limit
+        items = items[:page.limit]
+        if backward:
+            items.reverse()
+
+        # 뒤로 읽은 경우 원래 위치(다음 페이지)는 항상 있고, 더 읽을 행이 있으면 이전 페이지도 있음
+        if backward:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, values is not None or bool(page.offset)
+
+        result = Page(items=items, limit=page.limit)
+        if items:
+            if has_next:
+                result.next_cursor = self.encode(DIRECTION_NEXT, items[-1])
+            if has_prev:
+                result.prev_cursor = self.encode(DIRECTION_PREV, items[0])
+        return result
+
+
+def page_request_from_args(keyset: Keyset, default_limit: Optional[int] = None) -> PageRequest:
+    """
+    요청 파라미터(limit, cursor, offset)에서 페이지 요청 생성
+
+    limit이 없거나 올바르지 않으면 기본값을, PAGINATION_MAX_LIMIT를 넘으면 상한을 사용합니다.
+    커서는 조회 전에 keyset으로 미리 해석하여 잘못된 커서를 400으로 응답할 수 있게 합니다.
+
+    Args:
+        keyset (Keyset): 목록의 정렬 키
+        default_limit (Optional[int]): 기본 페이지 크기 (없으면 PAGINATION_DEFAULT_LIMIT)
+
+    Returns:
+        PageRequest: 페이지 요청
+
+    Raises:
+        InvalidCursorError: 커서를 해석할 수 없는 경우
+    """
+    config = current_app.config
+    max_limit = config.get('PAGINATION_MAX_LIMIT', 5000)
+    default_limit = min(default_limit or config.get('PAGINATION_DEFAULT_LIMIT', 1000), max_limit)
+
+    limit = request.args.get('limit', default_limit, type=int)
+    if limit is None or limit <= 0:
+        limit = default_limit
+    offset = request.args.get('offset', 0, type=int) or 0
+    cursor = request.args.get('cursor', '').strip() or None
+    if cursor:
+        keyset.decode(cursor)
+
+    return PageRequest(
+        limit=min(limit, max_limit),
+        cursor=cursor,
+        offset=max(offset, 0) or None,
+    )
+
+
+def page_headers(page: Page) -> Dict[str, str]:
+    """
+    페이지 커서 응답 헤더 (Link, X-Next-Cursor, X-Prev-Cursor, X-Page-Limit)
+
+    Args:
+        page (Page): 페이지 결과
+
+    Returns:
+        Dict[str, str]: 응답 헤더
+    """
+    headers = {'X-Page-Limit': str(page.limit)}
+    links = []
+    args = {key: value for key, value in request.args.items() if key not in ('cursor', 'offset')}
+    args['limit'] = page.limit
+    for rel, cursor in (('next', page.next_cursor), ('prev', page.prev_cursor)):
+        if cursor:
+            headers[f'X-{rel.capitalize()}-Cursor'] = cursor
+            links.append(f'<{request.base_url}?{urlencode({**args, "cursor": cursor})}>; rel="{rel}"')
+    if links:
+        headers['Link'] = ', '.join(links)
+    return headers
+
+
+def page_response(page: Page, serialize: Callable[[Any], Dict[str, Any]]) -> Response:
+    """
+    페이지 항목을 JSON 배열로 응답하고 커서 헤더를 붙임
+
+    Args:
+        page (Page): 페이지 결과
+        serialize (Callable): 항목 → 딕셔너리 변환 함수
+
+    Returns:
+        Response: JSON 배열 응답
+    """
+    response = jsonify([serialize(item) for item in page.items])
+    response.headers.extend(page_headers(page))
+    return response
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+조회 결과 고속 직렬화
+ORM 객체와 to_dict() 대신 컬럼 값 Row(튜플)를 projection별로 미리 만든 변환 함수로 딕셔너리로 바꾸고,
+orjson이 설치되어 있으면 orjson으로, 없으면 표준 json으로 인코딩합니다.
+
+표준 jsonify와 비교한 응답 차이 (JSON 값은 동일):
+    - 키를 정렬하지 않고 조회 컬럼 순서를 유지
+    - 한글 등 비ASCII 문자를 \\uXXXX로 이스케이프하지 않고 UTF-8로 출력
+    - date/datetime은 ISO 8601 문자열
+"""
+import functools
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """표준 json이 인코딩하지 못하는 값 변환 (orjson 미설치 시)"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"JSON으로 변환할 수 없는 값입니다: {type(value).__name__}")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    JSON 인코딩 (orjson 우선)
+
+    Args:
+        data: 인코딩할 값
+
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """
+    JSON 디코딩 (orjson 우선)
+
+    Args:
+        data: UTF-8 JSON
+
+    Returns:
+        디코딩한 값
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(data: Any) -> Response:
+    """dumps로 인코딩한 application/json 응답"""
+    return Response(dumps(data), mimetype='application/json')
+
+
+@functools.lru_cache(maxsize=256)
+def row_serializer(keys: Tuple[str, ...]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """
+    projection(컬럼 이름 튜플)별 Row → 딕셔너리 변환 함수
+
+    keys를 클로저에 담아 dict(zip(keys, row))로 변환하며, 같은 projection은 같은 함수를 재사용합니다.
+
+    Args:
+        keys (Tuple[str, ...]): 컬럼 이름 (Row 순서)
+
+    Returns:
+        Callable: Row → 딕셔너리 함수
+    """
+    def to_dict(row: Sequence[Any]) -> Dict[str, Any]:
+        return dict(zip(keys, row))
+    return to_dict
+
+
+def serialize_rows(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    같은 projection의 Row 목록을 딕셔너리 목록으로 변환
+
+    Args:
+        rows: 조회 결과 Row 목록 (첫 행의 _fields로 변환 함수를 선택)
+
+    Returns:
+        List[Dict]: 딕셔너리 목록
+    """
+    if not rows:
+        return []
+    to_dict = row_serializer(tuple(rows[0]._fields))
+    return [to_dict(row) for row in rows]
+
+
+def result_serializer() -> Callable[[Any], Dict[str, Any]]:
+    """
+    한 결과 집합용 Row → 딕셔너리 함수 (스트리밍용)
+
+    첫 행의 _fields로 변환 함수를 한 번만 선택하고 이후 행에는 그대로 사용합니다.
+
+    Returns:
+        Callable: Row → 딕셔너리 함수
+    """
+    to_dict = None
+
+    def serialize(row: Any) -> Dict[str, Any]:
+        nonlocal to_dict
+        if to_dict is None:
+            to_dict = row_serializer(tuple(row._fields))
+        return to_dict(row)
+    return serialize
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+공유 결과 캐시 (Redis)
+여러 gunicorn 워커/노드가 조회 결과를 함께 쓰도록 core.cache.ResultCache 뒤에 두는 2차 캐시입니다.
+
+    - 값은 JSON(core.serialization.dumps)으로 직렬화한 뒤 zlib으로 압축하여 저장
+      Row 목록은 열 단위 배열(core.formats.rows_to_columns)로, date/Decimal은 타입 표시와 함께 저장하며
+      복원하면 같은 필드의 namedtuple Row가 됩니다 (Row 목록, Page, 누적 시계열 등 서비스 조회 결과 그대로)
+      임의 객체를 복원하지 않으므로 Redis 값을 조작해도 코드가 실행되지 않으며, 지원하지 않는 값은 공유하지 않음
+    - 키에 태그별 버전을 포함 (버전 키는 MULTI/EXEC 안의 INCR로 한 번에 증가) - 쓰기 후 태그 버전을 올리면
+      모든 워커가 같은 순간부터 새 키를 사용하므로 이전 항목은 조회되지 않고 TTL로 사라짐 (키 삭제/스캔 없음)
+      버전은 MGET 한 번으로 읽으므로 일부 태그만 오른 상태를 보지 않음
+    - 조회 전에 읽은 버전으로 저장하므로, 조회 중에 버전이 바뀌면 결과는 이전 버전 키에만 남음
+    - Redis 오류는 요청을 실패시키지 않고 RETRY_INTERVAL초 동안 공유 캐시를 건너뜀
+
+REDIS_URL이 memory://이면 프로세스 안의 MemoryRedis를 사용합니다 (테스트/단일 프로세스 개발용).
+"""
+import functools
+import hashlib
+import keyword
+import logging
+import threading
+import time
+import zlib
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.formats import rows_to_columns
+from core.metrics import metrics
+from core.pagination import Page
+from core.serialization import dumps, loads
+
+try:
+    import redis
+except ImportError:  # 선택 의존성 (공유 캐시를 쓰지 않으면 필요 없음)
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+MEMORY_URL = 'memory://'
+
+# Redis 오류 후 공유 캐시를 다시 시도하기까지의 시간(초)
+RETRY_INTERVAL = 30
+
+# 저장 형식 버전 (형식을 바꾸면 올려서 이전 형식 값을 미스로 처리)
+PAYLOAD_VERSION = 1
+
+# 열 값 타입 표시 (JSON으로 표현하지 못하는 타입만)
+_COLUMN_ENCODERS = {
+    'datetime': (datetime, datetime.isoformat, datetime.fromisoformat),
+    'date': (date, date.isoformat, date.fromisoformat),
+    'decimal': (Decimal, str, Decimal),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _row_type(keys: Tuple[str, ...]):
+    """
+    필드 이름별 Row 대용 namedtuple (같은 projection은 같은 타입 재사용)
+
+    Raises:
+        TypeError: namedtuple 필드로 쓸 수 없는 이름이 있는 경우
+    """
+    for key in keys:
+        if not key.isidentifier() or keyword.iskeyword(key) or key.startswith('_'):
+            raise TypeError(f"Row 필드 이름으로 사용할 수 없습니다: {key}")
+    return namedtuple('Row', keys)
+
+
+def _column_type(values: list) -> Optional[str]:
+    """열 값의 타입 표시 (JSON 기본 타입이면 None)"""
+    for name, (python_type, _, _) in _COLUMN_ENCODERS.items():
+        if any(isinstance(value, python_type) for value in values):
+            return name
+    return None
+
+
+def _encode_rows(rows: list) -> Dict[str, Any]:
+    """같은 projection의 Row 목록을 열 단위로 인코딩"""
+    keys = tuple(rows[0]._fields)
+    _row_type(keys)
+    if any(tuple(row._fields) != keys for row in rows):
+        raise TypeError("필드가 다른 Row가 섞여 있습니다.")
+    columns = rows_to_columns(rows, keys)
+    types = {}
+    for key, values in columns.items():
+        name = _column_type(values)
+        if name is not None:
+            encode = _COLUMN_ENCODERS[name][1]
+            columns[key] = [None if value is None else encode(value) for value in values]
+            types[key] = name
+        else:
+            columns[key] = [_encode(value) for value in values]
+    return {'$rows': list(keys), 'types': types, 'count': len(rows), 'columns': columns}
+
+
+def _decode_rows(node: Dict[str, Any]) -> list:
+    """열 단위 Row 목록 복원"""
+    keys = tuple(node['$rows'])
+    columns = []
+    for key in keys:
+        values = node['columns'][key]
+        name = node['types'].get(key)
+        if name is not None:
+            decode = _COLUMN_ENCODERS[name][2]
+            values = [None if value is None else decode(value) for value in values]
+        else:
+            values = [_decode(value) for value in values]
+        columns.append(values)
+    row_type = _row_type(keys)
+    return [row_type._make(values) for values in zip(*columns)] if columns else [row_type() for _ in range(node['count'])]
+
+
+def _encode(value: Any) -> Any:
+    """
+    조회 결과를 JSON 값으로 변환 (지원하는 타입만)
+
+    Raises:
+        TypeError: 지원하지 않는 값인 경우 (공유 캐시에 저장하지 않음)
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    for name, (python_type, encode, _) in _COLUMN_ENCODERS.items():
+        if isinstance(value, python_type):
+            return {'$' + name: encode(value)}
+    if hasattr(value, '_fields'):
+        keys = tuple(value._fields)
+        _row_type(keys)
+        return {'$row': list(keys), 'values': [_encode(item) for item in value]}
+    if isinstance(value, Page):
+        return {'$page': {
+            'items': _encode(value.items),
+            'limit': value.limit,
+            'next_cursor': value.next_cursor,
+            'prev_cursor': value.prev_cursor,
+        }}
+    if isinstance(value, list):
+        if value and all(hasattr(item, '_fields') for item in value):
+            return _encode_rows(value)
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {'$tuple': [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("문자열이 아닌 딕셔너리 키는 저장할 수 없습니다.")
+        return {'$dict': {key: _encode(item) for key, item in value.items()}}
+    raise TypeError(f"공유 캐시에 저장할 수 없는 값입니다: {type(value).__name__}")
+
+
+def _decode(node: Any) -> Any:
+    """_encode로 변환한 JSON 값 복원"""
+    if isinstance(node, list):
+        return [_decode(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if '$rows' in node:
+        return _decode_rows(node)
+    if '$row' in node:
+        return _row_type(tuple(node['$row']))._make(_decode(item) for item in node['values'])
+    if '$page' in node:
+        page = node['$page']
+        return Page(items=_decode(page['items']), limit=page['limit'],
+                    next_cursor=page['next_cursor'], prev_cursor=page['prev_cursor'])
+    if '$tuple' in node:
+        return tuple(_decode(item) for item in node['$tuple'])
+    if '$dict' in node:
+        return {key: _decode(item) for key, item in node['$dict'].items()}
+    for name, (_, _, decode) in _COLUMN_ENCODERS.items():
+        if '$' + name in node:
+            return decode(node['$' + name])
+    raise ValueError(f"알 수 없는 공유 캐시 값 형식입니다: {sorted(node)}")
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    공유 캐시 값을 JSON 바이트로 직렬화
+
+    Raises:
+        TypeError: 지원하지 않는 값이 포함된 경우
+    """
+    return dumps({'version': PAYLOAD_VERSION, 'data': _encode(value)})
+
+
+def decode_value(blob: bytes) -> Any:
+    """
+    encode_value로 직렬화한 값 복원
+
+    Raises:
+        ValueError: 형식 버전이 다르거나 알 수 없는 형식인 경우
+    """
+    payload = loads(blob)
+    if not isinstance(payload, dict) or payload.get('version') != PAYLOAD_VERSION:
+        raise ValueError("공유 캐시 값의 형식 버전이 다릅니다.")
+    return _decode(payload['data'])
+
+
+class MemoryPipeline:
+    """MemoryRedis 파이프라인 (incr만 지원, execute 시 잠금 안에서 한 번에 적용하여 MULTI/EXEC를 재현)"""
+
+    def __init__(self, client: 'MemoryRedis'):
+        self.client = client
+        self._commands: List[Tuple[str, int]] = []
+
+    def incr(self, name: str, amount: int = 1) -> 'MemoryPipeline':
+        self._commands.append((name, amount))
+        return self
+
+    def execute(self) -> List[int]:
+        commands, self._commands = self._commands, []
+        with self.client._lock:
+            return [self.client._incr(name, amount) for name, amount in commands]
+
+
+class MemoryRedis:
+    """
+    프로세스 안의 Redis 대용 (공유 캐시가 쓰는 get/set/mget/incr/pipeline/delete/ping만 구현)
+
+    같은 인스턴스를 여러 SharedCache에 넘기면 워커 여러 개가 한 Redis를 쓰는 상황을 재현할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> Optional[bytes]:
+        item = self._data.get(name)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get(name)
+
+    def mget(self, names: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._get(name) for name in names]
+
+    def set(self, name: str, value: Any, ex: Optional[float] = None) -> bool:
+        if not isinstance(value, bytes):
+            value = str(value).encode('utf-8')
+        with self._lock:
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def _incr(self, name: str, amount: int) -> int:
+        value = int(self._get(name) or 0) + amount
+        expires_at = self._data[name][1] if name in self._data else None
+        self._data[name] = (str(value).encode('utf-8'), expires_at)
+        return value
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        with self._lock:
+            return self._incr(name, amount)
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        return MemoryPipeline(self)
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def ping(self) -> bool:
+        return True
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+def create_client(url: str):
+    """
+    REDIS_URL로 클라이언트 생성 (memory://이면 MemoryRedis)
+
+    Args:
+        url (str): Redis 접속 URL
+
+    Returns:
+        Redis 클라이언트
+
+    Raises:
+        RuntimeError: redis 패키지가 설치되지 않은 경우
+    """
+    if url.startswith(MEMORY_URL):
+        return MemoryRedis()
+    if redis is None:
+        raise RuntimeError("redis 패키지가 설치되지 않았습니다. (pip install redis)")
+    return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+class SharedCache:
+    """
+    태그 버전 키를 사용하는 Redis 결과 캐시
+
+    Args:
+        client: Redis 클라이언트 (redis.Redis 또는 MemoryRedis)
+        prefix (str): 키 접두사 (여러 애플리케이션이 한 Redis를 쓸 때 구분)
+        max_bytes (int): 압축 후 이보다 큰 값은 저장하지 않음
+        compress_level (int): zlib 압축 수준 (1: 빠름 ~ 9: 작음)
+    """
+
+    def __init__(self, client, prefix: str = 'result-cache', max_bytes: int = 8 * 1024 * 1024,
+                 compress_level: int = 1):
+        self.client = client
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._down_until = 0.0
+        # 버전을 올리지 못한 태그 (Redis가 다시 사용 가능해지면 먼저 올림)
+        self._pending_bumps: set = set()
+        self._lock = threading.Lock()
+
+    def _version_key(self, tag: str) -> str:
+        return f'{self.prefix}:tag:{tag}'
+
+    def _value_key(self, key: str, versions: Tuple[int, ...]) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return f"{self.prefix}:value:{digest}:{'.'.join(map(str, versions))}"
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action: str, error: Exception) -> None:
+        """오류를 기록하고 RETRY_INTERVAL초 동안 공유 캐시를 건너뜁니다."""
+        self._down_until = time.monotonic() + RETRY_INTERVAL
+        metrics.increment('cache.shared_errors', labels={'action': action})
+        logger.warning(f"공유 캐시 {action} 실패, {RETRY_INTERVAL}초 동안 사용 중지: {str(error)}")
+
+    def versions(self, tags: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """
+        태그별 현재 버전 (정렬된 태그 순서, 없는 태그는 0)
+
+        Returns:
+            Optional[Tuple[int, ...]]: 버전 목록 (공유 캐시를 쓸 수 없으면 None)
+        """
+        if not self._available():
+            return None
+        tags = sorted(set(tags))
+        with self._lock:
+            pending, self._pending_bumps = self._pending_bumps, set()
+        if pending:
+            self.bump(pending)
+            if not self._available():
+                return None
+        if not tags:
+            return ()
+        try:
+            return tuple(int(value or 0) for value in self.client.mget([self._version_key(tag) for tag in tags]))
+        except Exception as e:
+            self._failed('versions', e)
+            return None
+
+    def get(self, key: str, versions: Tuple[int, ...]) -> Tuple[bool, Any]:
+        """
+        버전 키로 값 조회
+
+        Returns:
+            Tuple[bool, Any]: (적중 여부, 값)
+        """
+        try:
+            blob = self.client.get(self._value_key(key, versions))
+        except Exception as e:
+            self._failed('get', e)
+            return False, None
+        if blob is None:
+            metrics.increment('cache.shared_misses')
+            return False, None
+        try:
+            value = decode_value(zlib.decompress(blob))
+        except Exception as e:
+            # 다른 형식 버전의 코드가 저장한 값 등 - 미스로 처리
+            logger.warning(f"공유 캐시 값 복원 실패: {str(e)}")
+            metrics.increment('cache.shared_misses')
+            return False, None
+        metrics.increment('cache.shared_hits')
+        return True, value
+
+    def set(self, key: str, versions: Tuple[int, ...], value: Any, ttl: float) -> bool:
+        """
+        조회 전에 읽은 버전 키로 값 저장
+
+        Returns:
+            bool: 저장했으면 True
+        """
+        try:
+            blob = zlib.compress(encode_value(value), self.compress_level)
+        except Exception as e:
+            logger.warning(f"공유 캐시 값 직렬화 실패: {str(e)}")
+            return False
+        if len(blob) > self.max_bytes:
+            return False
+        try:
+            self.client.set(self._value_key(key, versions), blob, ex=max(1, int(ttl)))
+        except Exception as e:
+            self._failed('set', e)
+            return False
+        metrics.increment('cache.shared_bytes_written', len(blob))
+        return True
+
+    def bump(self, tags: Iterable[str]) -> None:
+        """
+        태그 버전을 올려 해당 태그가 붙은 모든 워커의 공유 항목을 한 번에 무효화합니다.
+
+        모든 태그를 MULTI/EXEC 파이프라인 하나로 올리므로, 버전을 읽는 워커는 일부 태그만 오른 상태를 보지 않습니다.
+        Redis를 사용할 수 없는 동안에도 시도하며, 실패한 태그는 다음 조회 전에 다시 올립니다.
+        """
+        tags = sorted(set(tags))
+        if not tags:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=True)
+            for tag in tags:
+                pipeline.incr(self._version_key(tag))
+            pipeline.execute()
+        except Exception as e:
+            # 트랜잭션이 적용되지 않았으므로 이전 버전 항목이 다시 읽히지 않도록 다음 사용 전에 모두 다시 올림
+            with self._lock:
+                self._pending_bumps.update(tags)
+            self._failed('bump', e)
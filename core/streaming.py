@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+대용량 목록 스트리밍 응답
+서버 측 커서(yield_per)로 읽은 행을 바로 인코딩하여 청크 단위로 내보내므로,
+결과 건수와 관계없이 메모리 사용량이 일정하고 첫 바이트가 빨리 도착합니다.
+
+stream 파라미터(또는 Accept 헤더)로 형식을 선택합니다.
+    stream=ndjson: 한 줄에 JSON 객체 하나 (application/x-ndjson)
+    stream=json:   기존과 같은 JSON 배열을 나누어 전송 (application/json)
+
+응답 상태 코드는 첫 청크 전에 정해지므로, 전송 중 오류는 다음과 같이 알립니다.
+    ndjson: 마지막 줄에 {"error": ...} 객체
+    json:   닫는 괄호 없이 종료 (클라이언트 파싱 실패로 불완전한 응답임을 알 수 있음)
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from flask import Response, request, stream_with_context
+from core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+STREAM_NDJSON = 'ndjson'
+STREAM_JSON = 'json'
+STREAM_MODES = [STREAM_NDJSON, STREAM_JSON]
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# 한 번에 내보낼 행 수 (너무 작으면 청크 오버헤드, 너무 크면 첫 바이트 지연)
+ROWS_PER_CHUNK = 500
+
+
+class InvalidStreamModeError(ValueError):
+    """지원하지 않는 stream 값인 경우"""
+    parameter = 'stream'
+
+
+def stream_mode_from_args() -> Optional[str]:
+    """
+    요청의 스트리밍 형식 (stream 파라미터 우선, 없으면 Accept: application/x-ndjson)
+
+    Returns:
+        Optional[str]: ndjson, json 또는 None (일반 페이지 응답)
+
+    Raises:
+        InvalidStreamModeError: 지원하지 않는 stream 값인 경우
+    """
+    mode = request.args.get('stream', '').strip().lower()
+    if mode:
+        if mode not in STREAM_MODES:
+            raise InvalidStreamModeError(f"유효하지 않은 stream 값입니다: {mode}")
+        return mode
+    if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return STREAM_NDJSON
+    return None
+
+
+def _chunks(rows: Iterable[Any], serialize: Callable[[Any], Dict[str, Any]], separator: bytes) -> Iterator[bytes]:
+    """행을 인코딩하여 ROWS_PER_CHUNK개씩 구분자로 이어 붙인 바이트열을 생성합니다 (orjson 우선)."""
+    buffer = []
+    for row in rows:
+        buffer.append(dumps(serialize(row)))
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield separator.join(buffer)
+            buffer = []
+    if buffer:
+        yield separator.join(buffer)
+
+
+def iter_ndjson(rows: Iterable[Any], serialize: Callable[[Any], Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    NDJSON 청크 생성 (각 청크는 개행으로 끝남)
+
+    Args:
+        rows: 행 이터레이터 (서버 측 커서)
+        serialize (Callable): 행 → 딕셔너리 변환 함수
+
+    Yields:
+        bytes: 개행으로 구분된 JSON 객체 묶음
+    """
+    try:
+        for chunk in _chunks(rows, serialize, b'\n'):
+            yield chunk + b'\n'
+    except Exception as e:
+        logger.error(f"NDJSON 스트리밍 중 오류: {str(e)}")
+        yield dumps({'error': '스트리밍 중 오류가 발생했습니다.', 'message': str(e)}) + b'\n'
+
+
+def iter_json_array(rows: Iterable[Any], serialize: Callable[[Any], Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    JSON 배열 청크 생성 ('['로 시작해 ']'로 끝나며, 합치면 일반 응답과 같은 배열)
+
+    Args:
+        rows: 행 이터레이터 (서버 측 커서)
+        serialize (Callable): 행 → 딕셔너리 변환 함수
+
+    Yields:
+        bytes: JSON 배열 조각
+    """
+    yield b'['
+    try:
+        for index, chunk in enumerate(_chunks(rows, serialize, b',')):
+            yield chunk if index == 0 else b',' + chunk
+    except Exception as e:
+        # 닫는 괄호를 보내지 않아 클라이언트가 불완전한 응답을 감지하도록 함
+        logger.error(f"JSON 스트리밍 중 오류: {str(e)}")
+        return
+    yield b']'
+
+
+def stream_response(rows: Iterable[Any], serialize: Callable[[Any], Dict[str, Any]], mode: str) -> Response:
+    """
+    행 이터레이터를 스트리밍 응답으로 변환
+
+    요청/앱 컨텍스트(DB 세션 포함)는 전송이 끝날 때까지 유지되며,
+    클라이언트가 연결을 끊으면 이터레이터를 닫아 서버 측 커서를 정리합니다.
+
+    Args:
+        rows: 행 이터레이터 (서버 측 커서)
+        serialize (Callable): 행 → 딕셔너리 변환 함수
+        mode (str): ndjson 또는 json
+
+    Returns:
+        Response: 청크 전송 응답
+    """
+    def generate():
+        try:
+            if mode == STREAM_NDJSON:
+                yield from iter_ndjson(rows, serialize)
+            else:
+                yield from iter_json_array(rows, serialize)
+        finally:
+            close = getattr(rows, 'close', None)
+            if close is not None:
+                close()
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype=NDJSON_MIMETYPE if mode == STREAM_NDJSON else 'application/json'
+    )
+    # nginx 프록시 버퍼링을 끄고 받은 청크를 바로 전달
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
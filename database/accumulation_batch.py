@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+전체 종목 누적 순매수 일괄 계산 (NumPy)
+거래 테이블을 (stock_code, trade_date, id) 순서로 서버 측 커서에서 청크 단위로 읽고,
+종목 경계를 기준으로 구간별 누적합(np.cumsum)을 계산한 뒤
+임시 테이블에 COPY로 적재하고 UPDATE ... FROM 한 번으로 반영합니다.
+
+종목을 여러 샤드로 나누면 샤드마다 별도 프로세스와 연결에서 실행됩니다.
+샤드끼리는 갱신하는 행이 겹치지 않으므로 서로 잠금을 기다리지 않습니다.
+누적값은 초기값을 제외한 누계이며 (AccumulationService와 동일), 초기값은 조회 시점에 더해집니다.
+"""
+import io
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from extensions import db
+from database.partitioning import TRADING_TABLE
+from database.cache_invalidation import invalidate_trading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_SIZE = 50000
+STAGING_TABLE = 'accum_batch_staging'
+
+# 구간 누적합 이월 상태: (마지막 종목 코드, 기관 누계, 외국인 누계)
+Carry = Tuple[Optional[str], int, int]
+
+
+def segment_cumsum(keys: np.ndarray, values: np.ndarray, carry_key: Optional[str] = None,
+                   carry_value: int = 0) -> np.ndarray:
+    """
+    정렬된 키 구간별 누적합
+
+    keys가 바뀌는 위치를 구간 경계로 보고, 전체 누적합에서 각 구간 시작 직전의 누적합을 빼서 계산합니다.
+    첫 구간이 이전 청크의 마지막 종목(carry_key)과 같으면 carry_value부터 이어서 더합니다.
+
+    Args:
+        keys (np.ndarray): 정렬된 종목 코드 배열
+        values (np.ndarray): 순매수 배열 (NULL은 0)
+        carry_key (Optional[str]): 이전 청크의 마지막 종목 코드
+        carry_value (int): 이전 청크의 마지막 누계
+
+    Returns:
+        np.ndarray: int64 구간별 누적합
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    totals = np.cumsum(values, dtype=np.int64)
+    starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    segment_ids = np.zeros(len(values), dtype=np.int64)
+    segment_ids[starts] = 1
+    segment_ids = np.cumsum(segment_ids)
+    offsets = np.concatenate(([0], totals[starts - 1]))
+    result = totals - offsets[segment_ids]
+
+    if carry_key is not None and keys[0] == carry_key:
+        result[segment_ids == 0] += carry_value
+    return result
+
+
+def accumulate_chunk(rows: List[tuple], carry: Carry) -> Tuple[np.ndarray, np.ndarray, Carry]:
+    """
+    (id, trade_date, stock_code, institution_net_buy, foreigner_net_buy) 청크의 누계 계산
+
+    Args:
+        rows (List[tuple]): 정렬된 거래 행
+        carry (Carry): 이전 청크에서 이월된 상태
+
+    Returns:
+        Tuple: (기관 누계, 외국인 누계, 다음 청크로 넘길 상태)
+    """
+    keys = np.array([row[2] for row in rows], dtype=object)
+    institution = np.array([row[3] or 0 for row in rows], dtype=np.int64)
+    foreigner = np.array([row[4] or 0 for row in rows], dtype=np.int64)
+
+    carry_key, institution_carry, foreigner_carry = carry
+    institution_accum = segment_cumsum(keys, institution, carry_key, institution_carry)
+    foreigner_accum = segment_cumsum(keys, foreigner, carry_key, foreigner_carry)
+    return institution_accum, foreigner_accum, (keys[-1], int(institution_accum[-1]), int(foreigner_accum[-1]))
+
+
+def _copy_chunk(cursor, rows: List[tuple], institution_accum: np.ndarray, foreigner_accum: np.ndarray) -> None:
+    """계산 결과를 임시 테이블에 COPY로 적재합니다."""
+    buffer = io.StringIO()
+    for row, institution, foreigner in zip(rows, institution_accum.tolist(), foreigner_accum.tolist()):
+        buffer.write(f"{row[0]}\t{row[1].isoformat()}\t{institution}\t{foreigner}\n")
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {STAGING_TABLE} (id, trade_date, institution_accum, foreigner_accum) FROM STDIN", buffer
+    )
+
+
+def accumulate_shard(database_url: str, stock_codes: Optional[List[str]] = None,
+                     fetch_size: int = DEFAULT_FETCH_SIZE) -> Dict[str, any]:
+    """
+    종목 묶음 하나의 누적 순매수를 계산하여 반영 (프로세스 풀 작업 단위)
+
+    다른 프로세스에서도 실행되므로 앱의 커넥션 풀을 쓰지 않고 별도 연결을 엽니다.
+    읽기, COPY, UPDATE가 모두 한 트랜잭션에서 실행되며 실패하면 이 샤드 전체가 롤백됩니다.
+
+    Args:
+        database_url (str): 접속 URL
+        stock_codes (Optional[List[str]]): 대상 종목 코드 (None이면 전체)
+        fetch_size (int): 서버 측 커서에서 한 번에 가져올 행 수
+
+    Returns:
+        Dict: rows (읽은 행 수), updated_rows (갱신 행 수), stocks (종목 수), seconds
+    """
+    started = time.perf_counter()
+    engine = create_engine(database_url, poolclass=NullPool)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                id integer NOT NULL,
+                trade_date date NOT NULL,
+                institution_accum bigint NOT NULL,
+                foreigner_accum bigint NOT NULL
+            ) ON COMMIT DROP
+        """)
+
+        stream = connection.cursor(name='accum_batch_stream')
+        stream.itersize = fetch_size
+        if stock_codes is None:
+            stream.execute(f"""
+                SELECT id, trade_date, stock_code, institution_net_buy, foreigner_net_buy
+                FROM {TRADING_TABLE}
+                ORDER BY stock_code, trade_date, id
+            """)
+        else:
+            stream.execute(f"""
+                SELECT id, trade_date, stock_code, institution_net_buy, foreigner_net_buy
+                FROM {TRADING_TABLE}
+                WHERE stock_code = ANY(%s)
+                ORDER BY stock_code, trade_date, id
+            """, (list(stock_codes),))
+
+        carry: Carry = (None, 0, 0)
+        total_rows = 0
+        stocks = 0
+        while True:
+            rows = stream.fetchmany(fetch_size)
+            if not rows:
+                break
+            # 정렬되어 있으므로 청크 안의 종목 수에서 이전 청크와 이어지는 종목만 제외
+            stocks += len({row[2] for row in rows}) - (rows[0][2] == carry[0])
+            institution_accum, foreigner_accum, carry = accumulate_chunk(rows, carry)
+            _copy_chunk(cursor, rows, institution_accum, foreigner_accum)
+            total_rows += len(rows)
+        stream.close()
+
+        cursor.execute(f"ANALYZE {STAGING_TABLE}")
+        cursor.execute(f"""
+            UPDATE {TRADING_TABLE} t
+            SET institution_accum = s.institution_accum,
+                foreigner_accum = s.foreigner_accum
+            FROM {STAGING_TABLE} s
+            WHERE t.id = s.id AND t.trade_date = s.trade_date
+              AND (t.institution_accum IS DISTINCT FROM s.institution_accum
+                   OR t.foreigner_accum IS DISTINCT FROM s.foreigner_accum)
+        """)
+        updated_rows = cursor.rowcount
+        connection.commit()
+
+        return {
+            'rows': total_rows,
+            'updated_rows': updated_rows,
+            'stocks': stocks,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+        engine.dispose()
+
+
+def split_shards(stock_codes: List[str], shards: int) -> List[List[str]]:
+    """
+    종목 코드를 샤드 수만큼 나눔 (정렬 후 번갈아 배정하여 샤드별 종목 수를 고르게 분산)
+
+    Args:
+        stock_codes (List[str]): 종목 코드 목록
+        shards (int): 샤드 수
+
+    Returns:
+        List[List[str]]: 비어 있지 않은 샤드 목록
+    """
+    shards = max(1, shards)
+    ordered = sorted(stock_codes)
+    buckets = [ordered[i::shards] for i in range(shards)]
+    return [bucket for bucket in buckets if bucket]
+
+
+def run_accumulation_batch(workers: int = 1, stock_codes: Optional[List[str]] = None,
+                           fetch_size: int = DEFAULT_FETCH_SIZE) -> Dict[str, any]:
+    """
+    전체(또는 지정) 종목의 누적 순매수 일괄 계산 (앱 컨텍스트에서 호출)
+
+    Args:
+        workers (int): 프로세스 수 (1이면 현재 프로세스에서 한 번에 처리)
+        stock_codes (Optional[List[str]]): 대상 종목 코드 (None이면 전체)
+        fetch_size (int): 서버 측 커서 청크 크기
+
+    Returns:
+        Dict: shards, rows, updated_rows, stocks, seconds, by_shard
+    """
+    started = time.perf_counter()
+    database_url = db.engine.url.render_as_string(hide_password=False)
+
+    try:
+        if workers <= 1:
+            results = [accumulate_shard(database_url, stock_codes, fetch_size)]
+        else:
+            if stock_codes is None:
+                stock_codes = [row[0] for row in db.session.execute(
+                    text(f"SELECT DISTINCT stock_code FROM {TRADING_TABLE}")
+                ).all()]
+                db.session.commit()
+            shards = split_shards(stock_codes, workers)
+            # fork로 상속된 앱 풀의 연결을 자식 프로세스가 닫지 않도록 spawn 사용
+            with ProcessPoolExecutor(max_workers=len(shards) or 1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(accumulate_shard, database_url, shard, fetch_size) for shard in shards]
+                results = [future.result() for future in futures]
+    finally:
+        # 샤드는 별도 연결에서 커밋하므로 (일부 샤드가 실패해도) 앱 세션의 커밋을 기다리지 않고 무효화
+        invalidate_trading(stock_codes, immediate=True)
+
+    summary = {
+        'shards': len(results),
+        'rows': sum(result['rows'] for result in results),
+        'updated_rows': sum(result['updated_rows'] for result in results),
+        'stocks': sum(result['stocks'] for result in results),
+        'seconds': round(time.perf_counter() - started, 3),
+        'by_shard': results,
+    }
+    logger.info(f"누적 순매수 일괄 계산: {summary['stocks']}개 종목, {summary['rows']}행 중 "
+                f"{summary['updated_rows']}건 갱신 ({summary['shards']}개 샤드, {summary['seconds']}s)")
+    return summary
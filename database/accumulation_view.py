@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+누적 순매수 계산 뷰
+stock_list의 누적 초기값 + 순매수 누계를 조회 시점에 계산하는 뷰를 관리합니다.
+
+거래 테이블의 institution_accum/foreigner_accum 컬럼은 초기값을 제외한 누계를 저장하는 캐시이며
+(ACCUM_CACHE_ENABLED), 수집 시 증분 갱신(AccumulationService.extend_accumulation)으로 유지됩니다.
+초기값 변경이나 늦게 들어온 과거 데이터는 이 뷰에 즉시 반영되므로 행을 다시 쓰지 않아도 됩니다.
+캐시를 끄면 거래 데이터 조회도 이 뷰를 조인해 누적값을 읽습니다 (StockInvestorTrading.join_accum_view).
+"""
+import logging
+from sqlalchemy import column, event, table, text
+from extensions import db
+from database.partitioning import TRADING_TABLE
+
+logger = logging.getLogger(__name__)
+
+ACCUM_VIEW = f'{TRADING_TABLE}_accum'
+
+# ORM 쿼리에서 조인할 때 사용하는 뷰 컬럼 (누적값은 초기값 포함)
+ACCUM_VIEW_TABLE = table(
+    ACCUM_VIEW,
+    column('id'),
+    column('stock_code'),
+    column('institution_accum'),
+    column('foreigner_accum'),
+)
+
+# stock_code 조건은 윈도 PARTITION BY 키이므로 뷰 안쪽까지 전달되어 (stock_code, trade_date) 인덱스를 사용합니다.
+# trade_date 조건은 누계 계산 이후에 적용되므로 구간 조회도 처음부터의 누계를 반환합니다.
+ACCUM_VIEW_DDL = f"""
+    CREATE VIEW {ACCUM_VIEW} AS
+    SELECT t.id, t.stock_code, t.trade_date, t.close_price,
+           t.institution_net_buy, t.foreigner_net_buy,
+           COALESCE(s.institution_accum_init, 0)
+               + SUM(COALESCE(t.institution_net_buy, 0)) OVER w AS institution_accum,
+           COALESCE(s.foreigner_accum_init, 0)
+               + SUM(COALESCE(t.foreigner_net_buy, 0)) OVER w AS foreigner_accum
+    FROM {TRADING_TABLE} t
+    LEFT JOIN stock_list s ON s.stock_code = t.stock_code
+    WINDOW w AS (PARTITION BY t.stock_code ORDER BY t.trade_date, t.id ROWS UNBOUNDED PRECEDING)
+"""
+
+
+def create_accumulation_view(conn) -> None:
+    """
+    누적 순매수 뷰를 다시 생성
+
+    거래 테이블을 교체(파티션 전환, 저장 구조 재작성)하면 뷰가 보존된 원본 테이블을 가리키므로
+    교체 트랜잭션 안에서 호출합니다.
+
+    Args:
+        conn: 트랜잭션이 열린 연결
+    """
+    conn.execute(text(f"DROP VIEW IF EXISTS {ACCUM_VIEW}"))
+    conn.execute(text(ACCUM_VIEW_DDL))
+
+
+def ensure_accumulation_view() -> bool:
+    """
+    누적 순매수 뷰가 없으면 생성 (db.create_all() 이후 호출)
+
+    Returns:
+        bool: 새로 생성했으면 True
+    """
+    with db.engine.begin() as conn:
+        exists = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': ACCUM_VIEW}).scalar()
+        if exists:
+            return False
+        create_accumulation_view(conn)
+
+    logger.info(f"누적 순매수 뷰 생성 완료: {ACCUM_VIEW}")
+    return True
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_accumulation_view(target, connection, **kw) -> None:
+    """db.drop_all() 시 거래 테이블보다 먼저 뷰를 삭제합니다 (의존 객체로 인한 DROP 실패 방지)."""
+    connection.execute(text(f"DROP VIEW IF EXISTS {ACCUM_VIEW}"))
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+조회 결과 캐시 무효화
+쓰기가 커밋된 뒤 core.cache.result_cache에서 영향을 받는 태그를 제거합니다.
+
+    - ORM 쓰기(StockInvestorTrading, StockList)는 flush 시 태그를 모아 두었다가 커밋 후 무효화
+    - ORM을 거치지 않는 쓰기(UPDATE 문, COPY, TRUNCATE 등)는 invalidate_trading / invalidate_stocks를 직접 호출
+    - 롤백되면 모아 둔 태그를 버림 (커밋 전에 무효화하면 다른 요청이 이전 데이터를 다시 캐시할 수 있으므로 커밋 후 처리)
+    - stocks 태그를 무효화하면 주식명/누적 초기값 사전(StockList.get_name)도 함께 비움
+
+태그 구성:
+    - stocks: 주식 목록 조회 (거래 데이터 조회도 주식명/누적 초기값을 쓰므로 함께 붙임)
+    - trading: 모든 거래 데이터 조회
+    - trading:*: 여러 종목에 걸친 거래 데이터 조회
+    - trading:<종목코드>: 한 종목의 거래 데이터 조회
+
+이 무효화는 현재 프로세스에만 적용되며, 다른 워커의 쓰기는 데이터 워터마크 확인(core.cache.ResultCache.sync,
+주식명 사전은 StockList._ensure_cache의 stock_list 버전 확인)으로 반영됩니다.
+"""
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import event
+from extensions import db
+from database.routing import RoutingSession
+from core.cache import result_cache
+from models.stock import StockList
+from models.trading import StockInvestorTrading
+
+TAG_STOCKS = 'stocks'
+TAG_TRADING = 'trading'
+TAG_TRADING_ANY = 'trading:*'
+
+# 세션에 커밋 후 무효화할 태그를 모아 두는 키
+_PENDING_TAGS = 'cache_invalidation_tags'
+
+
+def trading_tag(stock_code: str) -> str:
+    """종목 거래 데이터 조회 태그"""
+    return f'{TAG_TRADING}:{stock_code}'
+
+
+def trading_tags(stock_code: Optional[str] = None) -> List[str]:
+    """
+    거래 데이터 조회 결과에 붙일 태그
+
+    Args:
+        stock_code (Optional[str]): 한 종목만 조회하면 종목 코드, 여러 종목이면 None
+
+    Returns:
+        List[str]: 태그 목록
+    """
+    stock_code = (stock_code or '').strip()
+    return [TAG_TRADING, trading_tag(stock_code) if stock_code else TAG_TRADING_ANY, TAG_STOCKS]
+
+
+def trading_write_tags(stock_codes: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    거래 데이터 쓰기로 무효화할 태그 (종목을 모르면 전체 거래 데이터)
+
+    Args:
+        stock_codes (Optional[Iterable[str]]): 변경된 종목 코드
+
+    Returns:
+        Set[str]: 태그 목록
+    """
+    if stock_codes is None:
+        return {TAG_TRADING}
+    codes = {code.strip() for code in stock_codes if code}
+    if not codes:
+        return set()
+    return {TAG_TRADING_ANY, *(trading_tag(code) for code in codes)}
+
+
+def _defer(session, tags: Iterable[str]) -> None:
+    """커밋 후 무효화할 태그를 세션에 추가합니다."""
+    session.info.setdefault(_PENDING_TAGS, set()).update(tags)
+
+
+def _invalidate(tags: Iterable[str]) -> None:
+    """조회 결과 캐시와, 주식 목록이 바뀌었으면 주식명/누적 초기값 사전을 무효화합니다."""
+    tags = set(tags)
+    result_cache.invalidate(*tags)
+    if TAG_STOCKS in tags:
+        StockList.invalidate_name_cache()
+
+
+def invalidate_trading(stock_codes: Optional[Iterable[str]] = None, immediate: bool = False) -> None:
+    """
+    거래 데이터 조회 캐시 무효화 (ORM을 거치지 않는 쓰기 후 호출)
+
+    Args:
+        stock_codes (Optional[Iterable[str]]): 변경된 종목 코드 (None이면 전체)
+        immediate (bool): 현재 세션의 커밋을 기다리지 않고 바로 무효화 (별도 연결로 이미 커밋한 경우)
+    """
+    tags = trading_write_tags(stock_codes)
+    if immediate:
+        _invalidate(tags)
+    else:
+        _defer(db.session, tags)
+
+
+def invalidate_stocks(immediate: bool = False) -> None:
+    """
+    주식 목록 조회 캐시 무효화 (거래 데이터 조회의 주식명/누적 초기값도 함께 무효화)
+
+    Args:
+        immediate (bool): 현재 세션의 커밋을 기다리지 않고 바로 무효화
+    """
+    if immediate:
+        _invalidate({TAG_STOCKS})
+    else:
+        _defer(db.session, {TAG_STOCKS})
+
+
+def _has_session_writes() -> bool:
+    """현재 세션에서 쓰기가 있었으면 캐시를 거치지 않고 자기 쓰기를 읽습니다."""
+    info = db.session.info
+    return bool(info.get('wrote') or info.get(_PENDING_TAGS))
+
+
+result_cache.bypass = _has_session_writes
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _collect_write_tags(session, flush_context) -> None:
+    """flush된 ORM 객체에서 무효화할 태그를 모읍니다."""
+    codes: Set[str] = set()
+    stocks = False
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, StockInvestorTrading):
+            codes.add(instance.stock_code)
+        elif isinstance(instance, StockList):
+            stocks = True
+    if codes:
+        _defer(session, trading_write_tags(codes))
+    if stocks:
+        _defer(session, {TAG_STOCKS})
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _collect_bulk_write_tags(orm_execute_state) -> None:
+    """flush를 거치지 않는 ORM 일괄 쓰기(query.delete(), update(Model) 등)의 태그를 모읍니다."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    if mapper.class_ is StockInvestorTrading:
+        _defer(orm_execute_state.session, trading_write_tags())
+    elif mapper.class_ is StockList:
+        _defer(orm_execute_state.session, {TAG_STOCKS})
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _invalidate_after_commit(session) -> None:
+    """커밋된 쓰기의 태그를 무효화합니다."""
+    tags = session.info.pop(_PENDING_TAGS, None)
+    if tags:
+        _invalidate(tags)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_after_rollback(session) -> None:
+    """롤백된 쓰기의 태그를 버립니다."""
+    session.info.pop(_PENDING_TAGS, None)
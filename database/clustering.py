@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 물리 정렬(CLUSTER) 관리
+야간 수집은 모든 종목을 같은 날짜 순으로 적재하므로 한 종목의 이력이 여러 힙 페이지에 흩어집니다.
+더 이상 쓰기가 없는 과거(cold) 파티션을 (stock_code, trade_date) 인덱스 기준으로 CLUSTER하여
+종목별 조회가 적은 페이지만 읽도록 유지합니다.
+
+정렬 상태는 ANALYZE가 수집하는 pg_stats의 stock_code 상관계수(correlation)로 판단합니다.
+"""
+import logging
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import text
+from extensions import db
+from database.index_advisor import parse_index_definition
+from database.partitioning import TRADING_TABLE, is_partitioned, list_partitions
+
+logger = logging.getLogger(__name__)
+
+# 물리 정렬 키 (종목별 날짜 범위 조회와 동일한 순서)
+CLUSTER_KEY = ['stock_code', 'trade_date']
+
+# 이 값 이상이면 이미 정렬된 것으로 간주
+DEFAULT_MIN_CORRELATION = 0.9
+
+
+def pick_cluster_index(indexdefs: Iterable[str]) -> Optional[str]:
+    """
+    CLUSTER에 사용할 인덱스를 선택 (CLUSTER_KEY로 시작하는 B-tree 중 가장 작은 것)
+
+    Args:
+        indexdefs (Iterable[str]): pg_indexes.indexdef 목록
+
+    Returns:
+        Optional[str]: 인덱스명 (없으면 None)
+    """
+    candidates = []
+    for indexdef in indexdefs:
+        index = parse_index_definition(indexdef)
+        if (not index or index['method'] != 'btree' or index['predicate']
+                or index['columns'][:len(CLUSTER_KEY)] != CLUSTER_KEY):
+            continue
+        candidates.append((len(index['columns']) + len(index['include']), index['name']))
+    return min(candidates)[1] if candidates else None
+
+
+def select_cluster_targets(relations: List[Dict[str, any]], today: date,
+                           min_correlation: float = DEFAULT_MIN_CORRELATION,
+                           include_hot: bool = False) -> List[Dict[str, any]]:
+    """
+    CLUSTER 대상 테이블/파티션을 선택
+
+    Args:
+        relations (List[Dict]): name, range_end, is_default, correlation, estimated_rows
+        today (date): 기준일 (range_end가 기준일 이하인 파티션만 cold로 간주)
+        min_correlation (float): 이 값 미만의 상관계수만 대상
+        include_hot (bool): 쓰기 중인 파티션(현재/미래, DEFAULT, 일반 테이블)도 포함할지 여부
+
+    Returns:
+        List[Dict]: 대상 목록 (reason 포함)
+    """
+    targets = []
+    for relation in relations:
+        if not relation.get('estimated_rows'):
+            continue
+
+        is_cold = bool(relation.get('range_end')) and not relation.get('is_default') \
+            and relation['range_end'] <= today.isoformat()
+        if not is_cold and not include_hot:
+            continue
+
+        correlation = relation.get('correlation')
+        if correlation is not None and abs(correlation) >= min_correlation:
+            continue
+
+        reason = '통계 없음' if correlation is None else f'stock_code 상관계수 {correlation:.2f}'
+        targets.append({**relation, 'reason': reason if is_cold else f'{reason} (쓰기 중)'})
+    return targets
+
+
+def find_cluster_index(relation: str) -> Optional[str]:
+    """테이블/파티션의 CLUSTER용 인덱스명을 조회합니다."""
+    indexdefs = db.session.execute(text("""
+        SELECT indexdef FROM pg_indexes WHERE tablename = :relation
+    """), {'relation': relation}).scalars().all()
+    return pick_cluster_index(indexdefs)
+
+
+def clustering_status(table: str = TRADING_TABLE) -> List[Dict[str, any]]:
+    """
+    테이블(파티션 테이블이면 각 파티션)의 정렬 상태를 조회
+
+    Args:
+        table (str): 테이블명
+
+    Returns:
+        List[Dict]: name, range_start, range_end, is_default, estimated_rows, total_bytes,
+                    correlation, clustered_index, modified_since_analyze
+    """
+    if is_partitioned(table):
+        relations = list_partitions(table)
+    else:
+        relations = [{'name': table, 'is_default': False, 'range_start': None, 'range_end': None}]
+
+    for relation in relations:
+        row = db.session.execute(text("""
+            SELECT GREATEST(c.reltuples, 0)::bigint,
+                   pg_total_relation_size(c.oid),
+                   (SELECT s.correlation FROM pg_stats s
+                    WHERE s.tablename = c.relname AND s.attname = :column),
+                   (SELECT i.relname FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+                    WHERE x.indrelid = c.oid AND x.indisclustered),
+                   (SELECT t.n_mod_since_analyze FROM pg_stat_user_tables t WHERE t.relid = c.oid)
+            FROM pg_class c
+            WHERE c.oid = CAST(:relation AS regclass)
+        """), {'relation': relation['name'], 'column': CLUSTER_KEY[0]}).first()
+        relation.update({
+            'estimated_rows': row[0],
+            'total_bytes': row[1],
+            'correlation': row[2],
+            'clustered_index': row[3],
+            'modified_since_analyze': row[4]
+        })
+    return relations
+
+
+def cluster_relation(relation: str, index_name: str, lock_timeout: str = '5s') -> float:
+    """
+    테이블/파티션을 인덱스 순서로 재작성하고 통계를 갱신
+
+    CLUSTER는 대상에 ACCESS EXCLUSIVE 잠금을 잡으므로 파티션 단위로 실행합니다.
+    잠금 획득이 lock_timeout을 넘으면 실패하며 다른 파티션에는 영향을 주지 않습니다.
+
+    Args:
+        relation (str): 테이블/파티션명
+        index_name (str): 정렬 기준 인덱스명
+        lock_timeout (str): 잠금 대기 한도
+
+    Returns:
+        float: 소요 시간 (초)
+    """
+    started = time.perf_counter()
+    with db.engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+        conn.execute(text(f"CLUSTER {relation} USING {index_name}"))
+        conn.execute(text(f"ANALYZE {relation}"))
+    elapsed = time.perf_counter() - started
+    logger.info(f"CLUSTER 완료: {relation} USING {index_name} ({elapsed:.1f}s)")
+    return elapsed
+
+
+def cluster_cold_partitions(table: str = TRADING_TABLE, today: Optional[date] = None,
+                            min_correlation: float = DEFAULT_MIN_CORRELATION,
+                            include_hot: bool = False, dry_run: bool = False,
+                            lock_timeout: str = '5s') -> List[Dict[str, any]]:
+    """
+    정렬이 흐트러진 cold 파티션을 CLUSTER
+
+    Args:
+        table (str): 테이블명
+        today (Optional[date]): 기준일 (기본값: 오늘)
+        min_correlation (float): 이 값 미만의 상관계수만 대상
+        include_hot (bool): 쓰기 중인 파티션/일반 테이블도 포함할지 여부
+        dry_run (bool): True이면 대상만 반환
+        lock_timeout (str): 잠금 대기 한도
+
+    Returns:
+        List[Dict]: 대상별 결과 (index, success, seconds, error)
+    """
+    targets = select_cluster_targets(
+        clustering_status(table), today or date.today(), min_correlation, include_hot
+    )
+
+    for target in targets:
+        target['index'] = find_cluster_index(target['name'])
+        if dry_run:
+            continue
+        if not target['index']:
+            target.update({'success': False, 'error': f"{'/'.join(CLUSTER_KEY)} 인덱스 없음"})
+            continue
+        try:
+            target['seconds'] = cluster_relation(target['name'], target['index'], lock_timeout)
+            target['success'] = True
+        except Exception as e:
+            logger.warning(f"CLUSTER 실패: {target['name']} - {str(e)}")
+            target.update({'success': False, 'error': str(e)})
+    return targets
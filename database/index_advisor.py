@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 인덱스 분석기
+인덱스 정의와 사용 통계, 실제 쿼리 형태를 비교하여 중복/미사용 인덱스를 찾고
+TradingService 조회 패턴에 맞는 커버링(INCLUDE) 인덱스를 제안합니다.
+
+DB 접근 없이 동작하는 순수 함수로 구성되어 있으며, 통계 수집과 적용은
+scripts/database/manage_trading_indexes.py에서 담당합니다.
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+TRADING_TABLE = 'stock_investor_trading'
+
+# TradingService의 실제 조회 형태
+# key: 인덱스 키 컬럼 (등호 조건 → 범위/정렬 조건 순서), include: 조회 컬럼 (index-only scan용)
+QUERY_SHAPES = [
+    {
+        'name': 'stock_date_range',
+        'description': '종목별 날짜 범위 전체 컬럼 조회 (get_trading_data_by_date_range, 중복 확인, 누적 계산)',
+        'key': ['stock_code', 'trade_date'],
+        'include': [],
+    },
+    {
+        'name': 'stock_date_range_institution',
+        'description': '종목별 날짜 범위 종가+기관 조회 (include_foreigner=false, fields가 종가/기관 필드 이내)',
+        'key': ['stock_code', 'trade_date'],
+        'include': ['id', 'close_price', 'institution_net_buy', 'institution_accum',
+                    'institution_trend_signal', 'institution_trend_score'],
+    },
+    {
+        'name': 'stock_date_range_foreigner',
+        'description': '종목별 날짜 범위 종가+외국인 조회 (include_institution=false, fields가 종가/외국인 필드 이내)',
+        'key': ['stock_code', 'trade_date'],
+        'include': ['id', 'close_price', 'foreigner_net_buy', 'foreigner_accum',
+                    'foreigner_trend_signal', 'foreigner_trend_score'],
+    },
+    {
+        'name': 'stock_date_range_price',
+        'description': '종목별 날짜 범위 종가 조회 (include_price만, fields=close_price)',
+        'key': ['stock_code', 'trade_date'],
+        'include': ['id', 'close_price'],
+    },
+    {
+        'name': 'date_range',
+        'description': '시장 전체 날짜 범위 조회 (date-range, date-range-optimized)',
+        'key': ['trade_date'],
+        'include': [],
+    },
+]
+
+_INDEX_PATTERN = re.compile(
+    r'CREATE\s+(?P<unique>UNIQUE\s+)?INDEX\s+(?P<name>\S+)\s+ON\s+(?:ONLY\s+)?(?P<table>\S+)'
+    r'\s+USING\s+(?P<method>\w+)\s+\((?P<columns>[^)]*)\)'
+    r'(?:\s+INCLUDE\s+\((?P<include>[^)]*)\))?'
+    r'(?:\s+WHERE\s+(?P<predicate>.+))?$',
+    re.IGNORECASE
+)
+
+
+def _split_columns(columns: Optional[str]) -> List[str]:
+    """컬럼 목록 문자열을 분리 (정렬 옵션/따옴표 제거)"""
+    if not columns:
+        return []
+    return [part.strip().split()[0].strip('"') for part in columns.split(',') if part.strip()]
+
+
+def parse_index_definition(indexdef: str) -> Optional[Dict[str, any]]:
+    """
+    pg_indexes.indexdef를 구조화
+
+    Args:
+        indexdef (str): CREATE INDEX 문
+
+    Returns:
+        Optional[Dict]: name, table, method, unique, columns, include, predicate (해석 실패 시 None)
+    """
+    match = _INDEX_PATTERN.match(indexdef.strip().rstrip(';'))
+    if not match:
+        return None
+    predicate = match.group('predicate')
+    return {
+        'name': match.group('name'),
+        'table': match.group('table').split('.')[-1],
+        'method': match.group('method').lower(),
+        'unique': bool(match.group('unique')),
+        'columns': _split_columns(match.group('columns')),
+        'include': _split_columns(match.group('include')),
+        'predicate': predicate.strip() if predicate else None,
+    }
+
+
+def covers(index: Dict[str, any], key: List[str], include: Iterable[str] = ()) -> bool:
+    """
+    인덱스가 주어진 키 접두사와 조회 컬럼을 모두 제공하는지 확인
+
+    Args:
+        index (Dict): parse_index_definition 결과
+        key (List[str]): 필요한 키 컬럼 (순서 중요)
+        include (Iterable[str]): 인덱스에서 바로 읽어야 하는 컬럼
+
+    Returns:
+        bool: 커버 여부 (부분 인덱스는 제외)
+    """
+    if index['method'] != 'btree' or index['predicate']:
+        return False
+    if index['columns'][:len(key)] != list(key):
+        return False
+    available = set(index['columns']) | set(index['include'])
+    return set(include) <= available
+
+
+def find_redundant_indexes(indexes: List[Dict[str, any]]) -> List[Dict[str, any]]:
+    """
+    다른 인덱스로 대체 가능한 인덱스 찾기
+
+    - 키 컬럼이 다른 btree 인덱스 키의 접두사이고 INCLUDE 컬럼도 제공되는 경우
+    - 같은 키의 부분 인덱스인데 조건 없는 인덱스가 이미 있는 경우
+
+    UNIQUE/PK 인덱스는 제약 조건이므로 대상에서 제외합니다.
+
+    Args:
+        indexes (List[Dict]): parse_index_definition 결과 목록
+
+    Returns:
+        List[Dict]: {'name', 'superseded_by', 'reason'} 목록
+    """
+    redundant = []
+    for index in indexes:
+        if index['unique'] or index['method'] != 'btree':
+            continue
+        candidates = []
+        for other in indexes:
+            if other is index or other['method'] != 'btree' or other['predicate']:
+                continue
+            if other['columns'][:len(index['columns'])] != index['columns']:
+                continue
+            available = set(other['columns']) | set(other['include'])
+            if not set(index['include']) <= available:
+                continue
+            same_shape = (other['columns'] == index['columns'] and
+                          set(other['include']) == set(index['include']) and not index['predicate'])
+            # 완전히 같은 정의는 이름순으로 하나만 남김
+            if same_shape and index['name'] < other['name']:
+                continue
+            candidates.append((other, same_shape))
+        if not candidates:
+            continue
+
+        # 대체 인덱스가 다시 중복으로 삭제되지 않도록 가장 넓은 인덱스를 기준으로 함
+        other, same_shape = max(candidates, key=lambda c: (len(c[0]['columns']), len(c[0]['include'])))
+        if index['predicate']:
+            reason = f"조건 없는 {other['name']}이(가) 같은 키를 제공 (부분 조건: {index['predicate']})"
+        elif same_shape:
+            reason = f"{other['name']}와(과) 정의가 동일"
+        else:
+            reason = f"키 ({', '.join(index['columns'])})가 {other['name']}의 접두사"
+        redundant.append({'name': index['name'], 'superseded_by': other['name'], 'reason': reason})
+    return redundant
+
+
+def find_unused_indexes(
+    indexes: List[Dict[str, any]],
+    usage: Dict[str, Dict[str, int]],
+    table_writes: int,
+    min_scans: int = 0,
+    min_scans_per_1k_writes: float = 1.0
+) -> List[Dict[str, any]]:
+    """
+    읽기 이득에 비해 쓰기 비용이 큰 인덱스 찾기
+
+    모든 INSERT/UPDATE/DELETE는 인덱스마다 추가 쓰기를 유발하므로, 쓰기 1,000건당
+    인덱스 스캔 수가 기준보다 적으면 유지 비용이 이득보다 크다고 판단합니다.
+
+    Args:
+        indexes (List[Dict]): parse_index_definition 결과 목록
+        usage (Dict[str, Dict]): 인덱스명 → {'idx_scan', 'size_bytes'} (pg_stat_user_indexes)
+        table_writes (int): 테이블 쓰기 수 (n_tup_ins + n_tup_upd - n_tup_hot_upd + n_tup_del)
+        min_scans (int): 이 값 이하의 스캔 수는 미사용으로 간주
+        min_scans_per_1k_writes (float): 쓰기 1,000건당 최소 스캔 수
+
+    Returns:
+        List[Dict]: {'name', 'idx_scan', 'size_bytes', 'scans_per_1k_writes', 'reason'} 목록
+    """
+    candidates = []
+    for index in indexes:
+        if index['unique']:
+            continue
+        stats = usage.get(index['name'], {})
+        scans = stats.get('idx_scan', 0) or 0
+        ratio = scans / table_writes * 1000 if table_writes else None
+
+        if scans <= min_scans:
+            reason = f'스캔 {scans}회 (미사용)'
+        elif ratio is not None and ratio < min_scans_per_1k_writes:
+            reason = f'쓰기 1,000건당 스캔 {ratio:.2f}회 (쓰기 비용 대비 이득 적음)'
+        else:
+            continue
+
+        candidates.append({
+            'name': index['name'],
+            'idx_scan': scans,
+            'size_bytes': stats.get('size_bytes', 0),
+            'scans_per_1k_writes': round(ratio, 2) if ratio is not None else None,
+            'reason': reason
+        })
+    return candidates
+
+
+_SELECT_PATTERN = re.compile(r'SELECT\s+(?P<select>.+?)\s+FROM\s+', re.IGNORECASE | re.DOTALL)
+_COLUMN_PATTERN = re.compile(r'(?:\w+\.)?(\w+)(?:\s+AS\s+\w+)?$', re.IGNORECASE)
+
+
+def classify_query(sql: str) -> Optional[str]:
+    """
+    거래 테이블 조회 SQL을 QUERY_SHAPES 중 하나로 분류
+
+    Args:
+        sql (str): SQL 문 (pg_stat_statements.query 또는 로그의 statement)
+
+    Returns:
+        Optional[str]: 쿼리 형태 이름 (분류 불가 시 None)
+    """
+    normalized = ' '.join(sql.split())
+    lowered = normalized.lower()
+    if TRADING_TABLE not in lowered or not lowered.startswith('select'):
+        return None
+
+    has_stock_filter = re.search(r'stock_code\s*(=|in\b|= any)', lowered) is not None
+    has_date_filter = re.search(r'trade_date\s*(>=|<=|>|<|between|=)', lowered) is not None
+    if not has_date_filter and not has_stock_filter:
+        return None
+    if not has_stock_filter:
+        return 'date_range'
+
+    match = _SELECT_PATTERN.search(normalized)
+    selected = set()
+    if match:
+        for part in match.group('select').split(','):
+            column = _COLUMN_PATTERN.search(part.strip())
+            if column:
+                selected.add(column.group(1).lower())
+
+    # 전체 컬럼 조회보다 좁은 형태부터 확인
+    for shape in sorted(QUERY_SHAPES, key=lambda s: len(s['include'])):
+        if shape['key'][0] != 'stock_code' or not shape['include']:
+            continue
+        projected = set(shape['include']) | set(shape['key'])
+        if selected and selected <= projected:
+            return shape['name']
+    return 'stock_date_range'
+
+
+def summarize_query_shapes(statements: Iterable[Dict[str, any]]) -> Dict[str, Dict[str, float]]:
+    """
+    쿼리 통계를 형태별로 집계
+
+    Args:
+        statements (Iterable[Dict]): {'query', 'calls', 'total_time_ms'} 목록
+            (pg_stat_statements 또는 로컬 쿼리 로그)
+
+    Returns:
+        Dict[str, Dict]: 형태 이름 → {'calls', 'total_time_ms'}
+    """
+    summary = {}
+    for statement in statements:
+        shape = classify_query(statement['query'])
+        if not shape:
+            continue
+        entry = summary.setdefault(shape, {'calls': 0, 'total_time_ms': 0.0})
+        entry['calls'] += statement.get('calls', 1) or 0
+        entry['total_time_ms'] += statement.get('total_time_ms', 0.0) or 0.0
+    return summary
+
+
+def parse_query_log(lines: Iterable[str]) -> List[Dict[str, any]]:
+    """
+    PostgreSQL 로그(log_min_duration_statement) 또는 SQL 한 줄씩 적힌 파일을 해석
+
+    지원 형식:
+        ... LOG:  duration: 12.345 ms  statement: SELECT ...
+        SELECT ...
+
+    Args:
+        lines (Iterable[str]): 로그 줄
+
+    Returns:
+        List[Dict]: {'query', 'calls', 'total_time_ms'} 목록
+    """
+    statements = []
+    pattern = re.compile(r'duration:\s*([\d.]+)\s*ms\s+(?:statement|execute [^:]*):\s*(.+)$', re.IGNORECASE)
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        match = pattern.search(line)
+        if match:
+            statements.append({'query': match.group(2), 'calls': 1, 'total_time_ms': float(match.group(1))})
+        elif line.lower().startswith('select'):
+            statements.append({'query': line, 'calls': 1, 'total_time_ms': 0.0})
+    return statements
+
+
+def propose_covering_indexes(
+    indexes: List[Dict[str, any]],
+    shape_usage: Optional[Dict[str, Dict[str, float]]] = None,
+    table: str = TRADING_TABLE
+) -> List[Dict[str, any]]:
+    """
+    실제 쿼리 형태에 맞는 커버링 인덱스 제안
+
+    같은 키를 쓰는 형태는 INCLUDE 컬럼을 합쳐 인덱스 하나로 묶어 쓰기 증폭을 줄입니다.
+    shape_usage가 주어지면 실제로 호출된 형태만 대상으로 합니다.
+
+    Args:
+        indexes (List[Dict]): 기존 인덱스 (parse_index_definition 결과)
+        shape_usage (Optional[Dict]): summarize_query_shapes 결과
+        table (str): 대상 테이블
+
+    Returns:
+        List[Dict]: {'name', 'key', 'include', 'shapes', 'reason'} 목록
+    """
+    grouped = {}
+    for shape in QUERY_SHAPES:
+        if shape_usage is not None and shape['name'] not in shape_usage:
+            continue
+        group = grouped.setdefault(tuple(shape['key']), {'include': [], 'shapes': []})
+        for column in shape['include']:
+            if column not in group['include'] and column not in shape['key']:
+                group['include'].append(column)
+        group['shapes'].append(shape['name'])
+
+    proposals = []
+    for key, group in grouped.items():
+        if any(covers(index, list(key), group['include']) for index in indexes):
+            continue
+        suffix = '_'.join(key)
+        name = f"idx_{table}_{suffix}_cover" if group['include'] else f"idx_{table}_{suffix}"
+        proposals.append({
+            'name': name,
+            'key': list(key),
+            'include': group['include'],
+            'shapes': group['shapes'],
+            'reason': f"조회 형태 {', '.join(group['shapes'])}를 index-only scan으로 처리"
+        })
+    return proposals
+
+
+def build_plan(
+    redundant: List[Dict[str, any]],
+    unused: List[Dict[str, any]],
+    proposals: List[Dict[str, any]],
+    table: str = TRADING_TABLE,
+    partitions: Optional[List[str]] = None
+) -> List[Dict[str, any]]:
+    """
+    인덱스 변경 계획 생성 (생성 먼저, 삭제는 나중)
+
+    일반 테이블은 CREATE/DROP INDEX CONCURRENTLY를 사용합니다. 파티션 테이블은 부모에
+    ON ONLY 인덱스를 만든 뒤 파티션별로 CONCURRENTLY 생성 후 ATTACH 합니다.
+
+    Args:
+        redundant (List[Dict]): find_redundant_indexes 결과
+        unused (List[Dict]): find_unused_indexes 결과
+        proposals (List[Dict]): propose_covering_indexes 결과
+        table (str): 대상 테이블
+        partitions (Optional[List[str]]): 파티션 테이블이면 파티션명 목록
+
+    Returns:
+        List[Dict]: {'action', 'name', 'statements', 'reason'} 목록 (statements는 순서대로 실행)
+    """
+    plan = []
+    for proposal in proposals:
+        columns = ', '.join(proposal['key'])
+        include = f" INCLUDE ({', '.join(proposal['include'])})" if proposal['include'] else ''
+        if partitions is None:
+            statements = [f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {proposal['name']} ON {table} ({columns}){include}"]
+        else:
+            statements = [f"CREATE INDEX IF NOT EXISTS {proposal['name']} ON ONLY {table} ({columns}){include}"]
+            for partition in partitions:
+                child = f"{partition}_{proposal['name'][len('idx_'):]}"[:63]
+                statements.append(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {child} ON {partition} ({columns}){include}")
+                statements.append(f"ALTER INDEX {proposal['name']} ATTACH PARTITION {child}")
+        plan.append({'action': 'create', 'name': proposal['name'], 'statements': statements,
+                     'reason': proposal['reason']})
+
+    seen = set()
+    for item in redundant + unused:
+        if item['name'] in seen:
+            continue
+        seen.add(item['name'])
+        # 파티션 인덱스는 CONCURRENTLY 삭제를 지원하지 않음
+        drop = 'DROP INDEX IF EXISTS' if partitions is not None else 'DROP INDEX CONCURRENTLY IF EXISTS'
+        plan.append({'action': 'drop', 'name': item['name'], 'statements': [f"{drop} {item['name']}"],
+                     'reason': item['reason']})
+    return plan
+
+
+def plan_index_changes(
+    indexes: List[Dict[str, any]],
+    usage: Dict[str, Dict[str, int]],
+    table_writes: int,
+    shape_usage: Optional[Dict[str, Dict[str, float]]] = None,
+    min_scans: int = 0,
+    min_scans_per_1k_writes: float = 1.0,
+    table: str = TRADING_TABLE,
+    partitions: Optional[List[str]] = None
+) -> Dict[str, List[Dict[str, any]]]:
+    """
+    인덱스 분석 전체 흐름 (제안 → 중복 → 미사용 → 계획)
+
+    제안된 커버링 인덱스가 기존 인덱스를 대체하면 기존 인덱스도 중복으로 표시합니다.
+    서로를 대체하는 인덱스가 함께 삭제되지 않도록, 대체하는 쪽이 삭제 대상이면
+    중복 인덱스는 유지합니다.
+
+    Returns:
+        Dict: {'proposals', 'redundant', 'unused', 'plan'}
+    """
+    proposals = propose_covering_indexes(indexes, shape_usage, table)
+    planned = [
+        {'name': p['name'], 'table': table, 'method': 'btree', 'unique': False,
+         'columns': p['key'], 'include': p['include'], 'predicate': None}
+        for p in proposals
+    ]
+
+    unused = find_unused_indexes(indexes, usage, table_writes, min_scans, min_scans_per_1k_writes)
+    unused_names = {item['name'] for item in unused}
+
+    redundant = [
+        item for item in find_redundant_indexes(indexes + planned)
+        if item['name'] not in {p['name'] for p in planned} and item['superseded_by'] not in unused_names
+    ]
+
+    return {
+        'proposals': proposals,
+        'redundant': redundant,
+        'unused': unused,
+        'plan': build_plan(redundant, unused, proposals, table, partitions)
+    }
@@ -0,0 +1,497 @@
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 테이블 파티션 관리
+stock_investor_trading 테이블의 trade_date 기준 선언적 RANGE 파티션을 생성/조회/정리합니다.
+"""
+import logging
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+TRADING_TABLE = 'stock_investor_trading'
+
+# 지원하는 파티션 단위
+INTERVAL_YEAR = 'year'
+INTERVAL_QUARTER = 'quarter'
+SUPPORTED_INTERVALS = (INTERVAL_YEAR, INTERVAL_QUARTER)
+
+# 파티션 테이블 컬럼 정의 (모델 StockInvestorTrading과 동일한 순서)
+# 파티션 키(trade_date)는 PK/UNIQUE 제약에 반드시 포함되어야 합니다.
+TRADING_COLUMNS_DDL = """
+    id INTEGER NOT NULL DEFAULT nextval('stock_investor_trading_id_seq'),
+    trade_date DATE NOT NULL,
+    institution_accum BIGINT,
+    foreigner_accum BIGINT,
+    close_price INTEGER,
+    institution_net_buy INTEGER,
+    foreigner_net_buy INTEGER,
+    institution_trend_score REAL,
+    foreigner_trend_score REAL,
+    stock_code VARCHAR(20) NOT NULL,
+    institution_trend_signal VARCHAR(50),
+    foreigner_trend_signal VARCHAR(50),
+    PRIMARY KEY (id, trade_date)
+"""
+
+# 주식명 컬럼을 분리하기 전(문자열 날짜) 레거시 스키마 - 기존 테이블 전환 시 사용
+LEGACY_TRADING_COLUMNS_DDL = """
+    id INTEGER NOT NULL DEFAULT nextval('stock_investor_trading_id_seq'),
+    stock_code VARCHAR(20) NOT NULL,
+    stock_name VARCHAR(100) NOT NULL,
+    trade_date VARCHAR(10) NOT NULL,
+    close_price INTEGER,
+    institution_net_buy INTEGER,
+    foreigner_net_buy INTEGER,
+    institution_accum INTEGER,
+    foreigner_accum INTEGER,
+    institution_trend_signal VARCHAR(50),
+    institution_trend_score DOUBLE PRECISION,
+    foreigner_trend_signal VARCHAR(50),
+    foreigner_trend_score DOUBLE PRECISION,
+    PRIMARY KEY (id, trade_date)
+"""
+
+# 파티션 부모에 생성하는 기본 인덱스 (각 파티션에 자동 전파됨)
+# (stock_code, trade_date) UNIQUE 인덱스는 종목별 조회와 일괄 적재의 ON CONFLICT 대상을 겸합니다.
+PARTITIONED_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS {table}_stock_date_key ON {table} (stock_code, trade_date)",
+    "CREATE INDEX IF NOT EXISTS {table}_date_idx ON {table} (trade_date)",
+]
+
+_BOUND_PATTERN = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+# 프로세스 단위 메모: 이미 확인한 파티션 구간 (시작일, 종료일) - 매 수집마다 카탈로그 조회 방지
+_ensured_range: Optional[Tuple[date, date]] = None
+
+
+def period_bounds(year: int, interval: str = INTERVAL_YEAR, quarter: int = 1) -> Tuple[str, str]:
+    """
+    파티션 하나의 [시작, 끝) 경계를 YYYY-MM-DD 문자열로 반환
+
+    Args:
+        year (int): 연도
+        interval (str): 파티션 단위 (year/quarter)
+        quarter (int): 분기 (interval이 quarter일 때만 사용, 1~4)
+
+    Returns:
+        Tuple[str, str]: (시작일, 종료일) - 종료일은 포함하지 않음
+    """
+    if interval == INTERVAL_QUARTER:
+        start_month = (quarter - 1) * 3 + 1
+        end_year, end_month = (year + 1, 1) if quarter == 4 else (year, start_month + 3)
+        return f'{year:04d}-{start_month:02d}-01', f'{end_year:04d}-{end_month:02d}-01'
+    return f'{year:04d}-01-01', f'{year + 1:04d}-01-01'
+
+
+def partition_name(year: int, interval: str = INTERVAL_YEAR, quarter: int = 1, table: str = TRADING_TABLE) -> str:
+    """
+    파티션 테이블명 생성 (예: stock_investor_trading_y2024, stock_investor_trading_y2024q1)
+    """
+    if interval == INTERVAL_QUARTER:
+        return f'{table}_y{year:04d}q{quarter}'
+    return f'{table}_y{year:04d}'
+
+
+def periods_between(start: date, end: date, interval: str = INTERVAL_YEAR) -> List[Tuple[int, int]]:
+    """
+    두 날짜를 포함하는 (연도, 분기) 파티션 목록
+
+    Args:
+        start (date): 시작 날짜
+        end (date): 종료 날짜
+        interval (str): 파티션 단위
+
+    Returns:
+        List[Tuple[int, int]]: (연도, 분기) 목록 - 연 단위면 분기는 1
+    """
+    periods = []
+    if interval == INTERVAL_QUARTER:
+        year, quarter = start.year, (start.month - 1) // 3 + 1
+        end_key = (end.year, (end.month - 1) // 3 + 1)
+        while (year, quarter) <= end_key:
+            periods.append((year, quarter))
+            year, quarter = (year + 1, 1) if quarter == 4 else (year, quarter + 1)
+    else:
+        periods = [(year, 1) for year in range(start.year, end.year + 1)]
+    return periods
+
+
+def is_partitioned(table: str = TRADING_TABLE) -> bool:
+    """
+    테이블이 선언적 파티션 테이블인지 확인
+
+    Args:
+        table (str): 테이블명
+
+    Returns:
+        bool: 파티션 테이블 여부
+    """
+    result = db.session.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = :table
+        )
+    """), {'table': table}).scalar()
+    return bool(result)
+
+
+def has_stock_date_key(table: str = TRADING_TABLE) -> bool:
+    """
+    (stock_code, trade_date) UNIQUE 인덱스가 있는지 확인 (일괄 적재 ON CONFLICT 대상)
+
+    Args:
+        table (str): 테이블명
+
+    Returns:
+        bool: 유효한 UNIQUE 인덱스가 있으면 True
+    """
+    result = db.session.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indrelid
+            WHERE c.relname = :table AND i.indisunique AND i.indisvalid AND i.indpred IS NULL
+              AND ARRAY(
+                  SELECT a.attname::text FROM unnest(i.indkey::int2[]) AS k(attnum)
+                  JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = k.attnum
+                  ORDER BY a.attname
+              ) = ARRAY['stock_code', 'trade_date']
+        )
+    """), {'table': table}).scalar()
+    return bool(result)
+
+
+def create_partitioned_table(conn, table: str, columns_ddl: str = TRADING_COLUMNS_DDL) -> None:
+    """
+    trade_date RANGE 파티션 부모 테이블과 DEFAULT 파티션, 기본 인덱스를 생성
+
+    Args:
+        conn: SQLAlchemy Connection (트랜잭션은 호출자가 관리)
+        table (str): 생성할 부모 테이블명
+        columns_ddl (str): 컬럼/제약 DDL
+    """
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table} ({columns_ddl}) PARTITION BY RANGE (trade_date)"))
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+    for index_sql in PARTITIONED_INDEXES:
+        conn.execute(text(index_sql.format(table=table)))
+
+
+def default_partition(conn, table: str = TRADING_TABLE) -> Optional[str]:
+    """
+    DEFAULT 파티션명 조회
+
+    Args:
+        conn: SQLAlchemy Connection
+        table (str): 부모 테이블명
+
+    Returns:
+        Optional[str]: DEFAULT 파티션명 (없으면 None)
+    """
+    return conn.execute(text("""
+        SELECT c.relname FROM pg_partitioned_table p
+        JOIN pg_class c ON c.oid = p.partdefid
+        WHERE p.partrelid = to_regclass(:table)
+    """), {'table': table}).scalar()
+
+
+def create_partition(conn, year: int, interval: str = INTERVAL_YEAR, quarter: int = 1,
+                     table: str = TRADING_TABLE) -> bool:
+    """
+    파티션 하나를 생성 (이미 있으면 건너뜀)
+
+    DEFAULT 파티션에 이 기간의 행이 있으면 그대로는 만들 수 없으므로
+    (updated partition constraint for default partition would be violated)
+    DEFAULT를 분리하고 파티션을 만든 뒤 해당 기간의 행을 옮기고 DEFAULT를 다시 연결합니다.
+    같은 행을 옮기기만 하므로 워터마크 트리거(부모 테이블 문장 트리거)는 실행되지 않습니다.
+
+    Args:
+        conn: SQLAlchemy Connection
+        year (int): 연도
+        interval (str): 파티션 단위
+        quarter (int): 분기
+        table (str): 부모 테이블명
+
+    Returns:
+        bool: 새로 생성했으면 True
+    """
+    name = partition_name(year, interval, quarter, table)
+    exists = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': name}).scalar()
+    if exists:
+        return False
+
+    start, end = period_bounds(year, interval, quarter)
+    bounds = {'start': start, 'end': end}
+    period = "trade_date >= CAST(:start AS date) AND trade_date < CAST(:end AS date)"
+    create_sql = text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ('{start}') TO ('{end}')")
+
+    default = default_partition(conn, table)
+    stranded = default is not None and conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {period})"), bounds
+    ).scalar()
+    if not stranded:
+        conn.execute(create_sql)
+        logger.info(f"파티션 생성: {name} [{start}, {end})")
+        return True
+
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    conn.execute(create_sql)
+    moved = conn.execute(text(f"""
+        WITH moved AS (DELETE FROM {default} WHERE {period} RETURNING *)
+        INSERT INTO {name} SELECT * FROM moved
+    """), bounds).rowcount
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    logger.info(f"파티션 생성: {name} [{start}, {end}) - DEFAULT 파티션에서 {moved}건 이동")
+    return True
+
+
+def ensure_partitions(start: date, end: date, interval: str = INTERVAL_YEAR, table: str = TRADING_TABLE) -> List[str]:
+    """
+    날짜 구간을 덮는 파티션을 모두 생성
+
+    Args:
+        start (date): 시작 날짜
+        end (date): 종료 날짜
+        interval (str): 파티션 단위
+        table (str): 부모 테이블명
+
+    Returns:
+        List[str]: 새로 생성된 파티션명 목록
+    """
+    created = []
+    with db.engine.begin() as conn:
+        # 여러 워커가 동시에 같은 파티션을 만들거나 DEFAULT를 분리하지 않도록 직렬화
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {'name': f'{table}_partitions'})
+        for year, quarter in periods_between(start, end, interval):
+            if create_partition(conn, year, interval, quarter, table):
+                created.append(partition_name(year, interval, quarter, table))
+    return created
+
+
+def ensure_future_partitions(interval: str = INTERVAL_YEAR, periods_ahead: int = 1,
+                             today: Optional[date] = None, start: Optional[date] = None) -> List[str]:
+    """
+    start(기본값: 현재 기간)부터 periods_ahead 만큼 앞선 기간까지 파티션을 생성
+
+    수집/적재 전에 그 구간 전체를 덮도록 호출하면 과거 데이터도 DEFAULT 파티션이 아닌
+    기간 파티션에 저장되어 파티션 제외와 보존 정책이 적용됩니다. DEFAULT 파티션에 이미 쌓인
+    행이 있으면 그 기간까지 구간을 넓혀 파티션을 만들고 행을 옮깁니다.
+
+    파티션 테이블이 아니면 아무것도 하지 않습니다. 같은 프로세스에서
+    이미 확인한 구간이면 카탈로그를 다시 조회하지 않습니다.
+
+    Args:
+        interval (str): 파티션 단위
+        periods_ahead (int): 미리 생성할 기간 수
+        today (Optional[date]): 기준 날짜 (테스트용)
+        start (Optional[date]): 구간 시작 날짜 (수집/적재할 가장 이른 거래일)
+
+    Returns:
+        List[str]: 새로 생성된 파티션명 목록
+    """
+    global _ensured_range
+
+    today = today or date.today()
+    if interval == INTERVAL_QUARTER:
+        months = today.month - 1 + periods_ahead * 3
+        end = date(today.year + months // 12, months % 12 + 1, 1)
+    else:
+        end = date(today.year + periods_ahead, 1, 1)
+    start = min(start or today, today)
+
+    if _ensured_range is not None and _ensured_range[0] <= start and _ensured_range[1] == end:
+        return []
+
+    if not is_partitioned():
+        return []
+
+    # DEFAULT 파티션에 남아 있는 기간도 함께 분리 (trade_date 인덱스로 최소/최대만 조회)
+    # 세션 트랜잭션에서 DEFAULT를 읽으면 그 잠금이 분리(DETACH)를 막으므로 별도 연결에서 바로 닫음
+    first = last = None
+    with db.engine.connect() as conn:
+        default = default_partition(conn)
+        if default is not None:
+            first, last = conn.execute(text(f"SELECT MIN(trade_date), MAX(trade_date) FROM {default}")).one()
+
+    created = ensure_partitions(min(start, first or start), max(end, last or end), interval)
+    if _ensured_range is not None:
+        start = min(start, _ensured_range[0])
+    _ensured_range = (start, end)
+    return created
+
+
+def list_partitions(table: str = TRADING_TABLE) -> List[Dict[str, any]]:
+    """
+    파티션 목록과 경계, 크기를 조회
+
+    Args:
+        table (str): 부모 테이블명
+
+    Returns:
+        List[Dict]: 파티션 정보 목록 (시작일 기준 오름차순, DEFAULT 파티션은 마지막)
+    """
+    rows = db.session.execute(text("""
+        SELECT c.relname,
+               pg_get_expr(c.relpartbound, c.oid) AS bound,
+               pg_total_relation_size(c.oid) AS total_bytes,
+               GREATEST(c.reltuples, 0)::bigint AS estimated_rows
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+    """), {'table': table}).all()
+
+    partitions = []
+    for name, bound, total_bytes, estimated_rows in rows:
+        match = _BOUND_PATTERN.search(bound or '')
+        partitions.append({
+            'name': name,
+            'is_default': bound == 'DEFAULT',
+            'range_start': match.group(1) if match else None,
+            'range_end': match.group(2) if match else None,
+            'total_bytes': total_bytes,
+            'estimated_rows': estimated_rows
+        })
+
+    partitions.sort(key=lambda p: (p['is_default'], p['range_start'] or ''))
+    return partitions
+
+
+def clear_partitions(conn, table: str = TRADING_TABLE) -> List[str]:
+    """
+    모든 파티션(DEFAULT 포함)을 분리(DETACH)한 뒤 삭제하고 같은 경계의 빈 파티션으로 다시 생성
+
+    전체 데이터 삭제용으로, 부모 테이블 TRUNCATE나 행 단위 DELETE 없이 파티션 단위로 저장 공간을 바로 반환합니다.
+    같은 경계로 다시 만들므로 워커별로 확인한 파티션 구간(ensure_future_partitions)이 그대로 유효하고
+    이후 적재가 DEFAULT 파티션에 쌓이지 않습니다. 인덱스는 부모의 파티션 인덱스로부터 자동 생성됩니다.
+    DETACH/DROP은 워터마크 트리거를 실행하지 않으므로 같은 트랜잭션에서 refresh_coverage를 호출해야 합니다.
+
+    Args:
+        conn: 트랜잭션이 열린 연결
+        table (str): 부모 테이블명
+
+    Returns:
+        List[str]: 다시 생성된 파티션명 목록
+    """
+    # 파티션 생성/DEFAULT 이동(ensure_partitions)과 겹치지 않도록 직렬화
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {'name': f'{table}_partitions'})
+    partitions = conn.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+        ORDER BY c.relname
+    """), {'table': table}).all()
+
+    for name, _ in partitions:
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+    for name, bound in partitions:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bound}"))
+
+    logger.info(f"파티션 비움 (분리 후 삭제, 빈 파티션 재생성): {len(partitions)}개")
+    return [name for name, _ in partitions]
+
+
+def apply_retention(keep_before: str, drop: bool = False, table: str = TRADING_TABLE) -> List[str]:
+    """
+    keep_before 이전 구간만 담은 파티션을 분리(DETACH)하고 필요하면 삭제
+
+    행 단위 DELETE 없이 오래된 데이터를 즉시 제거합니다. 분리된 파티션은
+    일반 테이블로 남으므로 보관(아카이브) 후 직접 삭제할 수 있습니다.
+    DETACH/DROP은 워터마크 트리거를 실행하지 않으므로 같은 트랜잭션에서 종목별 범위와
+    데이터 버전을 다시 계산하고, 커밋 후 조회 결과 캐시를 무효화합니다.
+
+    Args:
+        keep_before (str): 이 날짜(YYYY-MM-DD) 이전 데이터만 가진 파티션이 대상
+        drop (bool): True면 분리 후 바로 DROP
+        table (str): 부모 테이블명
+
+    Returns:
+        List[str]: 분리(또는 삭제)된 파티션명 목록
+    """
+    targets = [
+        p['name'] for p in list_partitions(table)
+        if not p['is_default'] and p['range_end'] and p['range_end'] <= keep_before
+    ]
+
+    if not targets:
+        return targets
+
+    # 워터마크/캐시 모듈은 이 모듈을 가져오므로 순환 import를 피해 함수 안에서 가져옴
+    from database.watermarks import refresh_coverage
+    from database.cache_invalidation import invalidate_trading
+
+    with db.engine.begin() as conn:
+        for name in targets:
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if drop:
+                conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"파티션 {'삭제' if drop else '분리'}: {name}")
+        refresh_coverage(conn)
+    invalidate_trading(immediate=True)
+
+    return targets
+
+
+def rename_dependents(conn, table: str, old_prefix: str, new_prefix: str) -> None:
+    """
+    테이블 교체 후 파티션/인덱스 이름의 접두사를 일괄 변경
+
+    교체 전후 테이블의 파티션·인덱스 이름이 겹치지 않도록 원본 쪽을 먼저
+    바꾼 뒤 새 테이블 쪽을 바꿉니다.
+
+    Args:
+        conn: SQLAlchemy Connection
+        table (str): 대상 테이블명 (이미 교체된 이름)
+        old_prefix (str): 기존 접두사
+        new_prefix (str): 새 접두사
+    """
+    children = conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+    """), {'table': table}).scalars().all()
+    indexes = conn.execute(text("""
+        SELECT indexname FROM pg_indexes WHERE tablename = :table
+    """), {'table': table}).scalars().all()
+
+    for name in children:
+        if name.startswith(old_prefix):
+            conn.execute(text(f"ALTER TABLE {name} RENAME TO {new_prefix}{name[len(old_prefix):]}"))
+    for name in indexes:
+        if name.startswith(old_prefix):
+            conn.execute(text(f"ALTER INDEX {name} RENAME TO {new_prefix}{name[len(old_prefix):]}"))
+
+
+def ensure_partitioned_trading_table(interval: str, periods_ahead: int = 1) -> bool:
+    """
+    신규 데이터베이스에서 거래 테이블을 파티션 테이블로 생성 (db.create_all() 이전 호출)
+
+    테이블이 이미 있으면 (일반/파티션 관계없이) 건드리지 않습니다.
+    기존 일반 테이블 전환은 scripts/database/partition_trading.py를 사용하세요.
+    여기서는 현재 기간부터 만들고, 과거 기간은 수집/적재 전에 그 구간으로 만듭니다 (ensure_future_partitions의 start).
+
+    Args:
+        interval (str): 파티션 단위
+        periods_ahead (int): 미리 생성할 기간 수
+
+    Returns:
+        bool: 새로 생성했으면 True
+    """
+    if interval not in SUPPORTED_INTERVALS:
+        raise ValueError(f"지원하지 않는 파티션 단위입니다: {interval} (year, quarter)")
+
+    with db.engine.begin() as conn:
+        exists = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': TRADING_TABLE}).scalar()
+        if exists:
+            return False
+        conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {TRADING_TABLE}_id_seq"))
+        create_partitioned_table(conn, TRADING_TABLE)
+        conn.execute(text(f"ALTER SEQUENCE {TRADING_TABLE}_id_seq OWNED BY {TRADING_TABLE}.id"))
+
+    ensure_future_partitions(interval, periods_ahead)
+    logger.info(f"파티션 거래 테이블 생성 완료 (단위: {interval})")
+    return True
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+커넥션 풀 계측과 크기 산정
+엔진별 QueuePool의 체크아웃 대기 시간, 사용 중/오버플로 연결 수, 타임아웃을 기록하고,
+DB_POOL_SIZING=auto이면 워커 수와 전체 연결 예산(DB_CONNECTION_BUDGET)으로 풀 크기를 계산합니다.
+
+gunicorn 워커마다 별도의 풀이 생기므로 예산은 워커 수로 나누어 프로세스별 한도로 사용합니다.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from sqlalchemy import event, text, exc as sa_exc
+from sqlalchemy.pool import QueuePool
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 최근 체크아웃 대기 시간 보관 개수 (p95 계산용)
+RECENT_SAMPLES = 1024
+
+SIZING_FIXED = 'fixed'
+SIZING_AUTO = 'auto'
+
+
+class PoolStats:
+    """풀 하나의 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.recent.append(seconds)
+
+    def record(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def to_dict(self) -> Dict[str, any]:
+        with self._lock:
+            recent = sorted(self.recent)
+            p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+            return {
+                'checkouts': self.checkouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_p95_ms': round(p95 * 1000, 3),
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+            }
+
+
+# 풀 이름(pool_logging_name)별 통계 - engine.dispose()로 풀이 재생성되어도 유지
+_pool_stats: Dict[str, PoolStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_pool_stats(name: str) -> PoolStats:
+    """풀 이름별 통계 객체를 반환합니다."""
+    with _stats_lock:
+        return _pool_stats.setdefault(name, PoolStats())
+
+
+class InstrumentedQueuePool(QueuePool):
+    """체크아웃 대기 시간과 타임아웃을 기록하는 QueuePool"""
+
+    @property
+    def stats(self) -> PoolStats:
+        return get_pool_stats(self.logging_name or 'primary')
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.stats.record('timeouts')
+            metrics.increment('db.pool.timeouts', labels={'pool': self.logging_name or 'primary'})
+            logger.warning(f"커넥션 풀 타임아웃: {self.logging_name or 'primary'} "
+                           f"(size={self.size()}, overflow={self.overflow()})")
+            raise
+        self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def _create_connection(self):
+        record = super()._create_connection()
+        record.info['pool_name'] = self.logging_name or 'primary'
+        self.stats.record('connects')
+        return record
+
+
+@event.listens_for(InstrumentedQueuePool, 'invalidate')
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    """연결 무효화(연결 끊김 감지 등) 횟수를 기록합니다."""
+    get_pool_stats(connection_record.info.get('pool_name', 'primary')).record('invalidations')
+
+
+def compute_pool_limits(connection_budget: int, workers: int, threads_per_worker: int,
+                        executor_workers: int) -> Dict[str, int]:
+    """
+    프로세스별 풀 크기 계산
+
+    상시 연결(pool_size)은 동시에 DB를 쓸 수 있는 스레드 수(요청 스레드 + 수집 스레드)까지만 두고,
+    프로세스 몫의 나머지 예산은 오버플로로 허용합니다.
+
+    Args:
+        connection_budget (int): 애플리케이션 전체에 허용할 DB 연결 수
+        workers (int): gunicorn 워커 프로세스 수
+        threads_per_worker (int): 워커당 요청 처리 스레드 수
+        executor_workers (int): 워커당 Flask-Executor 스레드 수
+
+    Returns:
+        Dict[str, int]: per_process, pool_size, max_overflow
+    """
+    per_process = max(1, connection_budget // max(1, workers))
+    pool_size = max(1, min(per_process, threads_per_worker + executor_workers))
+    return {
+        'per_process': per_process,
+        'pool_size': pool_size,
+        'max_overflow': max(0, per_process - pool_size),
+    }
+
+
+def sizing_inputs(config) -> Dict[str, int]:
+    """설정/환경 변수에서 풀 크기 산정 입력값을 읽습니다."""
+    return {
+        'connection_budget': int(config.get('DB_CONNECTION_BUDGET', 80)),
+        'workers': int(os.environ.get('WEB_CONCURRENCY', '1')),
+        'threads_per_worker': int(os.environ.get('GUNICORN_THREADS', '1')),
+        'executor_workers': int(config.get('EXECUTOR_MAX_WORKERS') or 1),
+    }
+
+
+def configure_engine_options(config) -> Optional[Dict[str, int]]:
+    """
+    엔진 옵션에 계측 풀을 설정하고, auto 모드이면 풀 크기를 계산하여 적용
+
+    db.init_app() 전에 호출해야 합니다. 복제본 바인드도 같은 방식으로 설정되며,
+    복제본은 별도 서버이므로 같은 예산을 따로 적용합니다.
+
+    Args:
+        config: app.config
+
+    Returns:
+        Optional[Dict[str, int]]: auto 모드에서 계산된 한도 (fixed 모드이면 None)
+    """
+    limits = None
+    if config.get('DB_POOL_SIZING', SIZING_FIXED) == SIZING_AUTO:
+        limits = compute_pool_limits(**sizing_inputs(config))
+
+    # 설정 클래스의 딕셔너리를 공유하지 않도록 복사본에 적용
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    config['SQLALCHEMY_BINDS'] = {
+        key: dict(options) if isinstance(options, dict) else options
+        for key, options in config.get('SQLALCHEMY_BINDS', {}).items()
+    }
+    targets = [('primary', config['SQLALCHEMY_ENGINE_OPTIONS'])]
+    targets += [(key, options) for key, options in config['SQLALCHEMY_BINDS'].items() if isinstance(options, dict)]
+
+    for name, options in targets:
+        options['poolclass'] = InstrumentedQueuePool
+        options['pool_logging_name'] = name
+        if limits:
+            options['pool_size'] = limits['pool_size']
+            options['max_overflow'] = limits['max_overflow']
+
+    if limits:
+        logger.info(f"커넥션 풀 자동 산정: pool_size={limits['pool_size']}, "
+                    f"max_overflow={limits['max_overflow']} (프로세스 한도 {limits['per_process']})")
+    return limits
+
+
+def pool_report(engines) -> Dict[str, Dict[str, any]]:
+    """
+    엔진별 커넥션 풀 상태와 누적 통계
+
+    Args:
+        engines: db.engines (bind key → Engine)
+
+    Returns:
+        Dict: 엔진 이름별 size, checked_out, checked_in, overflow, max_overflow, 통계
+    """
+    report = {}
+    for key, engine in engines.items():
+        pool = engine.pool
+        entry = {
+            'size': pool.size() if hasattr(pool, 'size') else None,
+            'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+            'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+            # QueuePool.overflow()는 -pool_size부터 시작하므로 실제 초과 연결 수로 변환
+            'overflow': max(0, pool.overflow()) if hasattr(pool, 'overflow') else None,
+            'max_overflow': getattr(pool, '_max_overflow', None),
+        }
+        if isinstance(pool, InstrumentedQueuePool):
+            entry.update(pool.stats.to_dict())
+        report[key or 'primary'] = entry
+    return report
+
+
+def server_connection_usage(engine) -> Dict[str, any]:
+    """
+    DB 서버의 max_connections 대비 현재 연결 수 (application_name별)
+
+    Args:
+        engine: 조회할 엔진
+
+    Returns:
+        Dict: max_connections, total, by_application
+    """
+    with engine.connect() as conn:
+        max_connections = int(conn.execute(text("SHOW max_connections")).scalar())
+        rows = conn.execute(text("""
+            SELECT COALESCE(NULLIF(application_name, ''), 'unknown'), COUNT(*)
+            FROM pg_stat_activity
+            WHERE backend_type = 'client backend'
+            GROUP BY 1
+        """)).all()
+    by_application = {name: count for name, count in rows}
+    return {
+        'max_connections': max_connections,
+        'total': sum(by_application.values()),
+        'by_application': by_application,
+    }
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+읽기 전용 복제본(replica) 라우팅
+REPLICA_DATABASE_URL이 설정되면 SQLALCHEMY_BINDS['replica'] 엔진을 만들고,
+read_only_transaction 뷰와 TradingService 조회 메서드의 쿼리를 복제본으로 보냅니다.
+
+다음 경우에는 항상 주 DB(primary)를 사용합니다.
+    - flush 중이거나 현재 세션에서 이미 쓰기가 발생한 경우 (자기 쓰기 읽기 보장)
+    - 복제 지연이 REPLICA_MAX_LAG_SECONDS를 넘거나 지연 확인에 실패한 경우
+"""
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+
+# 현재 실행 흐름이 복제본 읽기를 허용하는지 여부
+_prefer_replica: ContextVar[bool] = ContextVar('prefer_replica', default=False)
+
+# 복제 지연 확인 결과 캐시 (engine url → (확인 시각, 사용 가능 여부, 지연 초))
+_lag_cache: Dict[str, tuple] = {}
+_lag_lock = threading.Lock()
+
+
+def replica_lag_seconds(engine) -> Optional[float]:
+    """
+    복제본의 재생 지연(초)을 조회
+
+    스탠바이가 아닌 DB(로컬 테스트용 두 번째 데이터베이스 등)는 재생 시각이 없으므로 0으로 간주합니다.
+    받은 WAL을 모두 재생했으면 0으로 봅니다 (프라이머리에 쓰기가 없으면 마지막 재생 시각이
+    계속 과거로 밀려나므로, 남은 WAL이 있을 때만 재생 시각과의 차이를 지연으로 사용).
+
+    Args:
+        engine: 복제본 엔진
+
+    Returns:
+        Optional[float]: 지연 시간 (확인 실패 시 None)
+    """
+    try:
+        with engine.connect() as conn:
+            return float(conn.execute(text("""
+                SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END
+            """)).scalar())
+    except Exception as e:
+        logger.warning(f"복제 지연 확인 실패: {str(e)}")
+        return None
+
+
+def is_replica_available(engine) -> bool:
+    """
+    복제본 사용 가능 여부 (지연 확인 결과를 REPLICA_LAG_CHECK_INTERVAL초 동안 캐시)
+
+    Args:
+        engine: 복제본 엔진
+
+    Returns:
+        bool: 지연이 허용 범위 이내이면 True
+    """
+    config = current_app.config
+    key = str(engine.url)
+    now = time.monotonic()
+
+    with _lag_lock:
+        cached = _lag_cache.get(key)
+        if cached and now - cached[0] < config.get('REPLICA_LAG_CHECK_INTERVAL', 5):
+            return cached[1]
+        # 확인 중 다른 스레드는 직전 결과를 사용
+        _lag_cache[key] = (now, cached[1] if cached else False, cached[2] if cached else None)
+
+    lag = replica_lag_seconds(engine)
+    available = lag is not None and lag <= config.get('REPLICA_MAX_LAG_SECONDS', 10)
+    with _lag_lock:
+        _lag_cache[key] = (time.monotonic(), available, lag)
+
+    if lag is not None:
+        metrics.set_gauge('db.replica_lag_seconds', lag)
+    if not available:
+        logger.warning(f"복제본 사용 중지 (지연: {lag}), 주 DB로 전환")
+    return available
+
+
+class RoutingSession(Session):
+    """복제본 라우팅을 지원하는 Flask-SQLAlchemy 세션"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _prefer_replica.get() and not self._flushing and not self.info.get('wrote'):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                if is_replica_available(replica):
+                    return replica
+                metrics.increment('db.replica_fallbacks')
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_wrote(session, flush_context):
+    """쓰기가 발생한 세션은 이후 조회도 주 DB에서 실행합니다."""
+    session.info['wrote'] = True
+
+
+@contextmanager
+def use_replica():
+    """블록 안의 조회를 복제본으로 보냅니다 (설정되지 않은 경우 주 DB)."""
+    token = _prefer_replica.set(True)
+    try:
+        yield
+    finally:
+        _prefer_replica.reset(token)
+
+
+def replica_read(func: Callable) -> Callable:
+    """함수 안의 조회를 복제본으로 보내는 데코레이터"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+    return wrapper
+
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+온라인 테이블 재구성 유틸리티
+서비스 중단 없이 기존 테이블의 데이터를 새 구조의 테이블로 옮기고 이름을 교체합니다.
+
+동작 방식:
+    1. 원본 테이블에 변경 추적 트리거를 설치 (INSERT/UPDATE/DELETE된 id 기록)
+    2. 트리거 설치 시점의 최대 id까지 id 구간 단위로 배치 복사
+    3. 변경 로그에 쌓인 id를 반복 재동기화 (삭제 후 원본에서 다시 복사)
+    4. 짧은 ACCESS EXCLUSIVE 잠금 안에서 마지막 재동기화 후 테이블명 교체
+"""
+import logging
+import time
+from typing import Callable, Optional, Sequence
+from sqlalchemy import text
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class OnlineTableRebuild:
+    """트리거 기반 변경 추적을 이용한 온라인 테이블 재구성"""
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        columns: Sequence[str],
+        select_expressions: Optional[Sequence[str]] = None,
+        batch_size: int = 50000,
+        batch_delay: float = 0.0
+    ):
+        """
+        Args:
+            source (str): 원본 테이블명
+            target (str): 새 구조로 미리 생성된 대상 테이블명
+            columns (Sequence[str]): 대상 테이블에 INSERT할 컬럼 목록
+            select_expressions (Optional[Sequence[str]]): 원본에서 읽을 식 (형 변환 등, 기본값: columns)
+            batch_size (int): id 구간 배치 크기
+            batch_delay (float): 배치 간 대기 시간 (초, 운영 부하 조절용)
+        """
+        self.source = source
+        self.target = target
+        self.columns = list(columns)
+        self.select_expressions = list(select_expressions or columns)
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.change_log = f'{source}_rebuild_log'
+        self.trigger_function = f'{source}_rebuild_capture'
+
+    @property
+    def _insert_select(self) -> str:
+        return (
+            f"INSERT INTO {self.target} ({', '.join(self.columns)}) "
+            f"SELECT {', '.join(self.select_expressions)} FROM {self.source}"
+        )
+
+    def install_change_capture(self) -> int:
+        """
+        변경 추적 테이블과 트리거를 설치
+
+        Returns:
+            int: 트리거 설치 시점의 최대 id (이 id까지는 배치 복사로 처리)
+        """
+        with db.engine.begin() as conn:
+            conn.execute(text(f"CREATE UNLOGGED TABLE IF NOT EXISTS {self.change_log} (id INTEGER NOT NULL)"))
+            conn.execute(text(f"""
+                CREATE OR REPLACE FUNCTION {self.trigger_function}() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        INSERT INTO {self.change_log} (id) VALUES (OLD.id);
+                    ELSE
+                        INSERT INTO {self.change_log} (id) VALUES (NEW.id);
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """))
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {self.trigger_function}_trg ON {self.source}"))
+            conn.execute(text(f"""
+                CREATE TRIGGER {self.trigger_function}_trg
+                AFTER INSERT OR UPDATE OR DELETE ON {self.source}
+                FOR EACH ROW EXECUTE FUNCTION {self.trigger_function}()
+            """))
+            # 트리거와 같은 트랜잭션에서 읽으므로 이후 변경은 모두 로그에 남음
+            return conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {self.source}")).scalar()
+
+    def copy_existing(self, max_id: int, progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        id 구간 배치로 기존 데이터를 복사 (배치마다 커밋)
+
+        Args:
+            max_id (int): 복사할 최대 id
+            progress (Optional[Callable]): (복사된 마지막 id, max_id) 콜백
+
+        Returns:
+            int: 복사된 행 수
+        """
+        copied = 0
+        last_id = 0
+        while last_id < max_id:
+            upper = min(last_id + self.batch_size, max_id)
+            with db.engine.begin() as conn:
+                result = conn.execute(
+                    text(f"{self._insert_select} WHERE id > :lower AND id <= :upper"),
+                    {'lower': last_id, 'upper': upper}
+                )
+                copied += result.rowcount
+            last_id = upper
+            if progress:
+                progress(last_id, max_id)
+            if self.batch_delay:
+                time.sleep(self.batch_delay)
+        return copied
+
+    def _replay(self, conn, limit: Optional[int] = None) -> int:
+        """변경 로그의 id를 꺼내 대상 테이블에 재동기화"""
+        limit_clause = f"LIMIT {int(limit)}" if limit else ''
+        ids = conn.execute(text(f"""
+            DELETE FROM {self.change_log}
+            WHERE ctid IN (SELECT ctid FROM {self.change_log} {limit_clause})
+            RETURNING id
+        """)).scalars().all()
+        if not ids:
+            return 0
+
+        unique_ids = list(set(ids))
+        conn.execute(text(f"DELETE FROM {self.target} WHERE id = ANY(:ids)"), {'ids': unique_ids})
+        conn.execute(text(f"{self._insert_select} WHERE id = ANY(:ids)"), {'ids': unique_ids})
+        return len(unique_ids)
+
+    def replay_changes(self, until_below: int = 1000, max_rounds: int = 100) -> int:
+        """
+        변경 로그가 until_below 건 미만이 될 때까지 반복 재동기화
+
+        Returns:
+            int: 재동기화된 id 수
+        """
+        total = 0
+        for _ in range(max_rounds):
+            with db.engine.begin() as conn:
+                replayed = self._replay(conn, limit=self.batch_size)
+            total += replayed
+            if replayed < until_below:
+                break
+        return total
+
+    def swap(self, legacy_name: str, after_swap: Optional[Callable] = None) -> None:
+        """
+        원본을 잠그고 마지막 변경분을 반영한 뒤 테이블명을 교체
+
+        원본 테이블은 legacy_name으로 보존됩니다 (확인 후 직접 삭제).
+
+        Args:
+            legacy_name (str): 원본 테이블의 새 이름
+            after_swap (Optional[Callable]): 같은 트랜잭션에서 실행할 후처리 (conn 인자)
+        """
+        with db.engine.begin() as conn:
+            conn.execute(text(f"LOCK TABLE {self.source} IN ACCESS EXCLUSIVE MODE"))
+            self._replay(conn)
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {self.trigger_function}_trg ON {self.source}"))
+            conn.execute(text(f"ALTER TABLE {self.source} RENAME TO {legacy_name}"))
+            conn.execute(text(f"ALTER TABLE {self.target} RENAME TO {self.source}"))
+            if after_swap:
+                after_swap(conn)
+            conn.execute(text(f"DROP TABLE IF EXISTS {self.change_log}"))
+            conn.execute(text(f"DROP FUNCTION IF EXISTS {self.trigger_function}()"))
+        logger.info(f"테이블 교체 완료: {self.target} -> {self.source} (원본: {legacy_name})")
+
+    def abort(self) -> None:
+        """변경 추적 트리거와 로그를 제거 (대상 테이블은 유지)"""
+        with db.engine.begin() as conn:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {self.trigger_function}_trg ON {self.source}"))
+            conn.execute(text(f"DROP TABLE IF EXISTS {self.change_log}"))
+            conn.execute(text(f"DROP FUNCTION IF EXISTS {self.trigger_function}()"))
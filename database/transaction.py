@@ -6,14 +6,23 @@ API 레벨에서 트랜잭션을 안전하게 관리하기 위한 데코레이
 import functools
 import logging
 import time
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 from flask import jsonify
 from extensions import db
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy import text
+from core.metrics import metrics
+from database.routing import use_replica
 
 logger = logging.getLogger(__name__)
 
+# 읽기 작업의 연결 끊김 재시도 횟수 (최초 실행 포함)
+READ_MAX_RETRIES = 3
+
+# 연결 끊김으로 보는 PostgreSQL 오류 코드 (08: connection_exception, 57P01~57P05: 관리자/비정상 종료 등)
+DISCONNECT_PGCODE_PREFIXES = ('08', '57P0')
+
+
 def transactional(func: Callable) -> Callable:
     """
     트랜잭션을 관리하는 데코레이터
@@ -47,11 +56,79 @@ def transactional(func: Callable) -> Callable:
     
     return wrapper
 
+def is_disconnect_error(error: Exception) -> bool:
+    """
+    연결 끊김으로 인한 오류인지 판단합니다.
+    
+    SQLAlchemy가 연결 끊김을 감지하면 connection_invalidated가 설정되고
+    풀 전체가 무효화되므로, 다음 시도는 새 연결에서 실행됩니다.
+    그 밖에는 PostgreSQL 오류 코드로 판단합니다 (08: 연결 예외, 57P0x: 서버 종료/재시작).
+    "too many connections"처럼 메시지에 connection이 들어가는 다른 오류는 연결 끊김이 아닙니다.
+    
+    Args:
+        error: 발생한 예외
+        
+    Returns:
+        bool: 연결 끊김이면 True
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    if error.connection_invalidated:
+        return True
+    pgcode = getattr(error.orig, 'pgcode', None) or ''
+    return pgcode.startswith(DISCONNECT_PGCODE_PREFIXES)
+
+def _discard_session():
+    """실패한 세션을 정리하여 다음 시도가 새 연결을 사용하도록 합니다."""
+    try:
+        db.session.rollback()
+    except Exception:
+        pass
+    db.session.close()
+    db.session.remove()
+
+def find_operational_error(error: BaseException) -> Optional[DBAPIError]:
+    """
+    예외 자신 또는 그 원인(__cause__/__context__)에서 운영 오류(OperationalError/연결 끊김)를 찾습니다.
+    
+    서비스 계층은 오류를 Exception(...)으로 감싸 다시 발생시키므로,
+    연결 끊김 여부는 감싸기 전의 원래 예외로 판단해야 합니다.
+    SQL 문법 오류 같은 나머지 DB 오류는 대상이 아닙니다.
+    
+    Args:
+        error: 발생한 예외
+        
+    Returns:
+        Optional[DBAPIError]: 찾은 DB 오류 (없으면 None)
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, OperationalError) or is_disconnect_error(error):
+            return error
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return None
+
+def reraise_operational_error(error: Exception) -> None:
+    """
+    운영 DB 오류(감싼 예외 포함)이면 그대로 다시 발생시킵니다.
+    
+    read_only_transaction이 적용된 뷰의 일반 예외 처리(500 응답) 앞에서 호출하여,
+    연결 끊김을 데코레이터가 받아 재시도할 수 있도록 합니다.
+    
+    Args:
+        error: 뷰에서 잡은 예외
+    """
+    if find_operational_error(error) is not None:
+        raise error
+
 def safe_transaction(func: Callable) -> Callable:
     """
     안전한 트랜잭션 관리 데코레이터 (API 응답 포함)
     
     함수 실행 중 예외가 발생하면 rollback하고 적절한 HTTP 응답을 반환합니다.
+    사전 연결 확인(SELECT 1) 없이 바로 실행하며, 연결 끊김은 발생한 예외로 감지합니다.
+    쓰기 작업은 중복 반영 위험이 있으므로 자동 재시도하지 않고 503(Retry-After)을 반환합니다.
     
     Args:
         func: 트랜잭션으로 관리할 함수
@@ -61,70 +138,53 @@ def safe_transaction(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        max_retries = 3
-        retry_delay = 1
-        
-        for attempt in range(max_retries):
-            try:
-                # 연결 상태 확인
-                try:
-                    db.session.execute(text("SELECT 1"))
-                except Exception as conn_error:
-                    logger.warning(f"데이터베이스 연결 확인 실패, 세션 재생성: {conn_error}")
-                    db.session.close()
-                    db.session.remove()
-                    time.sleep(1)
-                
-                # 함수 실행
-                result = func(*args, **kwargs)
-                
-                # 성공 시 commit
-                db.session.commit()
-                logger.debug(f"트랜잭션 commit 성공: {func.__name__}")
-                
-                return result
-                
-            except OperationalError as e:
-                db.session.rollback()
-                db.session.close()
-                db.session.remove()
-                
-                if "server closed the connection" in str(e).lower() or "connection" in str(e).lower():
-                    if attempt < max_retries - 1:
-                        logger.warning(f"데이터베이스 연결 끊김, {retry_delay}초 후 재시도 ({attempt + 1}/{max_retries}): {func.__name__}")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2
-                        continue
-                    else:
-                        logger.error(f"데이터베이스 연결 오류 (최대 재시도 초과): {func.__name__} - {str(e)}")
-                        return jsonify({
-                            'error': '데이터베이스 연결 오류가 발생했습니다.',
-                            'type': 'database_error'
-                        }), 503
-                else:
-                    logger.error(f"데이터베이스 오류: {func.__name__} - {str(e)}")
-                    return jsonify({
-                        'error': '데이터베이스 오류가 발생했습니다.',
-                        'type': 'database_error'
-                    }), 503
-                    
-            except ValueError as e:
-                # 검증 오류 시 rollback
-                db.session.rollback()
-                logger.warning(f"트랜잭션 rollback (검증 오류): {func.__name__} - {str(e)}")
-                return jsonify({
-                    'error': str(e),
-                    'type': 'validation_error'
-                }), 400
+        try:
+            # 함수 실행
+            result = func(*args, **kwargs)
+            
+            # 성공 시 commit
+            db.session.commit()
+            logger.debug(f"트랜잭션 commit 성공: {func.__name__}")
+            
+            return result
+            
+        except OperationalError as e:
+            _discard_session()
+            
+            if is_disconnect_error(e):
+                metrics.increment('db.disconnects', labels={'mode': 'write'})
+                logger.error(f"데이터베이스 연결 끊김 (쓰기 재시도 안 함): {func.__name__} - {str(e)}")
+                response = jsonify({
+                    'error': '데이터베이스 연결 오류가 발생했습니다. 잠시 후 다시 시도해주세요.',
+                    'type': 'database_error'
+                })
+                response.headers['Retry-After'] = '1'
+                return response, 503
+            
+            metrics.increment('db.errors', labels={'mode': 'write'})
+            logger.error(f"데이터베이스 오류: {func.__name__} - {str(e)}")
+            return jsonify({
+                'error': '데이터베이스 오류가 발생했습니다.',
+                'type': 'database_error'
+            }), 503
                 
-            except Exception as e:
-                # 기타 오류 시 rollback
-                db.session.rollback()
-                logger.error(f"트랜잭션 rollback (시스템 오류): {func.__name__} - {str(e)}")
-                return jsonify({
-                    'error': '서버 내부 오류가 발생했습니다.',
-                    'type': 'system_error'
-                }), 500
+        except ValueError as e:
+            # 검증 오류 시 rollback
+            db.session.rollback()
+            logger.warning(f"트랜잭션 rollback (검증 오류): {func.__name__} - {str(e)}")
+            return jsonify({
+                'error': str(e),
+                'type': 'validation_error'
+            }), 400
+            
+        except Exception as e:
+            # 기타 오류 시 rollback
+            db.session.rollback()
+            logger.error(f"트랜잭션 rollback (시스템 오류): {func.__name__} - {str(e)}")
+            return jsonify({
+                'error': '서버 내부 오류가 발생했습니다.',
+                'type': 'system_error'
+            }), 500
     
     return wrapper
 
@@ -133,6 +193,11 @@ def read_only_transaction(func: Callable) -> Callable:
     읽기 전용 트랜잭션 데코레이터
     
     읽기 작업에 사용하며, 예외 발생 시에도 rollback하지 않습니다.
+    사전 연결 확인 없이 바로 실행하고, 연결 끊김이 감지되면 새 연결로 투명하게 재시도합니다.
+    (첫 재시도는 즉시, 이후에는 지수적으로 대기)
+    뷰는 연결/운영 DB 오류를 자체 500 응답으로 바꾸지 말고 reraise_operational_error로 다시 발생시켜야 하며,
+    재시도 후에도 실패하면 503을 반환합니다.
+    읽기 복제본이 설정되어 있으면 조회는 복제본에서 실행됩니다 (database.routing 참고).
     
     Args:
         func: 읽기 전용 함수
@@ -142,43 +207,43 @@ def read_only_transaction(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        max_retries = 3
-        retry_delay = 1
+        max_retries = READ_MAX_RETRIES
+        retry_delay = 0
         
         for attempt in range(max_retries):
             try:
-                # 연결 상태 확인
-                try:
-                    db.session.execute(text("SELECT 1"))
-                except Exception as conn_error:
-                    logger.warning(f"데이터베이스 연결 확인 실패, 세션 재생성: {conn_error}")
-                    db.session.close()
-                    db.session.remove()
-                    time.sleep(1)
+                # REPLICA_DATABASE_URL이 설정된 경우 복제본에서 조회
+                with use_replica():
+                    return func(*args, **kwargs)
                 
-                result = func(*args, **kwargs)
-                return result
+            except Exception as e:
+                # 서비스가 감싼 예외도 원인을 따라가 연결/운영 오류인지 확인
+                error = find_operational_error(e)
+                if error is None:
+                    logger.error(f"읽기 작업 실패: {func.__name__} - {str(e)}")
+                    raise
                 
-            except OperationalError as e:
-                db.session.close()
-                db.session.remove()
+                _discard_session()
+                disconnected = is_disconnect_error(error)
                 
-                if "server closed the connection" in str(e).lower() or "connection" in str(e).lower():
-                    if attempt < max_retries - 1:
-                        logger.warning(f"데이터베이스 연결 끊김, {retry_delay}초 후 재시도 ({attempt + 1}/{max_retries}): {func.__name__}")
+                if disconnected and attempt < max_retries - 1:
+                    metrics.increment('db.read_retries', labels={'view': func.__name__})
+                    logger.warning(f"데이터베이스 연결 끊김, 재시도 ({attempt + 1}/{max_retries}): {func.__name__}")
+                    if retry_delay:
                         time.sleep(retry_delay)
-                        retry_delay *= 2
-                        continue
-                    else:
-                        logger.error(f"데이터베이스 연결 오류 (최대 재시도 초과): {func.__name__} - {str(e)}")
-                        raise
-                else:
-                    logger.error(f"데이터베이스 오류: {func.__name__} - {str(e)}")
-                    raise
-                    
-            except Exception as e:
-                logger.error(f"읽기 작업 실패: {func.__name__} - {str(e)}")
-                raise
+                    retry_delay = retry_delay * 2 if retry_delay else 0.5
+                    continue
+                
+                metrics.increment('db.disconnects' if disconnected else 'db.errors', labels={'mode': 'read'})
+                logger.error(f"데이터베이스 오류: {func.__name__} - {str(e)}")
+                response = jsonify({
+                    'error': '데이터베이스 연결 오류가 발생했습니다. 잠시 후 다시 시도해주세요.'
+                    if disconnected else '데이터베이스 오류가 발생했습니다.',
+                    'type': 'database_error'
+                })
+                if disconnected:
+                    response.headers['Retry-After'] = '1'
+                return response, 503
     
     return wrapper
 
@@ -193,15 +258,6 @@ def bulk_transaction(operations: list) -> bool:
         bool: 모든 작업이 성공하면 True, 실패하면 False
     """
     try:
-        # 연결 상태 확인
-        try:
-            db.session.execute(text("SELECT 1"))
-        except Exception as conn_error:
-            logger.warning(f"데이터베이스 연결 확인 실패, 세션 재생성: {conn_error}")
-            db.session.close()
-            db.session.remove()
-            time.sleep(1)
-        
         for operation in operations:
             operation()
         
@@ -210,9 +266,9 @@ def bulk_transaction(operations: list) -> bool:
         return True
         
     except OperationalError as e:
-        db.session.rollback()
-        db.session.close()
-        db.session.remove()
+        _discard_session()
+        if is_disconnect_error(e):
+            metrics.increment('db.disconnects', labels={'mode': 'write'})
         logger.error(f"벌크 트랜잭션 실패 (연결 오류): {str(e)}")
         return False
         
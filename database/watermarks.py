@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+데이터 워터마크 트리거
+조건부 GET(ETag/Last-Modified)에 사용하는 data_version, stock_trading_coverage를 갱신하는 트리거를 관리합니다.
+
+쓰기 경로(ORM, 일괄 적재 COPY, 누적 재계산, 수집기의 TRUNCATE 등)가 다양하므로 애플리케이션이 아니라
+데이터베이스 트리거에서 갱신합니다. 모두 문장 단위(FOR EACH STATEMENT) 트리거이므로 행 수와 관계없이
+문장당 한 번만 실행되며, 종목별 범위는 전이 테이블(REFERENCING NEW/OLD TABLE)에서 종목별로 집계합니다.
+
+거래 테이블을 교체(파티션 전환, 저장 구조 재작성)하면 트리거는 보존된 원본 테이블에 남으므로
+교체 트랜잭션 안에서 create_watermark_triggers를 호출합니다.
+"""
+import logging
+from sqlalchemy import text
+from extensions import db
+from database.partitioning import TRADING_TABLE
+from models.stock import StockList
+from models.watermark import DataVersion, TradingCoverage
+
+logger = logging.getLogger(__name__)
+
+STOCK_TABLE = StockList.__tablename__
+VERSION_TABLE = DataVersion.__tablename__
+COVERAGE_TABLE = TradingCoverage.__tablename__
+
+# 데이터 버전을 관리하는 테이블
+VERSIONED_TABLES = [TRADING_TABLE, STOCK_TABLE]
+
+VERSION_FUNCTION = 'data_version_bump'
+COVERAGE_FUNCTION = 'trading_coverage_refresh'
+
+# 종목별 범위 갱신 (삽입은 건수를 더하고 최근 거래일을 넓히며, 수정/삭제는 최근 거래일을 인덱스로 다시 구함)
+_COVERAGE_UPSERT = f"""
+        INSERT INTO {COVERAGE_TABLE} AS c (stock_code, row_count, max_trade_date, version, updated_at)
+        SELECT stock_code, SUM(delta), MAX(trade_date), 1, now() FROM ({{changes}}) changes GROUP BY stock_code
+        ON CONFLICT (stock_code) DO UPDATE SET
+            row_count = c.row_count + EXCLUDED.row_count,
+            max_trade_date = {{max_trade_date}},
+            version = c.version + 1,
+            updated_at = now();
+""".strip()
+_RECOMPUTED_MAX = f"(SELECT MAX(t.trade_date) FROM {TRADING_TABLE} t WHERE t.stock_code = c.stock_code)"
+
+# 버전 값을 발급하는 시퀀스 (nextval은 행 잠금 없이 증가하며 테이블 간에도 값이 겹치지 않음)
+VERSION_SEQUENCE = f'{VERSION_TABLE}_seq'
+# 쓰기 트랜잭션별로 버전을 올릴 테이블을 적어 두는 테이블 (트랜잭션마다 다른 키이므로 서로 기다리지 않음)
+PENDING_TABLE = f'{VERSION_TABLE}_pending'
+COMMIT_FUNCTION = 'data_version_commit'
+COMMIT_TRIGGER = f'{COMMIT_FUNCTION}_trg'
+
+# 쓰기 문장에서는 트랜잭션별 대기 행만 남기고, data_version 행은 커밋 직전(지연 제약 트리거)에 한 번만 갱신합니다.
+# 문장마다 data_version 행을 갱신하면 긴 적재 트랜잭션이 커밋할 때까지 그 행을 잠가 다른 쓰기가 모두 기다리게 됩니다.
+# 버전을 문장 실행 시점에 발급하면 늦게 커밋된 트랜잭션의 버전이 이미 보인 값보다 작아 ETag가 바뀌지 않을 수 있으므로,
+# 커밋 직전에 발급하고 행 잠금은 커밋이 끝날 때까지만 유지합니다. 잠금을 기다리는 동안 더 큰 값이 먼저 기록될 수 있으므로
+# 기존 값보다 항상 커지도록 GREATEST로 맞춥니다 (같은 테이블에서 같은 버전이 다시 나오지 않음).
+VERSION_FUNCTION_DDL = f"""
+    CREATE OR REPLACE FUNCTION {VERSION_FUNCTION}() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO {PENDING_TABLE} (xid, table_name) VALUES (txid_current(), TG_TABLE_NAME)
+        ON CONFLICT DO NOTHING;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+COMMIT_FUNCTION_DDL = f"""
+    CREATE OR REPLACE FUNCTION {COMMIT_FUNCTION}() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO {VERSION_TABLE} (table_name, version, updated_at)
+        VALUES (NEW.table_name, nextval('{VERSION_SEQUENCE}'), clock_timestamp())
+        ON CONFLICT (table_name) DO UPDATE SET
+            version = GREATEST({VERSION_TABLE}.version + 1, EXCLUDED.version), updated_at = EXCLUDED.updated_at;
+        DELETE FROM {PENDING_TABLE} WHERE xid = NEW.xid AND table_name = NEW.table_name;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+COVERAGE_FUNCTION_DDL = f"""
+    CREATE OR REPLACE FUNCTION {COVERAGE_FUNCTION}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {_COVERAGE_UPSERT.format(
+                changes='SELECT stock_code, 1 AS delta, trade_date FROM new_rows',
+                max_trade_date='GREATEST(c.max_trade_date, EXCLUDED.max_trade_date)'
+            )}
+        ELSIF TG_OP = 'UPDATE' THEN
+            {_COVERAGE_UPSERT.format(
+                changes='SELECT stock_code, 1 AS delta, trade_date FROM new_rows '
+                        'UNION ALL SELECT stock_code, -1, NULL FROM old_rows',
+                max_trade_date=_RECOMPUTED_MAX
+            )}
+        ELSIF TG_OP = 'DELETE' THEN
+            {_COVERAGE_UPSERT.format(
+                changes='SELECT stock_code, -1 AS delta, NULL::date AS trade_date FROM old_rows',
+                max_trade_date=_RECOMPUTED_MAX
+            )}
+        ELSE
+            -- TRUNCATE: 행을 지우지 않고 버전을 올려 이전 ETag가 다시 나오지 않도록 함
+            UPDATE {COVERAGE_TABLE} SET row_count = 0, max_trade_date = NULL,
+                version = version + 1, updated_at = now();
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# 전이 테이블을 쓰는 트리거는 이벤트를 하나만 지정할 수 있으므로 이벤트별로 만듭니다.
+COVERAGE_TRIGGERS = {
+    f'{COVERAGE_FUNCTION}_ins': 'AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows',
+    f'{COVERAGE_FUNCTION}_upd': 'AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    f'{COVERAGE_FUNCTION}_del': 'AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows',
+    f'{COVERAGE_FUNCTION}_trunc': 'AFTER TRUNCATE ON {table}',
+}
+VERSION_TRIGGER = f'{VERSION_FUNCTION}_trg'
+
+
+def create_watermark_triggers(conn, table: str = TRADING_TABLE) -> None:
+    """
+    거래 테이블의 워터마크 트리거를 다시 생성
+
+    Args:
+        conn: 트랜잭션이 열린 연결
+        table (str): 트리거를 설치할 거래 테이블
+    """
+    _create_version_commit(conn)
+    conn.execute(text(VERSION_FUNCTION_DDL))
+    conn.execute(text(COVERAGE_FUNCTION_DDL))
+    _create_version_trigger(conn, table)
+    for name, timing in COVERAGE_TRIGGERS.items():
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name} ON {table}"))
+        conn.execute(text(
+            f"CREATE TRIGGER {name} {timing.format(table=table)} FOR EACH STATEMENT EXECUTE FUNCTION {COVERAGE_FUNCTION}()"
+        ))
+
+
+def _create_version_commit(conn) -> None:
+    """버전 시퀀스, 대기 테이블과 커밋 시점에 버전을 올리는 지연 트리거를 생성합니다."""
+    conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {VERSION_SEQUENCE}"))
+    # 이전 방식(행마다 1씩 증가)으로 쌓인 버전보다 큰 값부터 발급
+    conn.execute(text(f"""
+        SELECT setval('{VERSION_SEQUENCE}', GREATEST(
+            (SELECT last_value FROM {VERSION_SEQUENCE}),
+            (SELECT COALESCE(MAX(version), 0) FROM {VERSION_TABLE}) + 1
+        ))
+    """))
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {PENDING_TABLE} (
+            xid bigint NOT NULL,
+            table_name varchar(63) NOT NULL,
+            PRIMARY KEY (xid, table_name)
+        )
+    """))
+    conn.execute(text(COMMIT_FUNCTION_DDL))
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {COMMIT_TRIGGER} ON {PENDING_TABLE}"))
+    conn.execute(text(f"""
+        CREATE CONSTRAINT TRIGGER {COMMIT_TRIGGER}
+        AFTER INSERT ON {PENDING_TABLE}
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION {COMMIT_FUNCTION}()
+    """))
+
+
+def refresh_coverage(conn) -> None:
+    """
+    거래 테이블 전체로 종목별 범위를 다시 계산하고 버전을 올립니다.
+
+    트리거가 없던 동안의 변경이나 트리거가 실행되지 않는 변경(파티션 분리/삭제 등)을 반영하기 위해 호출합니다.
+    거래 데이터가 모두 사라진 종목은 행 수 0으로 갱신합니다.
+
+    Args:
+        conn: 트랜잭션이 열린 연결
+    """
+    conn.execute(text(f"""
+        INSERT INTO {COVERAGE_TABLE} AS c (stock_code, row_count, max_trade_date, version, updated_at)
+        SELECT stock_code, COUNT(*), MAX(trade_date), 1, now() FROM {TRADING_TABLE} GROUP BY stock_code
+        ON CONFLICT (stock_code) DO UPDATE SET
+            row_count = EXCLUDED.row_count,
+            max_trade_date = EXCLUDED.max_trade_date,
+            version = c.version + 1,
+            updated_at = now()
+    """))
+    conn.execute(text(f"""
+        UPDATE {COVERAGE_TABLE} c SET row_count = 0, max_trade_date = NULL, version = c.version + 1, updated_at = now()
+        WHERE c.row_count <> 0 AND NOT EXISTS (SELECT 1 FROM {TRADING_TABLE} t WHERE t.stock_code = c.stock_code)
+    """))
+    conn.execute(text(f"""
+        INSERT INTO {VERSION_TABLE} (table_name, version, updated_at)
+        SELECT name, nextval('{VERSION_SEQUENCE}'), clock_timestamp() FROM unnest(CAST(:tables AS text[])) AS name
+        ON CONFLICT (table_name) DO UPDATE SET
+            version = GREATEST({VERSION_TABLE}.version + 1, EXCLUDED.version), updated_at = EXCLUDED.updated_at
+    """), {'tables': VERSIONED_TABLES})
+
+
+def ensure_watermark_triggers() -> bool:
+    """
+    워터마크 트리거가 없으면 생성하고 범위를 다시 계산 (db.create_all() 이후 호출)
+
+    여러 워커가 동시에 시작해도 한 번만 설치하도록 advisory lock 안에서 다시 확인합니다.
+
+    Returns:
+        bool: 새로 생성했으면 True
+    """
+    expected = [VERSION_TRIGGER, *COVERAGE_TRIGGERS]
+    count_sql = text("""
+        SELECT COUNT(*) FROM pg_trigger
+        WHERE tgrelid = to_regclass(:table) AND tgname = ANY(:names) AND NOT tgisinternal
+    """)
+
+    def installed(conn) -> bool:
+        trading = conn.execute(count_sql, {'table': TRADING_TABLE, 'names': expected}).scalar()
+        stock = conn.execute(count_sql, {'table': STOCK_TABLE, 'names': [VERSION_TRIGGER]}).scalar()
+        commit = conn.execute(count_sql, {'table': PENDING_TABLE, 'names': [COMMIT_TRIGGER]}).scalar()
+        return trading == len(expected) and stock == 1 and commit == 1
+
+    with db.engine.connect() as conn:
+        if installed(conn):
+            return False
+
+    with db.engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {'name': VERSION_TABLE})
+        if installed(conn):
+            return False
+        create_watermark_triggers(conn)
+        _create_version_trigger(conn, STOCK_TABLE)
+        refresh_coverage(conn)
+
+    logger.info(f"데이터 워터마크 트리거 생성 완료: {TRADING_TABLE}, {STOCK_TABLE}")
+    return True
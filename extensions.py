@@ -2,7 +2,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_executor import Executor
+from database.routing import RoutingSession
  
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 cors = CORS()
 executor = Executor() 
\ No newline at end of file
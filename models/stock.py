@@ -3,8 +3,26 @@
 Stock 모델 정의
 주식 목록 정보를 관리하는 SQLAlchemy 모델
 """
+import threading
+import time
+from flask import has_app_context
 from extensions import db
-from typing import Dict, Any, Optional
+from models.watermark import DataVersion
+from typing import Dict, Any, Optional, Tuple
+
+# 주식명 사전 캐시 (stock_code -> stock_name)
+# 거래 데이터는 주식명을 저장하지 않고 이 사전으로 조회합니다.
+# 누적 초기값(stock_code -> (기관, 외국인))도 함께 적재하여 조회 시점에 누적값에 더합니다.
+# 적재 시점의 stock_list 데이터 버전(data_version)을 함께 기록하고 NAME_CACHE_CHECK_INTERVAL초마다 비교하므로,
+# 다른 워커가 커밋한 변경도 그 간격 안에 반영됩니다 (롤백된 변경은 버전이 바뀌지 않으므로 재적재하지 않음).
+NAME_CACHE_TTL = 300
+NAME_CACHE_CHECK_INTERVAL = 1.0
+_name_cache: Dict[str, str] = {}
+_baseline_cache: Dict[str, Tuple[int, int]] = {}
+_name_cache_loaded_at: Optional[float] = None
+_name_cache_checked_at: float = 0.0
+_name_cache_version: Optional[int] = None
+_name_cache_lock = threading.Lock()
 
 
 class StockList(db.Model):
@@ -55,6 +73,97 @@ class StockList(db.Model):
         comment='외국인 누적 초기값'
     )
 
+    @classmethod
+    def get_name(cls, stock_code: Optional[str]) -> Optional[str]:
+        """
+        주식 코드로 주식명 조회 (프로세스 단위 캐시, TTL 경과 시 전체 재적재)
+        
+        Args:
+            stock_code (Optional[str]): 주식 코드
+            
+        Returns:
+            Optional[str]: 주식명 (stock_list에 없으면 None)
+        """
+        if not stock_code:
+            return None
+        
+        cls._ensure_cache()
+        return _name_cache.get(stock_code)
+    
+    @classmethod
+    def get_accum_baseline(cls, stock_code: Optional[str]) -> Tuple[int, int]:
+        """
+        주식 코드로 누적 초기값 조회 (주식명과 같은 캐시 사용)
+        
+        Args:
+            stock_code (Optional[str]): 주식 코드
+            
+        Returns:
+            Tuple[int, int]: (기관 누적 초기값, 외국인 누적 초기값) - stock_list에 없으면 (0, 0)
+        """
+        if not stock_code:
+            return 0, 0
+        
+        cls._ensure_cache()
+        return _baseline_cache.get(stock_code, (0, 0))
+    
+    @classmethod
+    def _data_version(cls) -> int:
+        """stock_list 데이터 버전 (기본 키 한 행 조회, 행이 없으면 0)"""
+        with db.session.no_autoflush:
+            version = db.session.query(DataVersion.version).filter(DataVersion.table_name == cls.__tablename__).scalar()
+        return version or 0
+    
+    @classmethod
+    def _cache_valid(cls) -> bool:
+        """캐시가 TTL 안이고 기록한 데이터 버전이 현재 버전과 같은지 (확인 간격 안이면 버전을 다시 읽지 않음)"""
+        global _name_cache_checked_at
+        
+        loaded_at = _name_cache_loaded_at
+        now = time.monotonic()
+        if loaded_at is None or now - loaded_at > NAME_CACHE_TTL:
+            return False
+        if now - _name_cache_checked_at < NAME_CACHE_CHECK_INTERVAL:
+            return True
+        if cls._data_version() != _name_cache_version:
+            return False
+        _name_cache_checked_at = now
+        return True
+    
+    @classmethod
+    def _ensure_cache(cls) -> None:
+        """
+        TTL이 지났거나 stock_list 데이터 버전이 바뀌었거나 무효화된 경우 stock_list 전체를 다시 적재합니다
+        (앱 컨텍스트 밖에서는 적재하지 않음).
+        """
+        global _name_cache, _baseline_cache, _name_cache_loaded_at, _name_cache_checked_at, _name_cache_version
+        
+        if not has_app_context():
+            return
+        
+        if cls._cache_valid():
+            return
+        with _name_cache_lock:
+            if cls._cache_valid():
+                return
+            # 버전을 먼저 읽으므로, 그 사이에 커밋된 변경이 있으면 다음 확인에서 다시 적재
+            version = cls._data_version()
+            rows = db.session.query(
+                cls.stock_code, cls.stock_name, cls.institution_accum_init, cls.foreigner_accum_init
+            ).all()
+            _name_cache = {code: name for code, name, _, _ in rows}
+            _baseline_cache = {
+                code: (institution or 0, foreigner or 0) for code, _, institution, foreigner in rows
+            }
+            _name_cache_version = version
+            _name_cache_loaded_at = _name_cache_checked_at = time.monotonic()
+    
+    @staticmethod
+    def invalidate_name_cache() -> None:
+        """주식명/누적 초기값 캐시 무효화 (다음 조회 시 재적재, 커밋 후 database.cache_invalidation에서 호출)"""
+        global _name_cache_loaded_at
+        _name_cache_loaded_at = None
+
     def __repr__(self) -> str:
         """객체 문자열 표현"""
         return f'<StockList {self.stock_code}: {self.stock_name}>'
@@ -142,4 +251,4 @@ class StockList(db.Model):
             foreigner_accum_init (int): 외국인 누적 초기값
         """
         self.institution_accum_init = institution_accum_init
-        self.foreigner_accum_init = foreigner_accum_init 
\ No newline at end of file
+        self.foreigner_accum_init = foreigner_accum_init
@@ -3,8 +3,14 @@
 Stock Investor Trading 모델 정의
 주식 투자자별 거래 데이터를 관리하는 SQLAlchemy 모델
 """
+from datetime import date, datetime
+from flask import current_app, has_app_context
+from sqlalchemy import func, select
+from sqlalchemy.orm import query_expression, validates, with_expression
 from extensions import db
-from typing import Dict, Any, Optional
+from database.accumulation_view import ACCUM_VIEW_TABLE
+from models.stock import StockList
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 
 class StockInvestorTrading(db.Model):
@@ -14,38 +20,43 @@ class StockInvestorTrading(db.Model):
     Attributes:
         id (int): 거래 고유 ID (Primary Key, Auto Increment)
         stock_code (str): 주식 코드
-        stock_name (str): 주식명
-        trade_date (str): 거래 날짜 (YYYY-MM-DD)
+        stock_name (str): 주식명 (stock_list에서 조회, 컬럼 아님)
+        trade_date (date): 거래 날짜
         close_price (int): 종가
         institution_net_buy (int): 기관 순매수
         foreigner_net_buy (int): 외국인 순매수
-        institution_accum (int): 기관 누적 매수
-        foreigner_accum (int): 외국인 누적 매수
+        institution_accum (int): 기관 누적 매수 (초기값 제외 누계 캐시, 조회 시 초기값 가산)
+        foreigner_accum (int): 외국인 누적 매수 (초기값 제외 누계 캐시, 조회 시 초기값 가산)
+        institution_accum_total (int): 초기값을 더한 기관 누적 매수 (조회 시 계산, 컬럼 아님)
+        foreigner_accum_total (int): 초기값을 더한 외국인 누적 매수 (조회 시 계산, 컬럼 아님)
         institution_trend_signal (str): 기관 트렌드 신호
         institution_trend_score (float): 기관 트렌드 점수
         foreigner_trend_signal (str): 외국인 트렌드 신호
         foreigner_trend_score (float): 외국인 트렌드 점수
     """
     __tablename__ = 'stock_investor_trading'
+    __table_args__ = (
+        # 종목별 거래일은 한 건만 저장 (일괄 적재의 ON CONFLICT 대상, 파티션 키 trade_date 포함)
+        db.Index('stock_investor_trading_stock_date_key', 'stock_code', 'trade_date', unique=True),
+    )
     
+    # 컬럼 순서는 PostgreSQL 정렬 패딩을 줄이도록 고정 폭(8바이트 → 4바이트) → 가변 길이 순으로 배치
     # Primary Key
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, comment='거래 고유 ID')
-    
-    # 주식 기본 정보
-    stock_code = db.Column(
-        db.String(20), 
+    trade_date = db.Column(
+        db.Date, 
         nullable=False, 
-        comment='주식 코드'
+        comment='거래 날짜'
     )
-    stock_name = db.Column(
-        db.String(100), 
-        nullable=False, 
-        comment='주식명'
+    
+    # 누적 매수 정보 (장기 누적 합은 32비트 범위를 넘을 수 있음)
+    institution_accum = db.Column(
+        db.BigInteger, 
+        comment='기관 누적 매수'
     )
-    trade_date = db.Column(
-        db.String(10), 
-        nullable=False, 
-        comment='거래 날짜 (YYYY-MM-DD)'
+    foreigner_accum = db.Column(
+        db.BigInteger, 
+        comment='외국인 누적 매수'
     )
     
     # 가격 정보
@@ -64,33 +75,58 @@ class StockInvestorTrading(db.Model):
         comment='외국인 순매수'
     )
     
-    # 누적 매수 정보
-    institution_accum = db.Column(
-        db.Integer, 
-        comment='기관 누적 매수'
+    # 트렌드 점수 (단정밀도로 충분)
+    institution_trend_score = db.Column(
+        db.REAL, 
+        comment='기관 트렌드 점수'
     )
-    foreigner_accum = db.Column(
-        db.Integer, 
-        comment='외국인 누적 매수'
+    foreigner_trend_score = db.Column(
+        db.REAL, 
+        comment='외국인 트렌드 점수'
     )
     
-    # 트렌드 분석 정보
+    # 주식 기본 정보 (주식명은 stock_list에서 조회)
+    stock_code = db.Column(
+        db.String(20), 
+        nullable=False, 
+        comment='주식 코드'
+    )
+    
+    # 트렌드 신호
     institution_trend_signal = db.Column(
         db.String(50), 
         comment='기관 트렌드 신호'
     )
-    institution_trend_score = db.Column(
-        db.Float, 
-        comment='기관 트렌드 점수'
-    )
     foreigner_trend_signal = db.Column(
         db.String(50), 
         comment='외국인 트렌드 신호'
     )
-    foreigner_trend_score = db.Column(
-        db.Float, 
-        comment='외국인 트렌드 점수'
-    )
+
+    # 초기값을 더한 누적값 (목록 조회에서 with_expression으로 함께 조회, 컬럼 아님)
+    institution_accum_total = query_expression()
+    foreigner_accum_total = query_expression()
+
+    @validates('trade_date')
+    def _coerce_trade_date(self, key: str, value: Union[str, date, datetime, None]) -> Optional[date]:
+        """YYYY-MM-DD 문자열/datetime 입력을 date로 변환 (기존 호출부 호환)"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, str):
+            return date.fromisoformat(value.strip())
+        return value
+
+    @property
+    def stock_name(self) -> Optional[str]:
+        """
+        주식명 (행마다 저장하지 않고 stock_list 사전에서 조회)
+        
+        객체 생성/수정 시 전달된 이름이 있으면 그 값을 우선 반환합니다.
+        """
+        return getattr(self, '_stock_name', None) or StockList.get_name(self.stock_code)
+
+    @stock_name.setter
+    def stock_name(self, value: Optional[str]) -> None:
+        self._stock_name = value
 
     def __repr__(self) -> str:
         """객체 문자열 표현"""
@@ -103,22 +139,125 @@ class StockInvestorTrading(db.Model):
         Returns:
             Dict[str, Any]: 거래 정보 딕셔너리
         """
+        institution_accum, foreigner_accum = self.accum_totals()
         return {
             'id': self.id,
             'stock_code': self.stock_code,
             'stock_name': self.stock_name,
-            'trade_date': self.trade_date,
+            'trade_date': self.trade_date.isoformat() if self.trade_date else None,
             'close_price': self.close_price,
             'institution_net_buy': self.institution_net_buy,
             'foreigner_net_buy': self.foreigner_net_buy,
-            'institution_accum': self.institution_accum,
-            'foreigner_accum': self.foreigner_accum,
+            'institution_accum': institution_accum,
+            'foreigner_accum': foreigner_accum,
             'institution_trend_signal': self.institution_trend_signal,
             'institution_trend_score': self.institution_trend_score,
             'foreigner_trend_signal': self.foreigner_trend_signal,
             'foreigner_trend_score': self.foreigner_trend_score
         }
     
+    @staticmethod
+    def accum_cache_enabled() -> bool:
+        """저장된 누계 컬럼을 사용하는지 여부 (ACCUM_CACHE_ENABLED, 앱 컨텍스트 밖에서는 True)"""
+        return current_app.config.get('ACCUM_CACHE_ENABLED', True) if has_app_context() else True
+    
+    @classmethod
+    def accum_expressions(cls, use_cache: bool = True) -> Tuple[Any, Any]:
+        """
+        stock_list 누적 초기값을 더한 기관/외국인 누적값 SQL 식
+        
+        캐시를 사용하면 저장된 누계 컬럼에 초기값(기본 키 조회 서브쿼리)을 더하고,
+        사용하지 않으면 누적 뷰의 값을 사용합니다 (쿼리에 join_accum_view로 뷰를 조인해야 함).
+        
+        Args:
+            use_cache (bool): 저장된 누계 컬럼 사용 여부
+            
+        Returns:
+            Tuple: (기관 누적값 식, 외국인 누적값 식)
+        """
+        if not use_cache:
+            return ACCUM_VIEW_TABLE.c.institution_accum, ACCUM_VIEW_TABLE.c.foreigner_accum
+        
+        def baseline(column):
+            return func.coalesce(
+                select(column).where(StockList.stock_code == cls.stock_code).correlate_except(StockList).scalar_subquery(), 0
+            )
+        
+        return baseline(StockList.institution_accum_init) + cls.institution_accum, baseline(StockList.foreigner_accum_init) + cls.foreigner_accum
+    
+    @classmethod
+    def join_accum_view(cls, query):
+        """
+        누적 뷰를 조인합니다 (캐시를 끈 조회용).
+        
+        뷰는 종목별 윈도 함수로 누계를 한 번에 계산하므로 행마다 합계를 다시 구하지 않습니다.
+        ID와 함께 종목 코드로도 조인해 종목 조건이 뷰의 PARTITION BY 안쪽까지 전달되도록 합니다.
+        
+        Args:
+            query: 거래 데이터 쿼리
+            
+        Returns:
+            누적 뷰를 조인한 쿼리
+        """
+        return query.join(
+            ACCUM_VIEW_TABLE,
+            (ACCUM_VIEW_TABLE.c.id == cls.id) & (ACCUM_VIEW_TABLE.c.stock_code == cls.stock_code)
+        )
+    
+    @classmethod
+    def accum_options(cls, use_cache: bool = True) -> List[Any]:
+        """
+        모델 객체 조회에 초기값을 더한 누적값을 함께 읽는 쿼리 옵션
+        
+        Args:
+            use_cache (bool): 저장된 누계 컬럼 사용 여부 (False면 쿼리에 누적 뷰를 조인해야 함)
+            
+        Returns:
+            List: query.options()에 전달할 옵션 목록
+        """
+        institution, foreigner = cls.accum_expressions(use_cache)
+        return [with_expression(cls.institution_accum_total, institution), with_expression(cls.foreigner_accum_total, foreigner)]
+    
+    def accum_totals(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        초기값을 더한 기관/외국인 누적값
+        
+        조회 시 함께 읽은 값(accum_options)이 있으면 그대로 사용하고,
+        없으면 저장된 누계 컬럼에 주식명 사전의 초기값을 더합니다 (객체마다 SQL을 실행하지 않음).
+        
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (기관 누적값, 외국인 누적값)
+        """
+        if 'institution_accum_total' in self.__dict__:
+            return self.institution_accum_total, self.foreigner_accum_total
+        
+        data = self.apply_accum_baseline({
+            'stock_code': self.stock_code,
+            'institution_accum': self.institution_accum,
+            'foreigner_accum': self.foreigner_accum,
+        })
+        return data['institution_accum'], data['foreigner_accum']
+    
+    @staticmethod
+    def apply_accum_baseline(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        저장된 누적값(초기값 0 기준 누계)에 stock_list의 누적 초기값을 더합니다 (저장되지 않은 객체용).
+        
+        초기값은 조회 시점에 적용하므로 PUT /stocks/<id>/accum으로 초기값을 바꿔도 거래 행을 다시 쓰지 않습니다.
+        
+        Args:
+            data (Dict[str, Any]): stock_code와 누적 컬럼을 포함한 거래 데이터 딕셔너리
+            
+        Returns:
+            Dict[str, Any]: 초기값이 반영된 딕셔너리 (같은 객체)
+        """
+        institution_init, foreigner_init = StockList.get_accum_baseline(data.get('stock_code'))
+        if data.get('institution_accum') is not None:
+            data['institution_accum'] += institution_init
+        if data.get('foreigner_accum') is not None:
+            data['foreigner_accum'] += foreigner_init
+        return data
+
     @classmethod
     def create_trading_data(
         cls, 
@@ -187,7 +326,7 @@ class StockInvestorTrading(db.Model):
         거래 데이터 정보 업데이트
         
         Args:
-            stock_name (str): 새로운 주식명
+            stock_name (str): 새로운 주식명 (응답용 값, 영구 반영은 stock_list에서 관리)
             close_price (Optional[int]): 새로운 종가
             institution_net_buy (Optional[int]): 새로운 기관 순매수
             foreigner_net_buy (Optional[int]): 새로운 외국인 순매수
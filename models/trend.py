@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Trend Indicator State 모델 정의
+종목별 트렌드 지표의 증분 계산 상태를 관리하는 SQLAlchemy 모델
+"""
+from datetime import datetime
+from typing import Dict, Any
+from sqlalchemy.dialects.postgresql import ARRAY
+from extensions import db
+
+
+class TrendIndicatorState(db.Model):
+    """
+    종목별 트렌드 지표 상태 모델
+
+    마지막으로 반영한 거래일까지의 EMA 값과 최근 window 거래일의 순매수를 보관하여,
+    새 거래일이 들어오면 전체 이력을 다시 읽지 않고 새 행만으로 지표를 이어서 계산합니다.
+
+    Attributes:
+        stock_code (str): 주식 코드 (Primary Key)
+        last_trade_date (date): 마지막으로 반영한 거래 날짜
+        last_id (int): 마지막으로 반영한 거래 ID
+        config_key (str): 상태를 만든 지표 설정 (ema_short:ema_long:window) - 다르면 전체 재계산
+        institution_ema_short (float): 기관 순매수 단기 EMA
+        institution_ema_long (float): 기관 순매수 장기 EMA
+        foreigner_ema_short (float): 외국인 순매수 단기 EMA
+        foreigner_ema_long (float): 외국인 순매수 장기 EMA
+        institution_window (list): 최근 window 거래일 기관 순매수 (오래된 순)
+        foreigner_window (list): 최근 window 거래일 외국인 순매수 (오래된 순)
+        updated_at (datetime): 갱신 시간
+    """
+    __tablename__ = 'trend_indicator_state'
+
+    stock_code = db.Column(db.String(20), primary_key=True, comment='주식 코드')
+    last_trade_date = db.Column(db.Date, nullable=False, comment='마지막 반영 거래 날짜')
+    last_id = db.Column(db.Integer, nullable=False, comment='마지막 반영 거래 ID')
+    config_key = db.Column(db.String(50), nullable=False, comment='지표 설정 (ema_short:ema_long:window)')
+
+    # EMA 상태
+    institution_ema_short = db.Column(db.Float, comment='기관 순매수 단기 EMA')
+    institution_ema_long = db.Column(db.Float, comment='기관 순매수 장기 EMA')
+    foreigner_ema_short = db.Column(db.Float, comment='외국인 순매수 단기 EMA')
+    foreigner_ema_long = db.Column(db.Float, comment='외국인 순매수 장기 EMA')
+
+    # 최근 window 거래일 순매수 (기울기/z-score 계산용)
+    institution_window = db.Column(ARRAY(db.BigInteger), nullable=False, default=list, comment='최근 기관 순매수')
+    foreigner_window = db.Column(ARRAY(db.BigInteger), nullable=False, default=list, comment='최근 외국인 순매수')
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='갱신 시간')
+
+    def __repr__(self) -> str:
+        """객체 문자열 표현"""
+        return f'<TrendIndicatorState {self.stock_code} {self.last_trade_date}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        TrendIndicatorState 객체를 딕셔너리로 변환 (API 응답용)
+
+        Returns:
+            Dict[str, Any]: 지표 상태 딕셔너리
+        """
+        return {
+            'stock_code': self.stock_code,
+            'last_trade_date': self.last_trade_date.isoformat() if self.last_trade_date else None,
+            'last_id': self.last_id,
+            'config_key': self.config_key,
+            'institution_ema_short': self.institution_ema_short,
+            'institution_ema_long': self.institution_ema_long,
+            'foreigner_ema_short': self.foreigner_ema_short,
+            'foreigner_ema_long': self.foreigner_ema_long,
+            'institution_window': list(self.institution_window or []),
+            'foreigner_window': list(self.foreigner_window or []),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
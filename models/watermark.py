@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+데이터 워터마크 모델 정의
+조건부 GET(ETag/Last-Modified)의 기준이 되는 테이블별 데이터 버전과 종목별 거래 데이터 범위를 관리합니다.
+두 테이블은 database/watermarks.py의 트리거가 쓰기와 같은 트랜잭션에서 갱신하므로 (data_version은 커밋 직전),
+커밋된 데이터와 워터마크가 항상 함께 보입니다.
+"""
+from typing import Dict, Any
+from sqlalchemy import func
+from extensions import db
+
+
+class DataVersion(db.Model):
+    """
+    테이블별 데이터 버전
+
+    INSERT/UPDATE/DELETE/TRUNCATE가 있었던 트랜잭션이 커밋될 때마다 version이 커집니다 (행이 없으면 0으로 간주).
+    값은 시퀀스에서 발급하므로 연속되지 않으며, 비교는 같은지 여부로만 합니다.
+
+    Attributes:
+        table_name (str): 테이블명 (Primary Key)
+        version (int): 데이터 버전
+        updated_at (datetime): 마지막 변경 시간
+    """
+    __tablename__ = 'data_version'
+
+    table_name = db.Column(db.String(63), primary_key=True, comment='테이블명')
+    version = db.Column(db.BigInteger, nullable=False, default=0, comment='데이터 버전')
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), comment='마지막 변경 시간')
+
+    def __repr__(self) -> str:
+        """객체 문자열 표현"""
+        return f'<DataVersion {self.table_name} v{self.version}>'
+
+
+class TradingCoverage(db.Model):
+    """
+    종목별 거래 데이터 범위 (행 수, 최근 거래일, 버전)
+
+    종목의 거래 행이 바뀐 문장마다 version이 1씩 증가하므로, 값이 같은 행을 고쳐 써도 ETag가 달라집니다.
+
+    Attributes:
+        stock_code (str): 주식 코드 (Primary Key)
+        row_count (int): 거래 데이터 행 수
+        max_trade_date (date): 최근 거래 날짜
+        version (int): 종목 데이터 버전
+        updated_at (datetime): 마지막 변경 시간
+    """
+    __tablename__ = 'stock_trading_coverage'
+
+    stock_code = db.Column(db.String(20), primary_key=True, comment='주식 코드')
+    row_count = db.Column(db.BigInteger, nullable=False, default=0, comment='거래 데이터 행 수')
+    max_trade_date = db.Column(db.Date, comment='최근 거래 날짜')
+    version = db.Column(db.BigInteger, nullable=False, default=0, comment='종목 데이터 버전')
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), comment='마지막 변경 시간')
+
+    def __repr__(self) -> str:
+        """객체 문자열 표현"""
+        return f'<TradingCoverage {self.stock_code} v{self.version}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        TradingCoverage 객체를 딕셔너리로 변환
+
+        Returns:
+            Dict[str, Any]: 종목별 거래 데이터 범위 딕셔너리
+        """
+        return {
+            'stock_code': self.stock_code,
+            'row_count': self.row_count,
+            'max_trade_date': self.max_trade_date.isoformat() if self.max_trade_date else None,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+성능 측정(벤치마크) 스크립트 모듈
+"""
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 일괄 적재 벤치마크
+합성 거래 데이터를 NDJSON/CSV로 만들어 POST /trading/bulk로 적재하고 초당 처리 행 수를 보고합니다.
+
+합성 데이터는 실제 종목과 겹치지 않는 9로 시작하는 종목 코드를 사용하며, 측정 후 삭제합니다.
+같은 파일을 한 번 더 보내 갱신 없는 재적재(ON CONFLICT, 값이 같은 행은 쓰지 않음) 비용도 측정합니다.
+
+사용법:
+    python scripts/benchmarks/bulk_ingest.py
+    python scripts/benchmarks/bulk_ingest.py --rows 500000 --stocks 500 --formats csv
+    python scripts/benchmarks/bulk_ingest.py --keep
+
+목표: 로컬 PostgreSQL에서 최초 적재 50,000 rows/s 이상
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from app import create_app
+from extensions import db
+from database.partitioning import TRADING_TABLE
+
+CODE_PREFIX = '9'
+TARGET_ROWS_PER_SECOND = 50000
+
+
+def synthetic_rows(rows, stocks):
+    """종목별로 연속된 거래일의 합성 거래 행을 생성합니다."""
+    days = -(-rows // stocks)
+    start = date(2000, 1, 3)
+    generated = 0
+    for index in range(stocks):
+        stock_code = f"{CODE_PREFIX}{index:05d}"
+        for day in range(days):
+            if generated >= rows:
+                return
+            yield {
+                'stock_code': stock_code,
+                'trade_date': (start + timedelta(days=day)).isoformat(),
+                'close_price': 10000 + (day * 37 + index) % 5000,
+                'institution_net_buy': (day * 7919 + index) % 20001 - 10000,
+                'foreigner_net_buy': (day * 104729 + index) % 20001 - 10000,
+            }
+            generated += 1
+
+
+def build_body(data_format, rows, stocks):
+    """형식별 요청 본문과 Content-Type을 만듭니다."""
+    if data_format == 'csv':
+        lines = ['stock_code,trade_date,close_price,institution_net_buy,foreigner_net_buy']
+        lines.extend(
+            f"{row['stock_code']},{row['trade_date']},{row['close_price']},"
+            f"{row['institution_net_buy']},{row['foreigner_net_buy']}"
+            for row in synthetic_rows(rows, stocks)
+        )
+        return '\n'.join(lines).encode('utf-8'), 'text/csv'
+    body = '\n'.join(json.dumps(row) for row in synthetic_rows(rows, stocks))
+    return body.encode('utf-8'), 'application/x-ndjson'
+
+
+def cleanup():
+    """합성 종목의 거래 데이터와 트렌드 상태를 삭제합니다."""
+    pattern = f"{CODE_PREFIX}%"
+    deleted = db.session.execute(
+        text(f"DELETE FROM {TRADING_TABLE} WHERE stock_code LIKE :pattern"), {'pattern': pattern}
+    ).rowcount
+    db.session.execute(text("DELETE FROM trend_indicator_state WHERE stock_code LIKE :pattern"), {'pattern': pattern})
+    db.session.commit()
+    return deleted
+
+
+def measure(client, data_format, body, content_type):
+    """본문을 한 번 적재하고 (응답, 경과 시간)을 반환합니다."""
+    started = time.perf_counter()
+    response = client.post(f'/api/v1/trading/bulk?format={data_format}', data=body, content_type=content_type)
+    return response.get_json(), time.perf_counter() - started
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 일괄 적재 벤치마크')
+    parser.add_argument('--rows', type=int, default=200000, help='적재할 행 수')
+    parser.add_argument('--stocks', type=int, default=200, help='합성 종목 수')
+    parser.add_argument('--formats', nargs='+', default=['csv', 'ndjson'], choices=['csv', 'ndjson'])
+    parser.add_argument('--keep', action='store_true', help='측정 후 합성 데이터 유지')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 일괄 적재 벤치마크 ===")
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        cleanup()
+        for data_format in args.formats:
+            body, content_type = build_body(data_format, args.rows, args.stocks)
+            print(f"\n--- {data_format}: {args.rows:,}행, {len(body) / 1024 / 1024:.1f} MiB ---")
+
+            for label in ('최초 적재', '재적재(변경 없음)'):
+                result, seconds = measure(client, data_format, body, content_type)
+                if not result or result.get('status') == 'error':
+                    print(f"❌ {label} 실패: {result}")
+                    sys.exit(1)
+                rate = result['total'] / seconds if seconds else 0
+                print(f"  {label}: {seconds:.2f}s ({rate:,.0f} rows/s, 적재 {result['rows_per_second'] or 0:,} rows/s) "
+                      f"추가 {result['inserted']:,} / 갱신 {result['updated']:,} / 변경 없음 {result['unchanged']:,} "
+                      f"/ 거부 {result['rejected']:,}")
+                if label == '최초 적재':
+                    verdict = '✅' if rate >= TARGET_ROWS_PER_SECOND else '⚠️'
+                    print(f"  {verdict} 목표 {TARGET_ROWS_PER_SECOND:,} rows/s")
+
+            if not args.keep:
+                cleanup()
+
+        if args.keep:
+            print(f"\n합성 데이터를 유지합니다 (stock_code LIKE '{CODE_PREFIX}%').")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+조회 경로 벤치마크 (ORM 객체 경로 vs 빠른 조회 경로)
+같은 거래 데이터 페이지를 두 경로로 조회/직렬화하여 10,000행당 지연 시간과 CPU 시간을 비교합니다.
+
+    orm:  모델 객체 조회 → to_dict() (누적 초기값/주식명 조회 포함) → jsonify 인코딩
+    fast: 컬럼 값 Row 조회 (초기값/주식명은 SQL에서 계산) → projection별 변환 함수 → orjson(또는 표준 json)
+
+측정 항목:
+    - 조회+직렬화: 서비스 함수 호출부터 응답 바이트 생성까지 (벽시계 시간 / 프로세스 CPU 시간)
+    - 요청: 테스트 클라이언트로 GET /trading/stock/<code>를 호출한 전체 시간 (FAST_READ_PATH_ENABLED 전환)
+
+사용법:
+    python scripts/benchmarks/read_path.py
+    python scripts/benchmarks/read_path.py --stock-code 005930 --limit 5000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from flask import current_app
+from sqlalchemy import func
+from app import create_app
+from extensions import db
+from models.trading import StockInvestorTrading
+from services.trading_service import TradingService
+from core.pagination import PageRequest
+from core.serialization import dumps, orjson, serialize_rows
+
+PER_ROWS = 10000
+
+
+def pick_stock_code():
+    """거래 데이터가 가장 많은 종목 코드를 반환합니다."""
+    row = db.session.query(StockInvestorTrading.stock_code, func.count()).group_by(
+        StockInvestorTrading.stock_code
+    ).order_by(func.count().desc()).first()
+    return row[0] if row else None
+
+
+def measure(func_, repeat):
+    """함수를 repeat번 실행한 벽시계/CPU 시간의 중앙값(초)과 마지막 결과를 반환합니다."""
+    wall, cpu = [], []
+    result = None
+    for _ in range(repeat):
+        # 이전 반복에서 읽은 객체를 재사용하지 않도록 세션을 비움
+        db.session.expunge_all()
+        started, started_cpu = time.perf_counter(), time.process_time()
+        result = func_()
+        wall.append(time.perf_counter() - started)
+        cpu.append(time.process_time() - started_cpu)
+    return statistics.median(wall), statistics.median(cpu), result
+
+
+def orm_path(stock_code, limit):
+    """기존 경로: 모델 객체 → to_dict → Flask JSON"""
+    items = TradingService.get_trading_data_by_stock_code(stock_code, page=PageRequest(limit=limit)).items
+    return current_app.json.dumps([item.to_dict() for item in items]).encode('utf-8')
+
+
+def fast_path(stock_code, limit):
+    """빠른 경로: 컬럼 값 Row → 미리 만든 변환 함수 → dumps"""
+    page = PageRequest(limit=limit)
+    items = TradingService.get_trading_data_by_stock_code(stock_code, page=page, tabular=True).items
+    return dumps(serialize_rows(items))
+
+
+def per_rows(seconds, rows):
+    """10,000행당 밀리초"""
+    return seconds * 1000 * PER_ROWS / max(rows, 1)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='조회 경로 벤치마크')
+    parser.add_argument('--stock-code', help='측정할 종목 코드 (기본값: 거래 데이터가 가장 많은 종목)')
+    parser.add_argument('--limit', type=int, default=5000, help='조회 행 수 (PAGINATION_MAX_LIMIT 이하)')
+    parser.add_argument('--repeat', type=int, default=10, help='경로별 반복 횟수')
+    args = parser.parse_args()
+
+    print("=== 조회 경로 벤치마크 ===")
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        stock_code = args.stock_code or pick_stock_code()
+        if not stock_code:
+            print("❌ 거래 데이터가 없습니다.")
+            sys.exit(1)
+
+        rows = len(TradingService.get_trading_data_by_stock_code(stock_code, page=PageRequest(limit=args.limit)).items)
+        print(f"종목: {stock_code}, {rows:,}행, 반복 {args.repeat}회, JSON 인코더: {'orjson' if orjson else 'json'}")
+        print(f"{'path':<8}{'wall ms/10k':>14}{'cpu ms/10k':>13}{'request ms/10k':>17}{'bytes':>12}")
+
+        results = {}
+        url = f'/api/v1/trading/stock/{stock_code}?limit={args.limit}'
+        for name, path, fast in (('orm', orm_path, False), ('fast', fast_path, True)):
+            wall, cpu, body = measure(lambda: path(stock_code, args.limit), args.repeat)
+            app.config['FAST_READ_PATH_ENABLED'] = fast
+            request_wall, _, response = measure(lambda: client.get(url), args.repeat)
+            if response.status_code != 200:
+                print(f"❌ {name} 요청 실패: {response.status_code} {response.get_data(as_text=True)[:200]}")
+                sys.exit(1)
+            results[name] = (wall, cpu)
+            print(f"{name:<8}{per_rows(wall, rows):>14.2f}{per_rows(cpu, rows):>13.2f}"
+                  f"{per_rows(request_wall, rows):>17.2f}{len(body):>12,}")
+
+        (orm_wall, orm_cpu), (fast_wall, fast_cpu) = results['orm'], results['fast']
+        print(f"\nfast/orm: 지연 {fast_wall / orm_wall:.0%}, CPU {fast_cpu / orm_cpu:.0%}")
+
+
+if __name__ == "__main__":
+    main()
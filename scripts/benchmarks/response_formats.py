@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 응답 형식 벤치마크
+같은 종목 시계열을 format=json/columnar/csv/arrow/parquet으로 조회하여 형식별 크기와 시간을 비교합니다.
+
+측정 항목:
+    - 응답 크기 (원본 / gzip 압축 후)
+    - 직렬화 시간: 미리 조회한 결과를 인코딩하는 시간만 측정
+      json은 기존 경로(ORM 객체 → to_dict → JSON), 나머지는 컬럼 값 Row → 열 배열 → 인코딩
+    - 요청 시간: 테스트 클라이언트로 GET /trading/stock/<code>를 호출한 전체 시간 (조회 포함)
+
+pyarrow가 설치되지 않은 환경에서는 arrow/parquet을 건너뜁니다.
+
+사용법:
+    python scripts/benchmarks/response_formats.py
+    python scripts/benchmarks/response_formats.py --stock-code 005930 --limit 5000 --repeat 20
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from flask import current_app
+from sqlalchemy import func
+from app import create_app
+from extensions import db
+from models.trading import StockInvestorTrading
+from services.trading_service import TradingService
+from core.pagination import PageRequest
+from core.formats import FORMAT_JSON, available_formats, encode_table, rows_to_columns
+
+
+def pick_stock_code():
+    """거래 데이터가 가장 많은 종목 코드를 반환합니다."""
+    row = db.session.query(StockInvestorTrading.stock_code, func.count()).group_by(
+        StockInvestorTrading.stock_code
+    ).order_by(func.count().desc()).first()
+    return row[0] if row else None
+
+
+def median_seconds(func_, repeat):
+    """함수를 repeat번 실행한 시간의 중앙값(초)과 마지막 결과를 반환합니다."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func_()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def serialize(fmt, stock_code, limit):
+    """형식별 직렬화 함수를 만듭니다 (조회는 미리 한 번만 실행)."""
+    page = PageRequest(limit=limit)
+    if fmt == FORMAT_JSON:
+        items = TradingService.get_trading_data_by_stock_code(stock_code, page=page).items
+        return lambda: current_app.json.dumps([item.to_dict() for item in items]).encode('utf-8')
+
+    rows = TradingService.get_trading_data_by_stock_code(stock_code, page=page, tabular=True).items
+
+    return lambda: encode_table(fmt, rows_to_columns(rows, rows[0]._fields), {'stock_code': stock_code})
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 응답 형식 벤치마크')
+    parser.add_argument('--stock-code', help='측정할 종목 코드 (기본값: 거래 데이터가 가장 많은 종목)')
+    parser.add_argument('--limit', type=int, default=5000, help='조회 행 수 (PAGINATION_MAX_LIMIT 이하)')
+    parser.add_argument('--repeat', type=int, default=10, help='형식별 반복 횟수')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 응답 형식 벤치마크 ===")
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        stock_code = args.stock_code or pick_stock_code()
+        if not stock_code:
+            print("❌ 거래 데이터가 없습니다.")
+            sys.exit(1)
+
+        print(f"종목: {stock_code}, 최대 {args.limit:,}행, 반복 {args.repeat}회")
+        print(f"{'format':<10}{'size':>12}{'gzip':>12}{'serialize ms':>15}{'request ms':>13}")
+        baseline = None
+        for fmt in available_formats():
+            serialize_seconds, body = median_seconds(serialize(fmt, stock_code, args.limit), args.repeat)
+            url = f'/api/v1/trading/stock/{stock_code}?limit={args.limit}&format={fmt}'
+            request_seconds, response = median_seconds(lambda: client.get(url), args.repeat)
+            if response.status_code != 200:
+                print(f"❌ {fmt} 요청 실패: {response.status_code} {response.get_data(as_text=True)[:200]}")
+                sys.exit(1)
+
+            size, compressed = len(body), len(gzip.compress(body))
+            baseline = baseline or (size, serialize_seconds)
+            print(f"{fmt:<10}{size:>12,}{compressed:>12,}{serialize_seconds * 1000:>15.2f}{request_seconds * 1000:>13.2f}"
+                  f"   (json 대비 크기 {size / baseline[0]:.0%}, 직렬화 {serialize_seconds / baseline[1]:.0%})")
+
+
+if __name__ == "__main__":
+    main()
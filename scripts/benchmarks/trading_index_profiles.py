@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 인덱스 구성 벤치마크
+legacy(B-tree 다수)와 timeseries(BRIN + 커버링 인덱스) 구성을 같은 데이터 복사본에서 비교합니다.
+
+운영 테이블은 건드리지 않고 stock_investor_trading_bench 복사본을 만들어 측정합니다.
+각 구성마다 인덱스 크기, 대표 조회의 실행 시간/버퍼 사용량(EXPLAIN ANALYZE BUFFERS),
+index-only scan 여부(Heap Fetches), 그리고 삽입 비용(쓰기 증폭)을 보고합니다.
+
+사용법:
+    python scripts/benchmarks/trading_index_profiles.py
+    python scripts/benchmarks/trading_index_profiles.py --stocks 20 --repeat 5 --insert-rows 5000
+    python scripts/benchmarks/trading_index_profiles.py --cluster
+
+--cluster를 지정하면 각 구성을 (stock_code, trade_date) 순서로 CLUSTER한 뒤 다시 측정하여
+물리 정렬이 종목별 조회의 버퍼 접근 수에 주는 효과를 함께 보고합니다.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.database.apply_trading_indexes import INDEX_PROFILES
+from database.clustering import pick_cluster_index
+
+# 환경 변수 로드
+load_dotenv()
+
+SOURCE_TABLE = 'stock_investor_trading'
+BENCH_TABLE = 'stock_investor_trading_bench'
+
+# TradingService 조회 형태와 같은 SQL
+QUERIES = {
+    'stock_range_all': (
+        "SELECT * FROM {table} WHERE stock_code = %(stock_code)s "
+        "AND trade_date >= %(start)s AND trade_date <= %(end)s ORDER BY trade_date DESC"
+    ),
+    'stock_range_institution': (
+        "SELECT id, stock_code, trade_date, close_price, institution_net_buy, institution_accum, "
+        "institution_trend_signal, institution_trend_score FROM {table} WHERE stock_code = %(stock_code)s "
+        "AND trade_date >= %(start)s AND trade_date <= %(end)s ORDER BY trade_date DESC"
+    ),
+    'stock_range_foreigner': (
+        "SELECT id, stock_code, trade_date, close_price, foreigner_net_buy, foreigner_accum, "
+        "foreigner_trend_signal, foreigner_trend_score FROM {table} WHERE stock_code = %(stock_code)s "
+        "AND trade_date >= %(start)s AND trade_date <= %(end)s ORDER BY trade_date DESC"
+    ),
+    'stock_range_price': (
+        "SELECT id, stock_code, trade_date, close_price FROM {table} WHERE stock_code = %(stock_code)s "
+        "AND trade_date >= %(start)s AND trade_date <= %(end)s ORDER BY trade_date DESC"
+    ),
+    'market_range': (
+        "SELECT * FROM {table} WHERE trade_date >= %(market_start)s AND trade_date <= %(end)s "
+        "ORDER BY trade_date DESC"
+    ),
+    'market_range_page': (
+        "SELECT * FROM {table} WHERE trade_date >= %(market_start)s AND trade_date <= %(end)s "
+        "ORDER BY trade_date DESC LIMIT 100"
+    ),
+}
+
+
+def get_database_connection():
+    """데이터베이스 연결을 생성합니다."""
+    try:
+        database_url = os.getenv('DATABASE_URL')
+        if not database_url:
+            raise ValueError("DATABASE_URL 환경변수가 설정되지 않았습니다.")
+
+        conn = psycopg2.connect(database_url)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+    except Exception as e:
+        print(f"데이터베이스 연결 실패: {e}")
+        return None
+
+
+def prepare_bench_table(cursor):
+    """원본과 같은 구조/적재 순서의 복사본 테이블을 생성합니다 (인덱스 제외)."""
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    cursor.execute(f"CREATE TABLE {BENCH_TABLE} (LIKE {SOURCE_TABLE} INCLUDING DEFAULTS)")
+    # 실제 적재 순서(id 순)를 유지해야 BRIN 효과를 공정하게 측정할 수 있음
+    cursor.execute(f"INSERT INTO {BENCH_TABLE} SELECT * FROM {SOURCE_TABLE} ORDER BY id")
+    cursor.execute(f"ALTER TABLE {BENCH_TABLE} ADD PRIMARY KEY (id)")
+    cursor.execute(f"SELECT COUNT(*) FROM {BENCH_TABLE}")
+    return cursor.fetchone()[0]
+
+
+def drop_bench_indexes(cursor):
+    """복사본의 PK를 제외한 인덱스를 모두 삭제합니다."""
+    cursor.execute("""
+        SELECT indexname FROM pg_indexes
+        WHERE tablename = %s AND indexname <> %s
+    """, (BENCH_TABLE, f'{BENCH_TABLE}_pkey'))
+    for (name,) in cursor.fetchall():
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def apply_profile(cursor, profile):
+    """복사본에 인덱스 구성을 적용하고 VACUUM ANALYZE로 visibility map을 갱신합니다."""
+    drop_bench_indexes(cursor)
+    started = time.perf_counter()
+    for index_sql in INDEX_PROFILES[profile]:
+        cursor.execute(index_sql.replace('idx_trading_', 'idx_bench_').replace(SOURCE_TABLE, BENCH_TABLE))
+    build_seconds = time.perf_counter() - started
+    cursor.execute(f"VACUUM (ANALYZE) {BENCH_TABLE}")
+    cursor.execute(f"SELECT pg_indexes_size('{BENCH_TABLE}'), (SELECT COUNT(*) FROM pg_indexes WHERE tablename = %s)",
+                   (BENCH_TABLE,))
+    index_bytes, index_count = cursor.fetchone()
+    return {'build_seconds': build_seconds, 'index_bytes': index_bytes, 'index_count': index_count}
+
+
+def cluster_bench_table(cursor):
+    """복사본을 (stock_code, trade_date) 인덱스 순서로 CLUSTER합니다 (scripts/database/cluster_trading.py와 동일)."""
+    cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = %s", (BENCH_TABLE,))
+    index_name = pick_cluster_index(indexdef for (indexdef,) in cursor.fetchall())
+    if not index_name:
+        return None
+    started = time.perf_counter()
+    cursor.execute(f"CLUSTER {BENCH_TABLE} USING {index_name}")
+    cursor.execute(f"VACUUM (ANALYZE) {BENCH_TABLE}")
+    return time.perf_counter() - started
+
+
+def sample_parameters(cursor, stock_count):
+    """측정에 사용할 종목 코드와 날짜 범위를 고릅니다 (거래가 많은 종목 우선)."""
+    cursor.execute(f"""
+        SELECT stock_code FROM {BENCH_TABLE}
+        GROUP BY stock_code ORDER BY COUNT(*) DESC LIMIT %s
+    """, (stock_count,))
+    stock_codes = [code for (code,) in cursor.fetchall()]
+    cursor.execute(f"SELECT MIN(trade_date), MAX(trade_date) FROM {BENCH_TABLE}")
+    min_date, max_date = cursor.fetchone()
+    return stock_codes, min_date, max_date
+
+
+def explain(cursor, sql, params):
+    """EXPLAIN (ANALYZE, BUFFERS)를 실행하고 실행 시간/버퍼/힙 접근 정보를 추출합니다."""
+    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+    result = cursor.fetchone()[0]
+    plan = (result if isinstance(result, list) else json.loads(result))[0]
+
+    heap_fetches = 0
+    node_types = set()
+
+    def walk(node):
+        nonlocal heap_fetches
+        node_types.add(node['Node Type'])
+        heap_fetches += node.get('Heap Fetches', 0)
+        for child in node.get('Plans', []):
+            walk(child)
+
+    walk(plan['Plan'])
+    return {
+        'execution_ms': plan['Execution Time'],
+        'shared_hit': plan['Plan'].get('Shared Hit Blocks', 0),
+        'shared_read': plan['Plan'].get('Shared Read Blocks', 0),
+        'heap_fetches': heap_fetches,
+        'nodes': node_types,
+    }
+
+
+def measure_queries(cursor, stock_codes, min_date, max_date, repeat):
+    """조회 형태별 실행 시간 중앙값과 평균 버퍼 사용량을 측정합니다."""
+    def to_date(value):
+        return value if isinstance(value, date) else date.fromisoformat(value)
+
+    end = to_date(max_date)
+    params_list = [{
+        'stock_code': code,
+        'start': str(max(to_date(min_date), end - timedelta(days=365))),
+        'market_start': str(end - timedelta(days=30)),
+        'end': str(end),
+    } for code in stock_codes]
+
+    results = {}
+    for name, template in QUERIES.items():
+        sql = template.format(table=BENCH_TABLE)
+        runs = []
+        for _ in range(repeat):
+            for params in params_list:
+                runs.append(explain(cursor, sql, params))
+            if name.startswith('market'):
+                break
+        results[name] = {
+            'median_ms': statistics.median(r['execution_ms'] for r in runs),
+            'avg_buffers': statistics.mean(r['shared_hit'] + r['shared_read'] for r in runs),
+            'avg_heap_fetches': statistics.mean(r['heap_fetches'] for r in runs),
+            'nodes': sorted(set().union(*(r['nodes'] for r in runs))),
+        }
+    return results
+
+
+def measure_insert_cost(cursor, rows):
+    """
+    인덱스 유지 비용을 포함한 삽입 시간을 측정합니다 (트랜잭션 롤백으로 데이터는 남기지 않음).
+    id를 직접 지정하여 원본 테이블과 공유하는 시퀀스를 소모하지 않습니다.
+    """
+    cursor.execute("BEGIN")
+    try:
+        started = time.perf_counter()
+        cursor.execute(f"""
+            INSERT INTO {BENCH_TABLE} (id, stock_code, trade_date, close_price, institution_net_buy, foreigner_net_buy)
+            SELECT id + (SELECT MAX(id) FROM {BENCH_TABLE}), stock_code, trade_date, close_price,
+                   institution_net_buy, foreigner_net_buy
+            FROM {BENCH_TABLE} ORDER BY id DESC LIMIT %s
+        """, (rows,))
+        elapsed = time.perf_counter() - started
+    finally:
+        cursor.execute("ROLLBACK")
+    return elapsed / rows * 1000 * 1000 if rows else 0.0
+
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 단위로 변환합니다."""
+    size = float(size or 0)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def print_comparison(reports):
+    """구성별 결과를 표로 출력합니다."""
+    profiles = list(reports)
+    print("\n=== 인덱스 구성 비교 ===")
+    print(f"{'항목':<28}" + ''.join(f"{p:>24}" for p in profiles))
+    print(f"{'인덱스 수':<28}" + ''.join(f"{reports[p]['build']['index_count']:>24}" for p in profiles))
+    print(f"{'인덱스 크기':<28}" + ''.join(f"{format_bytes(reports[p]['build']['index_bytes']):>24}" for p in profiles))
+    print(f"{'인덱스 생성 시간(s)':<28}" + ''.join(f"{reports[p]['build']['build_seconds']:>24.1f}" for p in profiles))
+    print(f"{'삽입 비용(us/행)':<28}" + ''.join(f"{reports[p]['insert_us_per_row']:>24.1f}" for p in profiles))
+
+    for name in QUERIES:
+        print(f"\n[{name}]")
+        print(f"{'  실행 시간 중앙값(ms)':<28}" + ''.join(f"{reports[p]['queries'][name]['median_ms']:>24.2f}" for p in profiles))
+        print(f"{'  평균 버퍼 접근':<28}" + ''.join(f"{reports[p]['queries'][name]['avg_buffers']:>24.1f}" for p in profiles))
+        print(f"{'  평균 Heap Fetches':<28}" + ''.join(f"{reports[p]['queries'][name]['avg_heap_fetches']:>24.1f}" for p in profiles))
+        for p in profiles:
+            print(f"  {p}: {', '.join(reports[p]['queries'][name]['nodes'])}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 인덱스 구성 벤치마크')
+    parser.add_argument('--profiles', nargs='+', default=['legacy', 'timeseries'], choices=sorted(INDEX_PROFILES))
+    parser.add_argument('--stocks', type=int, default=10, help='측정할 종목 수')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수')
+    parser.add_argument('--insert-rows', type=int, default=2000, help='삽입 비용 측정 행 수')
+    parser.add_argument('--cluster', action='store_true', help='CLUSTER 후 재측정 결과도 보고')
+    parser.add_argument('--keep', action='store_true', help='측정 후 복사본 테이블 유지')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 인덱스 구성 벤치마크 ===")
+    conn = get_database_connection()
+    if not conn:
+        sys.exit(1)
+
+    cursor = conn.cursor()
+    try:
+        row_count = prepare_bench_table(cursor)
+        print(f"복사본 {BENCH_TABLE} 생성: {row_count:,}행")
+        if not row_count:
+            print("측정할 데이터가 없습니다.")
+            return
+
+        reports = {}
+        for position, profile in enumerate(args.profiles):
+            if args.cluster and position:
+                # 이전 구성의 CLUSTER로 바뀐 물리 순서를 적재 순서로 되돌림
+                prepare_bench_table(cursor)
+            print(f"\n--- {profile} 구성 측정 중 ---")
+            build = apply_profile(cursor, profile)
+            stock_codes, min_date, max_date = sample_parameters(cursor, args.stocks)
+            reports[profile] = {
+                'build': build,
+                'queries': measure_queries(cursor, stock_codes, min_date, max_date, args.repeat),
+                'insert_us_per_row': measure_insert_cost(cursor, args.insert_rows),
+            }
+
+            if args.cluster:
+                seconds = cluster_bench_table(cursor)
+                if seconds is None:
+                    print(f"{profile} 구성에 (stock_code, trade_date) 인덱스가 없어 CLUSTER를 건너뜁니다.")
+                    continue
+                print(f"CLUSTER 완료 ({seconds:.1f}s), 재측정 중")
+                reports[f'{profile}+cluster'] = {
+                    'build': build,
+                    'queries': measure_queries(cursor, stock_codes, min_date, max_date, args.repeat),
+                    'insert_us_per_row': measure_insert_cost(cursor, args.insert_rows),
+                }
+
+        print_comparison(reports)
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
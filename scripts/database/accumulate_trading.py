@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+전체 종목 누적 순매수 일괄 계산 스크립트
+서버 측 커서로 거래 테이블을 정렬 순서대로 읽어 NumPy로 종목별 누적합을 계산하고,
+임시 테이블 COPY + UPDATE ... FROM 한 번으로 반영합니다.
+
+사용법:
+    python scripts/database/accumulate_trading.py
+    python scripts/database/accumulate_trading.py --workers 4
+    python scripts/database/accumulate_trading.py --stock-codes 005930,000660 --fetch-size 20000
+
+과거 데이터를 대량으로 적재했거나 누적 캐시를 처음 채울 때 사용합니다.
+평상시 수집분은 저장 직후 증분 갱신되므로 이 스크립트가 필요하지 않습니다.
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from database.accumulation_batch import DEFAULT_FETCH_SIZE, run_accumulation_batch
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='전체 종목 누적 순매수 일괄 계산')
+    parser.add_argument('--workers', type=int, default=1, help='종목을 나누어 처리할 프로세스 수')
+    parser.add_argument('--fetch-size', type=int, default=DEFAULT_FETCH_SIZE, help='서버 측 커서 청크 크기')
+    parser.add_argument('--stock-codes', help='대상 종목 코드 (쉼표 구분, 생략 시 전체)')
+    args = parser.parse_args()
+
+    stock_codes = [code.strip() for code in args.stock_codes.split(',') if code.strip()] if args.stock_codes else None
+
+    print("=== 전체 종목 누적 순매수 일괄 계산 ===")
+    app = create_app()
+    with app.app_context():
+        try:
+            summary = run_accumulation_batch(workers=args.workers, stock_codes=stock_codes, fetch_size=args.fetch_size)
+        except Exception as e:
+            print(f"❌ 일괄 계산 실패: {e}")
+            sys.exit(1)
+
+    for index, result in enumerate(summary['by_shard'], 1):
+        print(f"  샤드 {index}: {result['stocks']:>6,}개 종목, {result['rows']:>12,}행 읽음, "
+              f"{result['updated_rows']:>12,}건 갱신 ({result['seconds']:.1f}s)")
+    print(f"✅ 완료: {summary['stocks']:,}개 종목, {summary['rows']:,}행 중 {summary['updated_rows']:,}건 갱신 "
+          f"({summary['shards']}개 샤드, {summary['seconds']:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 (stock_code, trade_date) UNIQUE 인덱스 추가 스크립트
+일괄 적재(POST /trading/bulk)의 ON CONFLICT 대상이 되는 UNIQUE 인덱스를 기존 테이블에 추가합니다.
+
+사용법:
+    python scripts/database/add_trading_unique_key.py             # 중복 확인 후 인덱스 생성
+    python scripts/database/add_trading_unique_key.py --dedupe    # 중복 행을 정리한 뒤 인덱스 생성
+
+새로 만든 테이블에는 모델/파티션 DDL에 포함되어 있으므로 필요하지 않습니다.
+같은 (stock_code, trade_date)가 여러 건 있으면 인덱스를 만들 수 없으므로, --dedupe로 id가 가장 큰(가장 최근에 저장된)
+행만 남기고 나머지를 삭제한 뒤 해당 종목의 누적 순매수/트렌드를 다시 계산합니다.
+파티션 전환/압축 스크립트도 이 인덱스를 가진 테이블을 만들므로 중복이 있으면 먼저 이 스크립트를 실행하세요.
+
+일반 테이블은 CONCURRENTLY로 생성하여 쓰기를 막지 않고, 파티션 테이블은 부모에 한 번 생성합니다 (생성 중 쓰기 대기).
+기존 (stock_code, trade_date) 일반 인덱스는 UNIQUE 인덱스가 대신하므로 삭제합니다.
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from app import create_app
+from extensions import db
+from database.partitioning import TRADING_TABLE, has_stock_date_key, is_partitioned
+from services.accumulation_service import AccumulationService
+from services.trend_service import TrendService
+
+UNIQUE_INDEX = f'{TRADING_TABLE}_stock_date_key'
+REDUNDANT_INDEX = f'{TRADING_TABLE}_stock_date_idx'
+
+
+def find_duplicates():
+    """중복된 (stock_code, trade_date) 그룹 수와 삭제 대상 행 수를 반환합니다."""
+    groups, extra = db.session.execute(text(f"""
+        SELECT COUNT(*), COALESCE(SUM(n - 1), 0)
+        FROM (
+            SELECT COUNT(*) AS n FROM {TRADING_TABLE}
+            GROUP BY stock_code, trade_date
+            HAVING COUNT(*) > 1
+        ) d
+    """)).one()
+    db.session.commit()
+    return groups, extra
+
+
+def dedupe():
+    """가장 큰 id만 남기고 중복 행을 삭제한 뒤 영향받은 종목의 누적 순매수/트렌드를 갱신합니다."""
+    rows = db.session.execute(text(f"""
+        WITH ranked AS (
+            SELECT id, trade_date,
+                   ROW_NUMBER() OVER (PARTITION BY stock_code, trade_date ORDER BY id DESC) AS rn
+            FROM {TRADING_TABLE}
+        ), deleted AS (
+            DELETE FROM {TRADING_TABLE} t
+            USING ranked r
+            WHERE t.id = r.id AND t.trade_date = r.trade_date AND r.rn > 1
+            RETURNING t.stock_code, t.trade_date
+        )
+        SELECT stock_code, MIN(trade_date), COUNT(*) FROM deleted GROUP BY stock_code
+    """)).all()
+
+    from_dates = {stock_code: first_date for stock_code, first_date, _ in rows}
+    AccumulationService.extend_accumulation(from_dates)
+    db.session.commit()
+    TrendService.advance_trends(from_dates=from_dates)
+    db.session.commit()
+    return sum(count for _, _, count in rows), len(from_dates)
+
+
+def create_unique_index(partitioned):
+    """UNIQUE 인덱스를 생성하고 중복되는 기존 일반 인덱스를 삭제합니다."""
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        if partitioned:
+            # 파티션 부모에는 CONCURRENTLY를 쓸 수 없음 (각 파티션에 자동 전파)
+            conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {UNIQUE_INDEX} ON {TRADING_TABLE} (stock_code, trade_date)"))
+            conn.execute(text(f"DROP INDEX IF EXISTS {REDUNDANT_INDEX}"))
+            return
+
+        try:
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {UNIQUE_INDEX} ON {TRADING_TABLE} (stock_code, trade_date)"
+            ))
+        except Exception:
+            # 실패한 CONCURRENTLY 생성은 INVALID 인덱스를 남기므로 정리
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {UNIQUE_INDEX}"))
+            raise
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {REDUNDANT_INDEX}"))
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 (stock_code, trade_date) UNIQUE 인덱스 추가')
+    parser.add_argument('--dedupe', action='store_true', help='중복 행을 정리한 뒤 인덱스 생성')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 UNIQUE 인덱스 추가 ===")
+    app = create_app()
+    with app.app_context():
+        if has_stock_date_key():
+            print("이미 (stock_code, trade_date) UNIQUE 인덱스가 있습니다. 건너뜁니다.")
+            return
+
+        groups, extra = find_duplicates()
+        if groups:
+            print(f"중복 (stock_code, trade_date): {groups:,}개 그룹, 삭제 대상 {extra:,}행")
+            if not args.dedupe:
+                print("❌ 중복이 있어 인덱스를 만들 수 없습니다. --dedupe로 정리 후 다시 실행하세요.")
+                sys.exit(1)
+            deleted, stocks = dedupe()
+            print(f"중복 정리: {deleted:,}행 삭제 ({stocks:,}개 종목 누적 순매수/트렌드 갱신)")
+
+        partitioned = is_partitioned(TRADING_TABLE)
+        db.session.commit()
+        try:
+            create_unique_index(partitioned)
+        except Exception as e:
+            print(f"❌ 인덱스 생성 실패: {e}")
+            sys.exit(1)
+
+    print(f"✅ 완료: {UNIQUE_INDEX} ({'파티션 부모' if partitioned else 'CONCURRENTLY'})")
+
+
+if __name__ == "__main__":
+    main()
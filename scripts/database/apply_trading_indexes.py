@@ -2,8 +2,16 @@
 # -*- coding: utf-8 -*-
 """
 거래 데이터 조회 성능 최적화를 위한 인덱스 적용 스크립트
+
+사용법:
+    python scripts/database/apply_trading_indexes.py                       # legacy 기본 인덱스
+    python scripts/database/apply_trading_indexes.py --advanced            # legacy 전체
+    python scripts/database/apply_trading_indexes.py --profile timeseries --drop-others
+
+두 구성의 성능 비교는 scripts/benchmarks/trading_index_profiles.py를 사용하세요.
 """
 
+import argparse
 import os
 import sys
 import psycopg2
@@ -13,6 +21,77 @@ from dotenv import load_dotenv
 # 환경 변수 로드
 load_dotenv()
 
+# 기존(legacy) 인덱스 구성
+BASIC_INDEXES = [
+    # 날짜 범위 조회 최적화
+    "CREATE INDEX IF NOT EXISTS idx_trading_date_range ON stock_investor_trading(trade_date);",
+    "CREATE INDEX IF NOT EXISTS idx_trading_date_close_price ON stock_investor_trading(trade_date, close_price);",
+    
+    # 종목별 날짜 범위 조회 최적화
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_range ON stock_investor_trading(stock_code, trade_date);",
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_close ON stock_investor_trading(stock_code, trade_date, close_price);",
+    
+    # 기관/외국인 순매수 조회 최적화
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_institution_net ON stock_investor_trading(stock_code, trade_date, institution_net_buy);",
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_foreigner_net ON stock_investor_trading(stock_code, trade_date, foreigner_net_buy);"
+]
+
+ADVANCED_INDEXES = [
+    # 트렌드 신호 조회를 위한 인덱스
+    "CREATE INDEX IF NOT EXISTS idx_trading_institution_trend ON stock_investor_trading(stock_code, trade_date, institution_trend_signal);",
+    "CREATE INDEX IF NOT EXISTS idx_trading_foreigner_trend ON stock_investor_trading(stock_code, trade_date, foreigner_trend_signal);",
+    
+    # 트렌드 점수 조회를 위한 인덱스
+    "CREATE INDEX IF NOT EXISTS idx_trading_institution_score ON stock_investor_trading(stock_code, trade_date, institution_trend_score);",
+    "CREATE INDEX IF NOT EXISTS idx_trading_foreigner_score ON stock_investor_trading(stock_code, trade_date, foreigner_trend_score);"
+]
+
+PARTIAL_INDEXES = [
+    # 기관 순매수가 있는 데이터만 인덱싱
+    "CREATE INDEX IF NOT EXISTS idx_trading_institution_net_not_null ON stock_investor_trading(stock_code, trade_date) WHERE institution_net_buy IS NOT NULL;",
+    
+    # 외국인 순매수가 있는 데이터만 인덱싱
+    "CREATE INDEX IF NOT EXISTS idx_trading_foreigner_net_not_null ON stock_investor_trading(stock_code, trade_date) WHERE foreigner_net_buy IS NOT NULL;",
+    
+    # 종가가 있는 데이터만 인덱싱
+    "CREATE INDEX IF NOT EXISTS idx_trading_close_price_not_null ON stock_investor_trading(stock_code, trade_date) WHERE close_price IS NOT NULL;"
+]
+
+# 시계열(timeseries) 인덱스 구성
+# 거래 데이터는 거의 trade_date 순으로 추가되고 누적 계산 이후 거의 갱신되지 않으므로
+# 시장 전체 날짜 범위 조회는 작은 BRIN 인덱스로, 종목별 범위 조회는 조회 형태마다
+# 필요한 컬럼을 INCLUDE한 커버링 인덱스로 처리하여 index-only scan이 되도록 합니다.
+TIMESERIES_INDEXES = [
+    # 시장 전체 날짜 범위 스캔 (B-tree 대비 수백 분의 1 크기)
+    "CREATE INDEX IF NOT EXISTS idx_trading_date_brin ON stock_investor_trading USING brin (trade_date) WITH (pages_per_range = 32);",
+    
+    # 종목별 날짜 범위 - 종가 + 기관 (include_foreigner=false), 전체 컬럼 조회도 이 인덱스의 키를 사용
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_cover_institution ON stock_investor_trading(stock_code, trade_date) "
+    "INCLUDE (id, close_price, institution_net_buy, institution_accum, institution_trend_signal, institution_trend_score);",
+    
+    # 종목별 날짜 범위 - 종가 + 외국인 (include_institution=false)
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_cover_foreigner ON stock_investor_trading(stock_code, trade_date) "
+    "INCLUDE (id, close_price, foreigner_net_buy, foreigner_accum, foreigner_trend_signal, foreigner_trend_score);",
+    
+    # 종목별 날짜 범위 - 종가만
+    "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_cover_price ON stock_investor_trading(stock_code, trade_date) "
+    "INCLUDE (id, close_price);"
+]
+
+# index-only scan은 visibility map에 의존하므로 추가 위주 테이블도 자주 VACUUM 되도록 설정
+TIMESERIES_TABLE_SETTINGS = [
+    "ALTER TABLE stock_investor_trading SET (autovacuum_vacuum_insert_scale_factor = 0.02, autovacuum_vacuum_insert_threshold = 10000);"
+]
+
+INDEX_PROFILES = {
+    'legacy': BASIC_INDEXES + ADVANCED_INDEXES + PARTIAL_INDEXES,
+    'timeseries': TIMESERIES_INDEXES,
+}
+
+def index_name(index_sql):
+    """CREATE INDEX 문에서 인덱스 이름을 추출합니다."""
+    return index_sql.split('IF NOT EXISTS ')[1].split(' ON')[0]
+
 def get_database_connection():
     """데이터베이스 연결을 생성합니다."""
     try:
@@ -31,24 +110,10 @@ def apply_basic_indexes(conn):
     """기본 인덱스를 적용합니다."""
     print("=== 기본 인덱스 적용 ===")
     
-    basic_indexes = [
-        # 날짜 범위 조회 최적화
-        "CREATE INDEX IF NOT EXISTS idx_trading_date_range ON stock_investor_trading(trade_date);",
-        "CREATE INDEX IF NOT EXISTS idx_trading_date_close_price ON stock_investor_trading(trade_date, close_price);",
-        
-        # 종목별 날짜 범위 조회 최적화
-        "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_range ON stock_investor_trading(stock_code, trade_date);",
-        "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_close ON stock_investor_trading(stock_code, trade_date, close_price);",
-        
-        # 기관/외국인 순매수 조회 최적화
-        "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_institution_net ON stock_investor_trading(stock_code, trade_date, institution_net_buy);",
-        "CREATE INDEX IF NOT EXISTS idx_trading_stock_date_foreigner_net ON stock_investor_trading(stock_code, trade_date, foreigner_net_buy);"
-    ]
-    
     cursor = conn.cursor()
     success_count = 0
     
-    for index_sql in basic_indexes:
+    for index_sql in BASIC_INDEXES:
         try:
             cursor.execute(index_sql)
             print(f"✅ 인덱스 생성 완료: {index_sql.split('IF NOT EXISTS ')[1].split(' ON')[0]}")
@@ -57,30 +122,17 @@ def apply_basic_indexes(conn):
             print(f"❌ 인덱스 생성 실패: {e}")
     
     cursor.close()
-    print(f"기본 인덱스 적용 완료: {success_count}/{len(basic_indexes)}")
-    return success_count == len(basic_indexes)
+    print(f"기본 인덱스 적용 완료: {success_count}/{len(BASIC_INDEXES)}")
+    return success_count == len(BASIC_INDEXES)
 
 def apply_advanced_indexes(conn):
     """고급 인덱스를 적용합니다."""
     print("\n=== 고급 인덱스 적용 ===")
     
-    advanced_indexes = [
-        # 종목명으로도 조회할 수 있도록 인덱스 추가
-        "CREATE INDEX IF NOT EXISTS idx_trading_stock_name_date ON stock_investor_trading(stock_name, trade_date);",
-        
-        # 트렌드 신호 조회를 위한 인덱스
-        "CREATE INDEX IF NOT EXISTS idx_trading_institution_trend ON stock_investor_trading(stock_code, trade_date, institution_trend_signal);",
-        "CREATE INDEX IF NOT EXISTS idx_trading_foreigner_trend ON stock_investor_trading(stock_code, trade_date, foreigner_trend_signal);",
-        
-        # 트렌드 점수 조회를 위한 인덱스
-        "CREATE INDEX IF NOT EXISTS idx_trading_institution_score ON stock_investor_trading(stock_code, trade_date, institution_trend_score);",
-        "CREATE INDEX IF NOT EXISTS idx_trading_foreigner_score ON stock_investor_trading(stock_code, trade_date, foreigner_trend_score);"
-    ]
-    
     cursor = conn.cursor()
     success_count = 0
     
-    for index_sql in advanced_indexes:
+    for index_sql in ADVANCED_INDEXES:
         try:
             cursor.execute(index_sql)
             print(f"✅ 고급 인덱스 생성 완료: {index_sql.split('IF NOT EXISTS ')[1].split(' ON')[0]}")
@@ -89,28 +141,17 @@ def apply_advanced_indexes(conn):
             print(f"❌ 고급 인덱스 생성 실패: {e}")
     
     cursor.close()
-    print(f"고급 인덱스 적용 완료: {success_count}/{len(advanced_indexes)}")
-    return success_count == len(advanced_indexes)
+    print(f"고급 인덱스 적용 완료: {success_count}/{len(ADVANCED_INDEXES)}")
+    return success_count == len(ADVANCED_INDEXES)
 
 def apply_partial_indexes(conn):
     """부분 인덱스를 적용합니다."""
     print("\n=== 부분 인덱스 적용 ===")
     
-    partial_indexes = [
-        # 기관 순매수가 있는 데이터만 인덱싱
-        "CREATE INDEX IF NOT EXISTS idx_trading_institution_net_not_null ON stock_investor_trading(stock_code, trade_date) WHERE institution_net_buy IS NOT NULL;",
-        
-        # 외국인 순매수가 있는 데이터만 인덱싱
-        "CREATE INDEX IF NOT EXISTS idx_trading_foreigner_net_not_null ON stock_investor_trading(stock_code, trade_date) WHERE foreigner_net_buy IS NOT NULL;",
-        
-        # 종가가 있는 데이터만 인덱싱
-        "CREATE INDEX IF NOT EXISTS idx_trading_close_price_not_null ON stock_investor_trading(stock_code, trade_date) WHERE close_price IS NOT NULL;"
-    ]
-    
     cursor = conn.cursor()
     success_count = 0
     
-    for index_sql in partial_indexes:
+    for index_sql in PARTIAL_INDEXES:
         try:
             cursor.execute(index_sql)
             print(f"✅ 부분 인덱스 생성 완료: {index_sql.split('IF NOT EXISTS ')[1].split(' ON')[0]}")
@@ -119,8 +160,64 @@ def apply_partial_indexes(conn):
             print(f"❌ 부분 인덱스 생성 실패: {e}")
     
     cursor.close()
-    print(f"부분 인덱스 적용 완료: {success_count}/{len(partial_indexes)}")
-    return success_count == len(partial_indexes)
+    print(f"부분 인덱스 적용 완료: {success_count}/{len(PARTIAL_INDEXES)}")
+    return success_count == len(PARTIAL_INDEXES)
+
+def is_partitioned_table(conn):
+    """거래 테이블이 파티션 테이블인지 확인합니다."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'stock_investor_trading'::regclass)")
+    partitioned = cursor.fetchone()[0]
+    cursor.close()
+    return partitioned
+
+def apply_timeseries_profile(conn, drop_others=False):
+    """시계열 인덱스 구성(BRIN + 커버링 인덱스)을 적용합니다."""
+    print("\n=== 시계열 인덱스 구성 적용 ===")
+    
+    # 일반 테이블은 쓰기를 막지 않도록 CONCURRENTLY로 생성 (파티션 부모는 미지원)
+    concurrently = not is_partitioned_table(conn)
+    cursor = conn.cursor()
+    success_count = 0
+    
+    for index_sql in TIMESERIES_INDEXES:
+        if concurrently:
+            index_sql = index_sql.replace('CREATE INDEX IF NOT EXISTS', 'CREATE INDEX CONCURRENTLY IF NOT EXISTS', 1)
+        try:
+            cursor.execute(index_sql)
+            print(f"✅ 인덱스 생성 완료: {index_name(index_sql)}")
+            success_count += 1
+        except Exception as e:
+            print(f"❌ 인덱스 생성 실패: {e}")
+    
+    for setting_sql in TIMESERIES_TABLE_SETTINGS:
+        try:
+            cursor.execute(setting_sql)
+        except Exception as e:
+            print(f"⚠️ 테이블 설정 실패: {e}")
+    
+    # 모든 인덱스가 준비된 경우에만 기존 구성 정리
+    if drop_others and success_count == len(TIMESERIES_INDEXES):
+        keep = {index_name(sql) for sql in TIMESERIES_INDEXES}
+        cursor.execute("""
+            SELECT i.indexname FROM pg_indexes i
+            JOIN pg_index x ON x.indexrelid = (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))::regclass
+            WHERE i.tablename = 'stock_investor_trading' AND NOT x.indisunique
+        """)
+        for (name,) in cursor.fetchall():
+            if name in keep:
+                continue
+            try:
+                cursor.execute(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}")
+                print(f"🗑️ 기존 인덱스 삭제: {name}")
+            except Exception as e:
+                print(f"❌ 인덱스 삭제 실패: {name}, {e}")
+    
+    # visibility map 갱신 (index-only scan 활성화)
+    cursor.execute("VACUUM (ANALYZE) stock_investor_trading")
+    cursor.close()
+    print(f"시계열 인덱스 적용 완료: {success_count}/{len(TIMESERIES_INDEXES)}")
+    return success_count == len(TIMESERIES_INDEXES)
 
 def check_existing_indexes(conn):
     """기존 인덱스를 확인합니다."""
@@ -177,6 +274,13 @@ def analyze_table_performance(conn):
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 인덱스 적용')
+    parser.add_argument('--profile', choices=sorted(INDEX_PROFILES), default='legacy',
+                        help='legacy: 기존 B-tree 구성, timeseries: BRIN + 커버링 인덱스')
+    parser.add_argument('--advanced', action='store_true', help='legacy 구성의 고급/부분 인덱스 포함')
+    parser.add_argument('--drop-others', action='store_true', help='timeseries 적용 후 구성에 없는 인덱스 삭제')
+    args = parser.parse_args()
+    
     print("=== 거래 데이터 인덱스 최적화 스크립트 ===")
     
     # 데이터베이스 연결
@@ -189,17 +293,21 @@ def main():
         # 기존 인덱스 확인
         existing_count = check_existing_indexes(conn)
         
-        # 기본 인덱스 적용
-        basic_success = apply_basic_indexes(conn)
-        
-        # 고급 인덱스 적용 (선택적)
-        if len(sys.argv) > 1 and sys.argv[1] == '--advanced':
-            advanced_success = apply_advanced_indexes(conn)
-            partial_success = apply_partial_indexes(conn)
+        if args.profile == 'timeseries':
+            basic_success = apply_timeseries_profile(conn, args.drop_others)
+            advanced_success = partial_success = True
         else:
-            print("\n고급 인덱스는 --advanced 옵션으로 적용할 수 있습니다.")
-            advanced_success = True
-            partial_success = True
+            # 기본 인덱스 적용
+            basic_success = apply_basic_indexes(conn)
+            
+            # 고급 인덱스 적용 (선택적)
+            if args.advanced:
+                advanced_success = apply_advanced_indexes(conn)
+                partial_success = apply_partial_indexes(conn)
+            else:
+                print("\n고급 인덱스는 --advanced 옵션으로 적용할 수 있습니다.")
+                advanced_success = True
+                partial_success = True
         
         # 최종 인덱스 확인
         final_count = check_existing_indexes(conn)
@@ -212,9 +320,9 @@ def main():
         print(f"기존 인덱스 수: {existing_count}")
         print(f"새로 추가된 인덱스 수: {final_count - existing_count}")
         print(f"총 인덱스 수: {final_count}")
-        print(f"기본 인덱스 적용: {'성공' if basic_success else '실패'}")
+        print(f"{'시계열' if args.profile == 'timeseries' else '기본'} 인덱스 적용: {'성공' if basic_success else '실패'}")
         
-        if len(sys.argv) > 1 and sys.argv[1] == '--advanced':
+        if args.advanced and args.profile == 'legacy':
             print(f"고급 인덱스 적용: {'성공' if advanced_success else '실패'}")
             print(f"부분 인덱스 적용: {'성공' if partial_success else '실패'}")
         
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 물리 정렬 유지 스크립트
+과거(cold) 파티션을 (stock_code, trade_date) 순서로 CLUSTER하여 종목별 조회의 페이지 접근을 줄입니다.
+
+사용법:
+    python scripts/database/cluster_trading.py --dry-run
+    python scripts/database/cluster_trading.py
+    python scripts/database/cluster_trading.py --include-hot --lock-timeout 30s
+
+주기 실행(예: 분기/연도 파티션이 닫힌 직후 야간 수집 이후)을 권장합니다.
+CLUSTER 중에는 해당 파티션의 조회/쓰기가 대기하므로 --include-hot은 수집이 없는 시간에만 사용하세요.
+효과는 scripts/benchmarks/trading_index_profiles.py --cluster 로 확인할 수 있습니다.
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from database.clustering import DEFAULT_MIN_CORRELATION, clustering_status, cluster_cold_partitions
+
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 단위로 변환합니다."""
+    size = float(size or 0)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def print_status(relations):
+    """정렬 상태를 출력합니다."""
+    for relation in relations:
+        correlation = relation['correlation']
+        label = 'DEFAULT' if relation['is_default'] else \
+            f"{relation['range_start']} ~ {relation['range_end']}" if relation['range_start'] else '-'
+        print(f"  {relation['name']:<40} {label:<26} 약 {relation['estimated_rows']:>12,}행"
+              f" | {format_bytes(relation['total_bytes']):>9}"
+              f" | 상관계수 {'N/A' if correlation is None else f'{correlation:.2f}':>5}"
+              f" | CLUSTER 인덱스 {relation['clustered_index'] or '-'}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 물리 정렬 유지')
+    parser.add_argument('--min-correlation', type=float, default=DEFAULT_MIN_CORRELATION,
+                        help='이 값 이상이면 이미 정렬된 것으로 간주')
+    parser.add_argument('--include-hot', action='store_true', help='쓰기 중인 파티션/일반 테이블도 포함')
+    parser.add_argument('--lock-timeout', default='5s', help='파티션별 잠금 대기 한도')
+    parser.add_argument('--dry-run', action='store_true', help='대상만 출력')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 물리 정렬 유지 ===")
+    app = create_app()
+    with app.app_context():
+        print("현재 상태:")
+        print_status(clustering_status())
+
+        results = cluster_cold_partitions(
+            min_correlation=args.min_correlation, include_hot=args.include_hot,
+            dry_run=args.dry_run, lock_timeout=args.lock_timeout
+        )
+        if not results:
+            print("\nCLUSTER 대상이 없습니다.")
+            return
+
+        print(f"\n대상 {len(results)}개:")
+        failed = 0
+        for result in results:
+            if args.dry_run:
+                print(f"  {result['name']:<40} {result['reason']} | 인덱스 {result['index'] or '없음'}")
+            elif result['success']:
+                print(f"✅ {result['name']} ({result['reason']}) - {result['seconds']:.1f}s")
+            else:
+                failed += 1
+                print(f"❌ {result['name']} 실패: {result['error']}")
+
+        if not args.dry_run:
+            print("\n정렬 후 상태:")
+            print_status(clustering_status())
+            if failed:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
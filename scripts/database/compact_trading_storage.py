@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 저장 형식 전환 스크립트
+stock_investor_trading을 압축 스키마로 온라인 전환합니다.
+
+변경 내용:
+    - trade_date: VARCHAR(10) → DATE
+    - institution_accum / foreigner_accum: INTEGER → BIGINT (누적 합 오버플로 방지)
+    - *_trend_score: DOUBLE PRECISION → REAL
+    - stock_name 컬럼 제거 (stock_list에서 조회)
+    - 정렬 패딩을 줄이도록 컬럼 순서 재배치
+
+사용법:
+    python scripts/database/compact_trading_storage.py
+    python scripts/database/compact_trading_storage.py --batch-size 20000 --batch-delay 0.1
+    python scripts/database/compact_trading_storage.py --report-only
+
+주의:
+    전환 후에는 새 모델(주식명 컬럼 없음)을 사용하는 애플리케이션만 쓰기가 가능합니다.
+    수집 작업을 멈춘 상태에서 실행하고, 완료 직후 애플리케이션을 배포하세요.
+    원본 테이블은 stock_investor_trading_legacy로 보존됩니다.
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from app import create_app
+from extensions import db
+from database.partitioning import (
+    TRADING_TABLE, TRADING_COLUMNS_DDL, PARTITIONED_INDEXES, SUPPORTED_INTERVALS,
+    create_partitioned_table, create_partition, is_partitioned, list_partitions, rename_dependents
+)
+from database.table_rebuild import OnlineTableRebuild
+from database.accumulation_view import create_accumulation_view
+from database.watermarks import create_watermark_triggers
+
+TARGET_TABLE = f'{TRADING_TABLE}_compact'
+LEGACY_TABLE = f'{TRADING_TABLE}_legacy'
+
+COLUMNS = [
+    'id', 'trade_date', 'institution_accum', 'foreigner_accum', 'close_price',
+    'institution_net_buy', 'foreigner_net_buy', 'institution_trend_score', 'foreigner_trend_score',
+    'stock_code', 'institution_trend_signal', 'foreigner_trend_signal'
+]
+
+# 원본(레거시) 컬럼을 새 타입으로 변환하는 식
+SELECT_EXPRESSIONS = [
+    'id', 'trade_date::date', 'institution_accum::bigint', 'foreigner_accum::bigint', 'close_price',
+    'institution_net_buy', 'foreigner_net_buy', 'institution_trend_score::real', 'foreigner_trend_score::real',
+    'stock_code', 'institution_trend_signal', 'foreigner_trend_signal'
+]
+
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 단위로 변환합니다."""
+    size = float(size or 0)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def table_size_report(table):
+    """테이블(파티션 포함)의 행 수 추정치와 힙/인덱스/전체 크기를 조회합니다."""
+    row = db.session.execute(text("""
+        SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint,
+               COALESCE(SUM(pg_table_size(t.relid)), 0),
+               COALESCE(SUM(pg_indexes_size(t.relid)), 0),
+               COALESCE(SUM(pg_total_relation_size(t.relid)), 0)
+        FROM pg_partition_tree(CAST(:table AS regclass)) t
+        JOIN pg_class c ON c.oid = t.relid
+        WHERE t.isleaf
+    """), {'table': table}).first()
+    return {
+        'estimated_rows': row[0],
+        'table_bytes': row[1],
+        'index_bytes': row[2],
+        'total_bytes': row[3]
+    }
+
+
+def print_report(label, report):
+    """크기 보고서를 출력합니다."""
+    rows = report['estimated_rows'] or 0
+    per_row = report['table_bytes'] / rows if rows else 0
+    print(f"[{label}] 약 {rows:,}행 | 테이블 {format_bytes(report['table_bytes'])} "
+          f"| 인덱스 {format_bytes(report['index_bytes'])} | 전체 {format_bytes(report['total_bytes'])} "
+          f"| 행당 {per_row:.1f}B")
+
+
+def has_legacy_schema():
+    """원본 테이블에 stock_name 컬럼이 남아 있는지 확인합니다."""
+    return bool(db.session.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = :table AND column_name = 'stock_name'
+        )
+    """), {'table': TRADING_TABLE}).scalar())
+
+
+def backfill_stock_names():
+    """stock_list에 없는 종목의 주식명을 거래 데이터에서 보충합니다 (가장 최근 이름 사용)."""
+    result = db.session.execute(text(f"""
+        INSERT INTO stock_list (stock_code, stock_name, institution_accum_init, foreigner_accum_init)
+        SELECT DISTINCT ON (t.stock_code) t.stock_code, t.stock_name, 0, 0
+        FROM {TRADING_TABLE} t
+        WHERE NOT EXISTS (SELECT 1 FROM stock_list s WHERE s.stock_code = t.stock_code)
+        ORDER BY t.stock_code, t.trade_date DESC
+    """))
+    db.session.commit()
+    return result.rowcount
+
+
+def create_target_table(interval):
+    """원본과 같은 구성(일반/파티션)으로 압축 스키마 대상 테이블을 생성합니다."""
+    with db.engine.begin() as conn:
+        if is_partitioned(TRADING_TABLE):
+            create_partitioned_table(conn, TARGET_TABLE, TRADING_COLUMNS_DDL)
+            for partition in list_partitions(TRADING_TABLE):
+                if partition['is_default'] or not partition['range_start']:
+                    continue
+                year = int(partition['range_start'][:4])
+                quarter = (int(partition['range_start'][5:7]) - 1) // 3 + 1
+                create_partition(conn, year, interval, quarter, table=TARGET_TABLE)
+        else:
+            conn.execute(text(f"CREATE TABLE {TARGET_TABLE} ({TRADING_COLUMNS_DDL})"))
+            for index_sql in PARTITIONED_INDEXES:
+                conn.execute(text(index_sql.format(table=TARGET_TABLE)))
+
+
+def print_progress(last_id, max_id):
+    """배치 복사 진행률을 출력합니다."""
+    percent = (last_id / max_id * 100) if max_id else 100
+    print(f"  복사 진행: id {last_id:,} / {max_id:,} ({percent:.1f}%)")
+
+
+def migrate(interval, batch_size, batch_delay):
+    """레거시 스키마를 압축 스키마로 전환합니다."""
+    if not has_legacy_schema():
+        print("이미 압축 스키마입니다. 전환을 건너뜁니다.")
+        return True
+
+    before = table_size_report(TRADING_TABLE)
+    print_report('전환 전', before)
+
+    added = backfill_stock_names()
+    print(f"stock_list 주식명 보충: {added}건")
+
+    create_target_table(interval)
+    print(f"대상 테이블 {TARGET_TABLE} 생성")
+
+    rebuild = OnlineTableRebuild(
+        TRADING_TABLE, TARGET_TABLE, COLUMNS, SELECT_EXPRESSIONS,
+        batch_size=batch_size, batch_delay=batch_delay
+    )
+
+    try:
+        max_id = rebuild.install_change_capture()
+        print(f"변경 추적 시작 (스냅샷 최대 id: {max_id:,})")
+        copied = rebuild.copy_existing(max_id, progress=print_progress)
+        print(f"기존 데이터 복사 완료: {copied:,}건")
+
+        replayed = rebuild.replay_changes()
+        print(f"변경분 재동기화: {replayed:,}건")
+
+        def finalize(conn):
+            conn.execute(text(f"ALTER SEQUENCE {TRADING_TABLE}_id_seq OWNED BY {TRADING_TABLE}.id"))
+            rename_dependents(conn, LEGACY_TABLE, f'{TRADING_TABLE}_', f'{LEGACY_TABLE}_')
+            rename_dependents(conn, TRADING_TABLE, f'{TARGET_TABLE}_', f'{TRADING_TABLE}_')
+            create_accumulation_view(conn)
+            create_watermark_triggers(conn)
+
+        rebuild.swap(LEGACY_TABLE, after_swap=finalize)
+        print(f"테이블 교체 완료 (원본 보존: {LEGACY_TABLE})")
+    except Exception as e:
+        print(f"전환 실패, 변경 추적을 정리합니다: {e}")
+        rebuild.abort()
+        return False
+
+    # 통계 갱신 후 크기 비교
+    db.session.execute(text(f"ANALYZE {TRADING_TABLE}"))
+    db.session.commit()
+    after = table_size_report(TRADING_TABLE)
+    print_report('전환 후', after)
+
+    if before['total_bytes']:
+        saved = 100 - after['total_bytes'] / before['total_bytes'] * 100
+        print(f"전체 크기 감소율: {saved:.1f}%")
+    return True
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 압축 스키마 전환')
+    parser.add_argument('--interval', choices=SUPPORTED_INTERVALS, default='year',
+                        help='원본이 파티션 테이블일 때 파티션 단위')
+    parser.add_argument('--batch-size', type=int, default=50000, help='배치 복사 크기 (id 구간)')
+    parser.add_argument('--batch-delay', type=float, default=0.0, help='배치 간 대기 시간 (초)')
+    parser.add_argument('--report-only', action='store_true', help='크기 보고서만 출력')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 저장 형식 전환 ===")
+    app = create_app()
+    with app.app_context():
+        if args.report_only:
+            print_report('현재', table_size_report(TRADING_TABLE))
+            return
+        if not migrate(args.interval, args.batch_size, args.batch_delay):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
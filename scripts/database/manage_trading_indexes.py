@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 인덱스 관리 스크립트
+인덱스 사용 통계와 실제 쿼리 형태를 분석하여 중복/미사용 인덱스 정리와
+커버링 인덱스 생성을 제안하고, CONCURRENTLY 방식으로 적용합니다.
+
+사용법:
+    python scripts/database/manage_trading_indexes.py report
+    python scripts/database/manage_trading_indexes.py plan --query-log /var/log/postgresql/postgresql.log
+    python scripts/database/manage_trading_indexes.py apply --yes
+
+쿼리 통계는 pg_stat_statements 확장이 있으면 사용하고, 없으면 --query-log로 전달한
+로그(log_min_duration_statement 형식 또는 SQL 한 줄씩)를 사용합니다.
+"""
+import argparse
+import os
+import sys
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from database.index_advisor import (
+    TRADING_TABLE, QUERY_SHAPES, parse_index_definition, parse_query_log,
+    summarize_query_shapes, plan_index_changes
+)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def get_database_connection():
+    """데이터베이스 연결을 생성합니다 (CONCURRENTLY 실행을 위해 autocommit)."""
+    try:
+        database_url = os.getenv('DATABASE_URL')
+        if not database_url:
+            raise ValueError("DATABASE_URL 환경변수가 설정되지 않았습니다.")
+
+        conn = psycopg2.connect(database_url)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+    except Exception as e:
+        print(f"데이터베이스 연결 실패: {e}")
+        return None
+
+
+def fetch_indexes(cursor):
+    """거래 테이블의 인덱스 정의를 조회합니다."""
+    cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = %s", (TRADING_TABLE,))
+    indexes = []
+    for (indexdef,) in cursor.fetchall():
+        parsed = parse_index_definition(indexdef)
+        if parsed:
+            indexes.append(parsed)
+        else:
+            print(f"  (해석 불가, 분석 제외) {indexdef}")
+    return indexes
+
+
+def fetch_index_usage(cursor):
+    """
+    인덱스별 스캔 수와 크기를 조회합니다.
+    파티션 테이블이면 파티션 인덱스의 통계를 부모 인덱스 기준으로 합산합니다.
+    """
+    cursor.execute("""
+        SELECT COALESCE(parent.relname, s.indexrelname) AS index_name,
+               SUM(s.idx_scan)::bigint,
+               SUM(pg_relation_size(s.indexrelid))::bigint
+        FROM pg_stat_user_indexes s
+        LEFT JOIN pg_inherits i ON i.inhrelid = s.indexrelid
+        LEFT JOIN pg_class parent ON parent.oid = i.inhparent
+        WHERE s.relid IN (SELECT relid FROM pg_partition_tree(%s::regclass))
+        GROUP BY 1
+    """, (TRADING_TABLE,))
+    return {name: {'idx_scan': scans or 0, 'size_bytes': size or 0} for name, scans, size in cursor.fetchall()}
+
+
+def fetch_table_writes(cursor):
+    """테이블 쓰기 수 (인덱스를 갱신하는 INSERT/UPDATE/DELETE)와 통계 초기화 시점을 조회합니다."""
+    cursor.execute("""
+        SELECT COALESCE(SUM(n_tup_ins + n_tup_upd - n_tup_hot_upd + n_tup_del), 0)::bigint
+        FROM pg_stat_user_tables
+        WHERE relid IN (SELECT relid FROM pg_partition_tree(%s::regclass))
+    """, (TRADING_TABLE,))
+    writes = cursor.fetchone()[0]
+    cursor.execute("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+    return writes, cursor.fetchone()[0]
+
+
+def fetch_partitions(cursor):
+    """파티션 테이블이면 파티션 목록을, 아니면 None을 반환합니다."""
+    cursor.execute("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass AND c.relkind IN ('r', 'p')
+        ORDER BY c.relname
+    """, (TRADING_TABLE,))
+    rows = [name for (name,) in cursor.fetchall()]
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)", (TRADING_TABLE,))
+    return rows if cursor.fetchone()[0] else None
+
+
+def fetch_statements(cursor, query_log=None):
+    """pg_stat_statements 또는 로컬 쿼리 로그에서 거래 테이블 쿼리 통계를 읽습니다."""
+    if query_log:
+        with open(query_log, encoding='utf-8', errors='ignore') as f:
+            return parse_query_log(f), f'로그 파일 ({query_log})'
+
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements')")
+    if not cursor.fetchone()[0]:
+        return None, None
+
+    cursor.execute("""
+        SELECT query, calls, total_exec_time
+        FROM pg_stat_statements
+        WHERE query ILIKE %s
+    """, (f'%{TRADING_TABLE}%',))
+    statements = [{'query': q, 'calls': c, 'total_time_ms': t} for q, c, t in cursor.fetchall()]
+    return statements, 'pg_stat_statements'
+
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 단위로 변환합니다."""
+    size = float(size or 0)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def analyze(cursor, args):
+    """인덱스 분석을 수행하고 보고서를 출력합니다."""
+    indexes = fetch_indexes(cursor)
+    usage = fetch_index_usage(cursor)
+    writes, stats_reset = fetch_table_writes(cursor)
+    partitions = fetch_partitions(cursor)
+    statements, source = fetch_statements(cursor, args.query_log)
+    shape_usage = summarize_query_shapes(statements) if statements is not None else None
+
+    print(f"=== 인덱스 현황 ({len(indexes)}개, 통계 기준: {stats_reset or '알 수 없음'}) ===")
+    print(f"테이블 쓰기 수: {writes:,}" + (f" | 파티션 {len(partitions)}개" if partitions is not None else ''))
+    for index in sorted(indexes, key=lambda i: i['name']):
+        stats = usage.get(index['name'], {})
+        include = f" INCLUDE ({', '.join(index['include'])})" if index['include'] else ''
+        predicate = f" WHERE {index['predicate']}" if index['predicate'] else ''
+        print(f"  {index['name']:<48} 스캔 {stats.get('idx_scan', 0):>10,} | {format_bytes(stats.get('size_bytes')):>9}"
+              f" | ({', '.join(index['columns'])}){include}{predicate}")
+
+    print("\n=== 쿼리 형태 ===")
+    if shape_usage is None:
+        print("  쿼리 통계 없음 (pg_stat_statements 미설치, --query-log 미지정) - 모든 형태를 대상으로 제안")
+    else:
+        print(f"  출처: {source}")
+        for shape in QUERY_SHAPES:
+            entry = shape_usage.get(shape['name'])
+            if entry:
+                print(f"  {shape['name']:<32} 호출 {entry['calls']:>10,} | 누적 {entry['total_time_ms']:,.0f}ms")
+            else:
+                print(f"  {shape['name']:<32} 호출 없음")
+
+    result = plan_index_changes(
+        indexes, usage, writes, shape_usage,
+        min_scans=args.min_scans, min_scans_per_1k_writes=args.min_ratio,
+        partitions=partitions
+    )
+
+    print("\n=== 중복 인덱스 ===")
+    for item in result['redundant'] or [{'name': '없음', 'reason': ''}]:
+        print(f"  {item['name']:<48} {item['reason']}")
+
+    print("\n=== 미사용/저효율 인덱스 ===")
+    for item in result['unused'] or [{'name': '없음', 'reason': ''}]:
+        print(f"  {item['name']:<48} {item['reason']}")
+
+    print("\n=== 커버링 인덱스 제안 ===")
+    for item in result['proposals'] or [{'name': '없음', 'reason': ''}]:
+        print(f"  {item['name']:<48} {item['reason']}")
+
+    return result['plan']
+
+
+def print_plan(plan):
+    """변경 계획을 출력합니다."""
+    print(f"\n=== 변경 계획 ({len(plan)}건) ===")
+    for step in plan:
+        print(f"-- [{step['action'].upper()}] {step['name']}: {step['reason']}")
+        for statement in step['statements']:
+            print(f"{statement};")
+
+
+def apply_plan(cursor, plan):
+    """변경 계획을 순서대로 적용합니다 (생성 실패 시 해당 인덱스의 삭제 단계는 중단)."""
+    print("\n=== 변경 적용 ===")
+    success_count = 0
+    for step in plan:
+        try:
+            for statement in step['statements']:
+                cursor.execute(statement)
+            print(f"✅ {step['action']} {step['name']}")
+            success_count += 1
+        except Exception as e:
+            print(f"❌ {step['action']} {step['name']} 실패: {e}")
+            if step['action'] == 'create':
+                print("커버링 인덱스 생성에 실패하여 이후 삭제 단계를 중단합니다.")
+                break
+    print(f"적용 완료: {success_count}/{len(plan)}")
+    return success_count == len(plan)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 인덱스 관리')
+    parser.add_argument('command', choices=['report', 'plan', 'apply'], nargs='?', default='report')
+    parser.add_argument('--query-log', help='pg_stat_statements 대신 사용할 쿼리 로그 파일')
+    parser.add_argument('--min-scans', type=int, default=0, help='이 값 이하 스캔 수는 미사용으로 간주')
+    parser.add_argument('--min-ratio', type=float, default=1.0, help='쓰기 1,000건당 최소 스캔 수')
+    parser.add_argument('--yes', action='store_true', help='apply 시 확인 없이 적용')
+    args = parser.parse_args()
+
+    conn = get_database_connection()
+    if not conn:
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        plan = analyze(cursor, args)
+
+        if args.command in ('plan', 'apply'):
+            print_plan(plan)
+
+        if args.command == 'apply':
+            if not plan:
+                print("적용할 변경이 없습니다.")
+            elif not args.yes:
+                print("\n--yes 옵션을 지정해야 적용됩니다.")
+            elif not apply_plan(cursor, plan):
+                sys.exit(1)
+        cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
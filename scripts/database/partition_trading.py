@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 테이블 파티션 전환 스크립트
+기존 일반 테이블 stock_investor_trading을 trade_date 기준 RANGE 파티션 테이블로 온라인 전환합니다.
+
+사용법:
+    python scripts/database/partition_trading.py --interval year
+    python scripts/database/partition_trading.py --interval quarter --batch-size 20000 --batch-delay 0.1
+
+전환 중에도 수집/조회는 계속 동작하며, 마지막 테이블명 교체 순간에만 짧게 잠금이 걸립니다.
+원본 테이블은 stock_investor_trading_legacy로 보존되므로 확인 후 직접 삭제하세요.
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from app import create_app
+from extensions import db
+from database.partitioning import (
+    TRADING_TABLE, TRADING_COLUMNS_DDL, LEGACY_TRADING_COLUMNS_DDL, SUPPORTED_INTERVALS,
+    create_partitioned_table, ensure_partitions, ensure_future_partitions, is_partitioned,
+    list_partitions, rename_dependents
+)
+from database.table_rebuild import OnlineTableRebuild
+from database.accumulation_view import create_accumulation_view
+from database.watermarks import create_watermark_triggers
+
+TARGET_TABLE = f'{TRADING_TABLE}_partitioned'
+LEGACY_TABLE = f'{TRADING_TABLE}_legacy'
+
+
+def get_source_columns():
+    """원본 테이블의 컬럼 목록을 조회합니다."""
+    return db.session.execute(text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = :table ORDER BY ordinal_position
+    """), {'table': TRADING_TABLE}).scalars().all()
+
+
+def get_source_date_range():
+    """원본 테이블의 거래일 범위를 조회합니다."""
+    row = db.session.execute(text(f"SELECT MIN(trade_date), MAX(trade_date) FROM {TRADING_TABLE}")).first()
+    if not row or not row[0]:
+        today = date.today()
+        return today, today
+    # 레거시 스키마는 trade_date가 문자열
+    return tuple(
+        datetime.strptime(value, '%Y-%m-%d').date() if isinstance(value, str) else value
+        for value in row
+    )
+
+
+def print_progress(last_id, max_id):
+    """배치 복사 진행률을 출력합니다."""
+    percent = (last_id / max_id * 100) if max_id else 100
+    print(f"  복사 진행: id {last_id:,} / {max_id:,} ({percent:.1f}%)")
+
+
+def migrate(interval, periods_ahead, batch_size, batch_delay):
+    """일반 테이블을 파티션 테이블로 전환합니다."""
+    if is_partitioned(TRADING_TABLE):
+        print("이미 파티션 테이블입니다. 전환을 건너뜁니다.")
+        return True
+
+    start, end = get_source_date_range()
+    print(f"원본 데이터 범위: {start} ~ {end}")
+
+    # 원본 스키마 그대로 파티션 테이블을 구성 (스키마 변경은 compact_trading_storage.py)
+    columns = get_source_columns()
+    columns_ddl = LEGACY_TRADING_COLUMNS_DDL if 'stock_name' in columns else TRADING_COLUMNS_DDL
+
+    # 1. 대상 파티션 테이블과 기간별 파티션 생성
+    with db.engine.begin() as conn:
+        create_partitioned_table(conn, TARGET_TABLE, columns_ddl)
+    created = ensure_partitions(start, end, interval, table=TARGET_TABLE)
+    print(f"대상 테이블 {TARGET_TABLE} 생성 (파티션 {len(created)}개)")
+
+    rebuild = OnlineTableRebuild(
+        TRADING_TABLE, TARGET_TABLE, columns,
+        batch_size=batch_size, batch_delay=batch_delay
+    )
+
+    try:
+        # 2. 변경 추적 시작 후 기존 데이터 복사
+        max_id = rebuild.install_change_capture()
+        print(f"변경 추적 시작 (스냅샷 최대 id: {max_id:,})")
+        copied = rebuild.copy_existing(max_id, progress=print_progress)
+        print(f"기존 데이터 복사 완료: {copied:,}건")
+
+        # 3. 복사 중 발생한 변경분 반영
+        replayed = rebuild.replay_changes()
+        print(f"변경분 재동기화: {replayed:,}건")
+
+        # 4. 테이블명 교체 (인덱스/시퀀스 소유권 정리 포함)
+        def finalize(conn):
+            conn.execute(text(f"ALTER SEQUENCE {TRADING_TABLE}_id_seq OWNED BY {TRADING_TABLE}.id"))
+            rename_dependents(conn, LEGACY_TABLE, f'{TRADING_TABLE}_', f'{LEGACY_TABLE}_')
+            rename_dependents(conn, TRADING_TABLE, f'{TARGET_TABLE}_', f'{TRADING_TABLE}_')
+            create_accumulation_view(conn)
+            create_watermark_triggers(conn)
+
+        rebuild.swap(LEGACY_TABLE, after_swap=finalize)
+        print(f"테이블 교체 완료 (원본 보존: {LEGACY_TABLE})")
+    except Exception as e:
+        print(f"전환 실패, 변경 추적을 정리합니다: {e}")
+        rebuild.abort()
+        return False
+
+    # 5. 미래 파티션 사전 생성
+    future = ensure_future_partitions(interval, periods_ahead)
+    if future:
+        print(f"미래 파티션 생성: {', '.join(future)}")
+
+    for partition in list_partitions():
+        label = 'DEFAULT' if partition['is_default'] else f"{partition['range_start']} ~ {partition['range_end']}"
+        print(f"  {partition['name']:<40} {label:<26} 약 {partition['estimated_rows']:,}행")
+    return True
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='거래 데이터 테이블 파티션 전환')
+    parser.add_argument('--interval', choices=SUPPORTED_INTERVALS, default='year', help='파티션 단위')
+    parser.add_argument('--premake', type=int, default=1, help='미리 생성할 미래 기간 수')
+    parser.add_argument('--batch-size', type=int, default=50000, help='배치 복사 크기 (id 구간)')
+    parser.add_argument('--batch-delay', type=float, default=0.0, help='배치 간 대기 시간 (초)')
+    args = parser.parse_args()
+
+    print("=== 거래 데이터 파티션 전환 ===")
+    app = create_app()
+    with app.app_context():
+        if not migrate(args.interval, args.premake, args.batch_size, args.batch_delay):
+            sys.exit(1)
+
+    print(f"\n완료. 애플리케이션 환경변수에 TRADING_PARTITION_INTERVAL={args.interval} 을 설정하세요.")
+
+
+if __name__ == "__main__":
+    main()
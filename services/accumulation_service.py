@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+누적 순매수 서비스 계층
+기관/외국인 누적 순매수(institution_accum, foreigner_accum)를 DB 안에서 집합 단위로 계산합니다.
+"""
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+from flask import current_app
+from sqlalchemy import text
+from extensions import db
+from database.accumulation_view import ACCUM_VIEW
+from database.routing import replica_read
+from database.cache_invalidation import invalidate_trading, trading_tags
+from core.cache import cached
+
+logger = logging.getLogger(__name__)
+
+TRADING_TABLE = 'stock_investor_trading'
+
+
+class AccumulationService:
+    """누적 순매수 계산 관련 비즈니스 로직을 처리하는 서비스 클래스"""
+
+    @staticmethod
+    def _summarize(rows) -> Dict[str, any]:
+        """UPDATE ... RETURNING 결과를 종목별 갱신 행 수로 집계하고, 갱신된 종목의 조회 캐시를 커밋 후 무효화하도록 등록합니다."""
+        updated_by_stock = {stock_code: count for stock_code, count in rows}
+        invalidate_trading(updated_by_stock)
+        return {
+            'updated_rows': sum(updated_by_stock.values()),
+            'updated_by_stock': updated_by_stock
+        }
+
+    @staticmethod
+    def recompute_accumulation(stock_codes: Optional[List[str]] = None) -> Dict[str, any]:
+        """
+        윈도 함수로 누적 순매수를 전체 재계산 (초기값 0)
+
+        종목별 SUM(...) OVER (PARTITION BY stock_code ORDER BY trade_date) 결과로
+        UPDATE 한 번에 갱신하며, 값이 바뀐 행만 기록합니다.
+
+        Args:
+            stock_codes (Optional[List[str]]): 대상 종목 코드 목록 (None이면 전체 종목)
+
+        Returns:
+            Dict: updated_rows (갱신 행 수), updated_by_stock (종목별 갱신 행 수)
+        """
+        try:
+            stock_filter = "WHERE stock_code = ANY(:stock_codes)" if stock_codes is not None else ""
+            params = {'stock_codes': list(stock_codes)} if stock_codes is not None else {}
+
+            rows = db.session.execute(text(f"""
+                WITH running AS (
+                    SELECT id, trade_date,
+                           SUM(COALESCE(institution_net_buy, 0)) OVER w AS institution_accum,
+                           SUM(COALESCE(foreigner_net_buy, 0)) OVER w AS foreigner_accum
+                    FROM {TRADING_TABLE}
+                    {stock_filter}
+                    WINDOW w AS (PARTITION BY stock_code ORDER BY trade_date, id ROWS UNBOUNDED PRECEDING)
+                ), updated AS (
+                    UPDATE {TRADING_TABLE} t
+                    SET institution_accum = r.institution_accum,
+                        foreigner_accum = r.foreigner_accum
+                    FROM running r
+                    WHERE t.id = r.id AND t.trade_date = r.trade_date
+                      AND (t.institution_accum IS DISTINCT FROM r.institution_accum
+                           OR t.foreigner_accum IS DISTINCT FROM r.foreigner_accum)
+                    RETURNING t.stock_code
+                )
+                SELECT stock_code, COUNT(*) FROM updated GROUP BY stock_code
+            """), params).all()
+
+            # 트랜잭션은 호출하는 쪽에서 관리됨
+            result = AccumulationService._summarize(rows)
+            logger.info(f"누적 순매수 재계산: {len(result['updated_by_stock'])}개 종목, {result['updated_rows']}건 갱신")
+            return result
+
+        except Exception as e:
+            raise Exception(f"누적 순매수 재계산 중 오류 발생: {str(e)}") from e
+
+    @staticmethod
+    def extend_accumulation(from_dates: Dict[str, date]) -> Dict[str, any]:
+        """
+        지정한 날짜 이후의 누적 순매수만 증분 갱신
+
+        종목별로 from_date 직전 행의 누적값을 기준으로 from_date 이후 행만 다시 계산합니다.
+        직전 행의 누적값이 비어 있으면(한 번도 계산되지 않은 경우) 해당 종목은 처음부터 계산합니다.
+
+        Args:
+            from_dates (Dict[str, date]): 종목 코드 → 새로 추가/수정된 가장 이른 거래일
+
+        Returns:
+            Dict: updated_rows (갱신 행 수), updated_by_stock (종목별 갱신 행 수)
+        """
+        if not from_dates:
+            return {'updated_rows': 0, 'updated_by_stock': {}}
+
+        try:
+            stock_codes = list(from_dates)
+            dates = [from_dates[code] for code in stock_codes]
+
+            rows = db.session.execute(text(f"""
+                WITH changed AS (
+                    SELECT * FROM unnest(CAST(:stock_codes AS varchar[]), CAST(:dates AS date[]))
+                        AS c(stock_code, from_date)
+                ), base AS (
+                    SELECT c.stock_code,
+                           CASE WHEN p.incomplete THEN DATE '0001-01-01' ELSE c.from_date END AS from_date,
+                           CASE WHEN p.incomplete THEN 0 ELSE COALESCE(p.institution_accum, 0) END AS institution_base,
+                           CASE WHEN p.incomplete THEN 0 ELSE COALESCE(p.foreigner_accum, 0) END AS foreigner_base
+                    FROM changed c
+                    LEFT JOIN LATERAL (
+                        SELECT t.institution_accum, t.foreigner_accum,
+                               (t.institution_accum IS NULL OR t.foreigner_accum IS NULL) AS incomplete
+                        FROM {TRADING_TABLE} t
+                        WHERE t.stock_code = c.stock_code AND t.trade_date < c.from_date
+                        ORDER BY t.trade_date DESC, t.id DESC
+                        LIMIT 1
+                    ) p ON TRUE
+                ), running AS (
+                    SELECT t.id, t.trade_date,
+                           b.institution_base + SUM(COALESCE(t.institution_net_buy, 0)) OVER w AS institution_accum,
+                           b.foreigner_base + SUM(COALESCE(t.foreigner_net_buy, 0)) OVER w AS foreigner_accum
+                    FROM {TRADING_TABLE} t
+                    JOIN base b ON b.stock_code = t.stock_code AND t.trade_date >= b.from_date
+                    WINDOW w AS (PARTITION BY t.stock_code ORDER BY t.trade_date, t.id ROWS UNBOUNDED PRECEDING)
+                ), updated AS (
+                    UPDATE {TRADING_TABLE} t
+                    SET institution_accum = r.institution_accum,
+                        foreigner_accum = r.foreigner_accum
+                    FROM running r
+                    WHERE t.id = r.id AND t.trade_date = r.trade_date
+                      AND (t.institution_accum IS DISTINCT FROM r.institution_accum
+                           OR t.foreigner_accum IS DISTINCT FROM r.foreigner_accum)
+                    RETURNING t.stock_code
+                )
+                SELECT stock_code, COUNT(*) FROM updated GROUP BY stock_code
+            """), {'stock_codes': stock_codes, 'dates': dates}).all()
+
+            # 트랜잭션은 호출하는 쪽에서 관리됨
+            result = AccumulationService._summarize(rows)
+            logger.debug(f"누적 순매수 증분 갱신: {len(stock_codes)}개 종목, {result['updated_rows']}건 갱신")
+            return result
+
+        except Exception as e:
+            raise Exception(f"누적 순매수 증분 갱신 중 오류 발생: {str(e)}") from e
+
+    @staticmethod
+    def find_stale_dates(stock_codes: Optional[List[str]] = None) -> Dict[str, date]:
+        """
+        누적값이 직전 누적값 + 당일 순매수와 맞지 않는 가장 이른 거래일을 종목별로 조회
+
+        새로 추가되어 누적값이 비어 있는 행과 순매수가 수정된 행을 함께 찾습니다 (읽기 전용).
+
+        Args:
+            stock_codes (Optional[List[str]]): 대상 종목 코드 목록 (None이면 전체 종목)
+
+        Returns:
+            Dict[str, date]: 종목 코드 → 증분 갱신을 시작할 거래일
+        """
+        try:
+            stock_filter = "WHERE stock_code = ANY(:stock_codes)" if stock_codes is not None else ""
+            params = {'stock_codes': list(stock_codes)} if stock_codes is not None else {}
+
+            rows = db.session.execute(text(f"""
+                SELECT stock_code, MIN(trade_date)
+                FROM (
+                    SELECT stock_code, trade_date, institution_accum, foreigner_accum,
+                           COALESCE(LAG(institution_accum) OVER w, 0) + COALESCE(institution_net_buy, 0) AS institution_expected,
+                           COALESCE(LAG(foreigner_accum) OVER w, 0) + COALESCE(foreigner_net_buy, 0) AS foreigner_expected
+                    FROM {TRADING_TABLE}
+                    {stock_filter}
+                    WINDOW w AS (PARTITION BY stock_code ORDER BY trade_date, id)
+                ) s
+                WHERE institution_accum IS DISTINCT FROM institution_expected
+                   OR foreigner_accum IS DISTINCT FROM foreigner_expected
+                GROUP BY stock_code
+            """), params).all()
+            return {stock_code: from_date for stock_code, from_date in rows}
+
+        except Exception as e:
+            raise Exception(f"누적 순매수 변경 구간 조회 중 오류 발생: {str(e)}") from e
+
+    @staticmethod
+    def refresh_accumulation(stock_codes: Optional[List[str]] = None) -> Dict[str, any]:
+        """
+        변경 구간을 찾아 해당 종목의 뒷부분만 증분 갱신
+
+        Args:
+            stock_codes (Optional[List[str]]): 대상 종목 코드 목록 (None이면 전체 종목)
+
+        Returns:
+            Dict: stale_stocks (변경 구간이 있는 종목 수), updated_rows, updated_by_stock
+        """
+        stale = AccumulationService.find_stale_dates(stock_codes)
+        result = AccumulationService.extend_accumulation(stale)
+        result['stale_stocks'] = len(stale)
+        return result
+
+    @staticmethod
+    @cached(lambda stock_code, **arguments: trading_tags(stock_code))
+    @replica_read
+    def get_accumulated_series(
+        stock_code: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        use_cache: Optional[bool] = None
+    ) -> List[Dict[str, any]]:
+        """
+        종목의 누적 순매수 시계열 조회 (stock_list 누적 초기값 포함)
+
+        캐시를 사용하면 저장된 누계에 초기값을 더하고, 사용하지 않으면 누적 뷰에서 조회 시점에 계산합니다.
+
+        Args:
+            stock_code (str): 주식 코드
+            start_date (Optional[str]): 시작 날짜 (YYYY-MM-DD)
+            end_date (Optional[str]): 종료 날짜 (YYYY-MM-DD)
+            use_cache (Optional[bool]): 저장된 누계 사용 여부 (None이면 ACCUM_CACHE_ENABLED 설정)
+
+        Returns:
+            List[Dict]: 거래일 오름차순 trade_date, close_price, 순매수, 누적 순매수
+        """
+        try:
+            if use_cache is None:
+                use_cache = current_app.config.get('ACCUM_CACHE_ENABLED', True)
+
+            if use_cache:
+                source = f"""
+                    (SELECT t.id, t.stock_code, t.trade_date, t.close_price,
+                            t.institution_net_buy, t.foreigner_net_buy,
+                            COALESCE(s.institution_accum_init, 0) + t.institution_accum AS institution_accum,
+                            COALESCE(s.foreigner_accum_init, 0) + t.foreigner_accum AS foreigner_accum
+                     FROM {TRADING_TABLE} t
+                     LEFT JOIN stock_list s ON s.stock_code = t.stock_code
+                     WHERE t.stock_code = :stock_code) a
+                """
+            else:
+                source = f"{ACCUM_VIEW} a"
+
+            conditions = ["a.stock_code = :stock_code"]
+            params = {'stock_code': stock_code}
+            if start_date:
+                conditions.append("a.trade_date >= CAST(:start_date AS date)")
+                params['start_date'] = start_date
+            if end_date:
+                conditions.append("a.trade_date <= CAST(:end_date AS date)")
+                params['end_date'] = end_date
+
+            rows = db.session.execute(text(f"""
+                SELECT a.trade_date, a.close_price, a.institution_net_buy, a.foreigner_net_buy,
+                       a.institution_accum, a.foreigner_accum
+                FROM {source}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY a.trade_date, a.id
+            """), params).mappings().all()
+
+            return [
+                {**row, 'trade_date': row['trade_date'].isoformat()}
+                for row in rows
+            ]
+
+        except Exception as e:
+            raise Exception(f"누적 순매수 시계열 조회 중 오류 발생: {str(e)}") from e
@@ -6,7 +6,7 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import time
 import logging
 from typing import Dict, List, Optional
@@ -14,11 +14,19 @@ from extensions import db
 from models.stock import StockList
 from services.stock_service import StockService
 from services.trading_service import TradingService
+from services.accumulation_service import AccumulationService
+from services.trend_service import TrendService
 import re
 import psutil
 import gc
 from sqlalchemy.exc import OperationalError
 from sqlalchemy import text
+from flask import current_app
+from database.partitioning import TRADING_TABLE, is_partitioned, ensure_future_partitions, clear_partitions
+from database.watermarks import refresh_coverage
+from database.transaction import is_disconnect_error
+from database.cache_invalidation import invalidate_trading
+from core.metrics import metrics
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -40,6 +48,7 @@ class DataCollectorService:
     # 기본 설정
     BASE_URL = "https://finance.naver.com/item/frgn.naver"
     REQUEST_DELAY = 1.0  # 요청 간 대기 시간 (초)
+    INCREMENTAL_YEARS = 1  # 증분 크롤링의 수집 기간 (년 단위, 최신 데이터 위주)
     
     # 장시간 배치 처리를 위한 설정
     BATCH_SIZE = 50  # 한 번에 처리할 주식 수
@@ -296,18 +305,17 @@ class DataCollectorService:
                             foreigner_net_text = cols[6].get_text(strip=True).replace(',', '').replace('+', '').replace('--', '0')
                             foreigner_net = int(foreigner_net_text) if foreigner_net_text and foreigner_net_text.lstrip('-').isdigit() else 0
 
-                            # 누적 데이터는 크롤링에서 수집하지 않음 (기본값 0으로 설정)
-                            # 나중에 별도 계산 로직으로 채워넣을 예정
-                            institution_accum = 0
-                            foreigner_accum = 0
+                            # 누적 데이터는 크롤링에서 수집하지 않음 (저장 후 증분 갱신 또는 누적 뷰에서 계산)
+                            institution_accum = None
+                            foreigner_accum = None
 
                             data_row = {
                                 'trade_date': trade_date.date(),
                                 'close_price': close_price,
                                 'institution_net_buy': institution_net,
                                 'foreigner_net_buy': foreigner_net,
-                                'institution_accum': institution_accum,  # 크롤링에서는 0으로 설정
-                                'foreigner_accum': foreigner_accum        # 크롤링에서는 0으로 설정
+                                'institution_accum': institution_accum,  # 크롤링에서는 비워 둠
+                                'foreigner_accum': foreigner_accum        # 크롤링에서는 비워 둠
                             }
                             
                             page_data_list.append(data_row)
@@ -424,15 +432,7 @@ class DataCollectorService:
             # 재시도 로직
             for attempt in range(max_retries):
                 try:
-                    # 연결 상태 확인 및 재연결
-                    try:
-                        db.session.execute(text("SELECT 1"))
-                    except Exception as conn_error:
-                        logger.warning(f"데이터베이스 연결 확인 실패, 세션 재생성: {conn_error}")
-                        db.session.close()
-                        db.session.remove()
-                    
-                    # 모든 데이터를 세션에 추가
+                    # 모든 데이터를 세션에 추가 (사전 연결 확인 없이 실행, 연결 끊김은 OperationalError로 감지)
                     for trading_data in new_data_list:
                         db.session.add(trading_data)
                     
@@ -447,7 +447,8 @@ class DataCollectorService:
                     db.session.close()
                     db.session.remove()
                     
-                    if "server closed the connection" in str(e).lower() or "connection" in str(e).lower():
+                    if is_disconnect_error(e):
+                        metrics.increment('db.write_retries', labels={'job': 'save_trading_data'})
                         logger.warning(f"데이터베이스 연결 끊김, {retry_delay}초 후 재시도 ({attempt + 1}/{max_retries}): {stock_code}")
                         time.sleep(retry_delay)
                         retry_delay *= 2
@@ -472,6 +473,26 @@ class DataCollectorService:
             
             logger.debug(f"저장 완료: {stock_code} ({total_saved}건)")
             
+            earliest_date = min(trading_data.trade_date for trading_data in new_data_list)
+            
+            # 새로 저장된 가장 이른 날짜부터 누적 순매수 캐시 증분 갱신 (캐시를 끄면 누적 뷰에서 계산)
+            if current_app.config.get('ACCUM_CACHE_ENABLED', True):
+                try:
+                    AccumulationService.extend_accumulation({stock_code: earliest_date})
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning(f"누적 순매수 증분 갱신 실패 (다음 계산 시 반영): {stock_code}, {e}")
+            
+            # 저장된 지표 상태에서 새 거래일의 트렌드 신호/점수만 이어서 계산
+            if current_app.config.get('TREND_STREAMING_ENABLED', True):
+                try:
+                    TrendService.advance_trends(from_dates={stock_code: earliest_date})
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning(f"트렌드 증분 갱신 실패 (다음 계산 시 반영): {stock_code}, {e}")
+            
             # 히스토리 로깅 (배치 처리 완료 후)
             if total_saved > 0:
                 try:
@@ -500,31 +521,34 @@ class DataCollectorService:
             stock_code (str): 주식 코드
             
         Returns:
-            Dict: 기존 데이터 정보 (최소/최대 날짜, 레코드 수) 또는 None
+            Dict: 기존 데이터 정보 (최소/최대 날짜 YYYY-MM-DD, 레코드 수) 또는 None
         """
         try:
             from models.trading import StockInvestorTrading
-            
-            # 기존 데이터 조회
-            existing_data = db.session.query(StockInvestorTrading).filter(
+            from sqlalchemy import func
+            
+            # 집계 한 번으로 범위와 건수 조회
+            min_date, max_date, record_count = db.session.query(
+                func.min(StockInvestorTrading.trade_date),
+                func.max(StockInvestorTrading.trade_date),
+                func.count(StockInvestorTrading.id)
+            ).filter(
                 StockInvestorTrading.stock_code == stock_code
-            ).order_by(StockInvestorTrading.trade_date).all()
+            ).one()
             
-            if not existing_data:
+            if not record_count:
                 return None
             
-            min_date = min(data.trade_date for data in existing_data)
-            max_date = max(data.trade_date for data in existing_data)
-            record_count = len(existing_data)
-            
             return {
-                'min_date': min_date,
-                'max_date': max_date,
+                'min_date': min_date.isoformat(),
+                'max_date': max_date.isoformat(),
                 'record_count': record_count,
                 'has_data': True
             }
             
         except Exception as e:
+            # 실패한 트랜잭션을 정리하여 이후 저장이 새 연결에서 실행되도록 함
+            db.session.rollback()
             logger.error(f"기존 데이터 범위 확인 실패: {stock_code}, {e}")
             return None
     
@@ -544,43 +568,47 @@ class DataCollectorService:
             # 기존 데이터 확인
             existing_info = DataCollectorService.get_existing_data_range(stock_code)
             
+            # 목표 날짜 계산 (현재 날짜에서 target_years년 전)
+            today = date.today()
+            target_date = today - timedelta(days=target_years * 365)
+            
             if not existing_info:
                 return {
                     'should_collect': True,
                     'reason': '기존 데이터 없음',
                     'existing_info': None,
-                    'target_date': datetime.now() - timedelta(days=target_years * 365)
+                    'target_date': target_date.isoformat()
                 }
             
-            # 목표 날짜 계산 (현재 날짜에서 target_years년 전)
-            target_date = datetime.now() - timedelta(days=target_years * 365)
+            min_date = date.fromisoformat(existing_info['min_date'])
+            max_date = date.fromisoformat(existing_info['max_date'])
             
-            # 기존 데이터가 목표 날짜보다 최신인지 확인
-            if existing_info['min_date'] <= target_date:
+            # 기존 데이터가 목표 날짜까지 거슬러 올라가는지 확인
+            if min_date > target_date:
                 return {
                     'should_collect': True,
                     'reason': f'기존 데이터가 {target_years}년 전까지 포함하지 않음',
                     'existing_info': existing_info,
-                    'target_date': target_date,
-                    'missing_period': f"{target_date.strftime('%Y-%m-%d')} ~ {existing_info['min_date'].strftime('%Y-%m-%d')}"
+                    'target_date': target_date.isoformat(),
+                    'missing_period': f"{target_date.isoformat()} ~ {existing_info['min_date']}"
                 }
             
             # 최신 데이터 확인 (최근 30일 이내 데이터가 있는지)
-            recent_threshold = datetime.now() - timedelta(days=30)
-            if existing_info['max_date'] < recent_threshold:
+            recent_threshold = today - timedelta(days=30)
+            if max_date < recent_threshold:
                 return {
                     'should_collect': True,
-                    'reason': f'최신 데이터 부족 (최신: {existing_info["max_date"].strftime("%Y-%m-%d")})',
+                    'reason': f'최신 데이터 부족 (최신: {existing_info["max_date"]})',
                     'existing_info': existing_info,
-                    'target_date': recent_threshold,
-                    'missing_period': f"{existing_info['max_date'].strftime('%Y-%m-%d')} ~ 현재"
+                    'target_date': recent_threshold.isoformat(),
+                    'missing_period': f"{existing_info['max_date']} ~ 현재"
                 }
             
             return {
                 'should_collect': False,
                 'reason': '충분한 데이터 보유',
                 'existing_info': existing_info,
-                'target_date': target_date
+                'target_date': target_date.isoformat()
             }
             
         except Exception as e:
@@ -589,7 +617,7 @@ class DataCollectorService:
                 'should_collect': True,
                 'reason': f'확인 실패: {str(e)}',
                 'existing_info': None,
-                'target_date': datetime.now() - timedelta(days=target_years * 365)
+                'target_date': (date.today() - timedelta(days=target_years * 365)).isoformat()
             }
     
     @staticmethod
@@ -657,6 +685,7 @@ class DataCollectorService:
             from services.trading_service import TradingService
             
             logger.info(f"증분 크롤링 시작 - 기간: 최근 {days_back}일, 강제수집: {force_collect}")
+            DataCollectorService.prepare_partitions(years=DataCollectorService.INCREMENTAL_YEARS)
             
             results = {
                 'total_stocks': 0,
@@ -719,7 +748,7 @@ class DataCollectorService:
                     # 데이터 크롤링 (최신 데이터 위주로 적은 페이지만)
                     df = DataCollectorService.fetch_stock_data(
                         stock.stock_code, 
-                        years=1,  # 1년으로 제한 (최신 데이터 위주)
+                        years=DataCollectorService.INCREMENTAL_YEARS,  # 최신 데이터 위주로 제한
                         max_pages=max_pages
                     )
                     
@@ -816,6 +845,8 @@ class DataCollectorService:
         }
         
         try:
+            DataCollectorService.prepare_partitions(years)
+            
             # 1. DB에서 주식 목록 조회
             stocks = StockService.get_all_stocks()
             results['total_stocks'] = len(stocks)
@@ -857,15 +888,6 @@ class DataCollectorService:
                             db.session.remove()
                             time.sleep(2)
                         
-                        # 데이터베이스 연결 상태 확인
-                        try:
-                            db.session.execute(text("SELECT 1"))
-                        except Exception as conn_error:
-                            logger.warning(f"데이터베이스 연결 확인 실패, 세션 재생성: {conn_error}")
-                            db.session.close()
-                            db.session.remove()
-                            time.sleep(2)
-                        
                         # 수집 필요 여부 미리 확인
                         collection_check = DataCollectorService.should_collect_data(stock.stock_code, years)
                         
@@ -896,6 +918,7 @@ class DataCollectorService:
                         time.sleep(DataCollectorService.REQUEST_DELAY)
                         
                     except OperationalError as e:
+                        metrics.increment('db.disconnects', labels={'mode': 'collect'})
                         results['failed_stocks'] += 1
                         results['failed_list'].append(f"{stock.stock_code} {stock.stock_name}: 연결 오류")
                         logger.error(f"데이터베이스 연결 오류: {stock.stock_code}, {e}")
@@ -931,61 +954,28 @@ class DataCollectorService:
             return results
 
     @staticmethod
-    def calculate_accumulated_data(stock_code: str) -> bool:
+    def calculate_accumulated_data(stock_code: str, incremental: bool = False) -> bool:
         """
         특정 주식의 누적 매수량 데이터를 계산하여 업데이트
-        (초기값 0, 기존 데이터 초기화 후 재계산)
+        (초기값 0, DB 윈도 함수로 한 번에 재계산)
         
         Args:
             stock_code (str): 주식 코드
+            incremental (bool): True이면 누적값이 맞지 않는 구간부터 뒷부분만 갱신
             
         Returns:
             bool: 계산 성공 여부
         """
         try:
-            from models.trading import StockInvestorTrading
+            logger.info(f"누적 데이터 계산 시작: {stock_code} ({'증분' if incremental else '전체'})")
             
-            logger.info(f"누적 데이터 계산 시작: {stock_code}")
-            
-            # 해당 주식의 모든 거래 데이터를 날짜순으로 조회 (오래된 것부터)
-            trading_data_list = StockInvestorTrading.query.filter_by(
-                stock_code=stock_code
-            ).order_by(StockInvestorTrading.trade_date.asc()).all()
-            
-            if not trading_data_list:
-                logger.info(f"거래 데이터가 없음: {stock_code}")
-                return True
-            
-            # 1단계: 기존 누적값을 모두 0으로 초기화
-            logger.info(f"기존 누적값 초기화: {stock_code}")
-            for trading_data in trading_data_list:
-                trading_data.institution_accum = 0
-                trading_data.foreigner_accum = 0
-            
-            # 2단계: 초기값을 0으로 시작하여 누적 계산
-            institution_accum = 0  # 초기값 0
-            foreigner_accum = 0    # 초기값 0
-            
-            updated_count = 0
-            
-            # 각 거래 데이터의 누적값 계산 (과거부터 최신까지)
-            for trading_data in trading_data_list:
-                # 순매수량을 누적값에 더함
-                institution_accum += trading_data.institution_net_buy or 0
-                foreigner_accum += trading_data.foreigner_net_buy or 0
-                
-                # 누적값 업데이트 (그날의 누적값이 됨)
-                trading_data.institution_accum = institution_accum
-                trading_data.foreigner_accum = foreigner_accum
-                
-                updated_count += 1
-                
-                logger.debug(f"{trading_data.trade_date}: 기관순매수={trading_data.institution_net_buy}, 기관누적={institution_accum}, 외국인순매수={trading_data.foreigner_net_buy}, 외국인누적={foreigner_accum}")
-            
-            # 배치로 저장
+            if incremental:
+                result = AccumulationService.refresh_accumulation([stock_code])
+            else:
+                result = AccumulationService.recompute_accumulation([stock_code])
             db.session.commit()
             
-            logger.info(f"누적 데이터 계산 완료: {stock_code}, {updated_count}건 업데이트 (초기값 0부터 시작)")
+            logger.info(f"누적 데이터 계산 완료: {stock_code}, {result['updated_rows']}건 업데이트 (초기값 0부터 시작)")
             return True
             
         except Exception as e:
@@ -994,9 +984,13 @@ class DataCollectorService:
             return False
     
     @staticmethod
-    def calculate_all_accumulated_data() -> Dict[str, any]:
+    def calculate_all_accumulated_data(incremental: bool = False) -> Dict[str, any]:
         """
         모든 주식의 누적 매수량 데이터를 계산
+        (전체 종목을 UPDATE 문 하나로 재계산)
+        
+        Args:
+            incremental (bool): True이면 누적값이 맞지 않는 종목의 뒷부분만 갱신
         
         Returns:
             Dict: 계산 결과 통계
@@ -1010,7 +1004,8 @@ class DataCollectorService:
                 'total_stocks': 0,
                 'success_stocks': 0,
                 'failed_stocks': 0,
-                'failed_list': []
+                'failed_list': [],
+                'updated_rows': 0
             }
             
             # 모든 주식 조회
@@ -1022,27 +1017,22 @@ class DataCollectorService:
                 results['error'] = "DB에 등록된 주식이 없습니다."
                 return results
             
-            # 각 주식별 누적 데이터 계산
-            for stock in stocks:
-                try:
-                    success = DataCollectorService.calculate_accumulated_data(stock.stock_code)
-                    
-                    if success:
-                        results['success_stocks'] += 1
-                    else:
-                        results['failed_stocks'] += 1
-                        results['failed_list'].append(f"{stock.stock_code} {stock.stock_name}")
-                        
-                except Exception as e:
-                    results['failed_stocks'] += 1
-                    results['failed_list'].append(f"{stock.stock_code} {stock.stock_name}: {str(e)}")
-                    logger.error(f"누적 데이터 계산 중 오류: {stock.stock_code}, {e}")
-                    continue
+            if incremental:
+                result = AccumulationService.refresh_accumulation()
+                results['stale_stocks'] = result['stale_stocks']
+            else:
+                result = AccumulationService.recompute_accumulation()
+            db.session.commit()
             
-            logger.info(f"전체 누적 데이터 계산 완료: 성공 {results['success_stocks']}개, 실패 {results['failed_stocks']}개")
+            results['success_stocks'] = len(stocks)
+            results['updated_rows'] = result['updated_rows']
+            results['updated_by_stock'] = result['updated_by_stock']
+            
+            logger.info(f"전체 누적 데이터 계산 완료: {len(stocks)}개 종목, {result['updated_rows']}건 갱신")
             return results
             
         except Exception as e:
+            db.session.rollback()
             logger.error(f"전체 누적 데이터 계산 중 오류: {e}")
             return {
                 'total_stocks': 0,
@@ -1052,6 +1042,74 @@ class DataCollectorService:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _is_trading_table_partitioned() -> bool:
+        """
+        stock_investor_trading 테이블이 선언적 파티션 테이블인지 확인
+        
+        Returns:
+            bool: 파티션 테이블 여부
+        """
+        return is_partitioned(TRADING_TABLE)
+    
+    @staticmethod
+    def prepare_partitions(years: Optional[int] = None) -> List[str]:
+        """
+        수집 시작 전 수집 구간(years년 전 ~ 앞으로 적재될 기간)의 파티션을 미리 생성
+        
+        과거 구간도 미리 만들어 두어야 수집한 과거 데이터가 DEFAULT 파티션에 쌓이지 않습니다.
+        파티션 설정이 없거나 파티션 테이블이 아니면 아무것도 하지 않으며,
+        실패해도 수집은 계속 진행합니다 (해당 기간 데이터는 DEFAULT 파티션에 저장되고 다음 생성 시 이동).
+        
+        Args:
+            years (Optional[int]): 수집할 기간 (년 단위, fetch_stock_data와 같은 기준) - None이면 현재 기간부터
+            
+        Returns:
+            List[str]: 새로 생성된 파티션명 목록
+        """
+        try:
+            interval = current_app.config.get('TRADING_PARTITION_INTERVAL')
+            if not interval:
+                return []
+            premake = current_app.config.get('TRADING_PARTITION_PREMAKE', 1)
+            start = date.today() - timedelta(days=years * 365) if years else None
+            created = ensure_future_partitions(interval, premake, start=start)
+            if created:
+                logger.info(f"파티션 생성: {', '.join(created)}")
+            return created
+        except Exception as e:
+            logger.warning(f"파티션 사전 생성 실패 (수집은 계속 진행): {str(e)}")
+            return []
+    
+    @staticmethod
+    def _delete_trading_data_by_codes(stock_codes: List[str]) -> Dict[str, int]:
+        """
+        여러 종목의 거래 데이터를 단일 DELETE 문으로 삭제 (커밋하지 않음)
+        
+        DELETE ... RETURNING 결과를 종목별로 집계하므로 사전 count() 없이
+        삭제 건수를 문장 자체에서 얻습니다. 같은 트랜잭션에서 해당 종목의 트렌드 지표 상태도 삭제합니다.
+        
+        Args:
+            stock_codes (List[str]): 주식 코드 목록
+            
+        Returns:
+            Dict[str, int]: 종목별 삭제 건수 (삭제된 행이 없는 종목은 0)
+        """
+        rows = db.session.execute(text("""
+            WITH deleted AS (
+                DELETE FROM stock_investor_trading
+                WHERE stock_code = ANY(:codes)
+                RETURNING stock_code
+            )
+            SELECT stock_code, COUNT(*) FROM deleted GROUP BY stock_code
+        """), {'codes': list(stock_codes)}).all()
+        
+        deleted_counts = {stock_code: 0 for stock_code in stock_codes}
+        deleted_counts.update({stock_code: count for stock_code, count in rows})
+        TrendService.clear_states(list(stock_codes))
+        invalidate_trading([stock_code for stock_code, _ in rows])
+        return deleted_counts
+    
     @staticmethod
     def clear_trading_data_by_stock(stock_code: str) -> bool:
         """
@@ -1064,33 +1122,26 @@ class DataCollectorService:
             bool: 삭제 성공 여부
         """
         try:
-            from models.trading import StockInvestorTrading
-            
             logger.info(f"거래 데이터 초기화 시작: {stock_code}")
             
-            # 해당 주식의 모든 거래 데이터 조회
-            trading_data_count = StockInvestorTrading.query.filter_by(stock_code=stock_code).count()
+            deleted_count = DataCollectorService._delete_trading_data_by_codes([stock_code])[stock_code]
+            db.session.commit()
             
-            if trading_data_count == 0:
+            if deleted_count == 0:
                 logger.info(f"삭제할 거래 데이터가 없음: {stock_code}")
                 return True
             
-            # 해당 주식의 모든 거래 데이터 삭제
-            deleted_count = StockInvestorTrading.query.filter_by(stock_code=stock_code).delete()
-            db.session.commit()
-            
             # 히스토리 로깅
-            if deleted_count > 0:
-                try:
-                    from services.history_service import HistoryService
-                    HistoryService.log_data_change(
-                        table_name='stock_investor_trading',
-                        record_id=None,  # 전체 삭제이므로 특정 ID 없음
-                        action='DELETE',
-                        description=f'종목별 데이터 삭제: {stock_code} ({deleted_count}건)'
-                    )
-                except Exception as e:
-                    logger.warning(f"히스토리 로깅 실패: {e}")
+            try:
+                from services.history_service import HistoryService
+                HistoryService.log_data_change(
+                    table_name='stock_investor_trading',
+                    record_id=None,  # 전체 삭제이므로 특정 ID 없음
+                    action='DELETE',
+                    description=f'종목별 데이터 삭제: {stock_code} ({deleted_count}건)'
+                )
+            except Exception as e:
+                logger.warning(f"히스토리 로깅 실패: {e}")
             
             logger.info(f"거래 데이터 초기화 완료: {stock_code}, {deleted_count}건 삭제")
             return True
@@ -1105,46 +1156,49 @@ class DataCollectorService:
         """
         모든 거래 데이터를 삭제
         
+        파티션 테이블이면 파티션을 분리(DETACH)해 삭제하고 같은 경계의 빈 파티션으로 다시 만들며,
+        일반 테이블이면 TRUNCATE로 한 번에 비웁니다. 트렌드 지표 상태도 같은 트랜잭션에서 삭제합니다.
+        두 방식 모두 삭제 건수를 알 수 없으므로 deleted_count는 None입니다 (추정치를 보고하지 않음).
+        
         Returns:
             Dict: 삭제 결과 통계
         """
         try:
-            from models.trading import StockInvestorTrading
-            
             logger.info("전체 거래 데이터 초기화 시작")
             
-            # 전체 거래 데이터 개수 확인
-            total_count = StockInvestorTrading.query.count()
-            
-            if total_count == 0:
-                logger.info("삭제할 거래 데이터가 없습니다.")
-                return {
-                    'deleted_count': 0,
-                    'message': '삭제할 거래 데이터가 없습니다.'
-                }
+            partitioned = DataCollectorService._is_trading_table_partitioned()
+            conn = db.session.connection()
             
-            # 모든 거래 데이터 삭제
-            deleted_count = StockInvestorTrading.query.delete()
+            if partitioned:
+                cleared = clear_partitions(conn)
+                # DETACH/DROP은 워터마크 트리거를 실행하지 않으므로 종목별 범위와 데이터 버전을 다시 계산
+                refresh_coverage(conn)
+            else:
+                cleared = []
+                conn.execute(text(f"TRUNCATE TABLE {TRADING_TABLE}"))
+            TrendService.clear_states()
+            invalidate_trading()
             db.session.commit()
             
             # 히스토리 로깅
-            if deleted_count > 0:
-                try:
-                    from services.history_service import HistoryService
-                    HistoryService.log_data_change(
-                        table_name='stock_investor_trading',
-                        record_id=None,  # 전체 삭제이므로 특정 ID 없음
-                        action='DELETE',
-                        description=f'전체 거래 데이터 삭제: {deleted_count}건'
-                    )
-                except Exception as e:
-                    logger.warning(f"히스토리 로깅 실패: {e}")
+            try:
+                from services.history_service import HistoryService
+                HistoryService.log_data_change(
+                    table_name='stock_investor_trading',
+                    record_id=None,  # 전체 삭제이므로 특정 ID 없음
+                    action='DELETE',
+                    description=f"전체 거래 데이터 삭제 ({'파티션 ' + str(len(cleared)) + '개 재생성' if partitioned else 'TRUNCATE'})"
+                )
+            except Exception as e:
+                logger.warning(f"히스토리 로깅 실패: {e}")
             
-            logger.info(f"전체 거래 데이터 초기화 완료: {deleted_count}건 삭제")
+            logger.info(f"전체 거래 데이터 초기화 완료 (파티션 테이블: {partitioned})")
             
             return {
-                'deleted_count': deleted_count,
-                'message': f'총 {deleted_count}건의 거래 데이터가 삭제되었습니다.'
+                'deleted_count': None,
+                'partitioned': partitioned,
+                'cleared_partitions': cleared,
+                'message': '모든 거래 데이터가 삭제되었습니다.'
             }
             
         except Exception as e:
@@ -1158,7 +1212,7 @@ class DataCollectorService:
     @staticmethod
     def clear_trading_data_by_stocks(stock_codes: List[str]) -> Dict[str, any]:
         """
-        여러 주식의 거래 데이터를 삭제
+        여러 주식의 거래 데이터를 삭제 (단일 DELETE 문)
         
         Args:
             stock_codes (List[str]): 주식 코드 목록
@@ -1174,30 +1228,47 @@ class DataCollectorService:
                 'success_stocks': 0,
                 'failed_stocks': 0,
                 'failed_list': [],
-                'total_deleted': 0
+                'total_deleted': 0,
+                'deleted_counts': {}
             }
             
+            # 유효하지 않은 코드는 실패로 분류하고 나머지만 한 번에 삭제
+            valid_codes = []
             for stock_code in stock_codes:
+                if isinstance(stock_code, str) and stock_code.strip():
+                    if stock_code.strip() not in valid_codes:
+                        valid_codes.append(stock_code.strip())
+                else:
+                    results['failed_stocks'] += 1
+                    results['failed_list'].append(str(stock_code))
+            
+            if valid_codes:
+                deleted_counts = DataCollectorService._delete_trading_data_by_codes(valid_codes)
+                db.session.commit()
+                
+                results['success_stocks'] = len(valid_codes)
+                results['deleted_counts'] = deleted_counts
+                results['total_deleted'] = sum(deleted_counts.values())
+            
+            # 히스토리 로깅 (일괄 삭제 1건으로 기록)
+            if results['total_deleted'] > 0:
                 try:
-                    success = DataCollectorService.clear_trading_data_by_stock(stock_code)
-                    
-                    if success:
-                        results['success_stocks'] += 1
-                    else:
-                        results['failed_stocks'] += 1
-                        results['failed_list'].append(stock_code)
-                        
+                    from services.history_service import HistoryService
+                    HistoryService.log_data_change(
+                        table_name='stock_investor_trading',
+                        record_id=None,
+                        action='DELETE',
+                        description=f"선택 종목 데이터 일괄 삭제: {len(valid_codes)}개 종목 ({results['total_deleted']}건)"
+                    )
                 except Exception as e:
-                    results['failed_stocks'] += 1
-                    results['failed_list'].append(f"{stock_code}: {str(e)}")
-                    logger.error(f"종목별 거래 데이터 초기화 중 오류: {stock_code}, {e}")
-                    continue
+                    logger.warning(f"히스토리 로깅 실패: {e}")
             
-            logger.info(f"선택 종목 거래 데이터 초기화 완료: 성공 {results['success_stocks']}개, 실패 {results['failed_stocks']}개")
+            logger.info(f"선택 종목 거래 데이터 초기화 완료: 성공 {results['success_stocks']}개, 실패 {results['failed_stocks']}개, {results['total_deleted']}건 삭제")
             return results
             
         except Exception as e:
             logger.error(f"선택 종목 거래 데이터 초기화 중 오류: {e}")
+            db.session.rollback()
             return {
                 'total_stocks': len(stock_codes),
                 'success_stocks': 0,
@@ -1205,4 +1276,4 @@ class DataCollectorService:
                 'failed_list': stock_codes,
                 'total_deleted': 0,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
@@ -8,6 +8,11 @@ from extensions import db
 from datetime import datetime
 import json
 from flask import request
+from core.pagination import Keyset
+
+# 목록 조회 정렬 키 (생성 시간 → ID 내림차순, 커서 페이지네이션 기준)
+DATA_HISTORY_KEYSET = Keyset('data_history', [DataHistory.created_at, DataHistory.id])
+SYSTEM_LOG_KEYSET = Keyset('system_log', [SystemLog.created_at, SystemLog.id])
 
 class HistoryService:
     """히스토리 관리 서비스 클래스"""
@@ -102,7 +107,7 @@ class HistoryService:
     
     @staticmethod
     def get_data_history(table_name=None, record_id=None, action=None, 
-                        start_date=None, end_date=None, limit=100, offset=0):
+                        start_date=None, end_date=None, limit=100, offset=0, page=None):
         """
         데이터 히스토리 조회
         
@@ -114,9 +119,10 @@ class HistoryService:
             end_date (datetime, optional): 종료 날짜
             limit (int): 조회 개수 제한
             offset (int): 오프셋
+            page (PageRequest, optional): 페이지 요청 (지정하면 limit/offset 대신 keyset 페이지 Page 반환)
             
         Returns:
-            list: 히스토리 목록
+            list 또는 Page: 히스토리 목록
         """
         query = DataHistory.query
         
@@ -131,11 +137,13 @@ class HistoryService:
         if end_date:
             query = query.filter(DataHistory.created_at <= end_date)
         
-        return query.order_by(DataHistory.created_at.desc()).limit(limit).offset(offset).all()
+        if page is not None:
+            return DATA_HISTORY_KEYSET.paginate(query, page)
+        return DATA_HISTORY_KEYSET.order(query).limit(limit).offset(offset).all()
     
     @staticmethod
     def get_system_logs(level=None, category=None, start_date=None, end_date=None, 
-                       limit=100, offset=0):
+                       limit=100, offset=0, page=None):
         """
         시스템 로그 조회
         
@@ -146,9 +154,10 @@ class HistoryService:
             end_date (datetime, optional): 종료 날짜
             limit (int): 조회 개수 제한
             offset (int): 오프셋
+            page (PageRequest, optional): 페이지 요청 (지정하면 limit/offset 대신 keyset 페이지 Page 반환)
             
         Returns:
-            list: 시스템 로그 목록
+            list 또는 Page: 시스템 로그 목록
         """
         query = SystemLog.query
         
@@ -161,7 +170,9 @@ class HistoryService:
         if end_date:
             query = query.filter(SystemLog.created_at <= end_date)
         
-        return query.order_by(SystemLog.created_at.desc()).limit(limit).offset(offset).all()
+        if page is not None:
+            return SYSTEM_LOG_KEYSET.paginate(query, page)
+        return SYSTEM_LOG_KEYSET.order(query).limit(limit).offset(offset).all()
     
     @staticmethod
     def get_latest_activity(table_name=None, limit=10):
@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 일괄 적재 서비스 계층
+NDJSON/CSV 업로드를 스트림으로 읽어 청크 단위로 검증하고,
+임시 테이블 COPY + INSERT ... ON CONFLICT (stock_code, trade_date)로 반영합니다.
+"""
+import csv
+import io
+import json
+import logging
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+from flask import current_app
+from sqlalchemy import text
+from extensions import db
+from database.partitioning import TRADING_TABLE, has_stock_date_key, ensure_future_partitions
+from database.cache_invalidation import invalidate_trading
+from services.accumulation_service import AccumulationService
+from services.history_service import HistoryService
+from services.trend_service import TrendService
+
+logger = logging.getLogger(__name__)
+
+# 업로드 형식
+FORMAT_NDJSON = 'ndjson'
+FORMAT_CSV = 'csv'
+SUPPORTED_FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+
+# 같은 (stock_code, trade_date)가 이미 있을 때: update는 값이 있는 필드만 덮어쓰고, skip은 기존 행을 유지
+ON_CONFLICT_UPDATE = 'update'
+ON_CONFLICT_SKIP = 'skip'
+SUPPORTED_CONFLICT_MODES = (ON_CONFLICT_UPDATE, ON_CONFLICT_SKIP)
+
+INGEST_COLUMNS = ['stock_code', 'trade_date', 'close_price', 'institution_net_buy', 'foreigner_net_buy']
+INTEGER_FIELDS = ['close_price', 'institution_net_buy', 'foreigner_net_buy']
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+DEFAULT_CHUNK_SIZE = 20000
+MAX_REJECTED_REPORT = 1000
+STAGING_TABLE = 'trading_ingest_staging'
+
+# 청크 = (검증 전 행, 행 번호, 파싱 단계에서 거부된 행)
+Chunk = Tuple[pd.DataFrame, List[int], List[Dict[str, any]]]
+
+
+def iter_ndjson_chunks(stream, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    NDJSON 바이트 스트림을 한 줄씩 읽어 chunk_size 행 단위로 반환
+
+    빈 줄은 건너뛰고, JSON 객체가 아닌 줄은 거부 목록에 담습니다 (행 번호는 1부터).
+
+    Args:
+        stream: 바이트 스트림 (요청 본문 또는 업로드 파일)
+        chunk_size (int): 청크 크기
+
+    Yields:
+        Chunk: (행 DataFrame, 행 번호, 거부된 행)
+    """
+    records, lines, rejects = [], [], []
+    for line_no, raw in enumerate(stream, 1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            rejects.append({'line': line_no, 'error': '올바른 JSON이 아닙니다.'})
+            continue
+        if not isinstance(record, dict):
+            rejects.append({'line': line_no, 'error': 'JSON 객체가 아닙니다.'})
+            continue
+        records.append(record)
+        lines.append(line_no)
+        if len(records) >= chunk_size:
+            yield pd.DataFrame(records, columns=INGEST_COLUMNS), lines, rejects
+            records, lines, rejects = [], [], []
+    if records or rejects:
+        yield pd.DataFrame(records, columns=INGEST_COLUMNS), lines, rejects
+
+
+def iter_csv_chunks(stream, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    헤더가 있는 CSV 바이트 스트림을 chunk_size 행 단위로 반환
+
+    헤더 이름은 대소문자/공백을 무시하며, 컬럼 수가 헤더와 다른 행은 거부 목록에 담습니다.
+
+    Args:
+        stream: 바이트 스트림 (요청 본문 또는 업로드 파일)
+        chunk_size (int): 청크 크기
+
+    Yields:
+        Chunk: (행 DataFrame, 행 번호, 거부된 행)
+
+    Raises:
+        ValueError: 헤더가 없거나 stock_code/trade_date 컬럼이 없는 경우
+    """
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = [name.strip().lower() for name in next(reader, [])]
+    missing = [name for name in ('stock_code', 'trade_date') if name not in header]
+    if missing:
+        raise ValueError(f"CSV 헤더에 필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    rows, lines, rejects = [], [], []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != len(header):
+            rejects.append({'line': reader.line_num, 'error': f'컬럼 수가 헤더와 다릅니다 ({len(row)}/{len(header)}).'})
+            continue
+        rows.append(row)
+        lines.append(reader.line_num)
+        if len(rows) >= chunk_size:
+            yield pd.DataFrame(rows, columns=header).reindex(columns=INGEST_COLUMNS), lines, rejects
+            rows, lines, rejects = [], [], []
+    if rows or rejects:
+        yield pd.DataFrame(rows, columns=header).reindex(columns=INGEST_COLUMNS), lines, rejects
+
+
+class IngestService:
+    """거래 데이터 일괄 적재 관련 비즈니스 로직을 처리하는 서비스 클래스"""
+
+    @staticmethod
+    def prepare_ingest_frame(frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        적재 행을 열 단위로 한 번에 검증하고 적재용 타입으로 변환
+
+        stock_code(6자리 숫자)와 trade_date(YYYY-MM-DD)는 필수이고,
+        종가/순매수는 비어 있을 수 있으나 값이 있으면 32비트 정수여야 합니다 (종가는 0 이상).
+
+        Args:
+            frame (pd.DataFrame): INGEST_COLUMNS 컬럼을 가진 행
+
+        Returns:
+            Tuple[pd.DataFrame, pd.Series]: (적재용 행 - 코드/날짜 문자열, 정수는 nullable Int64,
+                                             행별 오류 메시지 - 유효하면 None)
+        """
+        frame = frame.reindex(columns=INGEST_COLUMNS)
+        rows = pd.DataFrame(index=frame.index)
+        rows['stock_code'] = frame['stock_code'].astype('string').str.strip()
+        rows['trade_date'] = frame['trade_date'].astype('string').str.strip()
+        dates = pd.to_datetime(rows['trade_date'], format='%Y-%m-%d', errors='coerce')
+
+        conditions = [
+            ~rows['stock_code'].str.fullmatch(r'\d{6}').fillna(False).astype(bool),
+            dates.isna(),
+        ]
+        messages = [
+            'stock_code는 6자리 숫자여야 합니다.',
+            'trade_date는 YYYY-MM-DD 형식이어야 합니다.',
+        ]
+        for field in INTEGER_FIELDS:
+            raw = frame[field]
+            present = raw.notna() & (raw != '')
+            numbers = pd.to_numeric(raw, errors='coerce').astype('float64')
+            minimum = 0 if field == 'close_price' else INT32_MIN
+            # JSON true/false는 숫자로 변환되지 않도록 제외
+            booleans = raw.map(lambda value: isinstance(value, (bool, np.bool_))).astype(bool)
+            valid = ~booleans & np.isfinite(numbers) & (numbers % 1 == 0) & (numbers >= minimum) & (numbers <= INT32_MAX)
+            conditions.append(present & ~valid)
+            messages.append(f'{field}은(는) {minimum} 이상 {INT32_MAX} 이하의 정수여야 합니다.')
+            rows[field] = numbers.where(valid).astype('Int64')
+
+        errors = np.select([np.asarray(condition, dtype=bool) for condition in conditions], messages, default='')
+        errors = pd.Series(errors, index=frame.index, dtype=object)
+        return rows, errors.where(errors != '', None)
+
+    @staticmethod
+    def _create_staging_table() -> None:
+        """현재 트랜잭션에서만 쓰는 임시 적재 테이블을 생성합니다."""
+        db.session.execute(text(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+                stock_code varchar(20) NOT NULL,
+                trade_date date NOT NULL,
+                close_price integer,
+                institution_net_buy integer,
+                foreigner_net_buy integer
+            ) ON COMMIT DROP
+        """))
+
+    @staticmethod
+    def _load_chunk(rows: pd.DataFrame, on_conflict: str) -> List[tuple]:
+        """
+        청크를 임시 테이블에 COPY한 뒤 INSERT ... ON CONFLICT로 반영 (커밋하지 않음)
+
+        update 모드는 파일에 값이 있는 필드만 덮어쓰고, 값이 그대로인 행은 다시 쓰지 않습니다.
+
+        Args:
+            rows (pd.DataFrame): 청크 안에서 (stock_code, trade_date)가 중복되지 않는 적재용 행
+            on_conflict (str): update 또는 skip
+
+        Returns:
+            List[tuple]: 종목별 (stock_code, 가장 이른 변경 거래일, 추가 수, 갱신 수)
+        """
+        db.session.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+        buffer = io.StringIO()
+        rows.to_csv(buffer, sep='\t', header=False, index=False, na_rep='\\N')
+        buffer.seek(0)
+        cursor = db.session.connection().connection.cursor()
+        cursor.copy_expert(f"COPY {STAGING_TABLE} ({', '.join(INGEST_COLUMNS)}) FROM STDIN", buffer)
+
+        if on_conflict == ON_CONFLICT_UPDATE:
+            conflict = f"""
+                DO UPDATE SET
+                    close_price = COALESCE(EXCLUDED.close_price, t.close_price),
+                    institution_net_buy = COALESCE(EXCLUDED.institution_net_buy, t.institution_net_buy),
+                    foreigner_net_buy = COALESCE(EXCLUDED.foreigner_net_buy, t.foreigner_net_buy)
+                WHERE (t.close_price, t.institution_net_buy, t.foreigner_net_buy) IS DISTINCT FROM (
+                    COALESCE(EXCLUDED.close_price, t.close_price),
+                    COALESCE(EXCLUDED.institution_net_buy, t.institution_net_buy),
+                    COALESCE(EXCLUDED.foreigner_net_buy, t.foreigner_net_buy)
+                )
+            """
+        else:
+            conflict = "DO NOTHING"
+
+        # xmax = 0이면 새로 추가된 행, 아니면 ON CONFLICT로 갱신된 행
+        return db.session.execute(text(f"""
+            WITH written AS (
+                INSERT INTO {TRADING_TABLE} AS t ({', '.join(INGEST_COLUMNS)})
+                SELECT {', '.join(INGEST_COLUMNS)} FROM {STAGING_TABLE}
+                ON CONFLICT (stock_code, trade_date) {conflict}
+                RETURNING t.stock_code, t.trade_date, (t.xmax = 0) AS inserted
+            )
+            SELECT stock_code, MIN(trade_date),
+                   COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+            FROM written
+            GROUP BY stock_code
+        """)).all()
+
+    @staticmethod
+    def _prepare_partitions(from_dates: Dict[str, date]) -> None:
+        """
+        적재한 가장 이른 거래일부터 파티션을 만들고 DEFAULT 파티션에 들어간 행을 옮김 (커밋 후 호출)
+
+        업로드 기간은 스트림을 끝까지 읽어야 알 수 있고, 적재 트랜잭션 안에서 파티션을 만들면
+        커밋할 때까지 거래 테이블 잠금이 유지되므로 커밋 후에 처리합니다. 실패해도 적재 결과는 유지합니다.
+        """
+        interval = current_app.config.get('TRADING_PARTITION_INTERVAL')
+        if not interval:
+            return
+        try:
+            premake = current_app.config.get('TRADING_PARTITION_PREMAKE', 1)
+            created = ensure_future_partitions(interval, premake, start=min(from_dates.values()))
+            if created:
+                logger.info(f"일괄 적재 기간 파티션 생성: {', '.join(created)}")
+        except Exception as e:
+            logger.warning(f"일괄 적재 후 파티션 생성 실패 (다음 생성 시 DEFAULT 파티션에서 이동): {e}")
+
+    @staticmethod
+    def _refresh_derived(from_dates: Dict[str, date]) -> None:
+        """
+        변경된 종목의 누적 순매수 캐시와 트렌드 지표를 가장 이른 변경일부터 갱신
+
+        수집과 같이 실패해도 적재 결과는 유지하고 다음 계산 시 반영합니다.
+        """
+        if current_app.config.get('ACCUM_CACHE_ENABLED', True):
+            try:
+                AccumulationService.extend_accumulation(from_dates)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"일괄 적재 후 누적 순매수 갱신 실패 (다음 계산 시 반영): {e}")
+
+        if current_app.config.get('TREND_STREAMING_ENABLED', True):
+            try:
+                TrendService.advance_trends(from_dates=from_dates)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"일괄 적재 후 트렌드 갱신 실패 (다음 계산 시 반영): {e}")
+
+    @staticmethod
+    def ingest_trading_data(stream, data_format: str, on_conflict: str = ON_CONFLICT_UPDATE,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, any]:
+        """
+        NDJSON/CSV 스트림의 거래 데이터를 일괄 적재
+
+        스트림을 chunk_size 행씩 읽어 검증하고, 유효한 행을 하나의 트랜잭션으로 반영한 뒤 커밋합니다.
+        청크 안에서 같은 (stock_code, trade_date)가 반복되면 update 모드는 마지막 행을, skip 모드는 첫 행을 사용합니다.
+        적재 후 변경된 종목의 누적 순매수/트렌드를 갱신하고 히스토리를 한 건 남깁니다.
+        파티션이 없는 기간의 행은 DEFAULT 파티션에 저장되었다가 커밋 후 그 기간의 파티션을 만들면서 옮겨집니다.
+
+        Args:
+            stream: 바이트 스트림 (요청 본문 또는 업로드 파일)
+            data_format (str): ndjson 또는 csv
+            on_conflict (str): update 또는 skip
+            chunk_size (int): 청크 크기
+
+        Returns:
+            Dict: total, inserted, updated, unchanged, skipped, duplicates, rejected, rejected_rows,
+                  rejected_truncated, stocks, seconds, rows_per_second
+
+        Raises:
+            ValueError: 형식/모드가 올바르지 않거나 CSV 헤더가 잘못된 경우
+        """
+        if data_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {data_format} (ndjson, csv)")
+        if on_conflict not in SUPPORTED_CONFLICT_MODES:
+            raise ValueError(f"지원하지 않는 on_conflict 값입니다: {on_conflict} (update, skip)")
+
+        started = time.perf_counter()
+        chunks = iter_ndjson_chunks(stream, chunk_size) if data_format == FORMAT_NDJSON else iter_csv_chunks(stream, chunk_size)
+        keep = 'last' if on_conflict == ON_CONFLICT_UPDATE else 'first'
+
+        total = inserted = updated = duplicates = rejected = 0
+        rejected_rows: List[Dict[str, any]] = []
+        from_dates: Dict[str, date] = {}
+
+        def report(items: List[Dict[str, any]]) -> None:
+            room = MAX_REJECTED_REPORT - len(rejected_rows)
+            if room > 0:
+                rejected_rows.extend(items[:room])
+
+        try:
+            if not has_stock_date_key():
+                raise Exception(
+                    "(stock_code, trade_date) UNIQUE 인덱스가 없습니다. "
+                    "scripts/database/add_trading_unique_key.py를 먼저 실행하세요."
+                )
+            IngestService._create_staging_table()
+
+            for frame, lines, parse_rejects in chunks:
+                total += len(frame) + len(parse_rejects)
+                rejected += len(parse_rejects)
+                report(parse_rejects)
+                if frame.empty:
+                    continue
+
+                rows, errors = IngestService.prepare_ingest_frame(frame)
+                invalid = errors.notna()
+                if invalid.any():
+                    positions = np.flatnonzero(invalid.to_numpy())
+                    rejected += len(positions)
+                    report([
+                        {
+                            'line': lines[position],
+                            'error': errors.iat[position],
+                            **{key: None if pd.isna(frame[key].iat[position]) else str(frame[key].iat[position])
+                               for key in ('stock_code', 'trade_date')},
+                        }
+                        for position in positions[:max(0, MAX_REJECTED_REPORT - len(rejected_rows))]
+                    ])
+
+                rows = rows[~invalid]
+                repeated = rows.duplicated(['stock_code', 'trade_date'], keep=keep)
+                duplicates += int(repeated.sum())
+                rows = rows[~repeated]
+                if rows.empty:
+                    continue
+
+                for stock_code, first_date, added, changed in IngestService._load_chunk(rows, on_conflict):
+                    inserted += added
+                    updated += changed
+                    if stock_code not in from_dates or first_date < from_dates[stock_code]:
+                        from_dates[stock_code] = first_date
+
+            invalidate_trading(from_dates)
+            db.session.commit()
+
+        except ValueError:
+            db.session.rollback()
+            raise
+        except Exception as e:
+            db.session.rollback()
+            raise Exception(f"거래 데이터 일괄 적재 중 오류 발생: {str(e)}") from e
+
+        if from_dates:
+            IngestService._prepare_partitions(from_dates)
+            IngestService._refresh_derived(from_dates)
+            try:
+                HistoryService.log_data_change(
+                    table_name=TRADING_TABLE,
+                    record_id=None,
+                    action='CREATE',
+                    new_value={'inserted': inserted, 'updated': updated, 'stocks': len(from_dates)},
+                    description=f"거래 데이터 일괄 적재 ({data_format}, {on_conflict}): "
+                                f"{inserted}건 추가, {updated}건 갱신, {rejected}건 거부"
+                )
+            except Exception as e:
+                logger.warning(f"일괄 적재 히스토리 기록 실패: {e}")
+
+        rejected_rows.sort(key=lambda row: row['line'])
+        valid = total - rejected - duplicates
+        written = inserted + updated
+        seconds = time.perf_counter() - started
+        result = {
+            'total': total,
+            'inserted': inserted,
+            'updated': updated,
+            'unchanged': valid - written if on_conflict == ON_CONFLICT_UPDATE else 0,
+            'skipped': valid - written if on_conflict == ON_CONFLICT_SKIP else 0,
+            'duplicates': duplicates,
+            'rejected': rejected,
+            'rejected_rows': rejected_rows,
+            'rejected_truncated': rejected > len(rejected_rows),
+            'stocks': len(from_dates),
+            'seconds': round(seconds, 3),
+            'rows_per_second': int(total / seconds) if seconds > 0 else None,
+        }
+        logger.info(f"거래 데이터 일괄 적재: {total}행 중 {inserted}건 추가, {updated}건 갱신, "
+                    f"{rejected}건 거부 ({result['seconds']}s, {result['rows_per_second']} rows/s)")
+        return result
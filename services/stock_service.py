@@ -7,9 +7,27 @@ from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 from models.stock import StockList
 from extensions import db
+from core.cache import cached
+from database.cache_invalidation import TAG_STOCKS
 import re
 
 
+# 행 조회(tabular) 컬럼 - to_dict와 같은 필드/순서 (ORM 객체 없이 Row를 그대로 응답에 사용)
+STOCK_COLUMNS = [
+    StockList.id,
+    StockList.stock_code,
+    StockList.stock_name,
+    StockList.init_date,
+    StockList.institution_accum_init,
+    StockList.foreigner_accum_init,
+]
+
+
+def _cache_rows(tabular: bool = False, **arguments) -> bool:
+    """조회 결과 캐시 대상 여부 (Row 결과만 캐시 - 세션에 묶인 ORM 객체는 제외)"""
+    return tabular
+
+
 class StockService:
     """주식 목록 관련 비즈니스 로직을 처리하는 서비스 클래스"""
     
@@ -62,6 +80,11 @@ class StockService:
         """
         return 0 < len(stock_name.strip()) <= StockService.MAX_STOCK_NAME_LENGTH
     
+    @staticmethod
+    def _select(query, tabular: bool = False):
+        """tabular이면 모델 객체 대신 STOCK_COLUMNS 값만 조회하도록 SELECT 목록을 바꿉니다."""
+        return query.with_entities(*STOCK_COLUMNS) if tabular else query
+    
     @staticmethod
     def create_stock(
         stock_code: str, 
@@ -134,25 +157,32 @@ class StockService:
             raise Exception(f"주식 생성 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def get_all_stocks() -> List[StockList]:
+    @cached([TAG_STOCKS], when=_cache_rows)
+    def get_all_stocks(tabular: bool = False) -> List[StockList]:
         """
         모든 주식 조회
         
+        Args:
+            tabular (bool): True면 모델 객체 대신 컬럼 값 Row(STOCK_COLUMNS 순서)를 반환
+        
         Returns:
             List[StockList]: 주식 목록 (주식 코드 기준 오름차순)
         """
         try:
-            return StockList.query.order_by(StockList.stock_code.asc()).all()
+            query = StockList.query.order_by(StockList.stock_code.asc())
+            return StockService._select(query, tabular).all()
         except Exception as e:
             raise Exception(f"주식 목록 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def get_stock_by_id(stock_id: int) -> Optional[StockList]:
+    @cached([TAG_STOCKS], when=_cache_rows)
+    def get_stock_by_id(stock_id: int, tabular: bool = False) -> Optional[StockList]:
         """
         ID로 주식 조회
         
         Args:
             stock_id (int): 주식 ID
+            tabular (bool): True면 모델 객체 대신 컬럼 값 Row를 반환
             
         Returns:
             Optional[StockList]: 주식 객체 (없으면 None)
@@ -160,17 +190,21 @@ class StockService:
         try:
             if stock_id <= 0:
                 return None
+            if tabular:
+                return StockService._select(StockList.query.filter(StockList.id == stock_id), tabular).first()
             return StockList.query.get(stock_id)
         except Exception as e:
             raise Exception(f"주식 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def get_stock_by_code(stock_code: str) -> Optional[StockList]:
+    @cached([TAG_STOCKS], when=_cache_rows)
+    def get_stock_by_code(stock_code: str, tabular: bool = False) -> Optional[StockList]:
         """
         주식 코드로 주식 조회
         
         Args:
             stock_code (str): 주식 코드
+            tabular (bool): True면 모델 객체 대신 컬럼 값 Row를 반환
             
         Returns:
             Optional[StockList]: 주식 객체 (없으면 None)
@@ -178,7 +212,8 @@ class StockService:
         try:
             if not stock_code or not stock_code.strip():
                 return None
-            return StockList.query.filter_by(stock_code=stock_code.strip()).first()
+            query = StockList.query.filter_by(stock_code=stock_code.strip())
+            return StockService._select(query, tabular).first()
         except Exception as e:
             raise Exception(f"주식 조회 중 오류 발생: {str(e)}") from e
 
@@ -270,12 +305,14 @@ class StockService:
             raise Exception(f"주식 삭제 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def search_stocks_by_name(name: str) -> List[StockList]:
+    @cached([TAG_STOCKS], when=_cache_rows)
+    def search_stocks_by_name(name: str, tabular: bool = False) -> List[StockList]:
         """
         주식명으로 주식 검색
         
         Args:
             name (str): 검색할 주식명 (부분 일치)
+            tabular (bool): True면 모델 객체 대신 컬럼 값 Row를 반환
             
         Returns:
             List[StockList]: 검색된 주식 목록
@@ -284,20 +321,23 @@ class StockService:
             if not name or not name.strip():
                 return []
             
-            return StockList.query.filter(
+            query = StockList.query.filter(
                 StockList.stock_name.like(f'%{name.strip()}%')
-            ).order_by(StockList.stock_code.asc()).all()
+            ).order_by(StockList.stock_code.asc())
+            return StockService._select(query, tabular).all()
             
         except Exception as e:
             raise Exception(f"주식 검색 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def search_stocks_by_code(code: str) -> List[StockList]:
+    @cached([TAG_STOCKS], when=_cache_rows)
+    def search_stocks_by_code(code: str, tabular: bool = False) -> List[StockList]:
         """
         주식 코드로 주식 검색
         
         Args:
             code (str): 검색할 주식 코드 (부분 일치)
+            tabular (bool): True면 모델 객체 대신 컬럼 값 Row를 반환
             
         Returns:
             List[StockList]: 검색된 주식 목록
@@ -306,9 +346,10 @@ class StockService:
             if not code or not code.strip():
                 return []
             
-            return StockList.query.filter(
+            query = StockList.query.filter(
                 StockList.stock_code.like(f'%{code.strip()}%')
-            ).order_by(StockList.stock_code.asc()).all()
+            ).order_by(StockList.stock_code.asc())
+            return StockService._select(query, tabular).all()
             
         except Exception as e:
             raise Exception(f"주식 코드 검색 중 오류 발생: {str(e)}") from e
@@ -3,14 +3,106 @@
 Stock Investor Trading 서비스 계층
 주식 투자자별 거래 데이터 관련 비즈니스 로직을 처리하는 서비스
 """
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+from flask import current_app
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from sqlalchemy import func, or_, update, values, column, Integer, String, Float, Date
+from sqlalchemy.orm import aliased
 from models.trading import StockInvestorTrading
+from models.stock import StockList
 from extensions import db
 from services.history_service import HistoryService
+from database.routing import replica_read
+from database.cache_invalidation import invalidate_trading, trading_tags
+from core.cache import cached
+from core.pagination import Keyset, Page, PageRequest
 import re
 
+# 목록 조회 정렬 키 (거래일 → 주식 코드 → ID 내림차순, 커서 페이지네이션 기준)
+TRADING_KEYSET = Keyset('trading', [StockInvestorTrading.trade_date, StockInvestorTrading.stock_code, StockInvestorTrading.id])
+
+# 누적 초기값/주식명을 가져오는 stock_list 별칭 (검색 쿼리의 stock_list 조인과 구분)
+_STOCK_META = aliased(StockList, name='stock_meta')
+
+def _trading_columns(institution_accum, foreigner_accum) -> list:
+    """응답 컬럼 목록 (누적값 식은 초기값 포함)"""
+    return [
+        StockInvestorTrading.id,
+        StockInvestorTrading.stock_code,
+        _STOCK_META.stock_name.label('stock_name'),
+        StockInvestorTrading.trade_date,
+        StockInvestorTrading.close_price,
+        StockInvestorTrading.institution_net_buy,
+        StockInvestorTrading.foreigner_net_buy,
+        institution_accum.label('institution_accum'),
+        foreigner_accum.label('foreigner_accum'),
+        StockInvestorTrading.institution_trend_signal,
+        StockInvestorTrading.institution_trend_score,
+        StockInvestorTrading.foreigner_trend_signal,
+        StockInvestorTrading.foreigner_trend_score,
+    ]
+
+
+# 행 조회(tabular/fields) 컬럼 - to_dict와 같은 필드/순서
+# 누적값은 SQL에서 초기값을 더하고 주식명은 조인으로 가져오므로 ORM 객체 없이 Row를 그대로 응답에 사용합니다.
+TRADING_COLUMNS = _trading_columns(
+    func.coalesce(_STOCK_META.institution_accum_init, 0) + StockInvestorTrading.institution_accum,
+    func.coalesce(_STOCK_META.foreigner_accum_init, 0) + StockInvestorTrading.foreigner_accum,
+)
+
+# ACCUM_CACHE_ENABLED가 꺼져 있으면 저장된 누계 컬럼이 비어 있으므로 누적 뷰를 조인해 조회 시점 누적값을 사용
+TRADING_COMPUTED_COLUMNS = _trading_columns(*StockInvestorTrading.accum_expressions(use_cache=False))
+
+# stock_list 조인이 필요한 필드
+_STOCK_META_FIELDS = {'stock_name', 'institution_accum', 'foreigner_accum'}
+
+# 누적값 필드 (캐시를 끄면 누적 뷰 조인이 필요)
+_ACCUM_FIELDS = {'institution_accum', 'foreigner_accum'}
+
+# fields= 선택과 관계없이 항상 조회하는 필드 (정렬 키/커서에 필요)
+TRADING_KEY_FIELDS = ['id', 'stock_code', 'trade_date']
+
+# 필드 그룹 (include_price/include_institution/include_foreigner 단위)
+# 키 필드 + 한 그룹 범위의 조회는 timeseries 인덱스 구성의 커버링 인덱스로 index-only scan이 됩니다.
+TRADING_FIELD_GROUPS = {
+    'price': ['close_price'],
+    'institution': ['institution_net_buy', 'institution_accum', 'institution_trend_signal', 'institution_trend_score'],
+    'foreigner': ['foreigner_net_buy', 'foreigner_accum', 'foreigner_trend_signal', 'foreigner_trend_score'],
+}
+
+# fields=에 지정할 수 있는 필드
+TRADING_FIELD_NAMES = [column.key for column in TRADING_COLUMNS]
+
+
+def _cache_rows(stream: bool = False, tabular: bool = False, fields: Optional[List[str]] = None, **arguments) -> bool:
+    """조회 결과 캐시 대상 여부 (Row 결과만 캐시 - 스트림과 세션에 묶인 ORM 객체는 제외)"""
+    return not stream and (tabular or fields is not None)
+
+
+def _cache_stock_date_range(
+    include_price: bool = True,
+    include_institution: bool = True,
+    include_foreigner: bool = True,
+    fields: Optional[List[str]] = None,
+    **arguments
+) -> bool:
+    """종목별 날짜 범위 조회 캐시 대상 여부 (include_* 플래그로 컬럼을 고른 경우도 Row 결과)"""
+    if fields is None:
+        fields = TradingService.fields_for_groups(include_price, include_institution, include_foreigner)
+    return _cache_rows(fields=fields, **arguments)
+
+
+def _stock_tags(stock_code: Optional[str] = None, **arguments) -> List[str]:
+    """종목 코드 인자로 거래 데이터 캐시 태그 결정"""
+    return trading_tags(stock_code)
+
+
+class InvalidFieldsError(ValueError):
+    """fields 파라미터에 알 수 없는 필드가 있는 경우"""
+    parameter = 'fields'
+
 
 class TradingService:
     """주식 투자자별 거래 데이터 관련 비즈니스 로직을 처리하는 서비스 클래스"""
@@ -21,6 +113,128 @@ class TradingService:
     MAX_TRADE_DATE_LENGTH = 10
     MAX_TREND_SIGNAL_LENGTH = 50
     
+    # 일괄 트렌드 업데이트 설정
+    TREND_FIELDS = ['institution_trend_signal', 'institution_trend_score', 'foreigner_trend_signal', 'foreigner_trend_score']
+    BULK_TREND_MAX_ITEMS = 100000
+    BULK_TREND_CHUNK_SIZE = 2000
+    
+    @staticmethod
+    def _is_entity_query(query) -> bool:
+        """모델 객체 전체를 조회하는 쿼리인지 여부 (with_entities로 컬럼을 고른 쿼리는 False)"""
+        descriptions = query.column_descriptions
+        return len(descriptions) == 1 and descriptions[0]['expr'] is StockInvestorTrading
+    
+    @staticmethod
+    def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+        """
+        fields 파라미터(쉼표 구분) 해석
+
+        Args:
+            value (Optional[str]): 예) "close_price,institution_net_buy"
+
+        Returns:
+            Optional[List[str]]: 요청한 필드 목록 (중복 제거, 입력 순서 유지) - 비어 있으면 None (전체 필드)
+
+        Raises:
+            InvalidFieldsError: 알 수 없는 필드가 있는 경우
+        """
+        fields = list(dict.fromkeys(field.strip() for field in (value or '').split(',') if field.strip()))
+        if not fields:
+            return None
+        unknown = [field for field in fields if field not in TRADING_FIELD_NAMES]
+        if unknown:
+            raise InvalidFieldsError(f"알 수 없는 필드입니다: {', '.join(unknown)}")
+        return fields
+
+    @staticmethod
+    def fields_for_groups(include_price: bool, include_institution: bool, include_foreigner: bool) -> Optional[List[str]]:
+        """include_* 플래그를 필드 목록으로 변환 (모두 포함이면 None)"""
+        if include_price and include_institution and include_foreigner:
+            return None
+        fields = []
+        for group, included in (('price', include_price), ('institution', include_institution), ('foreigner', include_foreigner)):
+            if included:
+                fields.extend(TRADING_FIELD_GROUPS[group])
+        return fields
+
+    @staticmethod
+    def columns() -> list:
+        """응답 컬럼 목록 (ACCUM_CACHE_ENABLED에 따라 저장된 누계 또는 조회 시점 누계 사용)"""
+        return TRADING_COLUMNS if StockInvestorTrading.accum_cache_enabled() else TRADING_COMPUTED_COLUMNS
+
+    @staticmethod
+    def projection(fields: List[str]) -> list:
+        """요청 필드를 조회할 최소 컬럼 목록 (키 필드 포함, TRADING_COLUMNS 순서)"""
+        selected = set(TRADING_KEY_FIELDS) | set(fields)
+        return [column for column in TradingService.columns() if column.key in selected]
+
+    @staticmethod
+    def _select(query, tabular: bool = False, fields: Optional[List[str]] = None):
+        """
+        fields가 있으면 최소 컬럼만, tabular이면 전체 컬럼 값을 조회하도록 SELECT 목록을 바꿉니다.
+
+        주식명/누적값을 조회하는 경우에만 stock_list를 조인하므로, 키 필드와 한 그룹만 고른 종목별 조회는
+        커버링 인덱스만으로 처리될 수 있습니다.
+        모델 객체 조회는 초기값을 더한 누적값을 함께 읽어 to_dict가 행마다 다시 조회하지 않도록 합니다.
+        ACCUM_CACHE_ENABLED가 꺼져 있으면 누적값을 읽는 경우에만 누적 뷰를 조인합니다.
+        """
+        use_cache = StockInvestorTrading.accum_cache_enabled()
+        if fields is not None:
+            columns = TradingService.projection(fields)
+        elif not TradingService._is_entity_query(query):
+            return query
+        elif tabular:
+            columns = TradingService.columns()
+        else:
+            if not use_cache:
+                query = StockInvestorTrading.join_accum_view(query)
+            return query.options(*StockInvestorTrading.accum_options(use_cache))
+        keys = {column.key for column in columns}
+        # 누적 뷰의 누적값은 초기값을 포함하므로 stock_list는 주식명에만 필요
+        if keys & (_STOCK_META_FIELDS if use_cache else _STOCK_META_FIELDS - _ACCUM_FIELDS):
+            query = query.outerjoin(_STOCK_META, _STOCK_META.stock_code == StockInvestorTrading.stock_code)
+        if not use_cache and keys & _ACCUM_FIELDS:
+            query = StockInvestorTrading.join_accum_view(query)
+        return query.with_entities(*columns)
+
+    @staticmethod
+    def _reload(trading_data: StockInvestorTrading) -> StockInvestorTrading:
+        """
+        커밋한 객체를 초기값을 더한 누적값과 함께 다시 읽습니다.
+        
+        커밋 후 만료된 객체는 어차피 다시 조회되므로, 그 조회에 누적값을 포함해
+        응답의 to_dict가 저장된 누계 컬럼(캐시를 끈 경우 비어 있음)에 기대지 않도록 합니다.
+        """
+        query = StockInvestorTrading.query.filter(StockInvestorTrading.id == trading_data.id)
+        return TradingService._select(query).populate_existing().first() or trading_data
+
+    @staticmethod
+    def _fetch(
+        query,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[list, Page, Iterator]:
+        """
+        목록 쿼리를 정렬 키 순서로 조회
+
+        page를 지정하면 keyset 페이지 한 장만, stream이면 서버 측 커서 이터레이터를 반환합니다.
+        스트리밍은 STREAM_BATCH_SIZE건씩 가져오므로 전체 결과를 메모리에 올리지 않습니다.
+        쿼리는 여기서 실행되므로 복제본 라우팅(replica_read)이 이터레이터에도 그대로 적용됩니다.
+        tabular이면 모델 객체 대신 응답 값 Row(TRADING_COLUMNS, 누적 초기값/주식명 포함)를 반환합니다 (ORM 객체 생성 없음).
+        fields를 지정하면 키 필드와 요청 필드 컬럼만 조회한 Row를 반환합니다.
+        """
+        query = TradingService._select(query, tabular, fields)
+        if stream:
+            batch_size = current_app.config.get('STREAM_BATCH_SIZE', 2000)
+            ordered = TRADING_KEYSET.order(query)
+            result = db.session.execute(ordered.statement, execution_options={'yield_per': batch_size})
+            return result.scalars() if TradingService._is_entity_query(ordered) else result
+        if page is not None:
+            return TRADING_KEYSET.paginate(query, page)
+        return TRADING_KEYSET.order(query).all()
+    
     @staticmethod
     def validate_stock_code(stock_code: str) -> bool:
         """
@@ -184,7 +398,7 @@ class TradingService:
                 # 히스토리 로깅 실패는 무시 (주요 기능에 영향 없도록)
                 pass
             
-            return trading_data
+            return TradingService._reload(trading_data)
             
         except IntegrityError as e:
             db.session.rollback()
@@ -284,62 +498,100 @@ class TradingService:
             raise Exception(f"거래 데이터 생성 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def get_all_trading_data() -> List[StockInvestorTrading]:
+    @cached(trading_tags(), when=_cache_rows)
+    @replica_read
+    def get_all_trading_data(
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         모든 거래 데이터 조회
         
+        Args:
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
+        
         Returns:
-            List[StockInvestorTrading]: 거래 데이터 목록 (날짜 기준 내림차순)
+            List[StockInvestorTrading], Page 또는 Iterator: 거래 데이터 목록 (거래일, 주식 코드, ID 내림차순)
         """
         try:
-            return StockInvestorTrading.query.order_by(StockInvestorTrading.trade_date.desc()).all()
+            return TradingService._fetch(StockInvestorTrading.query, page, stream, tabular, fields)
         except Exception as e:
             raise Exception(f"거래 데이터 목록 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def get_trading_data_by_id(trading_id: int) -> Optional[StockInvestorTrading]:
+    @cached(trading_tags(), when=_cache_rows)
+    @replica_read
+    def get_trading_data_by_id(trading_id: int, fields: Optional[List[str]] = None) -> Optional[StockInvestorTrading]:
         """
         ID로 거래 데이터 조회
         
         Args:
             trading_id (int): 거래 데이터 ID
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            Optional[StockInvestorTrading]: 거래 데이터 객체 (없으면 None)
+            Optional[StockInvestorTrading]: 거래 데이터 객체 또는 Row (없으면 None)
         """
         try:
             if trading_id <= 0:
                 return None
-            return StockInvestorTrading.query.get(trading_id)
+            query = StockInvestorTrading.query.filter(StockInvestorTrading.id == trading_id)
+            if fields is not None:
+                return TradingService._select(query, fields=fields).first()
+            return TradingService._select(query).populate_existing().first()
         except Exception as e:
             raise Exception(f"거래 데이터 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def get_trading_data_by_stock_code(stock_code: str) -> List[StockInvestorTrading]:
+    @cached(_stock_tags, when=_cache_rows)
+    @replica_read
+    def get_trading_data_by_stock_code(
+        stock_code: str,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         주식 코드로 거래 데이터 조회
         
         Args:
             stock_code (str): 주식 코드
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            List[StockInvestorTrading]: 거래 데이터 목록 (날짜 기준 내림차순)
+            List[StockInvestorTrading], Page 또는 Iterator: 거래 데이터 목록 (날짜 기준 내림차순)
         """
         try:
             if not stock_code or not stock_code.strip():
-                return []
-            return StockInvestorTrading.query.filter_by(
-                stock_code=stock_code.strip()
-            ).order_by(StockInvestorTrading.trade_date.desc()).all()
+                if page is not None:
+                    return Page(items=[], limit=page.limit)
+                return iter([]) if stream else []
+            query = StockInvestorTrading.query.filter_by(stock_code=stock_code.strip())
+            return TradingService._fetch(query, page, stream, tabular, fields)
         except Exception as e:
             raise Exception(f"거래 데이터 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
+    @cached(_stock_tags, when=_cache_rows)
+    @replica_read
     def get_trading_data_by_date_range(
         start_date: str, 
         end_date: str, 
-        stock_code: Optional[str] = None
-    ) -> List[StockInvestorTrading]:
+        stock_code: Optional[str] = None,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         날짜 범위로 거래 데이터 조회 (인덱스 최적화)
         
@@ -347,9 +599,13 @@ class TradingService:
             start_date (str): 시작 날짜 (YYYY-MM-DD)
             end_date (str): 종료 날짜 (YYYY-MM-DD)
             stock_code (Optional[str]): 주식 코드 (선택)
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            List[StockInvestorTrading]: 거래 데이터 목록
+            List[StockInvestorTrading], Page 또는 Iterator: 거래 데이터 목록
         """
         try:
             # 날짜 형식 검증
@@ -367,27 +623,33 @@ class TradingService:
                     StockInvestorTrading.stock_code == stock_code.strip(),
                     StockInvestorTrading.trade_date >= start_date,
                     StockInvestorTrading.trade_date <= end_date
-                ).order_by(StockInvestorTrading.trade_date.desc())
+                )
             else:
                 # 날짜만으로 조회: 날짜 인덱스 활용
                 query = StockInvestorTrading.query.filter(
                     StockInvestorTrading.trade_date >= start_date,
                     StockInvestorTrading.trade_date <= end_date
-                ).order_by(StockInvestorTrading.trade_date.desc())
+                )
             
-            return query.all()
+            return TradingService._fetch(query, page, stream, tabular, fields)
         except Exception as e:
             raise Exception(f"날짜 범위 거래 데이터 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
+    @cached(_stock_tags, when=_cache_stock_date_range)
+    @replica_read
     def get_trading_data_by_stock_date_range(
         stock_code: str,
         start_date: str, 
         end_date: str,
         include_price: bool = True,
         include_institution: bool = True,
-        include_foreigner: bool = True
-    ) -> List[StockInvestorTrading]:
+        include_foreigner: bool = True,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         특정 종목의 날짜 범위 거래 데이터 조회 (고성능)
         
@@ -398,9 +660,13 @@ class TradingService:
             include_price (bool): 종가 포함 여부
             include_institution (bool): 기관 데이터 포함 여부
             include_foreigner (bool): 외국인 데이터 포함 여부
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            List[StockInvestorTrading]: 거래 데이터 목록
+            List[StockInvestorTrading], Page 또는 Iterator: 거래 데이터 목록
         """
         try:
             # 입력값 검증
@@ -418,68 +684,45 @@ class TradingService:
                 StockInvestorTrading.trade_date <= end_date
             )
             
-            # 필요한 컬럼만 선택하여 성능 최적화
-            if include_price and include_institution and include_foreigner:
-                # 모든 데이터 포함
-                pass
-            elif include_price and include_institution:
-                # 종가 + 기관 데이터만
-                query = query.with_entities(
-                    StockInvestorTrading.id,
-                    StockInvestorTrading.stock_code,
-                    StockInvestorTrading.stock_name,
-                    StockInvestorTrading.trade_date,
-                    StockInvestorTrading.close_price,
-                    StockInvestorTrading.institution_net_buy,
-                    StockInvestorTrading.institution_accum,
-                    StockInvestorTrading.institution_trend_signal,
-                    StockInvestorTrading.institution_trend_score
-                )
-            elif include_price and include_foreigner:
-                # 종가 + 외국인 데이터만
-                query = query.with_entities(
-                    StockInvestorTrading.id,
-                    StockInvestorTrading.stock_code,
-                    StockInvestorTrading.stock_name,
-                    StockInvestorTrading.trade_date,
-                    StockInvestorTrading.close_price,
-                    StockInvestorTrading.foreigner_net_buy,
-                    StockInvestorTrading.foreigner_accum,
-                    StockInvestorTrading.foreigner_trend_signal,
-                    StockInvestorTrading.foreigner_trend_score
-                )
-            elif include_price:
-                # 종가만
-                query = query.with_entities(
-                    StockInvestorTrading.id,
-                    StockInvestorTrading.stock_code,
-                    StockInvestorTrading.stock_name,
-                    StockInvestorTrading.trade_date,
-                    StockInvestorTrading.close_price
-                )
+            # 필요한 컬럼만 선택하여 성능 최적화 (fields가 include_* 플래그보다 우선)
+            if fields is None:
+                fields = TradingService.fields_for_groups(include_price, include_institution, include_foreigner)
             
-            return query.order_by(StockInvestorTrading.trade_date.desc()).all()
+            return TradingService._fetch(query, page, stream, tabular, fields)
         except Exception as e:
             raise Exception(f"종목별 날짜 범위 거래 데이터 조회 중 오류 발생: {str(e)}") from e
 
     @staticmethod
+    @cached(trading_tags(), when=_cache_rows)
+    @replica_read
     def get_trading_data_by_date_range_optimized(
         start_date: str, 
         end_date: str,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
-    ) -> List[StockInvestorTrading]:
+        offset: Optional[int] = None,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         날짜 범위 거래 데이터 조회 (페이징 지원, 고성능)
         
+        page를 지정하거나 stream이면 keyset 페이지/스트림을 반환하고 limit/offset은 무시합니다.
+        limit/offset(OFFSET 페이징)은 하위 호환용이며 뒤 페이지일수록 느려집니다.
+        
         Args:
             start_date (str): 시작 날짜 (YYYY-MM-DD)
             end_date (str): 종료 날짜 (YYYY-MM-DD)
             limit (Optional[int]): 조회할 레코드 수 제한
             offset (Optional[int]): 건너뛸 레코드 수
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            List[StockInvestorTrading]: 거래 데이터 목록
+            List[StockInvestorTrading], Page 또는 Iterator: 거래 데이터 목록
         """
         try:
             # 날짜 형식 검증
@@ -492,7 +735,10 @@ class TradingService:
             query = StockInvestorTrading.query.filter(
                 StockInvestorTrading.trade_date >= start_date,
                 StockInvestorTrading.trade_date <= end_date
-            ).order_by(StockInvestorTrading.trade_date.desc())
+            )
+            if page is not None or stream:
+                return TradingService._fetch(query, page, stream, tabular, fields)
+            query = TRADING_KEYSET.order(TradingService._select(query, tabular, fields))
             
             # 페이징 적용
             if offset is not None:
@@ -505,6 +751,8 @@ class TradingService:
             raise Exception(f"날짜 범위 거래 데이터 조회 중 오류 발생: {str(e)}") from e
     
     @staticmethod
+    @cached(_stock_tags)
+    @replica_read
     def get_latest_trade_date(stock_code: Optional[str] = None) -> Optional[str]:
         """
         최신 거래 데이터 날짜 조회
@@ -675,7 +923,7 @@ class TradingService:
                 # 히스토리 로깅 실패는 무시 (주요 기능에 영향 없도록)
                 pass
             
-            return trading_data
+            return TradingService._reload(trading_data)
             
         except Exception as e:
             db.session.rollback()
@@ -722,51 +970,84 @@ class TradingService:
             raise Exception(f"거래 데이터 삭제 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def search_trading_data_by_name(name: str) -> List[StockInvestorTrading]:
+    @cached(trading_tags(), when=_cache_rows)
+    @replica_read
+    def search_trading_data_by_name(
+        name: str,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         주식명으로 거래 데이터 검색
         
         Args:
             name (str): 검색할 주식명 (부분 일치)
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            List[StockInvestorTrading]: 검색된 거래 데이터 목록
+            List[StockInvestorTrading], Page 또는 Iterator: 검색된 거래 데이터 목록
         """
         try:
             if not name or not name.strip():
-                return []
+                if page is not None:
+                    return Page(items=[], limit=page.limit)
+                return iter([]) if stream else []
             
-            return StockInvestorTrading.query.filter(
-                StockInvestorTrading.stock_name.like(f'%{name.strip()}%')
-            ).order_by(StockInvestorTrading.trade_date.desc()).all()
+            # 주식명은 stock_list에서 관리하므로 조인하여 검색
+            return TradingService._fetch(StockInvestorTrading.query.join(
+                StockList, StockList.stock_code == StockInvestorTrading.stock_code
+            ).filter(
+                StockList.stock_name.like(f'%{name.strip()}%')
+            ), page, stream, tabular, fields)
             
         except Exception as e:
             raise Exception(f"거래 데이터 검색 중 오류 발생: {str(e)}") from e
 
     @staticmethod
-    def search_trading_data_by_query(query: str) -> List[StockInvestorTrading]:
+    @cached(trading_tags(), when=_cache_rows)
+    @replica_read
+    def search_trading_data_by_query(
+        query: str,
+        page: Optional[PageRequest] = None,
+        stream: bool = False,
+        tabular: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[StockInvestorTrading], Page, Iterator]:
         """
         주식 코드 또는 주식명으로 거래 데이터 검색
         
         Args:
             query (str): 검색할 주식 코드 또는 주식명 (부분 일치)
+            page (Optional[PageRequest]): 페이지 요청 (지정하면 Page 반환)
+            stream (bool): 전체 결과를 서버 측 커서 이터레이터로 반환할지 여부
+            tabular (bool): 모델 객체 대신 컬럼 값 Row로 조회할지 여부
+            fields (Optional[List[str]]): 조회할 필드 (지정하면 키 필드와 해당 컬럼만 Row로 조회)
             
         Returns:
-            List[StockInvestorTrading]: 검색된 거래 데이터 목록
+            List[StockInvestorTrading], Page 또는 Iterator: 검색된 거래 데이터 목록
         """
         try:
             if not query or not query.strip():
-                return []
+                if page is not None:
+                    return Page(items=[], limit=page.limit)
+                return iter([]) if stream else []
             
             search_term = query.strip()
             
             # 주식 코드 또는 주식명에서 검색 (OR 조건)
-            return StockInvestorTrading.query.filter(
+            return TradingService._fetch(StockInvestorTrading.query.outerjoin(
+                StockList, StockList.stock_code == StockInvestorTrading.stock_code
+            ).filter(
                 or_(
                     StockInvestorTrading.stock_code.like(f'%{search_term}%'),
-                    StockInvestorTrading.stock_name.like(f'%{search_term}%')
+                    StockList.stock_name.like(f'%{search_term}%')
                 )
-            ).order_by(StockInvestorTrading.trade_date.desc()).all()
+            ), page, stream, tabular, fields)
             
         except Exception as e:
             raise Exception(f"거래 데이터 검색 중 오류 발생: {str(e)}") from e
@@ -812,13 +1093,169 @@ class TradingService:
             )
             db.session.commit()
             
-            return trading_data
+            return TradingService._reload(trading_data)
             
         except Exception as e:
             db.session.rollback()
             raise Exception(f"트렌드 분석 업데이트 중 오류 발생: {str(e)}") from e
 
 
+    @staticmethod
+    def validate_trend_frame(frame: pd.DataFrame) -> pd.Series:
+        """
+        일괄 트렌드 업데이트 항목을 열 단위로 한 번에 검증
+        
+        각 항목은 id 또는 (stock_code, trade_date)로 거래 데이터를 지정하고, 신호/점수 4개 필드가 모두 필요합니다.
+        같은 id 또는 같은 (stock_code, trade_date)를 지정한 유효 항목이 여러 개이면 마지막 항목만 유효합니다.
+        
+        Args:
+            frame (pd.DataFrame): id, stock_code, trade_date, 신호/점수 컬럼을 가진 항목 목록
+            
+        Returns:
+            pd.Series: 항목별 오류 메시지 (유효하면 None)
+        """
+        frame = frame.reindex(columns=['id', 'stock_code', 'trade_date'] + TradingService.TREND_FIELDS)
+        
+        has_id = frame['id'].notna()
+        ids = pd.to_numeric(frame['id'], errors='coerce')
+        valid_id = ids.notna() & (ids > 0) & (ids % 1 == 0)
+        codes = frame['stock_code'].astype('string').str.strip()
+        valid_code = codes.str.fullmatch(r'\d{6}').fillna(False).astype(bool)
+        dates = pd.to_datetime(frame['trade_date'].astype('string').str.strip(), format='%Y-%m-%d', errors='coerce')
+        
+        conditions = [
+            has_id & ~valid_id,
+            ~has_id & ~valid_code,
+            ~has_id & dates.isna(),
+        ]
+        messages = [
+            'id는 양의 정수여야 합니다.',
+            'id가 없으면 stock_code(6자리 숫자)가 필요합니다.',
+            'id가 없으면 trade_date(YYYY-MM-DD)가 필요합니다.',
+        ]
+        for field in TradingService.TREND_FIELDS:
+            if field.endswith('_signal'):
+                signals = frame[field].astype('string').str.strip()
+                lengths = signals.str.len()
+                conditions.append((signals.isna() | (lengths == 0) | (lengths > TradingService.MAX_TREND_SIGNAL_LENGTH)).fillna(True).astype(bool))
+                messages.append(f'{field}은(는) {TradingService.MAX_TREND_SIGNAL_LENGTH}자 이내의 필수 문자열입니다.')
+            else:
+                scores = pd.to_numeric(frame[field], errors='coerce').astype('float64')
+                conditions.append(~np.isfinite(scores))
+                messages.append(f'{field}은(는) 필수 숫자입니다.')
+        
+        errors = np.select([np.asarray(condition, dtype=bool) for condition in conditions], messages, default='')
+        errors = pd.Series(errors, index=frame.index, dtype=object)
+        
+        # 같은 거래 데이터를 지정한 항목이 여러 개이면 마지막 항목만 반영 (한 UPDATE 안에서는 어느 값이 남을지 정해지지 않음)
+        targets = pd.Series(
+            np.where(has_id, 'id:' + ids.astype('string'), 'key:' + codes + ':' + dates.dt.strftime('%Y-%m-%d').astype('string')),
+            index=frame.index, dtype=object
+        )
+        valid = errors == ''
+        duplicated = targets[valid].duplicated(keep='last').reindex(frame.index, fill_value=False)
+        errors = errors.mask(duplicated, '같은 거래 데이터를 지정한 뒤쪽 항목이 있어 반영하지 않았습니다.')
+        return errors.where(errors != '', None)
+    
+    @staticmethod
+    def bulk_update_trend_analysis(frame: pd.DataFrame) -> Dict[str, any]:
+        """
+        트렌드 분석 데이터 일괄 업데이트
+        
+        열 단위로 검증한 뒤 유효한 항목을 BULK_TREND_CHUNK_SIZE개씩 UPDATE ... FROM (VALUES ...) 한 번으로 반영합니다.
+        검증 실패와 대상 없음은 항목별로 보고하고 나머지 항목은 반영합니다.
+        
+        Args:
+            frame (pd.DataFrame): id 또는 (stock_code, trade_date)와 신호/점수 4개 필드를 가진 항목 목록
+            
+        Returns:
+            Dict: total, updated, failed, failures (index, error, 식별 정보)
+        """
+        try:
+            frame = frame.reset_index(drop=True).reindex(columns=['id', 'stock_code', 'trade_date'] + TradingService.TREND_FIELDS)
+            errors = TradingService.validate_trend_frame(frame)
+            valid = frame[errors.isna()]
+            
+            table = StockInvestorTrading.__table__
+            matched = set()
+            updated_codes = set()
+            by_id = valid[valid['id'].notna()]
+            by_key = valid[valid['id'].isna()]
+            
+            def trend_values(rows: pd.DataFrame):
+                return [
+                    rows['institution_trend_signal'].astype(str).str.strip().tolist(),
+                    rows['institution_trend_score'].astype(float).tolist(),
+                    rows['foreigner_trend_signal'].astype(str).str.strip().tolist(),
+                    rows['foreigner_trend_score'].astype(float).tolist(),
+                ]
+            
+            trend_columns = [
+                column('institution_signal', String), column('institution_score', Float),
+                column('foreigner_signal', String), column('foreigner_score', Float),
+            ]
+            def assignments(v):
+                return {
+                    'institution_trend_signal': v.c.institution_signal,
+                    'institution_trend_score': v.c.institution_score,
+                    'foreigner_trend_signal': v.c.foreigner_signal,
+                    'foreigner_trend_score': v.c.foreigner_score,
+                }
+            
+            for start in range(0, len(by_id), TradingService.BULK_TREND_CHUNK_SIZE):
+                chunk = by_id.iloc[start:start + TradingService.BULK_TREND_CHUNK_SIZE]
+                rows = list(zip(chunk.index.tolist(), chunk['id'].astype(float).astype(int).tolist(), *trend_values(chunk)))
+                v = values(column('idx', Integer), column('id', Integer), *trend_columns, name='v').data(rows)
+                statement = update(table).where(table.c.id == v.c.id).values(assignments(v)).returning(v.c.idx, table.c.stock_code)
+                for idx, stock_code in db.session.execute(statement):
+                    matched.add(idx)
+                    updated_codes.add(stock_code)
+            
+            for start in range(0, len(by_key), TradingService.BULK_TREND_CHUNK_SIZE):
+                chunk = by_key.iloc[start:start + TradingService.BULK_TREND_CHUNK_SIZE]
+                dates = pd.to_datetime(chunk['trade_date'].astype(str).str.strip(), format='%Y-%m-%d').dt.date
+                rows = list(zip(
+                    chunk.index.tolist(), chunk['stock_code'].astype(str).str.strip().tolist(), dates.tolist(),
+                    *trend_values(chunk)
+                ))
+                v = values(
+                    column('idx', Integer), column('stock_code', String), column('trade_date', Date), *trend_columns, name='v'
+                ).data(rows)
+                statement = update(table).where(
+                    table.c.stock_code == v.c.stock_code, table.c.trade_date == v.c.trade_date
+                ).values(assignments(v)).returning(v.c.idx, table.c.stock_code)
+                for idx, stock_code in db.session.execute(statement):
+                    matched.add(idx)
+                    updated_codes.add(stock_code)
+            
+            # UPDATE 문은 ORM flush를 거치지 않으므로 커밋 후 무효화할 종목을 직접 등록
+            invalidate_trading(updated_codes)
+            db.session.commit()
+            
+            missing = valid.index.difference(list(matched))
+            errors.loc[missing] = '거래 데이터를 찾을 수 없습니다.'
+            failures = []
+            for index, error in errors.dropna().items():
+                item = {'index': int(index), 'error': error}
+                for key in ('id', 'stock_code', 'trade_date'):
+                    value = frame.at[index, key]
+                    if pd.notna(value):
+                        value = value.item() if hasattr(value, 'item') else value
+                        item[key] = int(value) if isinstance(value, float) and value.is_integer() else value
+                failures.append(item)
+            
+            return {
+                'total': len(frame),
+                'updated': len(matched),
+                'failed': len(failures),
+                'failures': failures,
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            raise Exception(f"트렌드 분석 일괄 업데이트 중 오류 발생: {str(e)}") from e
+
+
 # 하위 호환성을 위한 함수들
 def create_trading_data(
     stock_code: str, 
@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+"""
+트렌드 분석 서비스 계층
+종목별 기관/외국인 순매수 시계열로 지표를 벡터 연산으로 계산하고
+트렌드 신호/점수(institution_trend_signal/score, foreigner_trend_signal/score)를 일괄 기록합니다.
+
+지표 (window 구간 표준편차로 정규화)
+    - crossover: 순매수 단기 EMA - 장기 EMA
+    - slope: window 구간 누적 순매수의 선형 회귀 기울기
+    - zscore: 당일 순매수의 window 구간 z-score
+점수는 tanh로 [-1, 1]에 맞춘 지표의 가중 평균이며, 임계값으로 신호를 정합니다.
+
+종목별 EMA 값과 최근 window 거래일 순매수를 trend_indicator_state에 저장해 두고,
+수집으로 새 거래일이 들어오면 새 행만 이어서 계산합니다 (advance_trends).
+전체 재계산(analyze_trends)은 상태가 없거나 과거 데이터가 바뀐 경우의 대안입니다.
+"""
+import logging
+from collections import deque
+from datetime import date, datetime
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from flask import current_app, has_app_context
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from extensions import db
+from models.trend import TrendIndicatorState
+from database.partitioning import TRADING_TABLE
+from database.cache_invalidation import invalidate_trading
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_STRONG_UP = '강한 상승'
+SIGNAL_UP = '상승'
+SIGNAL_NEUTRAL = '중립'
+SIGNAL_DOWN = '하락'
+SIGNAL_STRONG_DOWN = '강한 하락'
+
+DEFAULT_TREND_CONFIG = {
+    'ema_short': 5,
+    'ema_long': 20,
+    'window': 20,
+    'weights': {'crossover': 0.4, 'slope': 0.4, 'zscore': 0.2},
+    'thresholds': {'strong': 0.6, 'weak': 0.2},
+}
+
+# UPDATE 한 번에 반영할 최대 행 수
+WRITE_BATCH_SIZE = 20000
+
+
+def trend_config(overrides: Optional[Dict] = None) -> Dict:
+    """
+    기본 설정에 TREND_ANALYSIS 설정과 호출 인자를 덮어쓴 지표 설정
+
+    Args:
+        overrides (Optional[Dict]): 호출 시 덮어쓸 설정
+
+    Returns:
+        Dict: ema_short, ema_long, window, weights, thresholds
+    """
+    config = {key: dict(value) if isinstance(value, dict) else value for key, value in DEFAULT_TREND_CONFIG.items()}
+    sources = [current_app.config.get('TREND_ANALYSIS') or {}] if has_app_context() else []
+    for source in sources + [overrides or {}]:
+        for key, value in source.items():
+            if isinstance(value, dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+    if config['window'] < 2 or config['ema_short'] < 1 or config['ema_long'] <= config['ema_short']:
+        raise ValueError("지표 설정이 올바르지 않습니다 (window >= 2, 1 <= ema_short < ema_long)")
+    return config
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """지수 이동 평균 (alpha = 2 / (span + 1), 첫 값에서 시작)"""
+    return pd.Series(values, dtype='float64').ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def slope_weights(window: int) -> np.ndarray:
+    """window 길이 시계열의 최소제곱 기울기 가중치 (가중치 합은 0)"""
+    positions = np.arange(window, dtype=np.float64)
+    centered = positions - positions.mean()
+    return centered / np.sum(centered ** 2)
+
+
+def window_indicators(windows: np.ndarray, crossover: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    window 구간 배열로 정규화된 지표 계산 (일괄 계산과 증분 계산이 함께 사용)
+
+    누적 순매수의 기울기는 구간 시작값과 무관하므로 구간 안의 누적합만으로 계산합니다.
+
+    Args:
+        windows (np.ndarray): (행 수, window) 형태의 구간별 순매수 (마지막 열이 당일)
+        crossover (np.ndarray): 행별 단기 EMA - 장기 EMA
+
+    Returns:
+        Dict[str, np.ndarray]: crossover, slope, zscore
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    std = windows.std(axis=1)
+    safe_std = np.where(std > 0, std, 1.0)
+    flat = std == 0
+
+    raw = {
+        'crossover': np.asarray(crossover, dtype=np.float64),
+        'slope': np.cumsum(windows, axis=1) @ slope_weights(windows.shape[1]),
+        'zscore': windows[:, -1] - windows.mean(axis=1),
+    }
+    return {name: np.where(flat, 0.0, values / safe_std) for name, values in raw.items()}
+
+
+def rolling_indicators(values: np.ndarray, config: Dict) -> Dict[str, np.ndarray]:
+    """
+    순매수 시계열 전체의 지표 계산 (window 미만 구간은 NaN)
+
+    Args:
+        values (np.ndarray): 거래일 순 순매수 (NULL은 0)
+        config (Dict): trend_config() 결과
+
+    Returns:
+        Dict[str, np.ndarray]: crossover, slope, zscore
+    """
+    values = np.asarray(values, dtype=np.float64)
+    window = config['window']
+    indicators = {name: np.full(len(values), np.nan) for name in ('crossover', 'slope', 'zscore')}
+    if len(values) < window:
+        return indicators
+
+    crossover = ema(values, config['ema_short']) - ema(values, config['ema_long'])
+    computed = window_indicators(np.lib.stride_tricks.sliding_window_view(values, window), crossover[window - 1:])
+    for name, result in computed.items():
+        indicators[name][window - 1:] = result
+    return indicators
+
+
+def combine_score(indicators: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+    """지표를 tanh로 [-1, 1]에 맞춘 뒤 가중 평균한 점수"""
+    total = sum(weights.values())
+    score = sum(weight * np.tanh(indicators[name]) for name, weight in weights.items())
+    return score / total
+
+
+def classify(scores: np.ndarray, thresholds: Dict[str, float]) -> List[Optional[str]]:
+    """
+    점수를 신호로 변환 (NaN은 None)
+
+    Args:
+        scores (np.ndarray): 트렌드 점수
+        thresholds (Dict[str, float]): strong, weak 임계값
+
+    Returns:
+        List[Optional[str]]: 신호 목록
+    """
+    signals = np.select(
+        [scores >= thresholds['strong'], scores >= thresholds['weak'],
+         scores <= -thresholds['strong'], scores <= -thresholds['weak']],
+        [SIGNAL_STRONG_UP, SIGNAL_UP, SIGNAL_STRONG_DOWN, SIGNAL_DOWN],
+        default=SIGNAL_NEUTRAL
+    ).astype(object)
+    signals[np.isnan(scores)] = None
+    return signals.tolist()
+
+
+def _scores_and_signals(indicators: Dict[str, np.ndarray], config: Dict) -> Tuple[List[Optional[float]], List[Optional[str]]]:
+    """지표를 점수(소수점 4자리, NaN은 None)와 신호로 변환합니다."""
+    scores = combine_score(indicators, config['weights'])
+    rounded = [None if np.isnan(score) else round(float(score), 4) for score in scores]
+    return rounded, classify(scores, config['thresholds'])
+
+
+def compute_trend(values: np.ndarray, config: Dict) -> Tuple[List[Optional[float]], List[Optional[str]], Dict]:
+    """
+    순매수 시계열 전체의 트렌드 점수와 신호
+
+    Args:
+        values (np.ndarray): 거래일 순 순매수
+        config (Dict): trend_config() 결과
+
+    Returns:
+        Tuple: 점수 목록, 신호 목록, 마지막 거래일 기준 지표 상태 (ema_short, ema_long, window)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scores, signals = _scores_and_signals(rolling_indicators(values, config), config)
+    state = {
+        'ema_short': float(ema(values, config['ema_short'])[-1]) if len(values) else None,
+        'ema_long': float(ema(values, config['ema_long'])[-1]) if len(values) else None,
+        'window': [int(value) for value in values[-config['window']:]],
+    }
+    return scores, signals, state
+
+
+def advance_trend(state: Dict, values: List[int], config: Dict) -> Tuple[List[Optional[float]], List[Optional[str]], Dict]:
+    """
+    저장된 지표 상태에서 새 거래일만큼 이어서 계산 (새 행 수에 비례)
+
+    EMA는 점화식으로 갱신하고, 최근 window 거래일은 길이 제한 deque(링 버퍼)로 유지합니다.
+    결과는 전체 이력으로 계산한 compute_trend()와 같습니다.
+
+    Args:
+        state (Dict): compute_trend()/advance_trend()가 반환한 상태
+        values (List[int]): 마지막 반영일 이후의 거래일 순 순매수
+        config (Dict): trend_config() 결과
+
+    Returns:
+        Tuple: 새 행의 점수 목록, 신호 목록, 갱신된 상태
+    """
+    window = config['window']
+    alpha_short = 2.0 / (config['ema_short'] + 1)
+    alpha_long = 2.0 / (config['ema_long'] + 1)
+    ema_short, ema_long = state.get('ema_short'), state.get('ema_long')
+    buffer = deque(state.get('window') or [], maxlen=window)
+
+    full_rows, windows, crossovers = [], [], []
+    for index, value in enumerate(values):
+        if ema_short is None:
+            ema_short = ema_long = float(value)
+        else:
+            ema_short += alpha_short * (value - ema_short)
+            ema_long += alpha_long * (value - ema_long)
+        buffer.append(int(value))
+        if len(buffer) == window:
+            full_rows.append(index)
+            windows.append(list(buffer))
+            crossovers.append(ema_short - ema_long)
+
+    indicators = {name: np.full(len(values), np.nan) for name in ('crossover', 'slope', 'zscore')}
+    if full_rows:
+        for name, result in window_indicators(np.array(windows), np.array(crossovers)).items():
+            indicators[name][full_rows] = result
+
+    scores, signals = _scores_and_signals(indicators, config)
+    return scores, signals, {'ema_short': ema_short, 'ema_long': ema_long, 'window': list(buffer)}
+
+
+def config_key(config: Dict) -> str:
+    """지표 상태에 영향을 주는 설정 식별자"""
+    return f"{config['ema_short']}:{config['ema_long']}:{config['window']}"
+
+
+class TrendService:
+    """트렌드 분석 관련 비즈니스 로직을 처리하는 서비스 클래스"""
+
+    @staticmethod
+    def _write_trends(rows: List[tuple]) -> int:
+        """
+        (id, trade_date, 기관 신호, 기관 점수, 외국인 신호, 외국인 점수) 목록을 UPDATE 한 번으로 반영
+
+        값이 바뀐 행만 기록하며, 트랜잭션은 호출하는 쪽에서 관리합니다.
+
+        Returns:
+            int: 갱신된 행 수
+        """
+        if not rows:
+            return 0
+
+        columns = list(zip(*rows))
+        result = db.session.execute(text(f"""
+            UPDATE {TRADING_TABLE} t
+            SET institution_trend_signal = u.institution_signal,
+                institution_trend_score = u.institution_score,
+                foreigner_trend_signal = u.foreigner_signal,
+                foreigner_trend_score = u.foreigner_score
+            FROM unnest(
+                CAST(:ids AS integer[]), CAST(:dates AS date[]),
+                CAST(:institution_signals AS varchar[]), CAST(:institution_scores AS real[]),
+                CAST(:foreigner_signals AS varchar[]), CAST(:foreigner_scores AS real[])
+            ) AS u(id, trade_date, institution_signal, institution_score, foreigner_signal, foreigner_score)
+            WHERE t.id = u.id AND t.trade_date = u.trade_date
+              AND (t.institution_trend_signal IS DISTINCT FROM u.institution_signal
+                   OR t.institution_trend_score IS DISTINCT FROM u.institution_score
+                   OR t.foreigner_trend_signal IS DISTINCT FROM u.foreigner_signal
+                   OR t.foreigner_trend_score IS DISTINCT FROM u.foreigner_score)
+        """), {
+            'ids': list(columns[0]), 'dates': list(columns[1]),
+            'institution_signals': list(columns[2]), 'institution_scores': list(columns[3]),
+            'foreigner_signals': list(columns[4]), 'foreigner_scores': list(columns[5]),
+        })
+        return result.rowcount
+
+    @staticmethod
+    def _save_states(states: List[Dict]) -> None:
+        """종목별 지표 상태를 INSERT ... ON CONFLICT로 한 번에 저장합니다 (트랜잭션은 호출하는 쪽에서 관리됨)."""
+        if not states:
+            return
+        statement = pg_insert(TrendIndicatorState.__table__).values(states)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=['stock_code'],
+            set_={
+                column: statement.excluded[column]
+                for column in states[0] if column != 'stock_code'
+            }
+        ))
+
+    @staticmethod
+    def clear_states(stock_codes: Optional[List[str]] = None) -> int:
+        """
+        종목별 지표 상태를 삭제합니다 (거래 데이터 삭제와 같은 트랜잭션에서 호출, 커밋하지 않음).
+
+        거래 데이터가 사라진 종목의 상태가 남아 있으면 다시 수집했을 때 삭제된 이력에서 이어서 계산하므로 함께 지웁니다.
+
+        Args:
+            stock_codes (Optional[List[str]]): 주식 코드 목록 (None이면 전체)
+
+        Returns:
+            int: 삭제된 상태 수
+        """
+        statement = TrendIndicatorState.__table__.delete()
+        if stock_codes is not None:
+            if not stock_codes:
+                return 0
+            statement = statement.where(TrendIndicatorState.stock_code.in_(list(stock_codes)))
+        return db.session.execute(statement).rowcount
+
+    @staticmethod
+    def _state_row(stock_code: str, last_row, key: str, institution: Dict, foreigner: Dict) -> Dict:
+        """투자자별 상태를 trend_indicator_state 행으로 변환합니다."""
+        return {
+            'stock_code': stock_code,
+            'last_trade_date': last_row.trade_date,
+            'last_id': last_row.id,
+            'config_key': key,
+            'institution_ema_short': institution['ema_short'],
+            'institution_ema_long': institution['ema_long'],
+            'foreigner_ema_short': foreigner['ema_short'],
+            'foreigner_ema_long': foreigner['ema_long'],
+            'institution_window': institution['window'],
+            'foreigner_window': foreigner['window'],
+            'updated_at': datetime.utcnow(),
+        }
+
+    @staticmethod
+    def analyze_trends(stock_codes: Optional[List[str]] = None, config: Optional[Dict] = None) -> Dict[str, any]:
+        """
+        종목별 트렌드 지표를 전체 이력으로 계산하여 신호/점수 일괄 기록 (전체 재계산)
+
+        거래 테이블을 (stock_code, trade_date) 순서로 서버 측 커서에서 읽어 종목 단위로 계산하고,
+        WRITE_BATCH_SIZE 행마다 UPDATE 한 번으로 반영합니다. 종목별 지표 상태도 함께 저장하여
+        이후 advance_trends()가 이어서 계산할 수 있게 합니다 (트랜잭션은 호출하는 쪽에서 관리됨).
+
+        Args:
+            stock_codes (Optional[List[str]]): 대상 종목 코드 (None이면 전체)
+            config (Optional[Dict]): 지표 설정 덮어쓰기
+
+        Returns:
+            Dict: stocks (종목 수), rows (계산 행 수), updated_rows (갱신 행 수), config
+        """
+        try:
+            config = trend_config(config)
+            key = config_key(config)
+            stock_filter = "WHERE stock_code = ANY(:stock_codes)" if stock_codes is not None else ""
+            params = {'stock_codes': list(stock_codes)} if stock_codes is not None else {}
+
+            rows = db.session.execute(text(f"""
+                SELECT id, trade_date, stock_code, institution_net_buy, foreigner_net_buy
+                FROM {TRADING_TABLE}
+                {stock_filter}
+                ORDER BY stock_code, trade_date, id
+            """).execution_options(yield_per=WRITE_BATCH_SIZE), params)
+
+            stocks = 0
+            total_rows = 0
+            updated_rows = 0
+            pending, states = [], []
+            for stock_code, group in groupby(rows, key=lambda row: row.stock_code):
+                series = list(group)
+                institution_scores, institution_signals, institution_state = compute_trend(
+                    np.array([row.institution_net_buy or 0 for row in series]), config
+                )
+                foreigner_scores, foreigner_signals, foreigner_state = compute_trend(
+                    np.array([row.foreigner_net_buy or 0 for row in series]), config
+                )
+                pending.extend(zip(
+                    [row.id for row in series], [row.trade_date for row in series],
+                    institution_signals, institution_scores, foreigner_signals, foreigner_scores
+                ))
+                states.append(TrendService._state_row(stock_code, series[-1], key, institution_state, foreigner_state))
+                stocks += 1
+                total_rows += len(series)
+                if len(pending) >= WRITE_BATCH_SIZE:
+                    updated_rows += TrendService._write_trends(pending)
+                    TrendService._save_states(states)
+                    pending, states = [], []
+            updated_rows += TrendService._write_trends(pending)
+            TrendService._save_states(states)
+            if updated_rows:
+                invalidate_trading(stock_codes)
+
+            logger.info(f"트렌드 분석: {stocks}개 종목, {total_rows}행 중 {updated_rows}건 갱신")
+            return {
+                'stocks': stocks,
+                'rows': total_rows,
+                'updated_rows': updated_rows,
+                'config': config,
+            }
+
+        except Exception as e:
+            raise Exception(f"트렌드 분석 중 오류 발생: {str(e)}") from e
+
+    @staticmethod
+    def advance_trends(stock_codes: Optional[List[str]] = None,
+                       from_dates: Optional[Dict[str, date]] = None) -> Dict[str, any]:
+        """
+        저장된 지표 상태에서 새 거래일만 이어서 계산하여 신호/점수 기록 (증분 갱신)
+
+        상태가 없거나, 지표 설정이 바뀌었거나, 마지막 반영일 이전 날짜가 추가/수정된 종목은
+        analyze_trends()로 전체 재계산합니다 (트랜잭션은 호출하는 쪽에서 관리됨).
+
+        Args:
+            stock_codes (Optional[List[str]]): 대상 종목 코드 (None이면 from_dates의 종목, 둘 다 없으면 전체)
+            from_dates (Optional[Dict[str, date]]): 종목 코드 → 새로 추가/수정된 가장 이른 거래일
+
+        Returns:
+            Dict: advanced_stocks, rebuilt_stocks, rows (새로 계산한 행 수), updated_rows
+        """
+        try:
+            config = trend_config()
+            key = config_key(config)
+            from_dates = from_dates or {}
+            if stock_codes is None:
+                stock_codes = list(from_dates) if from_dates else [
+                    code for code, in db.session.execute(text(f"SELECT DISTINCT stock_code FROM {TRADING_TABLE}"))
+                ]
+
+            states = {
+                state.stock_code: state
+                for state in TrendIndicatorState.query.filter(TrendIndicatorState.stock_code.in_(stock_codes)).all()
+            }
+            rebuild, advance = [], {}
+            for stock_code in stock_codes:
+                state = states.get(stock_code)
+                from_date = from_dates.get(stock_code)
+                if state is None or state.config_key != key or (from_date is not None and from_date <= state.last_trade_date):
+                    rebuild.append(stock_code)
+                else:
+                    advance[stock_code] = state
+
+            result = {'advanced_stocks': 0, 'rebuilt_stocks': len(rebuild), 'rows': 0, 'updated_rows': 0}
+            if rebuild:
+                rebuilt = TrendService.analyze_trends(rebuild)
+                result['rows'] += rebuilt['rows']
+                result['updated_rows'] += rebuilt['updated_rows']
+
+            if advance:
+                codes = list(advance)
+                rows = db.session.execute(text(f"""
+                    SELECT t.id, t.trade_date, t.stock_code, t.institution_net_buy, t.foreigner_net_buy
+                    FROM {TRADING_TABLE} t
+                    JOIN unnest(CAST(:stock_codes AS varchar[]), CAST(:last_dates AS date[])) AS s(stock_code, last_date)
+                      ON s.stock_code = t.stock_code AND t.trade_date > s.last_date
+                    ORDER BY t.stock_code, t.trade_date, t.id
+                """), {'stock_codes': codes, 'last_dates': [advance[code].last_trade_date for code in codes]}).all()
+
+                pending, new_states = [], []
+                for stock_code, group in groupby(rows, key=lambda row: row.stock_code):
+                    series = list(group)
+                    state = advance[stock_code]
+                    institution_scores, institution_signals, institution_state = advance_trend(
+                        {'ema_short': state.institution_ema_short, 'ema_long': state.institution_ema_long,
+                         'window': state.institution_window},
+                        [row.institution_net_buy or 0 for row in series], config
+                    )
+                    foreigner_scores, foreigner_signals, foreigner_state = advance_trend(
+                        {'ema_short': state.foreigner_ema_short, 'ema_long': state.foreigner_ema_long,
+                         'window': state.foreigner_window},
+                        [row.foreigner_net_buy or 0 for row in series], config
+                    )
+                    pending.extend(zip(
+                        [row.id for row in series], [row.trade_date for row in series],
+                        institution_signals, institution_scores, foreigner_signals, foreigner_scores
+                    ))
+                    new_states.append(TrendService._state_row(stock_code, series[-1], key, institution_state, foreigner_state))
+                    result['advanced_stocks'] += 1
+                    result['rows'] += len(series)
+
+                updated_rows = TrendService._write_trends(pending)
+                TrendService._save_states(new_states)
+                if updated_rows:
+                    invalidate_trading(codes)
+                result['updated_rows'] += updated_rows
+
+            logger.debug(f"트렌드 증분 갱신: {result}")
+            return result
+
+        except Exception as e:
+            raise Exception(f"트렌드 증분 갱신 중 오류 발생: {str(e)}") from e
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+데이터 워터마크 서비스
+조건부 GET의 ETag/Last-Modified 기준이 되는 워터마크를 조회합니다.
+본 조회 대신 기본 키로 한두 행만 읽으므로 요청마다 호출해도 부담이 작습니다.
+"""
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime
+from extensions import db
+from core.conditional import Watermark
+from database.routing import replica_read
+from database.cache_invalidation import TAG_STOCKS, TAG_TRADING_ANY, trading_tag
+from database.watermarks import STOCK_TABLE
+from database.partitioning import TRADING_TABLE
+from models.watermark import DataVersion, TradingCoverage
+
+
+class WatermarkService:
+    """데이터 워터마크 조회 서비스 클래스"""
+
+    @staticmethod
+    def _versions(*tables: str) -> Dict[str, Tuple[int, Optional[datetime]]]:
+        """테이블별 (버전, 마지막 변경 시간) - 행이 없으면 (0, None)"""
+        rows = db.session.query(DataVersion.table_name, DataVersion.version, DataVersion.updated_at).filter(
+            DataVersion.table_name.in_(tables)
+        ).all()
+        found = {name: (version, updated_at) for name, version, updated_at in rows}
+        return {table: found.get(table, (0, None)) for table in tables}
+
+    @staticmethod
+    def _combine(parts: Dict[str, Tuple[int, Optional[datetime]]]) -> Watermark:
+        """여러 워터마크를 하나로 합칩니다 (마지막 변경 시간은 가장 최근 값)."""
+        tag = ';'.join(f'{name}:{version}' for name, (version, _) in parts.items())
+        times = [updated_at for _, updated_at in parts.values() if updated_at is not None]
+        return Watermark(tag, max(times) if times else None)
+
+    @staticmethod
+    @replica_read
+    def stocks(**view_args) -> Watermark:
+        """
+        주식 목록 워터마크 (stock_list 데이터 버전)
+
+        Returns:
+            Watermark: 주식 목록 조회 응답의 검증 기준
+        """
+        try:
+            return WatermarkService._combine(WatermarkService._versions(STOCK_TABLE))
+        except Exception as e:
+            raise Exception(f"주식 목록 워터마크 조회 중 오류 발생: {str(e)}") from e
+
+    @staticmethod
+    @replica_read
+    def trading(**view_args) -> Watermark:
+        """
+        거래 데이터 전체 워터마크 (거래 테이블 + stock_list 데이터 버전)
+
+        주식명과 누적 초기값을 stock_list에서 가져오므로 stock_list 버전도 포함합니다.
+
+        Returns:
+            Watermark: 여러 종목에 걸친 거래 데이터 조회 응답의 검증 기준
+        """
+        try:
+            return WatermarkService._combine(WatermarkService._versions(TRADING_TABLE, STOCK_TABLE))
+        except Exception as e:
+            raise Exception(f"거래 데이터 워터마크 조회 중 오류 발생: {str(e)}") from e
+
+    @staticmethod
+    @replica_read
+    def trading_stock(stock_code: str, **view_args) -> Watermark:
+        """
+        종목 거래 데이터 워터마크 (종목별 행 수/최근 거래일/버전 + stock_list 데이터 버전)
+
+        다른 종목의 수집/수정은 이 워터마크를 바꾸지 않으므로 대시보드의 종목별 폴링이 계속 304를 받습니다.
+
+        Args:
+            stock_code (str): 주식 코드
+
+        Returns:
+            Watermark: 종목 거래 데이터 조회 응답의 검증 기준
+        """
+        try:
+            stock_code = stock_code.strip()
+            coverage = db.session.query(
+                TradingCoverage.row_count, TradingCoverage.max_trade_date,
+                TradingCoverage.version, TradingCoverage.updated_at
+            ).filter(TradingCoverage.stock_code == stock_code).first()
+            row_count, max_trade_date, version, updated_at = coverage or (0, None, 0, None)
+
+            parts = WatermarkService._versions(STOCK_TABLE)
+            parts[f'{stock_code}:{row_count}:{max_trade_date}'] = (version, updated_at)
+            return WatermarkService._combine(parts)
+        except Exception as e:
+            raise Exception(f"종목 거래 데이터 워터마크 조회 중 오류 발생 (Code: {stock_code}): {str(e)}") from e
+
+    @staticmethod
+    @replica_read
+    def cache_versions(known: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        조회 결과 캐시 태그별 데이터 버전 (core.cache.ResultCache.sync의 버전 조회 함수)
+
+        거래 테이블 버전이 바뀐 경우에만 종목별 범위 버전을 읽어, 바뀐 종목의 태그만 무효화되도록 합니다.
+
+        Args:
+            known (Dict[str, Any]): 마지막으로 확인한 태그별 버전
+
+        Returns:
+            Dict[str, Any]: 현재 태그별 버전
+        """
+        try:
+            parts = WatermarkService._versions(TRADING_TABLE, STOCK_TABLE)
+            versions = {TAG_STOCKS: parts[STOCK_TABLE][0], TAG_TRADING_ANY: parts[TRADING_TABLE][0]}
+            if known.get(TAG_TRADING_ANY) != versions[TAG_TRADING_ANY]:
+                rows = db.session.query(TradingCoverage.stock_code, TradingCoverage.version).all()
+                versions.update({trading_tag(stock_code): version for stock_code, version in rows})
+            return versions
+        except Exception as e:
+            raise Exception(f"캐시 데이터 버전 조회 중 오류 발생: {str(e)}") from e
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+인덱스 분석기 테스트
+"""
+import pytest
+from database.index_advisor import (
+    parse_index_definition, find_redundant_indexes, find_unused_indexes,
+    classify_query, parse_query_log, plan_index_changes
+)
+
+
+def _indexes(*definitions):
+    return [parse_index_definition(d) for d in definitions]
+
+
+@pytest.mark.unit
+class TestIndexAdvisor:
+    """인덱스 분석기 테스트"""
+    
+    def test_parse_index_definition(self):
+        """pg_indexes 정의 해석 테스트"""
+        index = parse_index_definition(
+            "CREATE INDEX idx_cover ON public.stock_investor_trading USING btree "
+            "(stock_code, trade_date DESC) INCLUDE (close_price) WHERE (close_price IS NOT NULL)"
+        )
+        assert index['name'] == 'idx_cover'
+        assert index['table'] == 'stock_investor_trading'
+        assert index['columns'] == ['stock_code', 'trade_date']
+        assert index['include'] == ['close_price']
+        assert index['predicate'] == '(close_price IS NOT NULL)'
+    
+    def test_prefix_and_partial_indexes_are_redundant(self):
+        """접두사 인덱스와 부분 인덱스 중복 판정 테스트"""
+        indexes = _indexes(
+            "CREATE UNIQUE INDEX stock_investor_trading_pkey ON public.stock_investor_trading USING btree (id)",
+            "CREATE INDEX idx_a ON public.stock_investor_trading USING btree (stock_code, trade_date)",
+            "CREATE INDEX idx_b ON public.stock_investor_trading USING btree (stock_code, trade_date, close_price)",
+            "CREATE INDEX idx_c ON public.stock_investor_trading USING btree (stock_code, trade_date) "
+            "WHERE (close_price IS NOT NULL)",
+        )
+        redundant = {item['name']: item['superseded_by'] for item in find_redundant_indexes(indexes)}
+        assert redundant == {'idx_a': 'idx_b', 'idx_c': 'idx_b'}
+    
+    def test_unused_indexes_by_write_ratio(self):
+        """쓰기 대비 스캔 비율 기준 미사용 판정 테스트"""
+        indexes = _indexes(
+            "CREATE INDEX idx_hot ON public.stock_investor_trading USING btree (stock_code, trade_date)",
+            "CREATE INDEX idx_cold ON public.stock_investor_trading USING btree (trade_date, close_price)",
+            "CREATE INDEX idx_never ON public.stock_investor_trading USING btree (foreigner_trend_score)",
+        )
+        usage = {'idx_hot': {'idx_scan': 50000}, 'idx_cold': {'idx_scan': 10}}
+        unused = {item['name'] for item in find_unused_indexes(indexes, usage, table_writes=100000)}
+        assert unused == {'idx_cold', 'idx_never'}
+    
+    def test_classify_query(self):
+        """쿼리 형태 분류 테스트"""
+        narrow = (
+            "SELECT stock_investor_trading.id AS stock_investor_trading_id, "
+            "stock_investor_trading.stock_code AS stock_investor_trading_stock_code, "
+            "stock_investor_trading.trade_date AS stock_investor_trading_trade_date, "
+            "stock_investor_trading.close_price AS stock_investor_trading_close_price "
+            "FROM stock_investor_trading WHERE stock_investor_trading.stock_code = $1 "
+            "AND stock_investor_trading.trade_date >= $2 AND stock_investor_trading.trade_date <= $3"
+        )
+        assert classify_query(narrow) == 'stock_date_range_price'
+        assert classify_query(
+            "SELECT * FROM stock_investor_trading WHERE trade_date >= $1 AND trade_date <= $2"
+        ) == 'date_range'
+        assert classify_query("SELECT * FROM stock_list") is None
+    
+    def test_parse_query_log(self):
+        """PostgreSQL 로그 해석 테스트"""
+        lines = [
+            "2024-01-01 LOG:  duration: 12.500 ms  statement: SELECT * FROM stock_investor_trading "
+            "WHERE trade_date >= '2024-01-01'",
+            "unrelated line",
+        ]
+        statements = parse_query_log(lines)
+        assert len(statements) == 1
+        assert statements[0]['total_time_ms'] == 12.5
+    
+    def test_plan_consolidates_covering_index(self):
+        """커버링 인덱스 제안 후 대체되는 인덱스 삭제 계획 테스트"""
+        indexes = _indexes(
+            "CREATE INDEX idx_a ON public.stock_investor_trading USING btree (stock_code, trade_date)",
+            "CREATE INDEX idx_d ON public.stock_investor_trading USING btree (trade_date)",
+        )
+        usage = {'idx_a': {'idx_scan': 10000}, 'idx_d': {'idx_scan': 10000}}
+        shape_usage = {'stock_date_range_price': {'calls': 100, 'total_time_ms': 10.0}}
+        result = plan_index_changes(indexes, usage, 1000, shape_usage)
+        
+        assert [p['include'] for p in result['proposals']] == [['id', 'close_price']]
+        actions = [(step['action'], step['name']) for step in result['plan']]
+        assert actions[0][0] == 'create'
+        assert ('drop', 'idx_a') in actions
+        assert ('drop', 'idx_d') not in actions
+        assert 'CONCURRENTLY' in result['plan'][0]['statements'][0]
@@ -4,7 +4,7 @@
 """
 import pytest
 import random
-from datetime import datetime
+from datetime import date, datetime
 from models.stock import StockList
 from models.trading import StockInvestorTrading
 from models.history import DataHistory, SystemLog
@@ -54,6 +54,39 @@ class TestStockModel:
             db_session.add(stock2)
             db_session.commit()
     
+    def test_name_cache_follows_committed_versions(self, db_session, monkeypatch):
+        """주식명 사전이 롤백된 변경은 무시하고, 다른 워커가 커밋한 변경은 데이터 버전으로 감지하는지 테스트"""
+        import models.stock as stock_module
+        from sqlalchemy import text
+        from extensions import db
+        unique_code = f"{random.randint(300000, 399999)}"
+        db_session.add(StockList(stock_code=unique_code, stock_name='변경전'))
+        db_session.commit()
+        assert StockList.get_name(unique_code) == '변경전'
+        loaded_at = stock_module._name_cache_loaded_at
+        
+        # flush 후 롤백된 이름 변경은 사전을 비우지 않음
+        stock = StockList.query.filter_by(stock_code=unique_code).one()
+        stock.stock_name = '롤백됨'
+        db_session.flush()
+        db_session.rollback()
+        assert StockList.get_name(unique_code) == '변경전'
+        assert stock_module._name_cache_loaded_at == loaded_at
+        
+        # 다른 워커의 커밋 (별도 연결로 변경하고 stock_list 데이터 버전을 올림)
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE stock_list SET stock_name = '변경후' WHERE stock_code = :code"), {'code': unique_code})
+            conn.execute(text("""
+                INSERT INTO data_version (table_name, version, updated_at) VALUES ('stock_list', 1, now())
+                ON CONFLICT (table_name) DO UPDATE SET version = data_version.version + 1, updated_at = now()
+            """))
+        monkeypatch.setattr(stock_module, 'NAME_CACHE_CHECK_INTERVAL', 0)
+        db_session.rollback()
+        assert StockList.get_name(unique_code) == '변경후'
+        
+        StockList.query.filter_by(stock_code=unique_code).delete()
+        db_session.commit()
+    
     def test_stock_to_dict(self, db_session):
         """주식 모델 딕셔너리 변환 테스트"""
         stock = StockList(
@@ -108,6 +141,21 @@ class TestTradingModel:
                 trade_date=datetime.now().date().isoformat(),
                 close_price=-1000
             )
+    
+    def test_trade_date_coerced_to_date(self):
+        """문자열 거래 날짜가 DATE로 변환되고 to_dict에서는 ISO 문자열로 반환되는지 테스트"""
+        trading = StockInvestorTrading(
+            stock_code='005930',
+            stock_name='삼성전자',
+            trade_date='2024-01-02',
+            institution_accum=3_000_000_000
+        )
+        
+        assert trading.trade_date == date(2024, 1, 2)
+        trading_dict = trading.to_dict()
+        assert trading_dict['trade_date'] == '2024-01-02'
+        assert trading_dict['stock_name'] == '삼성전자'
+        assert trading_dict['institution_accum'] == 3_000_000_000
 
 
 @pytest.mark.unit
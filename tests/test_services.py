@@ -145,4 +145,327 @@ class TestTradingService:
                 assert result is not None
             except Exception:
                 # 외부 API 연결 실패는 정상
-                pass 
\ No newline at end of file
+                pass 
+    
+    def test_validate_trend_frame(self):
+        """일괄 트렌드 업데이트 항목의 열 단위 검증 테스트"""
+        import pandas as pd
+        signals = {'institution_trend_signal': '상승', 'institution_trend_score': 0.8,
+                   'foreigner_trend_signal': '하락', 'foreigner_trend_score': -0.3}
+        frame = pd.DataFrame([
+            {'id': 1, **signals},
+            {'stock_code': '005930', 'trade_date': '2024-01-02', **signals},
+            {'stock_code': '005930', 'trade_date': '2024-13-02', **signals},
+            {'id': 2, **signals, 'foreigner_trend_score': 'abc'},
+            {'id': 3, **signals, 'institution_trend_signal': 'x' * 51},
+            {'id': 1.0, **signals, 'institution_trend_signal': '보합'},
+            {'stock_code': ' 005930', 'trade_date': '2024-01-02', **signals},
+            {'id': 3, **signals},
+        ])
+        
+        errors = TradingService.validate_trend_frame(frame)
+        assert 'trade_date' in errors[2]
+        assert 'foreigner_trend_score' in errors[3]
+        assert 'institution_trend_signal' in errors[4]
+        # 같은 거래 데이터를 지정한 항목은 마지막 항목만 유효 (검증 실패 항목은 중복으로 보지 않음)
+        assert '뒤쪽 항목' in errors[0] and '뒤쪽 항목' in errors[1]
+        assert errors[5] is None and errors[6] is None and errors[7] is None
+    
+    def test_bulk_update_trend_analysis(self, db_session):
+        """id 또는 (stock_code, trade_date)로 일괄 업데이트하고 실패 항목을 보고하는지 테스트"""
+        import pandas as pd
+        unique_code = f"{random.randint(700000, 799999)}"
+        trading = StockInvestorTrading(stock_code=unique_code, trade_date='2024-01-02')
+        other = StockInvestorTrading(stock_code=unique_code, trade_date='2024-01-03')
+        db_session.add_all([trading, other])
+        db_session.commit()
+        
+        signals = {'institution_trend_signal': '상승', 'institution_trend_score': 0.8,
+                   'foreigner_trend_signal': '하락', 'foreigner_trend_score': -0.3}
+        result = TradingService.bulk_update_trend_analysis(pd.DataFrame([
+            {'id': trading.id, **signals},
+            {'stock_code': unique_code, 'trade_date': '2024-01-03', **signals},
+            {'stock_code': unique_code, 'trade_date': '2024-01-04', **signals},
+        ]))
+        
+        assert (result['total'], result['updated'], result['failed']) == (3, 2, 1)
+        assert result['failures'][0]['index'] == 2
+        db_session.refresh(other)
+        assert other.institution_trend_signal == '상승'
+
+    def test_keyset_pages_cover_all_rows(self, db_session):
+        """커서로 다음/이전 페이지를 이동하면 겹치거나 빠진 행 없이 같은 순서를 유지하는지 테스트"""
+        from core.pagination import PageRequest
+        unique_code = f"{random.randint(500000, 599999)}"
+        for day in range(1, 6):
+            db_session.add(StockInvestorTrading(stock_code=unique_code, trade_date=f'2024-01-0{day}'))
+        db_session.commit()
+        
+        first = TradingService.get_trading_data_by_stock_code(unique_code, page=PageRequest(limit=2))
+        second = TradingService.get_trading_data_by_stock_code(unique_code, page=PageRequest(limit=2, cursor=first.next_cursor))
+        last = TradingService.get_trading_data_by_stock_code(unique_code, page=PageRequest(limit=2, cursor=second.next_cursor))
+        back = TradingService.get_trading_data_by_stock_code(unique_code, page=PageRequest(limit=2, cursor=second.prev_cursor))
+        
+        dates = [[row.trade_date.day for row in page.items] for page in (first, second, last, back)]
+        assert dates == [[5, 4], [3, 2], [1], [5, 4]]
+        assert first.prev_cursor is None and last.next_cursor is None and back.prev_cursor is None
+
+    def test_stream_matches_list(self, db_session):
+        """서버 측 커서 스트림이 전체 목록 조회와 같은 행을 같은 순서로 반환하는지 테스트"""
+        unique_code = f"{random.randint(500000, 599999)}"
+        for day in range(1, 4):
+            db_session.add(StockInvestorTrading(stock_code=unique_code, trade_date=f'2024-02-0{day}'))
+        db_session.commit()
+
+        streamed = [row.id for row in TradingService.get_trading_data_by_stock_code(unique_code, stream=True)]
+        listed = [row.id for row in TradingService.get_trading_data_by_stock_code(unique_code)]
+        assert streamed == listed and len(streamed) == 3
+
+    def test_fields_projection(self):
+        """fields 해석과 최소 컬럼 SELECT 구성 테스트 (키 필드 항상 포함, include_* 플래그 변환)"""
+        from services.trading_service import InvalidFieldsError
+        assert TradingService.parse_fields(' close_price, stock_name,close_price ') == ['close_price', 'stock_name']
+        assert TradingService.parse_fields('') is None
+        with pytest.raises(InvalidFieldsError):
+            TradingService.parse_fields('close_price,password')
+
+        columns = [column.key for column in TradingService.projection(['foreigner_accum', 'stock_name'])]
+        assert columns == ['id', 'stock_code', 'stock_name', 'trade_date', 'foreigner_accum']
+        assert [column.key for column in TradingService.projection(['close_price'])] == [
+            'id', 'stock_code', 'trade_date', 'close_price'
+        ]
+        assert TradingService.fields_for_groups(True, True, True) is None
+        assert TradingService.fields_for_groups(False, True, False) == [
+            'institution_net_buy', 'institution_accum', 'institution_trend_signal', 'institution_trend_score'
+        ]
+
+
+class TestAccumulationService:
+    """AccumulationService 테스트"""
+    
+    def test_recompute_accumulation(self, db_session):
+        """윈도 함수 누적 재계산 테스트 (입력 순서와 무관하게 날짜순 누적)"""
+        from services.accumulation_service import AccumulationService
+        unique_code = f"{random.randint(800000, 899999)}"
+        for trade_date, institution, foreigner in [
+            ('2024-01-03', 30, -5), ('2024-01-01', 10, 5), ('2024-01-02', None, 20)
+        ]:
+            db_session.add(StockInvestorTrading(
+                stock_code=unique_code, trade_date=trade_date,
+                institution_net_buy=institution, foreigner_net_buy=foreigner
+            ))
+        db_session.commit()
+        
+        result = AccumulationService.recompute_accumulation([unique_code])
+        db_session.commit()
+        
+        assert result['updated_by_stock'] == {unique_code: 3}
+        rows = StockInvestorTrading.query.filter_by(stock_code=unique_code).order_by(
+            StockInvestorTrading.trade_date
+        ).all()
+        assert [(r.institution_accum, r.foreigner_accum) for r in rows] == [(10, 5), (10, 25), (40, 20)]
+        
+        # 변경이 없으면 갱신하지 않음
+        assert AccumulationService.recompute_accumulation([unique_code])['updated_rows'] == 0
+    
+    def test_extend_accumulation_updates_tail_only(self, db_session):
+        """증분 갱신이 직전 누적값부터 뒷부분만 계산하는지 테스트"""
+        from datetime import date
+        from services.accumulation_service import AccumulationService
+        unique_code = f"{random.randint(800000, 899999)}"
+        for trade_date, net, accum in [('2024-01-01', 10, 10), ('2024-01-02', 5, 15), ('2024-01-03', 7, None)]:
+            db_session.add(StockInvestorTrading(
+                stock_code=unique_code, trade_date=trade_date,
+                institution_net_buy=net, foreigner_net_buy=0,
+                institution_accum=accum, foreigner_accum=0 if accum is not None else None
+            ))
+        db_session.commit()
+        
+        assert AccumulationService.find_stale_dates([unique_code]) == {unique_code: date(2024, 1, 3)}
+        result = AccumulationService.refresh_accumulation([unique_code])
+        db_session.commit()
+        
+        assert result['updated_rows'] == 1
+        latest = StockInvestorTrading.query.filter_by(stock_code=unique_code, trade_date='2024-01-03').first()
+        assert (latest.institution_accum, latest.foreigner_accum) == (22, 0)
+    
+    def test_accumulated_series_applies_baseline(self, db_session):
+        """누적 초기값이 행 재작성 없이 캐시/뷰 조회 모두에 반영되는지 테스트"""
+        from services.accumulation_service import AccumulationService
+        unique_code = f"{random.randint(800000, 899999)}"
+        stock = StockList(stock_code=unique_code, stock_name='누적초기값테스트', institution_accum_init=100, foreigner_accum_init=0)
+        db_session.add(stock)
+        for trade_date, net in [('2024-01-01', 10), ('2024-01-02', 5)]:
+            db_session.add(StockInvestorTrading(
+                stock_code=unique_code, trade_date=trade_date,
+                institution_net_buy=net, foreigner_net_buy=1
+            ))
+        db_session.commit()
+        AccumulationService.recompute_accumulation([unique_code])
+        db_session.commit()
+        
+        stock.institution_accum_init = 200
+        db_session.commit()
+        
+        cached = AccumulationService.get_accumulated_series(unique_code, use_cache=True)
+        computed = AccumulationService.get_accumulated_series(unique_code, use_cache=False)
+        assert [row['institution_accum'] for row in cached] == [210, 215]
+        assert cached == computed
+        
+        stored = StockInvestorTrading.query.filter_by(stock_code=unique_code, trade_date='2024-01-02').first()
+        assert stored.institution_accum == 15
+        assert stored.to_dict()['institution_accum'] == 215
+    
+    def test_trading_reads_compute_accum_without_cache(self, app, db_session, monkeypatch):
+        """누적 캐시를 끄면 저장된 누계가 비어 있어도 목록/단건 조회가 누적 뷰와 같은 값을 반환하는지 테스트"""
+        from services.accumulation_service import AccumulationService
+        from services.trading_service import TradingService
+        monkeypatch.setitem(app.config, 'ACCUM_CACHE_ENABLED', False)
+        unique_code = f"{random.randint(800000, 899999)}"
+        db_session.add(StockList(stock_code=unique_code, stock_name='누적계산테스트', institution_accum_init=100, foreigner_accum_init=0))
+        for trade_date, net in [('2024-01-01', 10), ('2024-01-02', 5)]:
+            db_session.add(StockInvestorTrading(
+                stock_code=unique_code, trade_date=trade_date,
+                institution_net_buy=net, foreigner_net_buy=1
+            ))
+        db_session.commit()
+        
+        expected = [(row['institution_accum'], row['foreigner_accum'])
+                    for row in AccumulationService.get_accumulated_series(unique_code, use_cache=False)]
+        assert expected == [(110, 1), (115, 2)]
+        rows = TradingService.get_trading_data_by_stock_code(unique_code, tabular=True)
+        assert sorted((row.institution_accum, row.foreigner_accum) for row in rows) == expected
+        items = TradingService.get_trading_data_by_stock_code(unique_code)
+        assert sorted((item.to_dict()['institution_accum'], item.to_dict()['foreigner_accum']) for item in items) == expected
+        # 단건 조회도 그 행까지의 전체 누계를 반환 (조회 대상 행만으로 계산하지 않음)
+        latest = next(item for item in items if item.trade_date.isoformat() == '2024-01-02')
+        single = TradingService.get_trading_data_by_id(latest.id)
+        assert (single.to_dict()['institution_accum'], single.to_dict()['foreigner_accum']) == (115, 2)
+
+
+class TestTrendService:
+    """트렌드 분석 서비스 테스트"""
+    
+    def test_compute_trend_signals(self):
+        """순매수 증가 구간은 상승, 감소 구간은 하락 신호가 나오는지 테스트"""
+        import numpy as np
+        from services.trend_service import compute_trend, trend_config, SIGNAL_STRONG_UP, SIGNAL_STRONG_DOWN
+        config = trend_config({'ema_short': 3, 'ema_long': 6, 'window': 5})
+        rising = np.concatenate([np.zeros(10), np.arange(1, 11) * 100])
+        
+        scores, signals, _ = compute_trend(rising, config)
+        assert scores[:4] == [None] * 4 and signals[:4] == [None] * 4
+        assert signals[-1] == SIGNAL_STRONG_UP and 0 < scores[-1] <= 1
+        
+        scores, signals, _ = compute_trend(-rising, config)
+        assert signals[-1] == SIGNAL_STRONG_DOWN and -1 <= scores[-1] < 0
+        
+        scores, _, _ = compute_trend(np.full(8, 500), config)
+        assert scores[-1] == 0.0
+    
+    def test_rolling_slope_matches_polyfit(self):
+        """구간 누적 순매수 기울기가 최소제곱 기울기와 같은지 테스트"""
+        import numpy as np
+        from services.trend_service import rolling_indicators, trend_config
+        config = trend_config({'window': 6})
+        values = np.array([3, -1, 4, 1, -5, 9, 2, -6, 5, 3], dtype=float)
+        
+        indicators = rolling_indicators(values, config)
+        for end in range(6, len(values) + 1):
+            window = values[end - 6:end]
+            expected = np.polyfit(np.arange(6), np.cumsum(window), 1)[0] / window.std()
+            assert np.isclose(indicators['slope'][end - 1], expected)
+    
+    def test_advance_trend_matches_full_recompute(self):
+        """저장된 상태에서 이어서 계산한 결과가 전체 재계산과 같은지 테스트"""
+        import numpy as np
+        from services.trend_service import advance_trend, compute_trend, trend_config
+        config = trend_config({'ema_short': 3, 'ema_long': 8, 'window': 5})
+        values = np.random.default_rng(7).integers(-1000, 1000, size=30)
+        
+        full_scores, full_signals, full_state = compute_trend(values, config)
+        scores, signals, state = compute_trend(values[:3], config)
+        for start, end in [(3, 4), (4, 12), (12, 30)]:
+            new_scores, new_signals, state = advance_trend(state, values[start:end].tolist(), config)
+            scores += new_scores
+            signals += new_signals
+        
+        assert signals == full_signals
+        assert np.allclose(np.array(scores, dtype=float), np.array(full_scores, dtype=float), atol=1e-4, equal_nan=True)
+        assert state['window'] == full_state['window']
+        assert np.isclose(state['ema_long'], full_state['ema_long'])
+    
+    def test_clearing_trading_data_clears_trend_state(self, app, db_session):
+        """종목 거래 데이터를 삭제하면 같은 트랜잭션에서 트렌드 지표 상태도 삭제되는지 테스트"""
+        from datetime import date
+        from models.trend import TrendIndicatorState
+        from services.data_collector import DataCollectorService
+        from services.trend_service import TrendService
+        unique_code = f"{random.randint(700000, 799999)}"
+        other_code = f"{random.randint(600000, 699999)}"
+        for code in (unique_code, other_code):
+            db_session.add(StockInvestorTrading(stock_code=code, trade_date='2024-01-02', institution_net_buy=1, foreigner_net_buy=1))
+            db_session.add(TrendIndicatorState(stock_code=code, last_trade_date=date(2024, 1, 2), last_id=1, config_key='3:6:5'))
+        db_session.commit()
+        
+        assert DataCollectorService.clear_trading_data_by_stock(unique_code)
+        assert db_session.get(TrendIndicatorState, unique_code) is None
+        assert db_session.get(TrendIndicatorState, other_code) is not None
+        assert TrendService.clear_states([]) == 0
+        
+        DataCollectorService.clear_trading_data_by_stock(other_code)
+
+
+class TestIngestService:
+    """IngestService 테스트"""
+    
+    def test_csv_chunks_validated_by_column(self):
+        """CSV를 청크로 나누고 열 단위 검증으로 거부 사유와 행 번호를 보고하는지 테스트"""
+        import io
+        import pandas as pd
+        from services.ingest_service import IngestService, iter_csv_chunks
+        body = (
+            "Stock_Code,trade_date,close_price,institution_net_buy\n"
+            "005930,2024-01-02,70000,-120\n"
+            "5930,2024-01-02,70000,1\n"
+            "005930,2024/01/03,,\n"
+            "005930,2024-01-04,1.5,\n"
+            "005930,2024-01-05\n"
+            "005930,2024-01-08,,3000000000\n"
+        ).encode('utf-8')
+        
+        chunks = list(iter_csv_chunks(io.BytesIO(body), chunk_size=3))
+        assert [lines for _, lines, _ in chunks] == [[2, 3, 4], [5, 7]]
+        assert chunks[1][2] == [{'line': 6, 'error': '컬럼 수가 헤더와 다릅니다 (2/4).'}]
+        
+        rows, errors = IngestService.prepare_ingest_frame(chunks[0][0])
+        assert errors.isna().tolist() == [True, False, False]
+        assert rows.iloc[0].tolist() == ['005930', '2024-01-02', 70000, -120, pd.NA]
+        _, errors = IngestService.prepare_ingest_frame(chunks[1][0])
+        assert errors.str.startswith('close_price').iat[0] and errors.str.startswith('institution_net_buy').iat[1]
+    
+    def test_ingest_trading_data(self, db_session):
+        """NDJSON 적재 시 추가/갱신/중복/거부 건수와 ON CONFLICT 동작 테스트"""
+        import io
+        import json
+        from services.ingest_service import IngestService
+        unique_code = f"{random.randint(600000, 699999)}"
+        db_session.add(StockInvestorTrading(stock_code=unique_code, trade_date='2024-01-02', close_price=100))
+        db_session.commit()
+        
+        lines = [
+            {'stock_code': unique_code, 'trade_date': '2024-01-02', 'institution_net_buy': 10},
+            {'stock_code': unique_code, 'trade_date': '2024-01-03', 'close_price': 110, 'institution_net_buy': 5},
+            {'stock_code': unique_code, 'trade_date': '2024-01-03', 'close_price': 120, 'institution_net_buy': 7},
+            {'stock_code': 'bad', 'trade_date': '2024-01-03'},
+        ]
+        body = '\n'.join(json.dumps(line) for line in lines) + '\nnot json\n'
+        result = IngestService.ingest_trading_data(io.BytesIO(body.encode('utf-8')), 'ndjson')
+        
+        assert (result['total'], result['inserted'], result['updated'], result['duplicates'], result['rejected']) == (5, 1, 1, 1, 2)
+        assert [row['line'] for row in result['rejected_rows']] == [4, 5]
+        rows = StockInvestorTrading.query.filter_by(stock_code=unique_code).order_by(StockInvestorTrading.trade_date).all()
+        assert [(row.close_price, row.institution_net_buy, row.institution_accum) for row in rows] == [(100, 10, 10), (120, 7, 17)]
+        
+        result = IngestService.ingest_trading_data(io.BytesIO(body.encode('utf-8')), 'ndjson', on_conflict='skip')
+        assert (result['inserted'], result['updated'], result['skipped']) == (0, 0, 2)
@@ -197,4 +197,61 @@ def test_delete_stock(client):
     
     # 주식 삭제
     response = client.delete(f'/api/v1/stocks/{stock_id}')
-    assert response.status_code == 204 
\ No newline at end of file
+    assert response.status_code == 204 
+
+def _disconnect_error():
+    """서비스 계층처럼 감싼 연결 끊김 예외"""
+    from sqlalchemy.exc import OperationalError
+    try:
+        raise OperationalError('SELECT 1', {}, Exception('server closed the connection unexpectedly'), connection_invalidated=True)
+    except OperationalError as e:
+        try:
+            raise Exception(f"주식 조회 중 오류 발생: {str(e)}") from e
+        except Exception as wrapped:
+            return wrapped
+
+
+@pytest.mark.api
+def test_read_view_retries_on_disconnect(client, monkeypatch):
+    """읽기 뷰가 서비스에서 감싼 연결 끊김을 재시도하는지 테스트"""
+    from core.metrics import metrics
+    from services.stock_service import StockService
+    
+    calls = []
+    
+    def flaky(stock_code, tabular=False):
+        calls.append(stock_code)
+        if len(calls) == 1:
+            raise _disconnect_error()
+        return None
+    
+    monkeypatch.setattr(StockService, 'get_stock_by_code', staticmethod(flaky))
+    before = metrics.snapshot()['counters'].get('db.read_retries{view=get_stock_by_code}', 0)
+    
+    response = client.get('/api/v1/stocks/code/999998')
+    
+    assert response.status_code == 404
+    assert len(calls) == 2
+    assert metrics.snapshot()['counters']['db.read_retries{view=get_stock_by_code}'] == before + 1
+
+
+@pytest.mark.api
+def test_read_view_returns_503_after_retries(client, monkeypatch):
+    """재시도 후에도 연결이 끊기면 503을 반환하는지 테스트"""
+    from core.metrics import metrics
+    from services.stock_service import StockService
+    import database.transaction as transaction
+    
+    def broken(stock_code, tabular=False):
+        raise _disconnect_error()
+    
+    monkeypatch.setattr(StockService, 'get_stock_by_code', staticmethod(broken))
+    monkeypatch.setattr(transaction.time, 'sleep', lambda seconds: None)
+    before = metrics.snapshot()['counters'].get('db.disconnects{mode=read}', 0)
+    
+    response = client.get('/api/v1/stocks/code/999998')
+    
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert json.loads(response.data)['type'] == 'database_error'
+    assert metrics.snapshot()['counters']['db.disconnects{mode=read}'] == before + 1
@@ -231,4 +231,642 @@ class TestUtilityFunctions:
         
         assert validate_length("test", 1, 10) == True
         assert validate_length("", 1, 10) == False
-        assert validate_length("very long string", 1, 10) == False 
\ No newline at end of file
+        assert validate_length("very long string", 1, 10) == False 
+
+@pytest.mark.unit
+class TestPartitioning:
+    """거래 데이터 파티션 헬퍼 테스트"""
+    
+    def test_period_bounds_year(self):
+        """연 단위 파티션 경계 테스트"""
+        from database.partitioning import period_bounds
+        assert period_bounds(2024) == ('2024-01-01', '2025-01-01')
+    
+    def test_period_bounds_quarter(self):
+        """분기 단위 파티션 경계 테스트"""
+        from database.partitioning import period_bounds, INTERVAL_QUARTER
+        assert period_bounds(2024, INTERVAL_QUARTER, 2) == ('2024-04-01', '2024-07-01')
+        assert period_bounds(2024, INTERVAL_QUARTER, 4) == ('2024-10-01', '2025-01-01')
+    
+    def test_partition_name(self):
+        """파티션 테이블명 생성 테스트"""
+        from database.partitioning import partition_name, INTERVAL_QUARTER
+        assert partition_name(2024) == 'stock_investor_trading_y2024'
+        assert partition_name(2024, INTERVAL_QUARTER, 3) == 'stock_investor_trading_y2024q3'
+    
+    def test_periods_between(self):
+        """날짜 구간의 파티션 목록 테스트"""
+        from datetime import date
+        from database.partitioning import periods_between, INTERVAL_QUARTER
+        assert periods_between(date(2022, 5, 1), date(2024, 2, 1)) == [(2022, 1), (2023, 1), (2024, 1)]
+        assert periods_between(date(2023, 11, 1), date(2024, 4, 1), INTERVAL_QUARTER) == [
+            (2023, 4), (2024, 1), (2024, 2)
+        ]
+
+
+class TestClustering:
+    """거래 데이터 물리 정렬 헬퍼 테스트"""
+    
+    def test_pick_cluster_index(self):
+        """CLUSTER 인덱스 선택 테스트 (가장 작은 (stock_code, trade_date) B-tree)"""
+        from database.clustering import pick_cluster_index
+        indexdefs = [
+            "CREATE INDEX idx_a ON public.stock_investor_trading USING btree (stock_code, trade_date) INCLUDE (close_price)",
+            "CREATE INDEX idx_b ON public.stock_investor_trading USING btree (stock_code, trade_date)",
+            "CREATE INDEX idx_c ON public.stock_investor_trading USING btree (stock_code, trade_date) WHERE (close_price IS NOT NULL)",
+            "CREATE INDEX idx_d ON public.stock_investor_trading USING brin (trade_date)",
+        ]
+        assert pick_cluster_index(indexdefs) == 'idx_b'
+        assert pick_cluster_index(indexdefs[3:]) is None
+    
+    def test_select_cluster_targets(self):
+        """cold 파티션 중 정렬되지 않은 것만 선택하는지 테스트"""
+        from datetime import date
+        from database.clustering import select_cluster_targets
+        relations = [
+            {'name': 'p2023', 'range_end': '2024-01-01', 'is_default': False, 'correlation': 0.1, 'estimated_rows': 100},
+            {'name': 'p2022', 'range_end': '2023-01-01', 'is_default': False, 'correlation': 0.99, 'estimated_rows': 100},
+            {'name': 'p2024', 'range_end': '2025-01-01', 'is_default': False, 'correlation': 0.1, 'estimated_rows': 100},
+            {'name': 'p_default', 'range_end': None, 'is_default': True, 'correlation': None, 'estimated_rows': 10},
+            {'name': 'p2021', 'range_end': '2022-01-01', 'is_default': False, 'correlation': None, 'estimated_rows': 0},
+        ]
+        today = date(2024, 6, 1)
+        assert [t['name'] for t in select_cluster_targets(relations, today)] == ['p2023']
+        assert [t['name'] for t in select_cluster_targets(relations, today, include_hot=True)] == [
+            'p2023', 'p2024', 'p_default'
+        ]
+
+
+class TestConnectionErrorHandling:
+    """연결 끊김 감지와 운영 지표 테스트"""
+    
+    def test_is_disconnect_error(self):
+        """연결 끊김 오류 판별 테스트"""
+        from sqlalchemy.exc import OperationalError, IntegrityError
+        from database.transaction import is_disconnect_error
+        
+        class PgError(Exception):
+            def __init__(self, message, pgcode=None):
+                super().__init__(message)
+                self.pgcode = pgcode
+        
+        closed = OperationalError('SELECT 1', {}, PgError('server closed the connection unexpectedly'), connection_invalidated=True)
+        invalidated = IntegrityError('SELECT 1', {}, Exception('boom'), connection_invalidated=True)
+        failure = OperationalError('SELECT 1', {}, PgError('connection failure', '08006'))
+        shutdown = OperationalError('SELECT 1', {}, PgError('terminating connection due to administrator command', '57P01'))
+        too_many = OperationalError('SELECT 1', {}, PgError('sorry, too many clients already', '53300'))
+        reserved = OperationalError('SELECT 1', {}, PgError('remaining connection slots are reserved', '53300'))
+        duplicate = IntegrityError('INSERT', {}, Exception('duplicate key'))
+        assert is_disconnect_error(closed)
+        assert is_disconnect_error(invalidated)
+        assert is_disconnect_error(failure)
+        assert is_disconnect_error(shutdown)
+        assert not is_disconnect_error(too_many)
+        assert not is_disconnect_error(reserved)
+        assert not is_disconnect_error(OperationalError('SELECT 1', {}, Exception('connection limit exceeded')))
+        assert not is_disconnect_error(duplicate)
+        assert not is_disconnect_error(ValueError('connection'))
+    
+    def test_find_operational_error_follows_cause(self):
+        """서비스가 감싼 예외에서 원래 DB 오류를 찾는지 테스트"""
+        from sqlalchemy.exc import OperationalError, ProgrammingError
+        from database.transaction import find_operational_error, reraise_operational_error
+        
+        closed = OperationalError('SELECT 1', {}, Exception('server closed the connection unexpectedly'), connection_invalidated=True)
+        try:
+            try:
+                raise closed
+            except OperationalError as e:
+                raise Exception(f"거래 데이터 조회 중 오류 발생: {str(e)}") from e
+        except Exception as e:
+            wrapped = e
+        
+        assert find_operational_error(wrapped) is closed
+        assert find_operational_error(ProgrammingError('SELECT x', {}, Exception('syntax error'))) is None
+        assert find_operational_error(ValueError('connection')) is None
+        with pytest.raises(Exception) as raised:
+            reraise_operational_error(wrapped)
+        assert raised.value is wrapped
+        reraise_operational_error(ValueError('connection'))
+    
+    def test_metrics_registry(self):
+        """카운터/게이지 기록 테스트"""
+        from core.metrics import MetricsRegistry
+        registry = MetricsRegistry()
+        registry.increment('db.read_retries', labels={'view': 'get_stocks'})
+        registry.increment('db.read_retries', labels={'view': 'get_stocks'})
+        registry.set_gauge('db.pool.in_use', 3)
+        snapshot = registry.snapshot()
+        assert snapshot['counters'] == {'db.read_retries{view=get_stocks}': 2}
+        assert snapshot['gauges'] == {'db.pool.in_use': 3}
+
+
+class TestReplicaRouting:
+    """읽기 복제본 라우팅 테스트"""
+    
+    def _session(self):
+        from sqlalchemy import create_engine
+        from database.routing import RoutingSession
+        
+        class FakeDB:
+            engines = {None: create_engine('sqlite://'), 'replica': create_engine('sqlite://')}
+        
+        return RoutingSession(FakeDB()), FakeDB.engines
+    
+    def test_routes_reads_to_replica(self, monkeypatch):
+        """복제본 읽기 범위에서만 복제본을 사용하는지 테스트"""
+        import database.routing as routing
+        monkeypatch.setattr(routing, 'is_replica_available', lambda engine: True)
+        session, engines = self._session()
+        
+        assert session.get_bind() is engines[None]
+        with routing.use_replica():
+            assert session.get_bind() is engines['replica']
+            session.info['wrote'] = True
+            assert session.get_bind() is engines[None]
+    
+    def test_falls_back_when_lagging(self, monkeypatch):
+        """복제 지연 시 주 DB로 전환되는지 테스트"""
+        import database.routing as routing
+        monkeypatch.setattr(routing, 'is_replica_available', lambda engine: False)
+        session, engines = self._session()
+        
+        with routing.use_replica():
+            assert session.get_bind() is engines[None]
+
+
+class TestConnectionPool:
+    """커넥션 풀 계측/크기 산정 테스트"""
+    
+    def test_compute_pool_limits(self):
+        """워커 수와 연결 예산으로 프로세스별 풀 크기를 계산하는지 테스트"""
+        from database.pool import compute_pool_limits
+        assert compute_pool_limits(80, 4, 1, 2) == {'per_process': 20, 'pool_size': 3, 'max_overflow': 17}
+        assert compute_pool_limits(8, 4, 4, 2) == {'per_process': 2, 'pool_size': 2, 'max_overflow': 0}
+    
+    def test_instrumented_pool_records_timeouts(self):
+        """체크아웃/타임아웃/무효화 통계 기록 테스트"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+        from database.pool import InstrumentedQueuePool, pool_report
+        engine = create_engine(
+            'sqlite://', poolclass=InstrumentedQueuePool, pool_logging_name='test_pool',
+            pool_size=1, max_overflow=0, pool_timeout=0.01
+        )
+        connection = engine.connect()
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        connection.invalidate()
+        connection.close()
+        
+        report = pool_report({'test_pool': engine})['test_pool']
+        assert report['size'] == 1
+        assert report['checkouts'] == 1
+        assert report['timeouts'] == 1
+        assert report['invalidations'] == 1
+
+
+class TestAccumulationBatch:
+    """누적 순매수 일괄 계산 헬퍼 테스트"""
+    
+    def test_segment_cumsum_with_carry(self):
+        """종목 경계에서 누계가 초기화되고 이전 청크 누계가 이어지는지 테스트"""
+        import numpy as np
+        from database.accumulation_batch import segment_cumsum
+        keys = np.array(['A', 'A', 'B', 'B', 'C'], dtype=object)
+        values = np.array([1, 2, 3, 4, 5], dtype=np.int64)
+        assert segment_cumsum(keys, values).tolist() == [1, 3, 3, 7, 5]
+        assert segment_cumsum(keys, values, carry_key='A', carry_value=10).tolist() == [11, 13, 3, 7, 5]
+        assert segment_cumsum(keys, values, carry_key='Z', carry_value=10).tolist() == [1, 3, 3, 7, 5]
+    
+    def test_accumulate_chunk_matches_single_pass(self):
+        """청크로 나누어 계산해도 한 번에 계산한 결과와 같은지 테스트"""
+        from datetime import date
+        from database.accumulation_batch import accumulate_chunk, split_shards
+        rows = [(i, date(2024, 1, 1 + i % 28), code, i, None if i % 3 else -i)
+                for i, code in enumerate(['A'] * 5 + ['B'] * 4 + ['C'] * 3)]
+        
+        whole_institution, whole_foreigner, _ = accumulate_chunk(rows, (None, 0, 0))
+        carry = (None, 0, 0)
+        institution, foreigner = [], []
+        for start in range(0, len(rows), 4):
+            chunk_institution, chunk_foreigner, carry = accumulate_chunk(rows[start:start + 4], carry)
+            institution += chunk_institution.tolist()
+            foreigner += chunk_foreigner.tolist()
+        
+        assert institution == whole_institution.tolist()
+        assert foreigner == whole_foreigner.tolist()
+        assert split_shards(['C', 'A', 'B'], 2) == [['A', 'C'], ['B']]
+
+
+@pytest.mark.unit
+class TestPagination:
+    """Keyset 커서 페이지네이션 테스트"""
+    
+    def test_cursor_round_trip(self):
+        """커서가 정렬 키 타입을 복원하고 다른 목록/잘못된 커서를 거부하는지 테스트"""
+        from datetime import date
+        from types import SimpleNamespace
+        from models.trading import StockInvestorTrading
+        from models.history import DataHistory
+        from core.pagination import Keyset, InvalidCursorError
+        keyset = Keyset('trading', [StockInvestorTrading.trade_date, StockInvestorTrading.stock_code, StockInvestorTrading.id])
+        item = SimpleNamespace(trade_date=date(2024, 1, 2), stock_code='005930', id=42)
+        
+        cursor = keyset.encode('prev', item)
+        assert keyset.decode(cursor) == ('prev', [date(2024, 1, 2), '005930', 42])
+        
+        other = Keyset('data_history', [DataHistory.created_at, DataHistory.id])
+        for invalid in (cursor[:-3], 'not-a-cursor', other.encode('next', SimpleNamespace(created_at=datetime(2024, 1, 2), id=1))):
+            with pytest.raises(InvalidCursorError):
+                keyset.decode(invalid)
+
+
+@pytest.mark.unit
+class TestStreaming:
+    """목록 스트리밍 응답 테스트"""
+    
+    def test_stream_response_formats(self):
+        """NDJSON/JSON 배열 청크가 일반 응답과 같은 내용이고 잘못된 stream 값을 거부하는지 테스트"""
+        import json
+        from flask import Flask
+        from core.streaming import InvalidStreamModeError, stream_mode_from_args, stream_response
+        app = Flask(__name__)
+        rows = [{'id': i, 'stock_code': f'{i:06d}'} for i in range(1203)]
+        
+        @app.route('/rows')
+        def list_rows():
+            return stream_response(iter(rows), dict, stream_mode_from_args())
+        
+        client = app.test_client()
+        response = client.get('/rows?stream=json')
+        assert response.is_streamed and json.loads(response.get_data()) == rows
+        
+        response = client.get('/rows', headers={'Accept': 'application/x-ndjson'})
+        assert response.mimetype == 'application/x-ndjson'
+        assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == rows
+        
+        with app.test_request_context('/rows?stream=xml'):
+            with pytest.raises(InvalidStreamModeError):
+                stream_mode_from_args()
+        with app.test_request_context('/rows'):
+            assert stream_mode_from_args() is None
+
+
+@pytest.mark.unit
+class TestSerialization:
+    """빠른 조회 경로 직렬화 테스트"""
+    
+    def test_row_serializer_and_dumps(self):
+        """projection별 변환 함수가 재사용되고 to_dict와 같은 값으로 인코딩되는지 테스트"""
+        import json
+        from collections import namedtuple
+        from datetime import date
+        from core.serialization import dumps, result_serializer, row_serializer, serialize_rows
+        Row = namedtuple('Row', ['id', 'stock_name', 'trade_date', 'close_price'])
+        rows = [Row(1, '삼성전자', date(2024, 1, 2), 70000), Row(2, '삼성전자', date(2024, 1, 3), None)]
+        
+        assert row_serializer(Row._fields) is row_serializer(tuple(Row._fields))
+        assert serialize_rows(rows)[1] == {'id': 2, 'stock_name': '삼성전자', 'trade_date': date(2024, 1, 3), 'close_price': None}
+        assert serialize_rows([]) == []
+        assert [result_serializer()(row) for row in rows] == serialize_rows(rows)
+        
+        body = dumps(serialize_rows(rows))
+        assert '삼성전자'.encode('utf-8') in body
+        assert json.loads(body)[0] == {'id': 1, 'stock_name': '삼성전자', 'trade_date': '2024-01-02', 'close_price': 70000}
+    
+    def test_dumps_without_orjson(self, monkeypatch):
+        """orjson이 없으면 표준 json으로 같은 결과를 인코딩하는지 테스트"""
+        import json
+        from datetime import date
+        from decimal import Decimal
+        from core import serialization
+        monkeypatch.setattr(serialization, 'orjson', None)
+        body = serialization.dumps({'trade_date': date(2024, 1, 2), 'score': Decimal('1.5'), 'name': '삼성전자'})
+        assert json.loads(body) == {'trade_date': '2024-01-02', 'score': 1.5, 'name': '삼성전자'}
+        with pytest.raises(TypeError):
+            serialization.dumps({'value': object()})
+
+
+@pytest.mark.unit
+class TestConditionalGet:
+    """조건부 GET 테스트"""
+    
+    def test_etag_and_not_modified(self):
+        """워터마크가 같으면 뷰를 실행하지 않고 304, 바뀌면 새 ETag로 200을 반환하는지 테스트"""
+        from datetime import datetime, timezone
+        from flask import Flask, jsonify
+        from core.conditional import Watermark, conditional_get
+        app = Flask(__name__)
+        app.config['CONDITIONAL_GET_ENABLED'] = True
+        app.config['CACHE_CONTROL'] = {'default': 'no-cache', 'stocks': 'public, max-age=30'}
+        state = {'version': 1, 'calls': 0}
+        
+        def watermark(stock_code):
+            return Watermark(f"{stock_code}:{state['version']}", datetime(2024, 1, 2, 9, 0, tzinfo=timezone.utc))
+        
+        @app.route('/stocks/<stock_code>')
+        @conditional_get(watermark, 'stocks')
+        def get_stock(stock_code):
+            state['calls'] += 1
+            return jsonify({'stock_code': stock_code}), 200
+        
+        client = app.test_client()
+        response = client.get('/stocks/005930')
+        etag = response.headers['ETag']
+        assert response.status_code == 200 and etag.startswith('W/"')
+        assert response.headers['Cache-Control'] == 'public, max-age=30'
+        assert response.headers['Last-Modified'] == 'Tue, 02 Jan 2024 09:00:00 GMT'
+        
+        response = client.get('/stocks/005930', headers={'If-None-Match': etag})
+        assert response.status_code == 304 and response.headers['ETag'] == etag and state['calls'] == 1
+        response = client.get('/stocks/005930', headers={'If-Modified-Since': 'Tue, 02 Jan 2024 09:00:00 GMT'})
+        assert response.status_code == 304 and state['calls'] == 1
+        
+        # 쿼리 문자열이 다르거나 데이터 버전이 바뀌면 다시 조회
+        assert client.get('/stocks/005930?format=csv', headers={'If-None-Match': etag}).status_code == 200
+        state['version'] = 2
+        response = client.get('/stocks/005930', headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.headers['ETag'] != etag and state['calls'] == 3
+        
+        app.config['CONDITIONAL_GET_ENABLED'] = False
+        response = client.get('/stocks/005930', headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 200 and 'ETag' not in response.headers
+
+
+@pytest.mark.unit
+class TestResponseFormats:
+    """표 형식 응답 인코딩 테스트"""
+    
+    def test_columnar_and_csv(self):
+        """Row를 열 배열로 전치하여 columnar JSON/CSV로 인코딩하는지 테스트"""
+        import json
+        from datetime import date
+        from flask import Flask
+        from core.formats import FORMAT_COLUMNAR, FORMAT_CSV, encode_table, rows_to_columns
+        rows = [(1, date(2024, 1, 2), 70000, None), (2, date(2024, 1, 3), 71000, 1.5)]
+        columns = rows_to_columns(rows, ['id', 'trade_date', 'close_price', 'score'])
+        assert columns['close_price'] == [70000, 71000]
+        assert rows_to_columns([], ['id']) == {'id': []}
+        
+        with Flask(__name__).app_context():
+            payload = json.loads(encode_table(FORMAT_COLUMNAR, columns, {'stock_code': '005930'}))
+        assert payload == {
+            'meta': {'stock_code': '005930'},
+            'count': 2,
+            'columns': {'id': [1, 2], 'trade_date': ['2024-01-02', '2024-01-03'],
+                        'close_price': [70000, 71000], 'score': [None, 1.5]}
+        }
+        assert encode_table(FORMAT_CSV, columns).decode('utf-8').splitlines() == [
+            'id,trade_date,close_price,score', '1,2024-01-02,70000,', '2,2024-01-03,71000,1.5'
+        ]
+    
+    def test_arrow_round_trip(self):
+        """Arrow IPC/Parquet 인코딩 결과를 같은 값으로 읽을 수 있는지 테스트 (pyarrow 설치 시)"""
+        pa = pytest.importorskip('pyarrow')
+        import pyarrow.parquet as pq
+        from datetime import date
+        from core.formats import FORMAT_ARROW, FORMAT_PARQUET, encode_table
+        columns = {'trade_date': [date(2024, 1, 2), None], 'close_price': [70000, None]}
+        
+        table = pa.ipc.open_stream(encode_table(FORMAT_ARROW, columns)).read_all()
+        assert table.to_pydict() == columns
+        assert pq.read_table(pa.BufferReader(encode_table(FORMAT_PARQUET, columns))).to_pydict() == columns
+
+
+@pytest.mark.unit
+class TestResultCache:
+    """조회 결과 캐시 테스트"""
+    
+    def test_bounds_ttl_and_tags(self, monkeypatch):
+        """항목 수/바이트 한도로 LRU 제거, TTL 만료, 태그 무효화와 조회 중 무효화 시 저장 생략을 테스트"""
+        import core.cache as cache_module
+        from core.cache import ResultCache, estimate_size
+        from core.metrics import metrics
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+        cache = ResultCache('test_bounds', max_entries=2, max_bytes=10 ** 6, default_ttl=10)
+        
+        cache.set('a', 1, ['stocks'])
+        cache.set('b', 2, ['trading:005930'])
+        assert cache.get('a') == (True, 1)
+        cache.set('c', 3, ['trading:*'])
+        assert cache.get('b') == (False, None) and cache.stats()['entries'] == 2
+        
+        large = ['x' * 1000] * 100
+        cache.configure(max_bytes=estimate_size(large) + 200)
+        cache.set('large', large)
+        assert cache.get('a') == (False, None) and cache.get('large') == (True, large)
+        assert not cache.set('huge', large * 2)
+        
+        now[0] += 11
+        assert cache.get('large') == (False, None)
+        
+        cache.configure(max_bytes=10 ** 6)
+        cache.set('d', 4, ['stocks'])
+        cache.set('e', 5, ['trading:005930', 'stocks'])
+        assert cache.invalidate('trading:005930') == 1
+        assert cache.get('d') == (True, 4) and cache.get('e') == (False, None)
+        
+        def loader():
+            cache.invalidate('stocks')
+            return 'stale'
+        assert cache.get_or_load('f', loader, ['stocks']) == 'stale'
+        assert cache.get('f') == (False, None)
+        assert metrics.snapshot()['counters']['cache.evictions{cache=test_bounds}'] >= 2
+    
+    def test_single_flight(self):
+        """같은 키의 동시 미스는 한 번만 조회하고 나머지는 결과를 공유하는지 테스트"""
+        import threading
+        from core.cache import ResultCache
+        cache = ResultCache('test_flight')
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return ('row',)
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('k', loader))) for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        assert len(calls) == 1 and results == [('row',)] * 4
+        
+        def failing():
+            raise RuntimeError('db down')
+        with pytest.raises(RuntimeError):
+            cache.get_or_load('err', failing)
+        assert cache.get('err') == (False, None)
+    
+    def test_cached_decorator_and_version_sync(self):
+        """cached 데코레이터의 인자 정규화, 조건부 캐시, 다른 프로세스 버전 변경 시 무효화를 테스트"""
+        from flask import Flask
+        from core.cache import cached, require_fresh, result_cache
+        app = Flask(__name__)
+        app.config.update(RESULT_CACHE_ENABLED=True, RESULT_CACHE_SYNC_INTERVAL=3600)
+        versions = {'trading:005930': 1}
+        calls = []
+        
+        @cached(lambda stock_code, **arguments: [f'trading:{stock_code}'], when=lambda stream, **arguments: not stream)
+        def load(stock_code, limit=10, stream=False):
+            calls.append(stock_code)
+            return (stock_code, limit)
+        
+        result_cache.clear()
+        result_cache.set_version_source(lambda known: dict(versions))
+        try:
+            with app.test_request_context():
+                assert load('005930') == load('005930', limit=10) == ('005930', 10)
+                assert len(calls) == 1
+                load('005930', stream=True)
+                assert len(calls) == 2
+                
+                # 동기화 간격 안에서는 확인하지 않고, require_fresh() 후에는 바로 반영
+                versions['trading:005930'] = 2
+                load('005930')
+                assert len(calls) == 2
+                require_fresh()
+                load('005930')
+                assert len(calls) == 3
+            
+            app.config['RESULT_CACHE_ENABLED'] = False
+            with app.app_context():
+                load('005930')
+            assert len(calls) == 4
+        finally:
+            result_cache.set_version_source(None)
+            result_cache.clear()
+    
+    def test_shared_tier_versioned_keys(self):
+        """공유 캐시(MemoryRedis)로 워커 간 결과를 공유하고, 태그 버전 증가로 모든 워커에서 무효화되는지 테스트"""
+        from sqlalchemy import create_engine, text
+        from core.cache import ResultCache
+        from core.shared_cache import MemoryRedis, SharedCache
+        with create_engine('sqlite://').connect() as conn:
+            rows = conn.execute(text("SELECT '005930' AS stock_code, 70000 AS close_price")).all()
+        redis = MemoryRedis()
+        workers = [ResultCache(f'test_shared_{index}') for index in range(2)]
+        for worker in workers:
+            worker.shared = SharedCache(redis, prefix='test')
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return rows
+        
+        tags = ['trading', 'trading:005930']
+        assert workers[0].get_or_load('k', loader, tags) == rows
+        shared = workers[1].get_or_load('k', loader, tags)
+        assert len(calls) == 1 and shared == rows and shared[0].close_price == 70000
+        
+        # 다른 종목 태그는 영향 없음, 같은 태그 버전이 오르면 다른 워커의 다음 미스도 다시 조회
+        workers[0].invalidate('trading:000660')
+        workers[1].clear()
+        workers[1].get_or_load('k', loader, tags)
+        assert len(calls) == 1
+        workers[0].invalidate('trading:005930')
+        workers[1].clear()
+        workers[1].get_or_load('k', loader, tags)
+        assert len(calls) == 2
+        
+        # 압축 후 한도를 넘는 값은 공유하지 않음
+        workers[0].shared.max_bytes = 10
+        workers[0].get_or_load('big', lambda: list(range(1000)), tags)
+        assert workers[1].shared.get('big', workers[1].shared.versions(tags)) == (False, None)
+    
+    def test_shared_tier_errors_fall_back(self):
+        """Redis 오류 시 조회는 계속되고, 올리지 못한 태그 버전은 다음 사용 전에 다시 올리는지 테스트"""
+        from core.cache import ResultCache
+        from core.shared_cache import MemoryRedis, SharedCache
+        
+        class FlakyRedis(MemoryRedis):
+            down = False
+            
+            def pipeline(self, transaction=True):
+                if self.down:
+                    raise ConnectionError('redis down')
+                return super().pipeline(transaction)
+            
+            def mget(self, names):
+                if self.down:
+                    raise ConnectionError('redis down')
+                return super().mget(names)
+        
+        redis = FlakyRedis()
+        cache = ResultCache('test_flaky')
+        cache.shared = SharedCache(redis, prefix='test')
+        assert cache.get_or_load('k', lambda: 1, ['stocks']) == 1
+        redis.down = True
+        cache.invalidate('stocks')
+        assert cache.get_or_load('k', lambda: 2, ['stocks']) == 2
+        
+        redis.down = False
+        cache.shared._down_until = 0
+        cache.clear()
+        assert cache.shared.versions(['stocks']) == (1,)
+        assert cache.get_or_load('k', lambda: 3, ['stocks']) == 3
+    
+    def test_shared_value_round_trip(self):
+        """공유 캐시 값이 pickle 없이 JSON으로 저장/복원되고, 지원하지 않는 값과 조작된 값은 공유하지 않는지 테스트"""
+        import pickle
+        import zlib
+        from datetime import date
+        from decimal import Decimal
+        from sqlalchemy import create_engine, text
+        from core.pagination import Page
+        from core.shared_cache import MemoryRedis, SharedCache, decode_value, encode_value
+        with create_engine('sqlite://').connect() as conn:
+            rows = conn.execute(text("SELECT '005930' AS stock_code, 70000 AS close_price, NULL AS institution_accum")).all()
+        value = {
+            'page': Page(items=rows, limit=1, next_cursor='abc'),
+            'series': [{'trade_date': '2024-01-02', 'institution_accum': 115}],
+            'latest': date(2024, 1, 2),
+            'ratio': Decimal('1.5'),
+            'pair': (1, None),
+        }
+        
+        restored = decode_value(encode_value(value))
+        assert restored == value
+        assert restored['page'].items[0].close_price == 70000
+        assert restored['page'].items[0]._fields == ('stock_code', 'close_price', 'institution_accum')
+        assert decode_value(encode_value([])) == []
+        
+        shared = SharedCache(MemoryRedis(), prefix='test')
+        versions = shared.versions(['stocks'])
+        assert not shared.set('object', versions, object(), 60)
+        assert shared.get('object', versions) == (False, None)
+        shared.client.set(shared._value_key('forged', versions), zlib.compress(pickle.dumps({'x': 1})))
+        assert shared.get('forged', versions) == (False, None)
+    
+    def test_shared_bump_is_atomic(self):
+        """태그 버전을 한 트랜잭션으로 올려, 실패하면 어떤 태그도 오르지 않고 다음 사용 전에 모두 다시 올리는지 테스트"""
+        from core.shared_cache import MemoryRedis, SharedCache
+        
+        class FailingExecRedis(MemoryRedis):
+            fail = True
+            
+            def pipeline(self, transaction=True):
+                pipeline = super().pipeline(transaction)
+                if self.fail:
+                    def execute():
+                        raise ConnectionError('connection lost before EXEC')
+                    pipeline.execute = execute
+                return pipeline
+        
+        redis = FailingExecRedis()
+        shared = SharedCache(redis, prefix='test')
+        tags = ['trading', 'trading:005930']
+        shared.bump(tags)
+        assert redis.mget([shared._version_key(tag) for tag in tags]) == [None, None]
+        
+        redis.fail = False
+        shared._down_until = 0
+        assert shared.versions(tags) == (1, 1)
@@ -37,7 +37,7 @@ def create_backup():
                        'init_date': s.init_date, 'institution_accum_init': s.institution_accum_init, 
                        'foreigner_accum_init': s.foreigner_accum_init} for s in StockList.query.all()],
             'trading_data': [{'id': t.id, 'stock_code': t.stock_code, 'stock_name': t.stock_name,
-                             'trade_date': t.trade_date, 'close_price': t.close_price,
+                             'trade_date': t.trade_date.isoformat(), 'close_price': t.close_price,
                              'institution_net_buy': t.institution_net_buy, 'foreigner_net_buy': t.foreigner_net_buy,
                              'institution_accum': t.institution_accum, 'foreigner_accum': t.foreigner_accum,
                              'institution_trend_signal': t.institution_trend_signal, 'institution_trend_score': t.institution_trend_score,
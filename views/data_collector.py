@@ -9,9 +9,11 @@ import logging
 import time
 from extensions import executor
 from services.data_collector import DataCollectorService
+from services.trend_service import TrendService
 from models.stock import StockList
 from services.stock_service import StockService
-from database.transaction import safe_transaction, read_only_transaction
+from database.transaction import safe_transaction, read_only_transaction, reraise_operational_error
+from database.partitioning import is_partitioned, list_partitions, apply_retention
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -82,6 +84,7 @@ def collect_data_background(years: int = 3, max_pages: int = 10):
         update_progress('initializing', '주식 목록 초기화 중...', 0)
         
         # 주식 목록 초기화
+        DataCollectorService.prepare_partitions(years)
         if not DataCollectorService.initialize_stock_list():
             update_progress('error', '', 0, 0, 0, '주식 목록 초기화 실패')
             return {'status': 'error', 'message': '주식 목록 초기화 실패'}
@@ -192,6 +195,7 @@ def get_collection_status():
         return jsonify(collection_status), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"상태 조회 실패: {str(e)}")
         return jsonify({
             'status': 'error',
@@ -386,6 +390,7 @@ def get_available_stocks():
         }), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"주식 목록 조회 실패: {str(e)}")
         return jsonify({
             'status': 'error',
@@ -399,14 +404,25 @@ def calculate_accumulated_data():
     """
     모든 주식의 누적 매수량 데이터를 계산
     
+    Query Parameters:
+        mode (str): full (기본값, 처음부터 재계산) 또는 incremental (변경 구간 이후만 갱신)
+    
     Returns:
         JSON: 계산 결과
     """
     try:
-        logger.info("누적 데이터 계산 요청")
+        mode = request.args.get('mode', 'full')
+        if mode not in ('full', 'incremental'):
+            return jsonify({
+                'status': 'error',
+                'error': 'mode는 full 또는 incremental이어야 합니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        logger.info(f"누적 데이터 계산 요청 ({mode})")
         
         # 누적 데이터 계산
-        results = DataCollectorService.calculate_all_accumulated_data()
+        results = DataCollectorService.calculate_all_accumulated_data(incremental=(mode == 'incremental'))
         
         return jsonify({
             'status': 'success' if results.get('success_stocks', 0) > 0 else 'info',
@@ -582,11 +598,22 @@ def calculate_accumulated_data_by_stock(stock_code):
     Args:
         stock_code (str): 주식 코드
         
+    Query Parameters:
+        mode (str): full (기본값, 처음부터 재계산) 또는 incremental (변경 구간 이후만 갱신)
+        
     Returns:
         JSON: 계산 결과
     """
     try:
-        logger.info(f"종목별 누적 데이터 계산 요청: {stock_code}")
+        mode = request.args.get('mode', 'full')
+        if mode not in ('full', 'incremental'):
+            return jsonify({
+                'status': 'error',
+                'error': 'mode는 full 또는 incremental이어야 합니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        logger.info(f"종목별 누적 데이터 계산 요청: {stock_code} ({mode})")
         
         # 입력값 검증
         if not stock_code or not stock_code.strip():
@@ -597,7 +624,9 @@ def calculate_accumulated_data_by_stock(stock_code):
             }), 400
         
         # 해당 종목의 누적 데이터 계산
-        success = DataCollectorService.calculate_accumulated_data(stock_code.strip())
+        success = DataCollectorService.calculate_accumulated_data(
+            stock_code.strip(), incremental=(mode == 'incremental')
+        )
         
         if success:
             return jsonify({
@@ -624,6 +653,66 @@ def calculate_accumulated_data_by_stock(stock_code):
         }), 500
 
 
+@collector_bp.route('/calculate-trends', methods=['POST'])
+@safe_transaction
+def calculate_trends():
+    """
+    모든 종목(또는 지정 종목)의 트렌드 신호/점수를 계산하여 일괄 기록
+    
+    Query Parameters:
+        mode (str): full (기본값, 전체 이력 재계산) 또는 incremental (저장된 지표 상태에서 새 거래일만 계산)
+        
+    Request Body (선택):
+        stock_codes (list): 대상 종목 코드 목록 (생략 시 전체)
+        
+    Returns:
+        JSON: 계산 결과
+    """
+    try:
+        mode = request.args.get('mode', 'full')
+        if mode not in ('full', 'incremental'):
+            return jsonify({
+                'status': 'error',
+                'error': 'mode는 full 또는 incremental이어야 합니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        data = request.get_json(silent=True) or {}
+        stock_codes = data.get('stock_codes')
+        if stock_codes is not None and (
+            not isinstance(stock_codes, list) or not all(isinstance(code, str) for code in stock_codes)
+        ):
+            return jsonify({
+                'status': 'error',
+                'error': 'stock_codes는 문자열 배열이어야 합니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        logger.info(f"트렌드 분석 요청 ({mode}): {len(stock_codes) if stock_codes is not None else '전체'} 종목")
+        if mode == 'incremental':
+            results = TrendService.advance_trends(stock_codes)
+            message = (f"트렌드 증분 갱신 완료: 이어서 계산 {results['advanced_stocks']}개, "
+                       f"재계산 {results['rebuilt_stocks']}개 종목, {results['updated_rows']}건 갱신")
+        else:
+            results = TrendService.analyze_trends(stock_codes)
+            message = f"트렌드 분석 완료: {results['stocks']}개 종목, {results['updated_rows']}건 갱신"
+        
+        return jsonify({
+            'status': 'success' if results['rows'] > 0 else 'info',
+            'message': message,
+            'results': results,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"트렌드 분석 실패: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+
 @collector_bp.route('/test-url/<stock_code>', methods=['GET'])
 @read_only_transaction
 def test_url(stock_code):
@@ -638,6 +727,7 @@ def test_url(stock_code):
             'timestamp': datetime.now().isoformat()
         }), 200
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"테스트 URL 호출 실패: {str(e)}")
         return jsonify({
             'status': 'error',
@@ -695,6 +785,7 @@ def get_batch_monitoring():
         return jsonify(monitoring_info), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"모니터링 정보 조회 실패: {e}")
         return jsonify({
             'error': '모니터링 정보 조회 중 오류가 발생했습니다.',
@@ -874,6 +965,98 @@ def check_missing_dates():
         }), 500
 
 
+@collector_bp.route('/partitions', methods=['GET'])
+@read_only_transaction
+def get_partitions():
+    """
+    거래 데이터 파티션 목록 조회
+    
+    Returns:
+        JSON: 파티션 여부와 파티션별 경계/크기
+    """
+    try:
+        partitioned = is_partitioned()
+        partitions = list_partitions() if partitioned else []
+        
+        return jsonify({
+            'status': 'success',
+            'partitioned': partitioned,
+            'interval': current_app.config.get('TRADING_PARTITION_INTERVAL') or None,
+            'partitions': partitions,
+            'count': len(partitions),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        reraise_operational_error(e)
+        logger.error(f"파티션 목록 조회 실패: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+
+@collector_bp.route('/partitions/retention', methods=['POST'])
+@safe_transaction
+def apply_partition_retention():
+    """
+    보존 기간이 지난 파티션을 분리(DETACH)하고 선택적으로 삭제
+    
+    Request Body:
+        keep_from (str): 보존 시작일 (YYYY-MM-DD) - 이 날짜 이전 구간만 가진 파티션이 대상
+        drop (bool): 분리 후 삭제 여부 (기본값: false)
+        
+    Returns:
+        JSON: 분리/삭제된 파티션 목록
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        keep_from = data.get('keep_from')
+        drop = bool(data.get('drop', False))
+        
+        if not keep_from:
+            return jsonify({
+                'status': 'error',
+                'error': 'keep_from 필드는 필수입니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        try:
+            datetime.strptime(keep_from, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({
+                'status': 'error',
+                'error': 'keep_from은 YYYY-MM-DD 형식이어야 합니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        if not is_partitioned():
+            return jsonify({
+                'status': 'error',
+                'error': '거래 데이터 테이블이 파티션 테이블이 아닙니다.',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        partitions = apply_retention(keep_from, drop=drop)
+        
+        return jsonify({
+            'status': 'success',
+            'message': f"{len(partitions)}개 파티션 {'삭제' if drop else '분리'} 완료",
+            'partitions': partitions,
+            'dropped': drop,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"파티션 보존 정책 적용 실패: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+
 # 에러 핸들러
 @collector_bp.errorhandler(404)
 def not_found(error):
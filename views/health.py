@@ -2,9 +2,11 @@
 """
 헬스체크 API
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 from extensions import db
 from core.logger import get_logger
+from core.metrics import metrics
+from database.pool import pool_report, server_connection_usage, compute_pool_limits, sizing_inputs
 
 health_bp = Blueprint('health', __name__)
 logger = get_logger(__name__)
@@ -40,4 +42,32 @@ def readiness_check():
         return jsonify({'status': 'ready'}), 200
     except Exception as e:
         logger.error('Readiness check failed', error=str(e))
-        return jsonify({'status': 'not ready'}), 503 
\ No newline at end of file
+        return jsonify({'status': 'not ready'}), 503 
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics_snapshot():
+    """프로세스 운영 지표 (연결 끊김/재시도 횟수, 엔진별 커넥션 풀 상태 등)"""
+    snapshot = metrics.snapshot()
+    snapshot['pools'] = pool_report(db.engines)
+    return jsonify(snapshot), 200
+
+
+@health_bp.route('/metrics/pools', methods=['GET'])
+def pool_metrics():
+    """커넥션 풀 상태와 DB 서버 연결 사용량 (max_connections 대비)"""
+    result = {
+        'pools': pool_report(db.engines),
+        'sizing': {
+            'mode': current_app.config.get('DB_POOL_SIZING'),
+            'inputs': sizing_inputs(current_app.config),
+            'recommended': compute_pool_limits(**sizing_inputs(current_app.config)),
+        },
+        'servers': {}
+    }
+    for key, engine in db.engines.items():
+        try:
+            result['servers'][key or 'primary'] = server_connection_usage(engine)
+        except Exception as e:
+            logger.error('Connection usage check failed', engine=key or 'primary', error=str(e))
+            result['servers'][key or 'primary'] = {'error': str(e)}
+    return jsonify(result), 200
@@ -4,10 +4,11 @@
 데이터 변경 히스토리와 시스템 로그를 관리하는 API 엔드포인트를 제공합니다.
 """
 from flask import Blueprint, jsonify, request
-from services.history_service import HistoryService
+from services.history_service import HistoryService, DATA_HISTORY_KEYSET, SYSTEM_LOG_KEYSET
 from extensions import db
 from models.history import DataHistory, SystemLog
-from database.transaction import safe_transaction, read_only_transaction
+from database.transaction import safe_transaction, read_only_transaction, reraise_operational_error
+from core.pagination import InvalidCursorError, page_request_from_args, page_response
 from datetime import datetime, timedelta
 import logging
 
@@ -30,11 +31,12 @@ def get_data_history():
         action (str, optional): 작업 유형 필터 (CREATE, READ, UPDATE, DELETE)
         start_date (str, optional): 시작 날짜 (YYYY-MM-DD)
         end_date (str, optional): 종료 날짜 (YYYY-MM-DD)
-        limit (int, optional): 조회 개수 제한 (기본값: 100)
-        offset (int, optional): 오프셋 (기본값: 0)
+        limit (int, optional): 페이지 크기 (기본값: 100, 최대 PAGINATION_MAX_LIMIT)
+        cursor (str, optional): 이전 응답의 X-Next-Cursor/X-Prev-Cursor 값
+        offset (int, optional): 오프셋 (하위 호환용, cursor가 없을 때만 적용)
         
     Returns:
-        JSON: 히스토리 목록
+        JSON: 히스토리 목록 (생성 시간 내림차순, 커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
     """
     try:
         # 쿼리 파라미터 파싱
@@ -43,8 +45,7 @@ def get_data_history():
         action = request.args.get('action')
         start_date_str = request.args.get('start_date')
         end_date_str = request.args.get('end_date')
-        limit = request.args.get('limit', 100, type=int)
-        offset = request.args.get('offset', 0, type=int)
+        page = page_request_from_args(DATA_HISTORY_KEYSET, default_limit=100)
         
         # 날짜 파싱
         start_date = None
@@ -67,19 +68,21 @@ def get_data_history():
                 }), 400
         
         # 히스토리 조회
-        history_list = HistoryService.get_data_history(
+        history_page = HistoryService.get_data_history(
             table_name=table_name,
             record_id=record_id,
             action=action,
             start_date=start_date,
             end_date=end_date,
-            limit=limit,
-            offset=offset
+            page=page
         )
         
-        return jsonify([history.to_dict() for history in history_list]), 200
+        return page_response(history_page, lambda history: history.to_dict()), 200
         
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e), 'parameter': 'cursor'}), 400
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"데이터 히스토리 조회 실패: {str(e)}")
         return jsonify({
             'error': '데이터 히스토리를 조회하는데 실패했습니다.',
@@ -98,11 +101,12 @@ def get_system_logs():
         category (str, optional): 카테고리 필터
         start_date (str, optional): 시작 날짜 (YYYY-MM-DD)
         end_date (str, optional): 종료 날짜 (YYYY-MM-DD)
-        limit (int, optional): 조회 개수 제한 (기본값: 100)
-        offset (int, optional): 오프셋 (기본값: 0)
+        limit (int, optional): 페이지 크기 (기본값: 100, 최대 PAGINATION_MAX_LIMIT)
+        cursor (str, optional): 이전 응답의 X-Next-Cursor/X-Prev-Cursor 값
+        offset (int, optional): 오프셋 (하위 호환용, cursor가 없을 때만 적용)
         
     Returns:
-        JSON: 시스템 로그 목록
+        JSON: 시스템 로그 목록 (생성 시간 내림차순, 커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
     """
     try:
         # 쿼리 파라미터 파싱
@@ -110,8 +114,7 @@ def get_system_logs():
         category = request.args.get('category')
         start_date_str = request.args.get('start_date')
         end_date_str = request.args.get('end_date')
-        limit = request.args.get('limit', 100, type=int)
-        offset = request.args.get('offset', 0, type=int)
+        page = page_request_from_args(SYSTEM_LOG_KEYSET, default_limit=100)
         
         # 날짜 파싱
         start_date = None
@@ -134,18 +137,20 @@ def get_system_logs():
                 }), 400
         
         # 시스템 로그 조회
-        logs = HistoryService.get_system_logs(
+        log_page = HistoryService.get_system_logs(
             level=level,
             category=category,
             start_date=start_date,
             end_date=end_date,
-            limit=limit,
-            offset=offset
+            page=page
         )
         
-        return jsonify([log.to_dict() for log in logs]), 200
+        return page_response(log_page, lambda log: log.to_dict()), 200
         
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e), 'parameter': 'cursor'}), 400
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"시스템 로그 조회 실패: {str(e)}")
         return jsonify({
             'error': '시스템 로그를 조회하는데 실패했습니다.',
@@ -179,6 +184,7 @@ def get_latest_activity():
         return jsonify([activity.to_dict() for activity in activities]), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"최근 활동 조회 실패: {str(e)}")
         return jsonify({
             'error': '최근 활동을 조회하는데 실패했습니다.',
@@ -207,6 +213,7 @@ def get_activity_summary():
         return jsonify(summary), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"활동 요약 조회 실패: {str(e)}")
         return jsonify({
             'error': '활동 요약을 조회하는데 실패했습니다.',
@@ -267,6 +274,7 @@ def get_history_stats():
         return jsonify(stats), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"히스토리 통계 조회 실패: {str(e)}")
         return jsonify({
             'error': '히스토리 통계를 조회하는데 실패했습니다.',
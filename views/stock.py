@@ -3,10 +3,13 @@
 Stock REST API 뷰
 주식 목록에 대한 CRUD API 엔드포인트를 제공합니다.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from services.stock_service import StockService
 from services.stock_list_collector import StockListCollectorService
-from database.transaction import safe_transaction, read_only_transaction
+from services.watermark_service import WatermarkService
+from database.transaction import safe_transaction, read_only_transaction, reraise_operational_error
+from core.conditional import conditional_get
+from core.serialization import json_response, row_serializer, serialize_rows
 import logging
 from datetime import datetime
 from extensions import db
@@ -22,24 +25,41 @@ logger = logging.getLogger(__name__)
 stock_bp = Blueprint('stock', __name__)
 
 
+def _fast_read_path() -> bool:
+    """모델 객체 대신 컬럼 값 Row로 조회하여 직렬화할지 여부 (FAST_READ_PATH_ENABLED)"""
+    return current_app.config.get('FAST_READ_PATH_ENABLED', True)
+
+
+def _stock_response(stock):
+    """주식 한 건 응답 (Row면 빠른 직렬화, 모델 객체면 to_dict)"""
+    if hasattr(stock, 'to_dict'):
+        return jsonify(stock.to_dict())
+    return json_response(row_serializer(tuple(stock._fields))(stock))
+
+
 @stock_bp.route('/', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.stocks, 'stocks')
 def list_stocks():
     """
     주식 목록 조회
     
     Returns:
         JSON: 주식 목록 배열
+        Headers: ETag, Last-Modified, Cache-Control (If-None-Match/If-Modified-Since가 일치하면 본문 없이 304)
         
     Example:
         GET /stocks/
         Response: [{"id": 1, "stock_code": "005930", "stock_name": "삼성전자", "init_date": "2024-01-01", "institution_accum_init": 0, "foreigner_accum_init": 0}]
     """
     try:
+        if _fast_read_path():
+            return json_response(serialize_rows(StockService.get_all_stocks(tabular=True))), 200
         stocks = StockService.get_all_stocks()
         return jsonify([stock.to_dict() for stock in stocks]), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"주식 목록 조회 실패: {str(e)}")
         return jsonify({
             'error': '주식 목록을 조회하는데 실패했습니다.',
@@ -49,6 +69,7 @@ def list_stocks():
 
 @stock_bp.route('/<int:stock_id>', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.stocks, 'stocks')
 def get_stock(stock_id):
     """
     특정 주식 조회
@@ -71,7 +92,7 @@ def get_stock(stock_id):
                 'stock_id': stock_id
             }), 400
         
-        stock = StockService.get_stock_by_id(stock_id)
+        stock = StockService.get_stock_by_id(stock_id, tabular=_fast_read_path())
         
         if not stock:
             return jsonify({
@@ -79,9 +100,10 @@ def get_stock(stock_id):
                 'stock_id': stock_id
             }), 404
             
-        return jsonify(stock.to_dict()), 200
+        return _stock_response(stock), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"주식 조회 실패 (ID: {stock_id}): {str(e)}")
         return jsonify({
             'error': '주식을 조회하는데 실패했습니다.',
@@ -91,6 +113,7 @@ def get_stock(stock_id):
 
 @stock_bp.route('/code/<string:stock_code>', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.stocks, 'stocks')
 def get_stock_by_code(stock_code):
     """
     주식 코드로 주식 조회
@@ -113,7 +136,7 @@ def get_stock_by_code(stock_code):
                 'stock_code': stock_code
             }), 400
         
-        stock = StockService.get_stock_by_code(stock_code.strip())
+        stock = StockService.get_stock_by_code(stock_code.strip(), tabular=_fast_read_path())
         
         if not stock:
             return jsonify({
@@ -121,9 +144,10 @@ def get_stock_by_code(stock_code):
                 'stock_code': stock_code
             }), 404
             
-        return jsonify(stock.to_dict()), 200
+        return _stock_response(stock), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"주식 조회 실패 (Code: {stock_code}): {str(e)}")
         return jsonify({
             'error': '주식을 조회하는데 실패했습니다.',
@@ -409,6 +433,7 @@ def delete_stock_api(stock_id):
 @stock_bp.route('/search/', methods=['GET'])
 @stock_bp.route('/search', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.stocks, 'stocks')
 def search_stocks():
     """
     주식 검색
@@ -435,18 +460,22 @@ def search_stocks():
                 'parameters': ['name', 'code']
             }), 400
         
+        tabular = _fast_read_path()
         stocks = []
         if name:
-            stocks.extend(StockService.search_stocks_by_name(name))
+            stocks.extend(StockService.search_stocks_by_name(name, tabular=tabular))
         if code:
-            code_stocks = StockService.search_stocks_by_code(code)
+            code_stocks = StockService.search_stocks_by_code(code, tabular=tabular)
             # 중복 제거
             existing_ids = {stock.id for stock in stocks}
             stocks.extend([stock for stock in code_stocks if stock.id not in existing_ids])
         
+        if tabular:
+            return json_response(serialize_rows(stocks)), 200
         return jsonify([stock.to_dict() for stock in stocks]), 200
         
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"주식 검색 실패 (name: {name}, code: {code}): {str(e)}")
         return jsonify({
             'error': '주식을 검색하는데 실패했습니다.',
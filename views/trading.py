@@ -3,9 +3,27 @@
 Stock Investor Trading REST API 뷰
 주식 투자자별 거래 데이터에 대한 CRUD API 엔드포인트를 제공합니다.
 """
-from flask import Blueprint, jsonify, request
-from services.trading_service import TradingService
-from database.transaction import safe_transaction, read_only_transaction
+from flask import Blueprint, current_app, jsonify, request
+from datetime import datetime
+import functools
+import io
+import pandas as pd
+from services.trading_service import TradingService, TRADING_KEYSET, TRADING_COLUMNS, TRADING_FIELD_NAMES, InvalidFieldsError
+from services.accumulation_service import AccumulationService
+from services.watermark_service import WatermarkService
+from services.ingest_service import (
+    IngestService, FORMAT_CSV, FORMAT_NDJSON, SUPPORTED_FORMATS, ON_CONFLICT_UPDATE
+)
+from models.stock import StockList
+from database.transaction import safe_transaction, read_only_transaction, reraise_operational_error
+from core.pagination import InvalidCursorError, page_headers, page_request_from_args, page_response
+from core.formats import (
+    FORMAT_COLUMNAR, FORMAT_JSON, InvalidFormatError, available_formats, response_format_from_args,
+    rows_to_columns, table_response
+)
+from core.streaming import InvalidStreamModeError, STREAM_MODES, stream_mode_from_args, stream_response
+from core.conditional import conditional_get
+from core.serialization import json_response, result_serializer, row_serializer, serialize_rows
 import logging
 
 # 로거 설정
@@ -15,24 +33,127 @@ logger = logging.getLogger(__name__)
 trading_bp = Blueprint('trading', __name__)
 
 
+def _serialize_trading(data):
+    """모델 객체 또는 행 조회 결과(Row, 누적 초기값/주식명 반영 완료)를 딕셔너리로 변환"""
+    if hasattr(data, 'to_dict'):
+        return data.to_dict()
+    return row_serializer(tuple(data._fields))(data)
+
+
+def _invalid_list_parameter_response(error: ValueError):
+    """잘못된 목록 조회 파라미터(cursor, stream, format, fields) 응답"""
+    body = {
+        'error': str(error),
+        'parameter': error.parameter
+    }
+    if isinstance(error, InvalidStreamModeError):
+        body['allowed_values'] = STREAM_MODES
+    elif isinstance(error, InvalidFormatError):
+        body['allowed_values'] = available_formats()
+    elif isinstance(error, InvalidFieldsError):
+        body['allowed_values'] = TRADING_FIELD_NAMES
+    return jsonify(body), 400
+
+
+def _table_response(fmt: str, rows, fields=None):
+    """
+    거래 데이터 Row 목록(누적 초기값/주식명 반영 완료)을 표 형식(columnar/csv/arrow/parquet) 응답으로 변환
+
+    columnar이면 주식 코드/주식명을 행마다 반복하지 않고 메타데이터에 한 번만 포함합니다
+    (한 종목이면 stock_code/stock_name, 여러 종목이면 stocks: {주식 코드: 주식명}).
+    """
+    if rows:
+        keys = rows[0]._fields
+    else:
+        keys = [column.key for column in (TradingService.projection(fields) if fields else TRADING_COLUMNS)]
+    columns = rows_to_columns(rows, keys)
+    if fmt != FORMAT_COLUMNAR or not rows:
+        return table_response(fmt, columns)
+    
+    names = dict(zip(columns['stock_code'], columns.pop('stock_name'))) if 'stock_name' in columns else None
+    if len(set(columns['stock_code'])) == 1:
+        meta = {'stock_code': columns.pop('stock_code')[0]}
+        if names is not None:
+            meta['stock_name'] = names[meta['stock_code']]
+        return table_response(fmt, columns, meta)
+    return table_response(fmt, columns, {'stocks': names} if names is not None else {})
+
+
+def _list_response(fetch, default_limit=None):
+    """
+    목록 조회 응답
+
+    format이 json이 아니면 커서 페이지 한 장을 컬럼 값으로 조회하여 표 형식으로 응답합니다 (stream 무시).
+    stream 파라미터(또는 Accept: application/x-ndjson)가 있으면 전체 결과를 서버 측 커서로 읽어 스트리밍하고,
+    없으면 커서 페이지 한 장을 JSON 배열로 응답합니다. 스트리밍에서는 limit/cursor를 적용하지 않습니다.
+    fields 파라미터가 있으면 어느 경우든 id, stock_code, trade_date와 요청 필드 컬럼만 조회합니다.
+    FAST_READ_PATH_ENABLED(기본값)이면 JSON 응답도 ORM 객체 없이 컬럼 값 Row로 조회하여 직렬화합니다.
+
+    Args:
+        fetch (Callable): page, stream, tabular, fields 키워드 인자를 받는 TradingService 조회 함수
+        default_limit (Optional[int]): 기본 페이지 크기
+
+    Returns:
+        Response: 표 형식, 스트리밍 또는 페이지 응답
+    """
+    fields = TradingService.parse_fields(request.args.get('fields'))
+    fmt = response_format_from_args()
+    if fmt != FORMAT_JSON:
+        page = page_request_from_args(TRADING_KEYSET, default_limit)
+        trading_page = fetch(page=page, tabular=True, fields=fields)
+        response = _table_response(fmt, trading_page.items, fields)
+        response.headers.extend(page_headers(trading_page))
+        return response
+    
+    # 빠른 조회 경로: 모델 객체 대신 응답 값 Row를 조회하여 projection별 변환 함수로 직렬화
+    rows = fields is not None or current_app.config.get('FAST_READ_PATH_ENABLED', True)
+    mode = stream_mode_from_args()
+    if mode:
+        serialize = result_serializer() if rows else _serialize_trading
+        return stream_response(fetch(stream=True, tabular=rows, fields=fields), serialize, mode)
+    page = page_request_from_args(TRADING_KEYSET, default_limit)
+    if not rows:
+        return page_response(fetch(page=page), _serialize_trading)
+    trading_page = fetch(page=page, tabular=True, fields=fields)
+    response = json_response(serialize_rows(trading_page.items))
+    response.headers.extend(page_headers(trading_page))
+    return response
+
+
 @trading_bp.route('/', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading, 'trading')
 def list_trading_data():
     """
-    거래 데이터 목록 조회
+    거래 데이터 목록 조회 (커서 페이지네이션)
     
+    Query Parameters:
+        limit (int): 페이지 크기 (선택, 기본값: PAGINATION_DEFAULT_LIMIT, 최대 PAGINATION_MAX_LIMIT)
+        cursor (str): 이전 응답의 X-Next-Cursor/X-Prev-Cursor 값 (선택)
+        stream (str): ndjson 또는 json이면 전체 결과를 스트리밍 (선택, limit/cursor 무시)
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        fields (str): 조회할 필드 (쉼표 구분, 선택, id/stock_code/trade_date는 항상 포함)
+        
     Returns:
-        JSON: 거래 데이터 목록 배열
+        JSON: 거래 데이터 목록 배열 (거래일, 주식 코드, ID 내림차순)
+        Headers: Link (rel="next"/"prev"), X-Next-Cursor, X-Prev-Cursor, X-Page-Limit
+        Headers: ETag, Last-Modified, Cache-Control (If-None-Match/If-Modified-Since가 일치하면 본문 없이 304)
         
     Example:
-        GET /trading/
+        GET /trading/?limit=100
+        GET /trading/?stream=ndjson  (전체 결과를 한 줄에 하나씩 스트리밍)
+        GET /trading/?format=parquet
+        GET /trading/?fields=close_price,institution_net_buy
+        Response: [{"id": 1, "stock_code": "005930", "trade_date": "2024-01-01", "close_price": 70000, "institution_net_buy": 1000}]
         Response: [{"id": 1, "stock_code": "005930", "stock_name": "삼성전자", "trade_date": "2024-01-01", "close_price": 70000, ...}]
     """
     try:
-        trading_data = TradingService.get_all_trading_data()
-        return jsonify([data.to_dict() for data in trading_data]), 200
+        return _list_response(TradingService.get_all_trading_data), 200
         
+    except (InvalidCursorError, InvalidStreamModeError, InvalidFormatError, InvalidFieldsError) as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"거래 데이터 목록 조회 실패: {str(e)}")
         return jsonify({
             'error': '거래 데이터 목록을 조회하는데 실패했습니다.',
@@ -42,6 +163,7 @@ def list_trading_data():
 
 @trading_bp.route('/<int:trading_id>', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading, 'trading')
 def get_trading_data(trading_id):
     """
     특정 거래 데이터 조회
@@ -49,11 +171,15 @@ def get_trading_data(trading_id):
     Args:
         trading_id (int): 거래 데이터 ID
         
+    Query Parameters:
+        fields (str): 조회할 필드 (쉼표 구분, 선택, id/stock_code/trade_date는 항상 포함)
+        
     Returns:
         JSON: 거래 데이터 정보 또는 에러 메시지
         
     Example:
         GET /trading/1
+        GET /trading/1?fields=close_price
         Response: {"id": 1, "stock_code": "005930", "stock_name": "삼성전자", "trade_date": "2024-01-01", "close_price": 70000, ...}
     """
     try:
@@ -64,7 +190,8 @@ def get_trading_data(trading_id):
                 'trading_id': trading_id
             }), 400
         
-        trading_data = TradingService.get_trading_data_by_id(trading_id)
+        fields = TradingService.parse_fields(request.args.get('fields'))
+        trading_data = TradingService.get_trading_data_by_id(trading_id, fields=fields)
         
         if not trading_data:
             return jsonify({
@@ -72,9 +199,14 @@ def get_trading_data(trading_id):
                 'trading_id': trading_id
             }), 404
             
+        if fields is not None:
+            return json_response(_serialize_trading(trading_data)), 200
         return jsonify(trading_data.to_dict()), 200
         
+    except InvalidFieldsError as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"거래 데이터 조회 실패 (ID: {trading_id}): {str(e)}")
         return jsonify({
             'error': '거래 데이터를 조회하는데 실패했습니다.',
@@ -84,6 +216,7 @@ def get_trading_data(trading_id):
 
 @trading_bp.route('/stock/<string:stock_code>', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading_stock, 'trading_stock')
 def get_trading_data_by_stock_code(stock_code):
     """
     주식 코드로 거래 데이터 조회
@@ -91,11 +224,21 @@ def get_trading_data_by_stock_code(stock_code):
     Args:
         stock_code (str): 주식 코드
         
+    Query Parameters:
+        limit (int): 페이지 크기 (선택)
+        cursor (str): 다음/이전 페이지 커서 (선택)
+        stream (str): ndjson 또는 json이면 전체 결과를 스트리밍 (선택, limit/cursor 무시)
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        fields (str): 조회할 필드 (쉼표 구분, 선택, id/stock_code/trade_date는 항상 포함)
+        
     Returns:
-        JSON: 거래 데이터 목록 또는 에러 메시지
+        JSON: 거래 데이터 목록 또는 에러 메시지 (커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
+        Headers: ETag, Last-Modified (종목 데이터가 바뀔 때만 변경, 일치하면 304)
         
     Example:
-        GET /trading/stock/005930
+        GET /trading/stock/005930?limit=250
+        GET /trading/stock/005930?limit=250&format=columnar
+        Response: {"meta": {"stock_code": "005930", "stock_name": "삼성전자"}, "count": 250, "columns": {"id": [...], "trade_date": [...], ...}}
         Response: [{"id": 1, "stock_code": "005930", "stock_name": "삼성전자", "trade_date": "2024-01-01", ...}]
     """
     try:
@@ -106,11 +249,14 @@ def get_trading_data_by_stock_code(stock_code):
                 'stock_code': stock_code
             }), 400
         
-        trading_data = TradingService.get_trading_data_by_stock_code(stock_code.strip())
-        
-        return jsonify([data.to_dict() for data in trading_data]), 200
+        return _list_response(
+            functools.partial(TradingService.get_trading_data_by_stock_code, stock_code.strip())
+        ), 200
         
+    except (InvalidCursorError, InvalidStreamModeError, InvalidFormatError, InvalidFieldsError) as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"거래 데이터 조회 실패 (Code: {stock_code}): {str(e)}")
         return jsonify({
             'error': '거래 데이터를 조회하는데 실패했습니다.',
@@ -118,8 +264,68 @@ def get_trading_data_by_stock_code(stock_code):
         }), 500
 
 
+@trading_bp.route('/stock/<string:stock_code>/accumulated', methods=['GET'])
+@read_only_transaction
+@conditional_get(WatermarkService.trading_stock, 'trading_stock')
+def get_accumulated_series(stock_code):
+    """
+    종목의 누적 순매수 시계열 조회 (stock_list 누적 초기값 포함)
+    
+    Args:
+        stock_code (str): 주식 코드
+        
+    Query Parameters:
+        start_date (str): 시작 날짜 (YYYY-MM-DD, 선택)
+        end_date (str): 종료 날짜 (YYYY-MM-DD, 선택)
+        source (str): 'cache' (저장된 누계 + 초기값) 또는 'view' (조회 시점 계산), 기본값은 ACCUM_CACHE_ENABLED 설정
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        
+    Returns:
+        JSON: 거래일 오름차순 누적 순매수 목록
+        
+    Example:
+        GET /trading/stock/005930/accumulated?start_date=2024-01-01&source=view
+        Response: [{"trade_date": "2024-01-02", "close_price": 70000, "institution_net_buy": 1000, "institution_accum": 51000, ...}]
+        GET /trading/stock/005930/accumulated?format=columnar
+        Response: {"meta": {"stock_code": "005930", "stock_name": "삼성전자"}, "count": 2, "columns": {"trade_date": ["2024-01-02", ...], ...}}
+    """
+    try:
+        stock_code = stock_code.strip()
+        start_date = request.args.get('start_date', '').strip() or None
+        end_date = request.args.get('end_date', '').strip() or None
+        source = request.args.get('source', '').strip().lower()
+        fmt = response_format_from_args()
+        
+        if source not in ('', 'cache', 'view'):
+            return jsonify({
+                'error': '유효하지 않은 source 값입니다.',
+                'allowed_values': ['cache', 'view']
+            }), 400
+        
+        use_cache = None if not source else source == 'cache'
+        series = AccumulationService.get_accumulated_series(stock_code, start_date, end_date, use_cache)
+        
+        if fmt != FORMAT_JSON:
+            columns = {key: [row[key] for row in series] for key in (series[0] if series else [])}
+            meta = {'stock_code': stock_code, 'stock_name': StockList.get_name(stock_code)}
+            return table_response(fmt, columns, meta), 200
+        
+        return jsonify(series), 200
+        
+    except InvalidFormatError as e:
+        return _invalid_list_parameter_response(e)
+    except Exception as e:
+        reraise_operational_error(e)
+        logger.error(f"누적 순매수 시계열 조회 실패 (Code: {stock_code}): {str(e)}")
+        return jsonify({
+            'error': '누적 순매수 데이터를 조회하는데 실패했습니다.',
+            'message': str(e)
+        }), 500
+
+
 @trading_bp.route('/date-range', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading, 'trading')
 def get_trading_data_by_date_range():
     """
     날짜 범위로 거래 데이터 조회 (인덱스 최적화)
@@ -128,9 +334,14 @@ def get_trading_data_by_date_range():
         start_date (str): 시작 날짜 (YYYY-MM-DD, 필수)
         end_date (str): 종료 날짜 (YYYY-MM-DD, 필수)
         stock_code (str): 주식 코드 (선택)
+        limit (int): 페이지 크기 (선택)
+        cursor (str): 다음/이전 페이지 커서 (선택)
+        stream (str): ndjson 또는 json이면 전체 결과를 스트리밍 (선택, limit/cursor 무시)
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        fields (str): 조회할 필드 (쉼표 구분, 선택, id/stock_code/trade_date는 항상 포함)
         
     Returns:
-        JSON: 거래 데이터 목록
+        JSON: 거래 데이터 목록 (커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
         
     Example:
         GET /trading/date-range?start_date=2024-01-01&end_date=2024-01-31&stock_code=005930
@@ -148,13 +359,14 @@ def get_trading_data_by_date_range():
                 'format': 'YYYY-MM-DD'
             }), 400
         
-        trading_data = TradingService.get_trading_data_by_date_range(
-            start_date, end_date, stock_code
-        )
-        
-        return jsonify([data.to_dict() for data in trading_data]), 200
+        return _list_response(
+            functools.partial(TradingService.get_trading_data_by_date_range, start_date, end_date, stock_code)
+        ), 200
         
+    except (InvalidCursorError, InvalidStreamModeError, InvalidFormatError, InvalidFieldsError) as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"날짜 범위 거래 데이터 조회 실패: {str(e)}")
         return jsonify({
             'error': '거래 데이터를 조회하는데 실패했습니다.',
@@ -163,6 +375,7 @@ def get_trading_data_by_date_range():
 
 @trading_bp.route('/stock-date-range', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading, 'trading')
 def get_trading_data_by_stock_date_range():
     """
     특정 종목의 날짜 범위 거래 데이터 조회 (고성능)
@@ -174,9 +387,14 @@ def get_trading_data_by_stock_date_range():
         include_price (bool): 종가 포함 여부 (기본값: true)
         include_institution (bool): 기관 데이터 포함 여부 (기본값: true)
         include_foreigner (bool): 외국인 데이터 포함 여부 (기본값: true)
+        limit (int): 페이지 크기 (선택)
+        cursor (str): 다음/이전 페이지 커서 (선택)
+        stream (str): ndjson 또는 json이면 전체 결과를 스트리밍 (선택, limit/cursor 무시)
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        fields (str): 조회할 필드 (쉼표 구분, 선택, 지정하면 include_* 대신 사용, id/stock_code/trade_date는 항상 포함)
         
     Returns:
-        JSON: 거래 데이터 목록
+        JSON: 거래 데이터 목록 (커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
         
     Example:
         GET /trading/stock-date-range?stock_code=005930&start_date=2024-01-01&end_date=2024-01-31&include_price=true&include_institution=true&include_foreigner=false
@@ -205,13 +423,15 @@ def get_trading_data_by_stock_date_range():
                 'format': 'YYYY-MM-DD'
             }), 400
         
-        trading_data = TradingService.get_trading_data_by_stock_date_range(
+        return _list_response(functools.partial(
+            TradingService.get_trading_data_by_stock_date_range,
             stock_code, start_date, end_date, include_price, include_institution, include_foreigner
-        )
-        
-        return jsonify([data.to_dict() for data in trading_data]), 200
+        )), 200
         
+    except (InvalidCursorError, InvalidStreamModeError, InvalidFormatError, InvalidFieldsError) as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"종목별 날짜 범위 거래 데이터 조회 실패: {str(e)}")
         return jsonify({
             'error': '거래 데이터를 조회하는데 실패했습니다.',
@@ -220,6 +440,7 @@ def get_trading_data_by_stock_date_range():
 
 @trading_bp.route('/date-range-optimized', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading, 'trading')
 def get_trading_data_by_date_range_optimized():
     """
     날짜 범위 거래 데이터 조회 (페이징 지원, 고성능)
@@ -227,35 +448,25 @@ def get_trading_data_by_date_range_optimized():
     Query Parameters:
         start_date (str): 시작 날짜 (YYYY-MM-DD, 필수)
         end_date (str): 종료 날짜 (YYYY-MM-DD, 필수)
-        limit (int): 조회할 레코드 수 제한 (선택, 기본값: 1000)
-        offset (int): 건너뛸 레코드 수 (선택, 기본값: 0)
+        limit (int): 페이지 크기 (선택, 기본값: 1000, 최대 PAGINATION_MAX_LIMIT)
+        cursor (str): 이전 응답의 X-Next-Cursor/X-Prev-Cursor 값 (선택)
+        stream (str): ndjson 또는 json이면 전체 결과를 스트리밍 (선택, limit/cursor 무시)
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        fields (str): 조회할 필드 (쉼표 구분, 선택, id/stock_code/trade_date는 항상 포함)
+        offset (int): 건너뛸 레코드 수 (하위 호환용, cursor가 없을 때만 적용, 선택)
         
     Returns:
-        JSON: 거래 데이터 목록
+        JSON: 거래 데이터 목록 (커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
         
     Example:
-        GET /trading/date-range-optimized?start_date=2024-01-01&end_date=2024-01-31&limit=100&offset=0
+        GET /trading/date-range-optimized?start_date=2024-01-01&end_date=2024-01-31&limit=100
+        GET /trading/date-range-optimized?start_date=2024-01-01&end_date=2024-01-31&limit=100&cursor=eyJrIjoi...
         Response: [{"id": 1, "stock_code": "005930", "trade_date": "2024-01-01", ...}]
     """
     try:
         start_date = request.args.get('start_date', '').strip()
         end_date = request.args.get('end_date', '').strip()
         
-        # 페이징 파라미터 처리
-        try:
-            limit = int(request.args.get('limit', 1000))
-            if limit <= 0:
-                limit = 1000
-        except ValueError:
-            limit = 1000
-        
-        try:
-            offset = int(request.args.get('offset', 0))
-            if offset < 0:
-                offset = 0
-        except ValueError:
-            offset = 0
-        
         if not start_date or not end_date:
             return jsonify({
                 'error': '시작 날짜와 종료 날짜는 필수입니다.',
@@ -263,13 +474,16 @@ def get_trading_data_by_date_range_optimized():
                 'format': 'YYYY-MM-DD'
             }), 400
         
-        trading_data = TradingService.get_trading_data_by_date_range_optimized(
-            start_date, end_date, limit, offset
-        )
-        
-        return jsonify([data.to_dict() for data in trading_data]), 200
+        # 페이징 파라미터 처리 (OFFSET 대신 keyset 커서)
+        return _list_response(
+            functools.partial(TradingService.get_trading_data_by_date_range_optimized, start_date, end_date),
+            default_limit=1000
+        ), 200
         
+    except (InvalidCursorError, InvalidStreamModeError, InvalidFormatError, InvalidFieldsError) as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"최적화된 날짜 범위 거래 데이터 조회 실패: {str(e)}")
         return jsonify({
             'error': '거래 데이터를 조회하는데 실패했습니다.',
@@ -625,6 +839,7 @@ def delete_trading_data_api(trading_id):
 
 @trading_bp.route('/search', methods=['GET'])
 @read_only_transaction
+@conditional_get(WatermarkService.trading, 'trading')
 def search_trading_data():
     """
     거래 데이터 검색
@@ -632,9 +847,14 @@ def search_trading_data():
     Query Parameters:
         query (str): 검색할 주식 코드 또는 주식명 (부분 일치)
         name (str): 검색할 주식명 (부분 일치) - 하위 호환성을 위해 유지
+        limit (int): 페이지 크기 (선택)
+        cursor (str): 다음/이전 페이지 커서 (선택)
+        stream (str): ndjson 또는 json이면 전체 결과를 스트리밍 (선택, limit/cursor 무시)
+        format (str): json(기본값), columnar, csv, arrow, parquet (선택)
+        fields (str): 조회할 필드 (쉼표 구분, 선택, id/stock_code/trade_date는 항상 포함)
         
     Returns:
-        JSON: 검색된 거래 데이터 목록
+        JSON: 검색된 거래 데이터 목록 (커서는 Link/X-Next-Cursor/X-Prev-Cursor 헤더)
         
     Example:
         GET /trading/search?query=삼성바이오로직스
@@ -657,13 +877,16 @@ def search_trading_data():
         
         # query 파라미터가 있으면 코드/이름 모두 검색, name 파라미터면 이름만 검색
         if query:
-            trading_data = TradingService.search_trading_data_by_query(search_term)
+            search = functools.partial(TradingService.search_trading_data_by_query, search_term)
         else:
-            trading_data = TradingService.search_trading_data_by_name(search_term)
+            search = functools.partial(TradingService.search_trading_data_by_name, search_term)
         
-        return jsonify([data.to_dict() for data in trading_data]), 200
+        return _list_response(search), 200
         
+    except (InvalidCursorError, InvalidStreamModeError, InvalidFormatError, InvalidFieldsError) as e:
+        return _invalid_list_parameter_response(e)
     except Exception as e:
+        reraise_operational_error(e)
         logger.error(f"거래 데이터 검색 실패 (query: {search_term}): {str(e)}")
         return jsonify({
             'error': '거래 데이터를 검색하는데 실패했습니다.',
@@ -779,6 +1002,183 @@ def update_trend_analysis(trading_id):
         }), 500
 
 
+def _read_bulk_frame(max_items: int) -> pd.DataFrame:
+    """
+    일괄 요청 본문(JSON 배열, {"items": [...]}, CSV 본문 또는 CSV 파일 업로드)을 DataFrame으로 변환
+    
+    Raises:
+        ValueError: 형식이 올바르지 않거나 항목 수가 max_items를 넘는 경우
+    """
+    if 'file' in request.files:
+        frame = pd.read_csv(request.files['file'], dtype=str, keep_default_na=False, na_values=[''])
+    elif request.mimetype == 'text/csv':
+        frame = pd.read_csv(io.StringIO(request.get_data(as_text=True)), dtype=str, keep_default_na=False, na_values=[''])
+    elif request.is_json:
+        data = request.get_json(silent=True)
+        items = data.get('items') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValueError('요청 본문은 객체 배열 또는 {"items": [...]} 형식이어야 합니다.')
+        frame = pd.DataFrame.from_records(items)
+    else:
+        raise ValueError('Content-Type은 application/json 또는 text/csv이어야 합니다.')
+    
+    if frame.empty:
+        raise ValueError('업데이트할 항목이 없습니다.')
+    if len(frame) > max_items:
+        raise ValueError(f'한 번에 최대 {max_items}개 항목까지 처리할 수 있습니다.')
+    return frame
+
+
+@trading_bp.route('/trend/bulk', methods=['PUT'])
+@safe_transaction
+def bulk_update_trend_analysis():
+    """
+    트렌드 분석 데이터 일괄 업데이트
+    
+    Request Body (JSON 배열 / {"items": [...]} / CSV):
+        id (int): 거래 데이터 ID (또는 stock_code + trade_date)
+        stock_code (str): 주식 코드 (id가 없을 때 필수)
+        trade_date (str): 거래 날짜 (YYYY-MM-DD, id가 없을 때 필수)
+        institution_trend_signal (str): 기관 트렌드 신호 (필수, 최대 50자)
+        institution_trend_score (float): 기관 트렌드 점수 (필수)
+        foreigner_trend_signal (str): 외국인 트렌드 신호 (필수, 최대 50자)
+        foreigner_trend_score (float): 외국인 트렌드 점수 (필수)
+        
+    Returns:
+        JSON: 전체/성공/실패 건수와 실패 항목 목록 (index는 요청 내 순번)
+        
+    Example:
+        PUT /trading/trend/bulk
+        Body: [{"id": 1, "institution_trend_signal": "상승", "institution_trend_score": 0.8, "foreigner_trend_signal": "하락", "foreigner_trend_score": -0.3},
+               {"stock_code": "005930", "trade_date": "2024-01-02", "institution_trend_signal": "중립", ...}]
+        Response: {"status": "success", "total": 2, "updated": 2, "failed": 0, "failures": [], "timestamp": "..."}
+    """
+    try:
+        frame = _read_bulk_frame(TradingService.BULK_TREND_MAX_ITEMS)
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'error': f'요청 본문을 읽을 수 없습니다: {str(e)}',
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    
+    try:
+        result = TradingService.bulk_update_trend_analysis(frame)
+        logger.info(f"트렌드 분석 일괄 업데이트: {result['updated']}/{result['total']}건 (실패 {result['failed']}건)")
+        
+        return jsonify({
+            'status': 'success' if result['failed'] == 0 else 'partial',
+            **result,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"트렌드 분석 일괄 업데이트 실패: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': '트렌드 분석을 일괄 업데이트하는데 실패했습니다.',
+            'message': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+
+# 일괄 적재 업로드의 Content-Type/확장자 → 형식
+_INGEST_MIMETYPES = {
+    'text/csv': FORMAT_CSV,
+    'application/x-ndjson': FORMAT_NDJSON,
+    'application/ndjson': FORMAT_NDJSON,
+    'application/jsonl': FORMAT_NDJSON,
+}
+_INGEST_EXTENSIONS = {'.csv': FORMAT_CSV, '.ndjson': FORMAT_NDJSON, '.jsonl': FORMAT_NDJSON}
+
+
+def _ingest_source():
+    """
+    일괄 적재 요청의 본문 스트림과 형식을 결정 (format 파라미터 > 파일 확장자 > Content-Type)
+    
+    Returns:
+        Tuple: (바이트 스트림, 형식) - 형식을 알 수 없으면 형식은 None
+    """
+    data_format = request.args.get('format')
+    if 'file' in request.files:
+        upload = request.files['file']
+        extension = '.' + upload.filename.rsplit('.', 1)[-1].lower() if upload.filename and '.' in upload.filename else ''
+        return upload.stream, data_format or _INGEST_EXTENSIONS.get(extension)
+    return request.stream, data_format or _INGEST_MIMETYPES.get(request.mimetype)
+
+
+@trading_bp.route('/bulk', methods=['POST'])
+@safe_transaction
+def bulk_ingest_trading_data():
+    """
+    거래 데이터 일괄 적재 (NDJSON/CSV)
+    
+    본문을 스트림으로 읽어 청크 단위로 검증하고 COPY + ON CONFLICT (stock_code, trade_date)로 반영합니다.
+    유효하지 않은 행은 건너뛰고 행 번호와 사유를 보고합니다 (최대 1000건).
+    
+    Request Body:
+        NDJSON (application/x-ndjson) 또는 헤더가 있는 CSV (text/csv), 또는 multipart 'file' 업로드
+        stock_code (str): 주식 코드 (필수, 6자리 숫자)
+        trade_date (str): 거래 날짜 (필수, YYYY-MM-DD)
+        close_price (int): 종가 (선택, 0 이상)
+        institution_net_buy (int): 기관 순매수 (선택)
+        foreigner_net_buy (int): 외국인 순매수 (선택)
+        
+    Query Parameters:
+        format (str): ndjson 또는 csv (생략 시 Content-Type/파일 확장자로 판단)
+        on_conflict (str): 이미 있는 행 처리 - update(기본, 값이 있는 필드만 덮어씀) 또는 skip
+        
+    Returns:
+        JSON: 전체/추가/갱신/변경 없음/건너뜀/중복/거부 건수와 거부 행 목록
+        
+    Example:
+        POST /trading/bulk?on_conflict=update
+        Content-Type: text/csv
+        Body: stock_code,trade_date,close_price,institution_net_buy,foreigner_net_buy
+              005930,2024-01-02,70000,1200,-300
+        Response: {"status": "success", "total": 1, "inserted": 1, "updated": 0, "rejected": 0, "rejected_rows": [], ...}
+    """
+    stream, data_format = _ingest_source()
+    if data_format not in SUPPORTED_FORMATS:
+        return jsonify({
+            'status': 'error',
+            'error': '형식을 알 수 없습니다. Content-Type(application/x-ndjson, text/csv) 또는 format 파라미터(ndjson, csv)를 지정하세요.',
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    
+    try:
+        result = IngestService.ingest_trading_data(
+            stream, data_format, request.args.get('on_conflict', ON_CONFLICT_UPDATE)
+        )
+        
+        return jsonify({
+            'status': 'success' if result['rejected'] == 0 else 'partial',
+            **result,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"거래 데이터 일괄 적재 실패: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': '거래 데이터를 일괄 적재하는데 실패했습니다.',
+            'message': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+
 # 에러 핸들러
 @trading_bp.errorhandler(404)
 def not_found(error):